@@ -1,39 +1,69 @@
 #!/usr/bin/env python3
 """
-Script do dodania zdjęć do starszych artykułów z dzisiaj (bez zdjęć)
+Script do dodania zdjęć do starszych artykułów (bez zdjęć) z danego dnia
+
+Usage:
+    python add_images_to_old_articles.py [--date 2025-11-19] [--workers 4]
 """
 import sys
 sys.path.insert(0, '.')
 
-from app import app, db
+import threading
+from datetime import datetime
+
+from app import db
+from sqlalchemy.orm import undefer_group
 from models import ContentLog
+from utils.automation.batch_runner import BatchJob, OK, run_job_cli
 from utils.automation.workflow_engine import WorkflowEngine
 
-def add_images():
-    with app.app_context():
-        # Pobierz artykuły bez zdjęć z dzisiaj
-        articles_without_images = ContentLog.query.filter(
-            db.func.date(ContentLog.created_at) == '2025-11-19',
+class AddImagesJob(BatchJob):
+    """Dodaje featured image do artykułów, które go nie mają"""
+    name = "add_images_to_old_articles"
+    description = "Acquire featured images for articles created on a given day without one"
+    model = ContentLog
+
+    def __init__(self):
+        super().__init__()
+        self.date = datetime.utcnow().date()
+        self._engines = threading.local()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", default=None, help="creation date YYYY-MM-DD (default: today)")
+
+    def configure(self, args):
+        if args.date:
+            self.date = datetime.strptime(args.date, "%Y-%m-%d").date()
+
+    def params(self):
+        return {"date": self.date.isoformat()}
+
+    def query(self):
+        return ContentLog.query.filter(
+            db.func.date(ContentLog.created_at) == self.date.isoformat(),
             (ContentLog.featured_image_data == None) | (ContentLog.featured_image_data == '')
-        ).all()
-        
-        print(f"Found {len(articles_without_images)} articles without images")
-        
-        engine = WorkflowEngine()
-        
-        for article in articles_without_images:
-            print(f"\n📷 Adding images to: {article.title}")
-            print(f"   Article ID: {article.id}, Blog ID: {article.blog_id}")
-            
-            # Dodaj zdjęcia
-            result = engine._execute_image_acquisition(article, topic_category=None)
-            
-            if result.get("success"):
-                print(f"   ✅ Images added! Found {result.get('images_found', 0)} images")
-            else:
-                print(f"   ❌ Failed: {result.get('error')}")
-        
-        print("\n✅ Done adding images")
+        )
+
+    def prepare(self, article):
+        return {"id": article.id, "blog_id": article.blog_id}
+
+    def process(self, item):
+        # One engine per worker thread
+        engine = getattr(self._engines, 'engine', None)
+        if engine is None:
+            engine = WorkflowEngine()
+            self._engines.engine = engine
+
+        article = db.session.get(ContentLog, item["id"], options=[undefer_group('body')])
+        blog = self.blogs.get(item["blog_id"])
+        self.wait_for_host(blog and blog['url'])
+
+        result = engine._execute_image_acquisition(article, topic_category=None)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error") or "image acquisition failed")
+
+        print(f"📷 {(article.title or '')[:60]}: {result.get('images_found', 0)} images")
+        return OK
 
 if __name__ == "__main__":
-    add_images()
+    run_job_cli(AddImagesJob())
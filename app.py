@@ -1,12 +1,16 @@
 import os
 import logging
-from flask import Flask, session
+import importlib
+from flask import Blueprint, Flask, render_template_string, request, flash, redirect, url_for, session
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from datetime import timedelta
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
+from utils.monitoring.startup import startup_report
+
+# Setup logging (non-blocking, level from LOG_LEVEL)
+from utils.logger import configure_logging
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # SQLAlchemy base class
@@ -16,54 +20,93 @@ class Base(DeclarativeBase):
 # Initialize SQLAlchemy
 db = SQLAlchemy(model_class=Base)
 
-# Create the Flask app
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "blogautomationagent_secret")
-
-# Configure the SQLite database
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///zyga.db")
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
-
-# Initialize the app with the SQLAlchemy extension
-db.init_app(app)
-
-# Import admin authentication system
-from admin_auth import admin_auth, require_admin_login, LOGIN_TEMPLATE
-from flask import render_template_string, request, flash, redirect, url_for, session
-
-# Make sessions permanent for better user experience  
-from datetime import timedelta as td
-app.permanent_session_lifetime = td(days=7)
-
-# Add admin login routes
-@app.route('/admin/login', methods=['GET', 'POST'])
-def admin_login():
-    """Admin login page"""
-    if request.method == 'POST':
-        username = request.form['username']
-        password = request.form['password']
-        
-        if admin_auth.authenticate(username, password):
-            admin_auth.login_user()
-            next_url = session.pop('next_url', url_for('index'))
-            return redirect(next_url)
-        else:
-            flash('Nieprawidłowy login lub hasło administratora')
-    
-    return render_template_string(LOGIN_TEMPLATE)
-
-@app.route('/admin/logout')
-def admin_logout():
-    """Admin logout"""
-    admin_auth.logout_user()
-    return redirect(url_for('admin_login'))
-
-# Register routes directly here to ensure they're loaded in all circumstances
-from routes import register_routes
-register_routes(app)
-
-logger.info("Flask application initialized with authentication and routes")
+# Route modules and the attribute that registers them: a Blueprint or a
+# register function taking the app. They are imported only by
+# register_blueprints(), so scripts and queue workers that just need `app`
+# and `db` skip importing the whole web layer and its API clients.
+BLUEPRINTS = [
+    ("routes", "register_routes"),
+    ("routes_scheduling", "scheduling_bp"),
+    ("routes_multi_blog", "multi_blog_bp"),
+]
+
+
+def create_app() -> Flask:
+    """
+    Create the Flask app with the database, tracing and admin login.
+
+    The route modules are not registered here; the web entry point (main.py)
+    calls register_blueprints() on the app it serves.
+    """
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "blogautomationagent_secret")
+
+    # Configure the SQLite database
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///zyga.db")
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    }
+
+    # Initialize the app with the SQLAlchemy extension
+    db.init_app(app)
+
+    # SQL statements run inside a traced workflow become spans of its trace
+    from utils.monitoring.tracing import instrument_sqlalchemy
+    instrument_sqlalchemy()
+
+    # Make sessions permanent for better user experience
+    app.permanent_session_lifetime = timedelta(days=7)
+
+    register_admin_routes(app)
+    return app
+
+
+def register_admin_routes(app: Flask):
+    """Admin login and logout pages"""
+    from admin_auth import admin_auth, LOGIN_TEMPLATE
+
+    @app.route('/admin/login', methods=['GET', 'POST'])
+    def admin_login():
+        """Admin login page"""
+        if request.method == 'POST':
+            username = request.form['username']
+            password = request.form['password']
+
+            if admin_auth.authenticate(username, password):
+                admin_auth.login_user()
+                next_url = session.pop('next_url', url_for('index'))
+                return redirect(next_url)
+            else:
+                flash('Nieprawidłowy login lub hasło administratora')
+
+        return render_template_string(LOGIN_TEMPLATE)
+
+    @app.route('/admin/logout')
+    def admin_logout():
+        """Admin logout"""
+        admin_auth.logout_user()
+        return redirect(url_for('admin_login'))
+
+
+def register_blueprints(app: Flask):
+    """Import the route modules in BLUEPRINTS and register them with the app"""
+    for module_name, attribute in BLUEPRINTS:
+        with startup_report.phase(f"routes:{module_name}"):
+            target = getattr(importlib.import_module(module_name), attribute)
+            if isinstance(target, Blueprint):
+                app.register_blueprint(target)
+            else:
+                target(app)
+    logger.info(f"Registered {len(BLUEPRINTS)} route modules")
+
+
+with startup_report.phase("create_app"):
+    app = create_app()
+
+    # Register the tables with db.metadata, so db.create_all() in scripts and
+    # workers creates them without importing any route module first
+    import models  # noqa: E402,F401
+
+logger.info("Flask application initialized")
@@ -0,0 +1,5 @@
+"""
+Offline benchmarks.
+
+Run from the repository root, e.g. python -m benchmarks.e2e --articles 8
+"""
@@ -0,0 +1,193 @@
+"""
+Synthetic Polish article text
+
+Deterministic generator of blog-style Polish HTML (intro, <h2> sections with
+long paragraphs and lists, conclusion) built from the inflected forms in
+utils/data/pl_wordlist.txt. The fake OpenRouter server answers completions
+with it, so the benchmarks need no network and see the same text for the
+same seed.
+
+Write a corpus of full articles for the microbenchmarks (or for inspection):
+    python -m benchmarks.corpus --count 20 --words 2200 --out corpus.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from utils.polish_lexicon import WORDLIST_PATH
+
+OPENERS = [
+    "Warto pamiętać, że", "Z badań wynika, że", "Eksperci podkreślają, że", "W praktyce",
+    "Coraz więcej rodziców zauważa, że", "Pediatrzy zalecają, aby", "Nie bez powodu",
+    "Dla wielu rodzin", "Jak pokazuje doświadczenie,", "Co ciekawe,",
+]
+VERBS = [
+    "wspiera", "wymaga", "poprawia", "zmienia", "oznacza", "wpływa na", "chroni", "ułatwia",
+    "pozwala zrozumieć", "łagodzi", "wzmacnia", "uzupełnia", "przygotowuje", "obejmuje",
+]
+LINKS = ["i", "oraz", "a także", "ale", "dlatego", "ponieważ", "gdy", "zwłaszcza gdy", "w tym"]
+FILLERS = [
+    "bardzo", "często", "codziennie", "naturalnie", "stopniowo", "spokojnie", "również",
+    "przede wszystkim", "na co dzień", "w domu", "od początku", "z czasem", "każdego dnia",
+]
+CATEGORIES = ["Planowanie ciąży", "Zdrowie w ciąży", "Karmienie dziecka", "Kosmetyki dla mam",
+              "Zdrowie dziecka", "Akcesoria dziecięce"]
+HEADINGS = [
+    "Podstawowe informacje", "Praktyczne porady krok po kroku", "Najczęstsze błędy",
+    "Na co zwrócić uwagę", "Rekomendacje i sprawdzone rozwiązania", "Najczęstsze pytania",
+    "Bezpieczeństwo i normy", "Plan działania na kolejne tygodnie",
+]
+TITLE_PATTERNS = [
+    "Jak zadbać o {a} i {b}", "{A} krok po kroku", "{A} a {b} - praktyczny poradnik",
+    "Najlepsze sposoby na {a}", "{A} w codziennym życiu rodziny", "Wszystko o {a} dla rodziców",
+]
+
+
+@lru_cache(maxsize=1)
+def vocabulary() -> List[str]:
+    """All word forms from the bundled wordlist (lemmas and their inflections)"""
+    words = []
+    with open(WORDLIST_PATH, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or ':' not in line:
+                continue
+            lemma, forms = line.split(':', 1)
+            words.append(lemma.strip())
+            words.extend(forms.split())
+    return words
+
+
+def _phrase(rng: random.Random, words: List[str]) -> str:
+    if rng.random() < 0.4:
+        return f"{rng.choice(words)} {rng.choice(words)}"
+    return rng.choice(words)
+
+
+def sentence(rng: random.Random) -> str:
+    """One sentence of 8-25 words ending with punctuation"""
+    words = vocabulary()
+    parts = []
+    if rng.random() < 0.3:
+        parts.append(rng.choice(OPENERS))
+    parts += [_phrase(rng, words), rng.choice(VERBS), _phrase(rng, words)]
+    while len(' '.join(parts).split()) < rng.randint(8, 25):
+        parts += [rng.choice(LINKS), rng.choice(FILLERS) if rng.random() < 0.3 else _phrase(rng, words),
+                  rng.choice(VERBS), _phrase(rng, words)]
+    text = ' '.join(parts)
+    end = rng.choices(['.', '?', '!'], weights=[18, 1, 1])[0]
+    return text[0].upper() + text[1:] + end
+
+
+def paragraph(rng: random.Random, words: int = 120) -> str:
+    """Sentences adding up to at least `words` words"""
+    sentences = []
+    count = 0
+    while count < words:
+        text = sentence(rng)
+        sentences.append(text)
+        count += len(text.split())
+    return ' '.join(sentences)
+
+
+def title(rng: random.Random, topic: Optional[str] = None) -> str:
+    """Title of at most 60 characters, optionally built around a topic"""
+    if topic:
+        return topic[:60]
+    words = vocabulary()
+    a, b = rng.choice(words), rng.choice(words)
+    text = rng.choice(TITLE_PATTERNS).format(a=a, b=b, A=a.capitalize())
+    return text[:60]
+
+
+def html(rng: random.Random, words: int, headings: bool = False, paragraph_words: int = 130) -> str:
+    """
+    HTML fragment of roughly `words` words in <p> paragraphs.
+
+    Args:
+        rng: Random source (seed it for repeatable output)
+        words: Target length in words
+        headings: Start with an <h2> heading
+        paragraph_words: Words per paragraph
+
+    Returns:
+        HTML ending with a complete sentence and a closing </p>
+    """
+    parts = [f"<h2>{rng.choice(HEADINGS)}</h2>"] if headings else []
+    count = 0
+    while count < words:
+        size = min(paragraph_words, max(words - count, 20))
+        text = paragraph(rng, size)
+        parts.append(f"<p>{text}</p>")
+        count += len(text.split())
+    return '\n'.join(parts)
+
+
+def article(seed: int, words: int = 2200, sections: int = 6) -> str:
+    """
+    Full article: introduction, `sections` <h2> sections (one with a list)
+    and a conclusion, about `words` words in total.
+    """
+    rng = random.Random(seed)
+    section_words = words // (sections + 2)
+    parts = [html(rng, section_words)]
+    for number in range(sections):
+        parts.append(html(rng, section_words, headings=True))
+        if number == sections // 2:
+            items = ''.join(f"<li>{sentence(rng)}</li>" for _ in range(5))
+            parts.append(f"<ul>{items}</ul>")
+    parts.append(html(rng, section_words))
+    return '\n\n'.join(parts)
+
+
+def generate_corpus(count: int = 20, words: int = 2200, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Articles shaped like ContentLog rows: title, excerpt, HTML content,
+    category, tags and a primary keyword taken from the text.
+    """
+    articles = []
+    for number in range(count):
+        rng = random.Random(seed * 100003 + number)
+        content = article(rng.randrange(1 << 30), words=words)
+        excerpt = sentence(rng)
+        tags = rng.sample(vocabulary(), 12)
+        articles.append({
+            "title": title(rng),
+            "excerpt": excerpt if len(excerpt) <= 150 else excerpt[:150].rsplit(' ', 1)[0] + '.',
+            "content": content,
+            "category": rng.choice(CATEGORIES),
+            "tags": tags,
+            "primary_keyword": tags[0],
+        })
+    return articles
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """Read a corpus written by this module's command line"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic Polish article corpus as JSONL")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--words", type=int, default=2200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="-", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    lines = ''.join(json.dumps(item, ensure_ascii=False) + '\n'
+                    for item in generate_corpus(args.count, args.words, args.seed))
+    if args.out == "-":
+        sys.stdout.write(lines)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(lines)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
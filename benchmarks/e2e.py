@@ -0,0 +1,299 @@
+"""
+End-to-end workflow benchmark (offline)
+
+Starts the fake OpenRouter, WordPress and image servers from
+benchmarks/fake_services.py, seeds a scratch SQLite database with a blog and
+an automation rule, and runs the article pipeline against them:
+
+- batch: AutomationScheduler.batch_generate_articles (the morning batch)
+- cycle: WorkflowEngine.execute_full_cycle, once per article
+
+For each scenario it reports articles per minute, p50/p95 latency of every
+workflow stage and outgoing call (taken from the workflow traces) and the
+number of requests per fake endpoint. Each run is appended to
+benchmarks/results/e2e.jsonl with the git commit and compared with the last
+earlier run that used the same parameters.
+
+Usage:
+    python -m benchmarks.e2e --articles 8
+    python -m benchmarks.e2e --scenario batch --articles 20 --llm-token-rate 80 --llm-429-rate 0.05
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_services import FakeImageProviders, FakeOpenRouter, FakeWordPress, service_environment
+
+logger = logging.getLogger(__name__)
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'e2e.jsonl')
+BLOG_NAME = "MamaTestuje.com"
+CATEGORIES = ["Planowanie ciąży", "Zdrowie w ciąży", "Karmienie dziecka", "Kosmetyki dla mam"]
+
+# Parameters that must match for two runs to be compared
+COMPARED_PARAMS = ("articles", "topics", "llm_latency", "llm_token_rate", "llm_429_rate",
+                   "wp_latency", "image_latency")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark of the article workflow")
+    parser.add_argument("--scenario", choices=["batch", "cycle", "all"], default="all")
+    parser.add_argument("--articles", type=int, default=8, help="Articles per scenario")
+    parser.add_argument("--topics", type=int, default=0,
+                        help="Approved topics seeded per category (0: topics are generated by the LLM)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fixed seconds per completion")
+    parser.add_argument("--llm-token-rate", type=float, default=2000.0, help="Completion tokens per second")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="Share of completions answered with 429")
+    parser.add_argument("--wp-latency", type=float, default=0.02, help="Seconds per WordPress request")
+    parser.add_argument("--image-latency", type=float, default=0.03, help="Seconds per image provider request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSONL file the run is appended to")
+    parser.add_argument("--no-save", action="store_true", help="Only print the report")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(durations: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(durations),
+        "p50_ms": round(percentile(durations, 50), 1),
+        "p95_ms": round(percentile(durations, 95), 1),
+        "total_ms": round(sum(durations), 1),
+    }
+
+
+def seed_blog(scenario: str, wordpress: FakeWordPress, args: argparse.Namespace) -> Dict[str, int]:
+    """Blog, its WordPress categories and an active automation rule (inside an app context)"""
+    from app import db
+    from models import ArticleTopic, AutomationRule, Blog, Category
+
+    blog = Blog(name=f"{BLOG_NAME} ({scenario})", url=wordpress.url, api_url=f"{wordpress.url}/wp-json/wp/v2",
+                username="bench", api_token="bench", active=True)
+    db.session.add(blog)
+    db.session.flush()
+
+    for category in wordpress.categories:
+        db.session.add(Category(blog_id=blog.id, name=category["name"], wordpress_id=category["id"]))
+        for number in range(args.topics):
+            title = f"{category['name']} - temat {number + 1}"
+            db.session.add(ArticleTopic(blog_id=blog.id, topic=title, title=title, category=category["name"],
+                                        status="approved", priority=5, created_at=datetime.utcnow()))
+
+    rule = AutomationRule(blog_id=blog.id, name=f"Benchmark {scenario}", is_active=True,
+                          posts_per_day=args.articles, auto_publish=True, auto_social_post=False,
+                          auto_approve_topics=True)
+    rule.set_categories([category["id"] for category in wordpress.categories])
+    db.session.add(rule)
+    db.session.commit()
+    return {"blog_id": blog.id, "rule_id": rule.id}
+
+
+def collect_spans(started_ns: int) -> List[Dict[str, Any]]:
+    """Spans of all workflow traces started after started_ns"""
+    from utils.monitoring.tracing import tracer
+
+    spans = []
+    for trace in tracer.recent_traces():
+        if trace["name"] == "workflow" and trace["start_time_unix_nano"] >= started_ns:
+            spans.extend(tracer.get_trace(trace["trace_id"]))
+    return spans
+
+
+def span_statistics(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """p50/p95 per workflow stage and per kind of outgoing call"""
+    from utils.monitoring.tracing import KIND_CLIENT, STATUS_ERROR
+
+    stages, calls, workflows = defaultdict(list), defaultdict(list), []
+    errors = defaultdict(int)
+    for span in spans:
+        duration = (span["end_time_unix_nano"] - span["start_time_unix_nano"]) / 1e6
+        if span["name"] == "workflow" and not span["parent_span_id"]:
+            workflows.append(duration)
+        elif span["name"].startswith("step "):
+            stages[span["name"][5:]].append(duration)
+            if span["status"]["code"] == STATUS_ERROR:
+                errors[span["name"][5:]] += 1
+        elif span["kind"] == KIND_CLIENT:
+            name = f"sql {span['name']}" if "db.system" in span["attributes"] else span["name"]
+            calls[name].append(duration)
+
+    stage_stats = {}
+    for stage, durations in stages.items():
+        stage_stats[stage] = summarize(durations)
+        stage_stats[stage]["failed"] = errors.get(stage, 0)
+    return {
+        "workflow": summarize(workflows),
+        "stages": stage_stats,
+        "calls": {name: summarize(durations) for name, durations in sorted(calls.items())},
+    }
+
+
+def run_scenario(scenario: str, args: argparse.Namespace, openrouter: FakeOpenRouter,
+                 wordpress: FakeWordPress, images: FakeImageProviders) -> Dict[str, Any]:
+    from app import app, db
+    from models import AutomationRule, ContentLog
+
+    with app.app_context():
+        ids = seed_blog(scenario, wordpress, args)
+
+    services = (openrouter, wordpress, images)
+    for service in services:
+        service.reset_counts()
+    openrouter.tokens.clear()
+
+    started_ns = time.time_ns()
+    started = time.perf_counter()
+    if scenario == "batch":
+        from utils.automation.scheduler import AutomationScheduler
+        scheduler = AutomationScheduler(max_workers=1)
+        try:
+            scheduler.batch_generate_articles(ids["blog_id"])
+        finally:
+            scheduler.executor.shutdown(wait=False)
+    else:
+        from utils.automation.workflow_engine import WorkflowEngine
+        with app.app_context():
+            engine = WorkflowEngine()
+            for _ in range(args.articles):
+                engine.execute_full_cycle(db.session.get(AutomationRule, ids["rule_id"]))
+                db.session.remove()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        generated = ContentLog.query.filter_by(blog_id=ids["blog_id"]).count()
+        published = ContentLog.query.filter_by(blog_id=ids["blog_id"], status="published").count()
+
+    result = {
+        "elapsed_s": round(elapsed, 2),
+        "articles_generated": generated,
+        "articles_published": published,
+        "articles_per_minute": round(published / elapsed * 60, 2) if elapsed else 0.0,
+        "llm_tokens": dict(openrouter.tokens),
+        "requests": {f"{service.name} {endpoint}": count
+                     for service in services for endpoint, count in sorted(service.request_counts().items())},
+    }
+    result.update(span_statistics(collect_spans(started_ns)))
+    return result
+
+
+def git_commit() -> Dict[str, Any]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def previous_run(path: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Last stored run with the same compared parameters"""
+    if not os.path.exists(path):
+        return None
+    match = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if all(run.get("params", {}).get(key) == params.get(key) for key in COMPARED_PARAMS):
+                match = run
+    return match
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+
+def print_report(run: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    print(f"\nCommit {run['commit']}{' (dirty)' if run['dirty'] else ''}"
+          f"{', compared with ' + str(baseline['commit']) + ' from ' + baseline['timestamp'] if baseline else ''}")
+    for scenario, result in run["scenarios"].items():
+        before = (baseline or {}).get("scenarios", {}).get(scenario, {})
+        print(f"\n== {scenario}: {result['articles_published']}/{result['articles_generated']} published "
+              f"in {result['elapsed_s']} s, {result['articles_per_minute']} articles/min"
+              f"{_delta(result['articles_per_minute'], before.get('articles_per_minute'))}")
+        workflow = result["workflow"]
+        print(f"   workflow p50 {workflow['p50_ms']} ms, p95 {workflow['p95_ms']} ms")
+        print(f"   {'stage / call':<44}{'count':>7}{'p50 ms':>16}{'p95 ms':>16}")
+        for section in ("stages", "calls"):
+            for name, stats in result[section].items():
+                old = before.get(section, {}).get(name, {})
+                print(f"   {name[:43]:<44}{stats['count']:>7}"
+                      f"{str(stats['p50_ms']) + _delta(stats['p50_ms'], old.get('p50_ms')):>16}"
+                      f"{str(stats['p95_ms']) + _delta(stats['p95_ms'], old.get('p95_ms')):>16}")
+        print(f"   {'requests':<44}{'count':>7}")
+        for endpoint, count in result["requests"].items():
+            print(f"   {endpoint[:43]:<44}{count:>7}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="zyga-bench-")
+
+    openrouter = FakeOpenRouter(args.llm_latency, args.llm_token_rate, args.llm_429_rate, seed=args.seed).start()
+    wordpress = FakeWordPress(CATEGORIES, latency=args.wp_latency).start()
+    images = FakeImageProviders(latency=args.image_latency).start()
+
+    # Configuration is read at import time, so the environment is set before app is imported
+    os.environ.update(service_environment(openrouter, images))
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "LOG_LEVEL": args.log_level,
+        "LOG_FILE": "",
+        "TRACING_ENABLED": "true",
+        "TRACING_EXPORTER": "jsonl",
+        "TRACING_JSONL_PATH": os.path.join(workdir, "traces.jsonl"),
+        "JOB_QUEUE_ENABLED": "false",
+    })
+    os.environ.setdefault("ADMIN_LOGIN", "bench")
+    os.environ.setdefault("ADMIN_PASSWORD", "bench")
+
+    from app import app, db
+    with app.app_context():
+        db.create_all()
+
+    scenarios = ["batch", "cycle"] if args.scenario == "all" else [args.scenario]
+    params = {key: value for key, value in vars(args).items() if key not in ("results", "no_save", "log_level")}
+    run = {"timestamp": datetime.utcnow().isoformat(timespec="seconds"), **git_commit(), "params": params,
+           "python": sys.version.split()[0], "scenarios": {}}
+    try:
+        for scenario in scenarios:
+            run["scenarios"][scenario] = run_scenario(scenario, args, openrouter, wordpress, images)
+    finally:
+        for service in (openrouter, wordpress, images):
+            service.stop()
+
+    print_report(run, previous_run(args.results, params))
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run, ensure_ascii=False) + '\n')
+        print(f"\nResults appended to {args.results} (scratch data in {workdir})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
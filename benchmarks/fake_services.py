@@ -0,0 +1,304 @@
+"""
+Local stand-ins for the external APIs used by the content workflow
+
+Each service is a threaded HTTP server on 127.0.0.1 (random port) that
+counts requests per endpoint:
+
+- FakeOpenRouter: /chat/completions with configurable latency, token rate
+  and injected 429s. Answers are shaped after the prompt (topic JSON, image
+  query JSON, comma-separated tags, titles, HTML sections).
+- FakeWordPress: the wp/v2 REST routes the publisher uses (posts, media,
+  tags, categories, users).
+- FakeImageProviders: Pexels, Unsplash and Bing image search plus the image
+  files their results point to.
+
+service_environment() returns the environment variables that point the
+application at these servers; set them before importing app.
+"""
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import corpus
+
+# Polish text is about two tokens per word for the models we use
+TOKENS_PER_WORD = 2.0
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def _json(status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps(payload).encode('utf-8')
+
+
+class FakeService:
+    """Threaded HTTP server dispatching to handle(), with per-endpoint request counts"""
+
+    name = "service"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(100)
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                parsed = urlparse(self.path)
+                service.count(self.command, parsed.path)
+                if service.latency:
+                    time.sleep(service.latency)
+                status, headers, payload = service.handle(
+                    self.command, parsed.path, parse_qs(parsed.query), self.headers, body)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "FakeService":
+        self._thread = threading.Thread(target=self.server.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def count(self, method: str, path: str):
+        endpoint = f"{method} {re.sub(r'/[0-9]+(?=[/.]|$)', '/{id}', path)}"
+        with self._lock:
+            self.counts[endpoint] += 1
+
+    def request_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts.clear()
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers, body: bytes) -> Response:
+        return _json(404, {"error": f"no route for {method} {path}"})
+
+
+class FakeOpenRouter(FakeService):
+    """
+    OpenRouter chat completions. Each answer takes
+    latency + completion_tokens / token_rate seconds; error_rate of the
+    requests get a 429 instead.
+    """
+
+    name = "openrouter"
+
+    def __init__(self, latency: float = 0.05, token_rate: float = 2000.0, error_rate: float = 0.0,
+                 fill: float = 0.5, seed: int = 0):
+        super().__init__()
+        self.base_latency = latency
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.fill = fill
+        self._rng = random.Random(seed)
+        self.tokens = Counter()
+
+    def handle(self, method, path, query, headers, body):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return super().handle(method, path, query, headers, body)
+
+        data = json.loads(body or b'{}')
+        with self._lock:
+            seed = self._rng.random()
+        if seed < self.error_rate:
+            return _json(429, {"error": {"code": 429, "message": "Rate limit exceeded"}}, {"Retry-After": "1"})
+
+        prompt = '\n'.join(message.get("content", "") for message in data.get("messages", []))
+        rng = random.Random(f"{prompt}{seed}")
+        content = self._answer(prompt, data, rng)
+        prompt_tokens = int(len(prompt.split()) * TOKENS_PER_WORD)
+        completion_tokens = int(len(content.split()) * TOKENS_PER_WORD)
+        with self._lock:
+            self.tokens["prompt"] += prompt_tokens
+            self.tokens["completion"] += completion_tokens
+
+        time.sleep(self.base_latency + completion_tokens / self.token_rate)
+        return _json(200, {
+            "id": f"gen-{self.next_id()}",
+            "model": data.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def _answer(self, prompt: str, data: Dict[str, Any], rng: random.Random) -> str:
+        max_tokens = data.get("max_tokens") or 1000
+        if (data.get("response_format") or {}).get("type") == "json_object":
+            if "tematy" in prompt:
+                match = re.search(r"Wygeneruj (\d+)", prompt)
+                count = int(match.group(1)) if match else 10
+                return json.dumps({"tematy": [corpus.title(rng) for _ in range(count)]}, ensure_ascii=False)
+            if "primary_query" in prompt:
+                return json.dumps({
+                    "primary_query": "mother with baby at home",
+                    "alternates": ["newborn baby care", "happy family morning"],
+                    "negative": ["text", "logo"],
+                    "domain_terms": ["baby", "mother", "family"],
+                    "orientation": "landscape",
+                    "style": "photo",
+                })
+            return json.dumps({"result": corpus.sentence(rng)}, ensure_ascii=False)
+        if "przecinkami" in prompt:
+            return ', '.join(rng.sample(corpus.vocabulary(), 8))
+        if "tytułem" in prompt and max_tokens <= 150:
+            return corpus.title(rng)
+        if max_tokens <= 150:
+            # Excerpts and sentence endings; the validator rejects excerpts over 160 characters
+            text = corpus.sentence(rng)
+            return text if len(text) <= 150 else text[:150].rsplit(' ', 1)[0] + '.'
+        words = int(max_tokens * self.fill / TOKENS_PER_WORD)
+        return corpus.html(rng, words, headings="<h2>" in prompt or "H2" in prompt)
+
+
+class FakeWordPress(FakeService):
+    """WordPress REST API (wp-json/wp/v2) with in-memory posts, media, tags, categories and users"""
+
+    name = "wordpress"
+
+    def __init__(self, categories: List[str], latency: float = 0.02, authors: int = 4):
+        super().__init__(latency)
+        self.categories = [{"id": 10 + index, "name": name, "slug": f"category-{10 + index}", "count": 0}
+                           for index, name in enumerate(categories)]
+        self.users = [{"id": index, "name": f"Autor {index}", "slug": f"autor-{index}"}
+                      for index in range(1, authors + 1)]
+        self.tags: Dict[str, Dict[str, Any]] = {}
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.media: Dict[int, Dict[str, Any]] = {}
+
+    def handle(self, method, path, query, headers, body):
+        match = re.match(r".*/wp-json/wp/v2/(\w+)(?:/(\d+))?/?$", path)
+        if not match:
+            return super().handle(method, path, query, headers, body)
+        collection, item_id = match.group(1), match.group(2)
+        search = (query.get("search") or [""])[0].lower()
+
+        if collection == "categories" and method == "GET":
+            return _json(200, [c for c in self.categories if search in c["name"].lower()])
+        if collection == "users" and method == "GET":
+            return _json(200, self.users)
+        if collection == "tags":
+            if method == "GET":
+                with self._lock:
+                    return _json(200, [t for name, t in self.tags.items() if search in name])
+            name = json.loads(body or b'{}').get("name", "")
+            with self._lock:
+                tag = self.tags.get(name.lower())
+                if tag:
+                    return _json(400, {"code": "term_exists", "message": "Tag exists",
+                                       "data": {"term_id": tag["id"]}})
+                tag = self.tags[name.lower()] = {"id": next(self._ids), "name": name, "slug": name.lower()}
+            return _json(201, tag)
+        if collection == "media" and method == "POST":
+            if item_id:
+                return _json(200, self.media.get(int(item_id), {"id": int(item_id)}))
+            media_id = self.next_id()
+            self.media[media_id] = {"id": media_id, "source_url": f"{self.url}/uploads/{media_id}.jpg",
+                                    "bytes": len(body)}
+            return _json(201, self.media[media_id])
+        if collection == "posts":
+            if method == "GET" and item_id:
+                post = self.posts.get(int(item_id))
+                return _json(200, post) if post else _json(404, {"code": "rest_post_invalid_id"})
+            if method == "DELETE" and item_id:
+                return _json(200, {"deleted": bool(self.posts.pop(int(item_id), None))})
+            if method == "POST":
+                fields = json.loads(body or b'{}')
+                post_id = int(item_id) if item_id else self.next_id()
+                post = self.posts.setdefault(post_id, {"id": post_id, "link": f"{self.url}/?p={post_id}"})
+                post.update({key: value for key, value in fields.items() if key != "content"})
+                post["content_chars"] = len(fields.get("content", ""))
+                return _json(200 if item_id else 201, post)
+        return super().handle(method, path, query, headers, body)
+
+
+class FakeImageProviders(FakeService):
+    """Pexels (/v1/search), Unsplash (/search/photos), Bing (/v7.0/images/search) and image files (/img/<id>.jpg)"""
+
+    name = "images"
+
+    def __init__(self, latency: float = 0.03, results: int = 10, image_bytes: int = 60000):
+        super().__init__(latency)
+        self.results = results
+        self.image = b'\xff\xd8\xff\xe0' + bytes(max(image_bytes - 6, 0)) + b'\xff\xd9'
+
+    def _photos(self, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        text = (query.get("query") or query.get("q") or [""])[0]
+        count = int((query.get("per_page") or query.get("count") or [self.results])[0])
+        return [{"id": self.next_id(), "description": f"{text} photo {index}", "width": 1600, "height": 1000}
+                for index in range(min(count, self.results))]
+
+    def handle(self, method, path, query, headers, body):
+        if path.startswith("/img/"):
+            return 200, {"Content-Type": "image/jpeg"}, self.image
+        if path == "/v1/search":
+            return _json(200, {"photos": [{
+                "id": p["id"], "width": p["width"], "height": p["height"], "alt": p["description"],
+                "photographer": "Fotograf", "url": f"{self.url}/photo/{p['id']}",
+                "src": {size: f"{self.url}/img/{p['id']}.jpg"
+                        for size in ("original", "large2x", "large", "medium", "small", "tiny")},
+            } for p in self._photos(query)]})
+        if path == "/search/photos":
+            return _json(200, {"results": [{
+                "id": str(p["id"]), "width": p["width"], "height": p["height"], "description": p["description"],
+                "urls": {"regular": f"{self.url}/img/{p['id']}.jpg", "thumb": f"{self.url}/img/{p['id']}.jpg"},
+                "user": {"name": "Fotograf", "links": {"html": self.url}}, "links": {"html": self.url},
+            } for p in self._photos(query)]})
+        if path == "/v7.0/images/search":
+            return _json(200, {"value": [{
+                "imageId": str(p["id"]), "name": p["description"], "width": p["width"], "height": p["height"],
+                "contentUrl": f"{self.url}/img/{p['id']}.jpg", "thumbnailUrl": f"{self.url}/img/{p['id']}.jpg",
+                "hostPageUrl": self.url, "hostPageDisplayUrl": "127.0.0.1",
+            } for p in self._photos(query)]})
+        return super().handle(method, path, query, headers, body)
+
+
+def service_environment(openrouter: FakeOpenRouter, images: FakeImageProviders) -> Dict[str, str]:
+    """Environment variables pointing the LLM and image clients at the fake servers"""
+    return {
+        "OPENROUTER_API_KEY": "bench-key",
+        "OPENROUTER_API_BASE": openrouter.url,
+        "PEXELS_API_KEY": "bench-key",
+        "PEXELS_API_URL": f"{images.url}/v1",
+        "UNSPLASH_API_KEY": "bench-key",
+        "UNSPLASH_API_URL": images.url,
+        "BING_SEARCH_API_KEY": "bench-key",
+        "BING_SEARCH_ENDPOINT": f"{images.url}/v7.0/images/search",
+    }
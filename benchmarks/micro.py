@@ -0,0 +1,207 @@
+"""
+Microbenchmarks for the text-processing hot paths
+
+Times the functions every generated article passes through, over a corpus
+of synthetic 2,200-word Polish articles (benchmarks/corpus.py, generated in
+memory or read with --corpus), and compares each median with the committed
+baseline in benchmarks/baselines/micro.json. A case more than --threshold
+times (default 2x) slower than its baseline fails the run (exit status 1).
+
+Timings are compared relative to a fixed pure-Python calibration loop
+measured in the same run, so a baseline recorded on one machine stays
+meaningful on another.
+
+Usage:
+    python -m benchmarks.micro
+    python -m benchmarks.micro -k validate --min-time 2
+    python -m benchmarks.micro --save-baseline    # after an intended change
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+MIN_ROUNDS = 5
+MIN_ROUND_SECONDS = 0.002
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the text-processing hot paths")
+    parser.add_argument("-k", dest="select", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--corpus", help="JSONL corpus from python -m benchmarks.corpus (default: generated)")
+    parser.add_argument("--articles", type=int, default=10, help="Articles in the generated corpus")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each case")
+    parser.add_argument("--threshold", type=float, default=2.0, help="Slowdown factor that fails a case")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    return parser.parse_args(argv)
+
+
+def calibration_workload(texts: List[str]) -> int:
+    """
+    Fixed pure-Python string work used to normalise timings. It avoids dicts
+    and sets, whose speed varies between processes with string hash seeds.
+    """
+    total = 0
+    for text in texts:
+        for word in text.split():
+            total += len(word.lower().strip('.,!?'))
+    return total
+
+
+def build_cases(articles: List[Dict[str, Any]]) -> Dict[str, Callable[[], Any]]:
+    """Case name -> zero-argument callable processing every article in the corpus once"""
+    import app  # noqa: F401  (models expect the app module to be initialised first)
+    from utils.ai_content_strategy.article_generator import (
+        clean_markdown_artifacts, ensure_complete_ending, get_blog_config_by_name, validate_article_length
+    )
+    from utils.analytics.collector import AnalyticsCollector
+    from utils.content.content_validator import ContentValidator
+    from utils.content import long_paragraph_generator
+    from utils.content.long_paragraph_generator import count_tokens
+    from utils.images.auto_image_finder import compute_image_score
+    from utils.seo.analyzer import analyze_content
+    from utils.seo.optimizer import seo_optimizer
+
+    blog_config = get_blog_config_by_name("MamaTestuje.com")
+    validator = ContentValidator()
+    collector = AnalyticsCollector()
+    fenced = [f"```html\n{article['content']}\n```" for article in articles]
+    # Unclosed last paragraph: ensure_complete_ending trims back to the last </p>
+    unclosed = [article['content'] + "\n<p>Ostatni akapit urywa się w połowie" for article in articles]
+    titles = [article['title'] for article in articles] * 20
+    images = [{
+        "description": corpus.sentence(random.Random(number)),
+        "attribution_text": "Photo by Fotograf on Pexels",
+        "url": f"https://images.example/{number}.jpg",
+        "width": 1600 if number % 3 else 900,
+        "height": 1000,
+        "source": ("bing", "unsplash", "pexels")[number % 3],
+    } for number in range(30)]
+    planner = {"primary_query": "mother with baby", "domain_terms": ["baby", "mother", "dziecko"],
+               "negative": ["logo", "text"], "orientation": "landscape", "style": "photo"}
+
+    def score_images():
+        for article in articles:
+            context = {"title": article['title'], "tags": article['tags'], "category": article['category']}
+            for image in images:
+                compute_image_score(image, context, planner)
+
+    # Without the tiktoken encoding (offline) count_tokens falls back to len/4,
+    # which is timed as a separate case so the two never share a baseline
+    count_tokens_case = "count_tokens" if long_paragraph_generator.get_encoder() is not None else "count_tokens[fallback]"
+
+    return {
+        "clean_markdown_artifacts": lambda: [clean_markdown_artifacts(text) for text in fenced],
+        "ensure_complete_ending": lambda: [ensure_complete_ending(text, "temat") for text in unclosed],
+        "validate_article_length": lambda: [validate_article_length(a['content'], blog_config) for a in articles],
+        "ContentValidator.validate_article": lambda: [
+            validator.validate_article(a['title'], a['excerpt'], a['content'], a['category']) for a in articles],
+        "analyze_content": lambda: [
+            analyze_content(a['content'], a['primary_keyword'], a['tags'][1:6]) for a in articles],
+        "seo_optimizer": lambda: [seo_optimizer(a['content'], a['primary_keyword'], a['tags'][1:6]) for a in articles],
+        "compute_image_score": score_images,
+        count_tokens_case: lambda: [count_tokens(a['content']) for a in articles],
+        "_find_common_words": lambda: collector._find_common_words(titles),
+    }
+
+
+def measure(func: Callable[[], Any], min_time: float) -> List[float]:
+    """
+    Seconds per call, one value per round: at least MIN_ROUNDS rounds and
+    min_time seconds. Fast callables are repeated within a round so that
+    each round lasts at least MIN_ROUND_SECONDS.
+    """
+    begin = time.perf_counter()
+    func()  # warm-up (lazy imports, caches, regex compilation)
+    number = max(1, int(MIN_ROUND_SECONDS / max(time.perf_counter() - begin, 1e-9)))
+    gc.collect()
+    rounds = []
+    started = time.perf_counter()
+    while len(rounds) < MIN_ROUNDS or time.perf_counter() - started < min_time:
+        begin = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - begin) / number)
+    return rounds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ.setdefault("TRACING_ENABLED", "false")
+    os.environ.setdefault("ADMIN_LOGIN", "bench")
+    os.environ.setdefault("ADMIN_PASSWORD", "bench")
+    logging.disable(logging.CRITICAL)
+
+    articles = corpus.load_corpus(args.corpus) if args.corpus else corpus.generate_corpus(args.articles)
+    cases = {name: func for name, func in build_cases(articles).items() if args.select in name}
+
+    texts = [article['content'] for article in articles]
+    calibrate = lambda: min(measure(lambda: calibration_workload(texts), args.min_time))
+    calibration = calibrate()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    timings = {name: measure(func, args.min_time) for name, func in cases.items()}
+    # Calibrated before and after the cases; the faster of the two is least disturbed by other load
+    calibration = min(calibration, calibrate())
+
+    results = {}
+    failures = []
+    print(f"{len(articles)} articles, calibration {calibration * 1000:.2f} ms\n")
+    print(f"{'case':<36}{'rounds':>7}{'min ms':>10}{'median ms':>11}{'per article':>13}{'vs baseline':>13}")
+    for name, rounds in timings.items():
+        median = statistics.median(rounds)
+        relative = median / calibration
+        results[name] = {"median_ms": round(median * 1000, 4), "min_ms": round(min(rounds) * 1000, 4),
+                         "relative": round(relative, 5)}
+
+        ratio_text = "-"
+        previous = (baseline or {}).get("cases", {}).get(name)
+        if previous:
+            ratio = relative / previous["relative"]
+            ratio_text = f"{ratio:.2f}x"
+            if ratio > args.threshold:
+                failures.append(f"{name}: {ratio:.2f}x the baseline (threshold {args.threshold}x)")
+                ratio_text += " FAIL"
+        print(f"{name:<36}{len(rounds):>7}{min(rounds) * 1000:>10.3f}{median * 1000:>11.3f}"
+              f"{median * 1000 / len(articles):>13.4f}{ratio_text:>13}")
+
+    if args.save_baseline:
+        saved = {"python": sys.version.split()[0], "articles": len(articles),
+                 "calibration_ms": round(calibration * 1000, 3), "cases": results}
+        if baseline and args.select:
+            saved["cases"] = {**baseline.get("cases", {}), **results}
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+    if failures:
+        print("\nRegressions:\n  " + "\n  ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Startup import profiler
+
+Imports a module (default: app) in fresh interpreters under
+`python -X importtime`, reports the total import time and the modules that
+contribute most to it, and fails (exit status 1) when the median total is
+over --budget seconds or when one of the heavy client libraries that must
+only be loaded on first use (HEAVY_MODULES) is imported.
+
+`import app` is what every one-off maintenance script and queue worker pays
+before doing any work, so keep it under budget: import heavy libraries
+inside the functions that use them and create clients on first use.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget 0.8 --runs 5
+    python -m benchmarks.startup --module main --budget 3 --allow-heavy
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that take hundreds of milliseconds to import (or download data on
+# first use); importing app must not pull any of them in
+HEAVY_MODULES = [
+    "anthropic", "google.analytics.data_v1beta", "googleapiclient.discovery", "openai",
+    "pandas", "pytrends", "tiktoken",
+]
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Profile the import time of the app")
+    parser.add_argument("--module", default="app", help="Module to import")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds the median import may take")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed in the report")
+    parser.add_argument("--allow-heavy", action="store_true", help="Do not fail on HEAVY_MODULES")
+    return parser.parse_args(argv)
+
+
+def profile_import(module: str) -> Dict[str, Dict[str, float]]:
+    """
+    Import `module` in a new interpreter with -X importtime.
+
+    Returns:
+        Module name -> {"self": seconds, "cumulative": seconds, "depth": nesting level}
+        for every module imported as a consequence of importing `module`
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("LOG_LEVEL", "ERROR")
+    env.setdefault("LOG_FILE", "")
+    env.setdefault("ADMIN_LOGIN", "bench")
+    env.setdefault("ADMIN_PASSWORD", "bench")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    # importtime prints a module after the modules it imported, so everything
+    # between the previous top-level line and the target's own line belongs to it
+    lines = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            lines.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2))
+
+    # Background threads started by the import may log more imports after it
+    end = max(number for number, line in enumerate(lines) if line[0] == module and line[3] == 0)
+    modules = {}
+    for name, self_seconds, cumulative, depth in reversed(lines[:end + 1]):
+        if depth == 0 and modules:
+            break
+        modules[name] = {"self": self_seconds, "cumulative": cumulative, "depth": depth}
+    return modules
+
+
+def heavy_modules(modules: Dict[str, Dict[str, float]]) -> List[str]:
+    return [name for name in HEAVY_MODULES if name in modules]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    runs = [profile_import(args.module) for _ in range(max(1, args.runs))]
+    totals = [run[args.module]["cumulative"] for run in runs]
+    median = statistics.median(totals)
+    # The run closest to the median is the one shown in detail
+    modules = min(runs, key=lambda run: abs(run[args.module]["cumulative"] - median))
+
+    print(f"import {args.module}: median {median:.3f} s over {len(runs)} runs "
+          f"({', '.join(f'{total:.3f}' for total in totals)}), {len(modules)} modules, budget {args.budget:.2f} s\n")
+
+    print(f"{'slowest modules (self)':<60}{'self ms':>10}")
+    for name, timing in sorted(modules.items(), key=lambda item: item[1]["self"], reverse=True)[:args.top]:
+        print(f"{name:<60}{timing['self'] * 1000:>10.1f}")
+
+    print(f"\n{'direct imports of ' + args.module:<60}{'cumulative ms':>14}")
+    direct = [(name, timing) for name, timing in modules.items() if timing["depth"] == 1]
+    for name, timing in sorted(direct, key=lambda item: item[1]["cumulative"], reverse=True)[:args.top]:
+        print(f"{name:<60}{timing['cumulative'] * 1000:>14.1f}")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"import {args.module} takes {median:.3f} s, over the {args.budget:.2f} s budget")
+    heavy = heavy_modules(modules)
+    if heavy and not args.allow_heavy:
+        failures.append(f"import {args.module} loads heavy modules: {', '.join(heavy)} "
+                        f"(import them where they are used)")
+
+    if failures:
+        print("\nFailed:\n  " + "\n  ".join(failures))
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ load_dotenv()
 class Config:
     # OpenRouter API Configuration
     OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
+    OPENROUTER_API_BASE = os.environ.get("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1").rstrip("/")
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")  # Direct Anthropic API fallback
     
     # Image API Configuration
@@ -27,6 +28,11 @@ class Config:
     LINKEDIN_CLIENT_ID = os.environ.get("LINKEDIN_CLIENT_ID")
     LINKEDIN_CLIENT_SECRET = os.environ.get("LINKEDIN_CLIENT_SECRET")
     
+    # Social publishing queues (see social/dispatch.py)
+    SOCIAL_PUBLISH_WORKERS = int(os.environ.get("SOCIAL_PUBLISH_WORKERS", 2))  # per platform
+    SOCIAL_PUBLISH_ATTEMPTS = int(os.environ.get("SOCIAL_PUBLISH_ATTEMPTS", 3))
+    SOCIAL_PUBLISH_TIMEOUT = float(os.environ.get("SOCIAL_PUBLISH_TIMEOUT", 120))  # seconds to wait for all platforms
+    
     # Application Configuration
     ARTICLES_PER_DAY_PER_BLOG = int(os.environ.get("ARTICLES_PER_DAY_PER_BLOG", 4))
     ARTICLE_MIN_LENGTH = int(os.environ.get("ARTICLE_MIN_LENGTH", 1200))
@@ -43,3 +49,65 @@ class Config:
     
     # Scheduler Configuration
     SCHEDULER_API_ENABLED = True
+    
+    # Job Queue Configuration
+    # When enabled, scheduled jobs are enqueued in the job_queue table and run by worker.py
+    JOB_QUEUE_ENABLED = os.environ.get("JOB_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes")
+    JOB_QUEUE_LEASE_SECONDS = int(os.environ.get("JOB_QUEUE_LEASE_SECONDS", 300))
+    JOB_QUEUE_POLL_SECONDS = float(os.environ.get("JOB_QUEUE_POLL_SECONDS", 2))
+    JOB_QUEUE_MAX_ATTEMPTS = int(os.environ.get("JOB_QUEUE_MAX_ATTEMPTS", 3))
+    
+    # Leader election: only the leader instance fires timed jobs
+    LEADER_ELECTION_ENABLED = os.environ.get("LEADER_ELECTION_ENABLED", "true").lower() in ("1", "true", "yes")
+    LEADER_CHECK_SECONDS = float(os.environ.get("LEADER_CHECK_SECONDS", 5))
+    
+    # SEO data cache freshness (Google Trends and SerpAPI responses)
+    SEO_DAILY_TRENDS_CACHE_HOURS = float(os.environ.get("SEO_DAILY_TRENDS_CACHE_HOURS", 3))
+    SEO_TREND_SERIES_CACHE_HOURS = float(os.environ.get("SEO_TREND_SERIES_CACHE_HOURS", 24))
+    SEO_SERP_CACHE_DAYS = float(os.environ.get("SEO_SERP_CACHE_DAYS", 7))
+    
+    # Batch topic generation from trends
+    SEO_SERP_CONCURRENCY = int(os.environ.get("SEO_SERP_CONCURRENCY", 4))
+    # Topic variations come from templates; with SEO_TOPIC_AI_VARIATIONS the AI is
+    # asked for them too (one request per blog and SEO_TOPIC_BATCH_SIZE trends)
+    SEO_TOPIC_AI_VARIATIONS = os.environ.get("SEO_TOPIC_AI_VARIATIONS", "false").lower() in ("1", "true", "yes")
+    SEO_TOPIC_BATCH_SIZE = int(os.environ.get("SEO_TOPIC_BATCH_SIZE", 20))
+    
+    # Local tag extraction (AI is only asked when the local result is weak)
+    TAG_AI_FALLBACK_ENABLED = os.environ.get("TAG_AI_FALLBACK_ENABLED", "true").lower() in ("1", "true", "yes")
+    TAG_MIN_CONFIDENCE = float(os.environ.get("TAG_MIN_CONFIDENCE", 0.5))
+    TAG_INDEX_REFRESH_SECONDS = int(os.environ.get("TAG_INDEX_REFRESH_SECONDS", 600))
+    
+    # Newsletters: with NEWSLETTER_AUTO_WEEKLY=true, weekly issues are created and sent
+    # to real subscribers for blogs with a weekly config when their send slot has passed
+    # (at most NEWSLETTER_WEEKLY_CATCHUP_HOURS ago). Off by default: sending is opt-in.
+    NEWSLETTER_AUTO_WEEKLY = os.environ.get("NEWSLETTER_AUTO_WEEKLY", "false").lower() in ("1", "true", "yes")
+    NEWSLETTER_WEEKLY_CATCHUP_HOURS = float(os.environ.get("NEWSLETTER_WEEKLY_CATCHUP_HOURS", 24))
+    
+    # EmailOctopus subscriber sync (see utils/newsletter/subscriber_sync.py)
+    EMAILOCTOPUS_API_URL = os.environ.get("EMAILOCTOPUS_API_URL", "https://emailoctopus.com/api/1.6").rstrip("/")
+    NEWSLETTER_SYNC_WORKERS = int(os.environ.get("NEWSLETTER_SYNC_WORKERS", 8))
+    NEWSLETTER_SYNC_REQUESTS_PER_SECOND = float(os.environ.get("NEWSLETTER_SYNC_REQUESTS_PER_SECOND", 10))
+    NEWSLETTER_ROSTER_CACHE_HOURS = float(os.environ.get("NEWSLETTER_ROSTER_CACHE_HOURS", 24))
+    
+    # Logging (see utils/logger.py)
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    # Structured "zyga" events (utils/logger.log_event); empty disables the file
+    LOG_FILE = os.environ.get("LOG_FILE", os.path.join("logs", "zyga.log"))
+    LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    LOG_DEBUG_SAMPLE_RATE = int(os.environ.get("LOG_DEBUG_SAMPLE_RATE", 100))
+    LOG_MAX_MESSAGE_CHARS = int(os.environ.get("LOG_MAX_MESSAGE_CHARS", 4000))
+    
+    # In-process metrics (see utils/monitoring/metrics.py)
+    METRICS_SNAPSHOT_SECONDS = int(os.environ.get("METRICS_SNAPSHOT_SECONDS", 60))
+    METRICS_RETENTION_DAYS = int(os.environ.get("METRICS_RETENTION_DAYS", 30))
+    
+    # Tracing (see utils/monitoring/tracing.py); exporter is "jsonl", "otlp" or "none".
+    # Only workflow runs are traced; recent traces are kept in memory either way.
+    TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+    TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "none")
+    TRACING_JSONL_PATH = os.environ.get("TRACING_JSONL_PATH", os.path.join("logs", "traces.jsonl"))
+    TRACING_JSONL_MAX_BYTES = int(os.environ.get("TRACING_JSONL_MAX_BYTES", 50 * 1024 * 1024))
+    TRACING_JSONL_BACKUPS = int(os.environ.get("TRACING_JSONL_BACKUPS", 3))
+    TRACING_OTLP_ENDPOINT = os.environ.get("TRACING_OTLP_ENDPOINT", "")
+    TRACING_EXPORT_SECONDS = float(os.environ.get("TRACING_EXPORT_SECONDS", 5))
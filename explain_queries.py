@@ -0,0 +1,219 @@
+"""
+Query plan audit for the hot model filters
+
+Runs EXPLAIN on the ORM queries used by topic selection
+(claim_next_topic, used by WorkflowEngine._select_topic_for_article), duplicate detection
+(check_duplicate_content), the main dashboard (routes.py::dashboard) and the
+analytics routes, and reports whether each one is served by an index.
+
+Usage:
+    DATABASE_URL=sqlite:///explain.db python explain_queries.py --seed 50000
+
+--seed fills the database with synthetic blogs and N rows per table first,
+so always point DATABASE_URL at a scratch database when seeding.
+The script exits with status 1 if any query falls back to a full table scan.
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import app, db
+from models import Blog, ArticleTopic, ContentLog, ContentMetrics, ImageLibrary, PerformanceReport
+from utils.automation.topic_manager import topic_claim_query
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED_BLOG_NAME = "EXPLAIN audit blog"
+SEED_BLOG_COUNT = 10
+SEED_CATEGORIES = ["Zdrowie", "Ciąża", "Dziecko", "Rodzina", "Edukacja", "Zabawki", "Kuchnia", "Dom"]
+STATUSES = {
+    "topic": ["pending", "approved", "rejected", "used"],
+    "content": ["draft", "scheduled", "published", "failed"],
+}
+
+
+def seed_database(rows: int) -> Blog:
+    """
+    Insert synthetic blogs sharing `rows` topics, logs, metrics and images.
+
+    Rows are spread over several blogs so per-blog filters are as selective
+    as on a real multi-blog installation. Returns the first seeded blog.
+    """
+    blogs = []
+    for number in range(SEED_BLOG_COUNT):
+        name = SEED_BLOG_NAME if number == 0 else f"{SEED_BLOG_NAME} {number}"
+        blog = Blog.query.filter_by(name=name).first()
+        if blog is None:
+            blog = Blog(
+                name=name,
+                url="https://example.com",
+                api_url="https://example.com/wp-json/wp/v2",
+                username="explain",
+                api_token="explain",
+            )
+            db.session.add(blog)
+        blogs.append(blog)
+    db.session.commit()
+    blog_ids = [blog.id for blog in blogs]
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    batch = 5000
+
+    logger.info(f"Seeding {rows} rows per table across {len(blog_ids)} blogs")
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        db.session.bulk_insert_mappings(ArticleTopic, [{
+            "blog_id": rng.choice(blog_ids),
+            "topic": f"Temat {start + i}",
+            "title": f"Temat {start + i}",
+            "keywords": json.dumps(["słowo", f"kw{i % 50}"]),
+            "category": rng.choice(SEED_CATEGORIES),
+            "status": rng.choice(STATUSES["topic"]),
+            "priority": rng.randint(1, 7),
+            "used": rng.random() < 0.7,
+            "created_at": now - timedelta(minutes=start + i),
+        } for i in range(count)])
+        db.session.bulk_insert_mappings(ContentLog, [{
+            "blog_id": rng.choice(blog_ids),
+            "title": f"Artykuł {start + i}",
+            "content": "Lorem ipsum " * 200,
+            "status": rng.choice(STATUSES["content"]),
+            "created_at": now - timedelta(minutes=start + i),
+            "published_at": now - timedelta(minutes=start + i),
+        } for i in range(count)])
+        db.session.bulk_insert_mappings(ContentMetrics, [{
+            "blog_id": rng.choice(blog_ids),
+            "post_id": start + i,
+            "title": f"Artykuł {start + i}",
+            "url": f"https://example.com/?p={start + i}",
+            "page_views": rng.randint(0, 10000),
+            "updated_at": now - timedelta(hours=rng.randint(0, 24 * 90)),
+        } for i in range(count)])
+        db.session.bulk_insert_mappings(ImageLibrary, [{
+            "blog_id": rng.choice(blog_ids),
+            "url": f"https://images.example.com/{start + i}.jpg",
+            "created_at": now - timedelta(minutes=start + i),
+        } for i in range(count)])
+        db.session.commit()
+
+    db.session.bulk_insert_mappings(PerformanceReport, [{
+        "blog_id": blog_ids[i % len(blog_ids)],
+        "report_type": "weekly",
+        "start_date": now - timedelta(days=7 * (i + 1)),
+        "end_date": now - timedelta(days=7 * i),
+        "created_at": now - timedelta(days=7 * i),
+    } for i in range(min(rows, 500))])
+    db.session.commit()
+
+    # Refresh planner statistics
+    with db.engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+    return blogs[0]
+
+
+def build_queries(blog_id: int) -> dict:
+    """ORM queries mirroring the hot call sites, keyed by a readable name"""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "workflow: claim topic": topic_claim_query(
+            blog_id, preferred_categories=SEED_CATEGORIES[:1], fallback_categories=SEED_CATEGORIES[:3]
+        ).limit(1),
+        "validator: duplicate titles": db.session.query(ContentLog.title).filter_by(blog_id=blog_id),
+        "dashboard: pending topics": ArticleTopic.query.filter_by(status='pending'),
+        "dashboard: recent posts": ContentLog.query.filter_by(status='published').order_by(
+            ContentLog.published_at.desc()
+        ).limit(10),
+        "dashboard: posts today": ContentLog.query.filter(
+            ContentLog.blog_id == blog_id,
+            ContentLog.status == 'published',
+            ContentLog.published_at >= today
+        ),
+        "analytics: blog metrics": ContentMetrics.query.filter_by(blog_id=blog_id),
+        "analytics: metrics last 30 days": ContentMetrics.query.filter(
+            ContentMetrics.updated_at >= datetime.utcnow() - timedelta(days=30)
+        ),
+        "analytics: top posts": ContentMetrics.query.order_by(ContentMetrics.page_views.desc()).limit(5),
+        "analytics: published logs": ContentLog.query.filter_by(blog_id=blog_id, status='published'),
+        "analytics: blog reports": PerformanceReport.query.filter_by(blog_id=blog_id).order_by(
+            PerformanceReport.created_at.desc()
+        ).limit(5),
+        "images: by url": ImageLibrary.query.filter_by(url="https://images.example.com/1.jpg"),
+        "images: blog library": ImageLibrary.query.filter_by(blog_id=blog_id).order_by(
+            ImageLibrary.created_at.desc()
+        ),
+    }
+
+
+def explain(query, dialect_name: str) -> list:
+    """Return the plan lines for a query"""
+    dialect = postgresql.dialect() if dialect_name == 'postgresql' else sqlite.dialect()
+    compiled = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN" if dialect_name == 'postgresql' else "EXPLAIN QUERY PLAN"
+
+    with db.engine.connect() as conn:
+        rows = conn.execute(text(f"{prefix} {compiled}")).fetchall()
+
+    if dialect_name == 'postgresql':
+        return [row[0] for row in rows]
+    # SQLite rows are (id, parent, notused, detail)
+    return [row[-1] for row in rows]
+
+
+def uses_full_scan(plan: list, dialect_name: str) -> bool:
+    """True if the plan reads a whole table instead of an index"""
+    for line in plan:
+        if dialect_name == 'postgresql':
+            if "Seq Scan" in line:
+                return True
+        elif line.startswith("SCAN") and "USING" not in line:
+            return True
+    return False
+
+
+def run_audit(seed_rows: int = 0) -> bool:
+    """Print the plan of every hot query, returns False if any scans a table"""
+    with app.app_context():
+        db.create_all()
+        dialect_name = db.engine.dialect.name
+
+        if seed_rows:
+            blog = seed_database(seed_rows)
+        else:
+            blog = Blog.query.filter_by(name=SEED_BLOG_NAME).first() or Blog.query.first()
+            if blog is None:
+                logger.error("No blogs in the database, run with --seed N")
+                return False
+
+        all_indexed = True
+        for name, query in build_queries(blog.id).items():
+            plan = explain(query, dialect_name)
+            full_scan = uses_full_scan(plan, dialect_name)
+            all_indexed = all_indexed and not full_scan
+
+            print(f"[{'SCAN ' if full_scan else 'INDEX'}] {name}")
+            for line in plan:
+                print(f"        {line}")
+
+        return all_indexed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot ORM queries")
+    parser.add_argument("--seed", type=int, default=0, help="seed N synthetic rows per table first")
+    args = parser.parse_args()
+
+    if not run_audit(args.seed):
+        print("Some queries do not use an index")
+        sys.exit(1)
+    print("All audited queries use an index")
@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 """
-Napraw artykuły z dzisiaj - usuń znaczniki markdown ```html
+Napraw artykuły z danego dnia - usuń znaczniki markdown ```html
+
+Usage:
+    python fix_html_artifacts.py [--date 2025-11-19] [--workers 4] [--rate 2]
 """
 import sys
 sys.path.insert(0, '.')
 
 import re
-from app import app, db
-from models import ContentLog, Blog
-import requests
 import base64
 from datetime import datetime
 
+from app import db
+from sqlalchemy.orm import undefer_group
+from models import ContentLog
+from utils.automation.batch_runner import BatchJob, OK, SKIPPED, run_job_cli
+
 def clean_markdown_artifacts(content: str) -> str:
     """Remove markdown code block artifacts"""
     if not content:
@@ -24,57 +29,73 @@ def clean_markdown_artifacts(content: str) -> str:
     
     return content.strip()
 
-def fix_articles():
-    with app.app_context():
-        # Pobierz artykuły z dzisiaj
-        articles = ContentLog.query.filter(
-            db.func.date(ContentLog.created_at) == datetime.utcnow().date()
-        ).all()
-        
-        print(f"Found {len(articles)} articles from today")
-        
-        for article in articles:
-            # Sprawdź czy ma znaczniki markdown
-            if article.content and ('```html' in article.content or article.content.startswith('```')):
-                print(f"\n🔧 Fixing article {article.id}: {article.title[:60]}")
-                
-                # Wyczyść content
-                old_length = len(article.content)
-                article.content = clean_markdown_artifacts(article.content)
-                new_length = len(article.content)
-                
-                print(f"   Cleaned: {old_length} → {new_length} chars (removed {old_length - new_length} chars)")
-                
-                # Zaktualizuj w WordPress jeśli opublikowane
-                if article.post_id and article.status == 'published':
-                    blog = db.session.get(Blog, article.blog_id)
-                    if blog:
-                        try:
-                            credentials = f"{blog.username}:{blog.api_token}"
-                            auth_token = base64.b64encode(credentials.encode()).decode('utf-8')
-                            
-                            update_url = f"{blog.url}/wp-json/wp/v2/posts/{article.post_id}"
-                            update_data = {'content': article.content}
-                            
-                            response = requests.post(
-                                update_url,
-                                headers={'Authorization': f'Basic {auth_token}', 'Content-Type': 'application/json'},
-                                json=update_data,
-                                timeout=30
-                            )
-                            
-                            if response.status_code == 200:
-                                print(f"   ✅ Updated on WordPress (Post ID: {article.post_id})")
-                            else:
-                                print(f"   ⚠️  WordPress update failed: {response.status_code}")
-                        except Exception as e:
-                            print(f"   ❌ Error updating WordPress: {str(e)}")
-            else:
-                print(f"✓ Article {article.id} OK (no markdown artifacts)")
-        
-        # Zapisz zmiany w bazie
+def has_markdown_artifacts(content: str) -> bool:
+    """Check whether content still contains markdown code fences"""
+    return bool(content) and ('```html' in content or content.startswith('```'))
+
+class FixHtmlArtifactsJob(BatchJob):
+    """Czyści znaczniki markdown w artykułach i aktualizuje je na WordPress"""
+    name = "fix_html_artifacts"
+    description = "Remove ```html markdown fences from articles created on a given day"
+    model = ContentLog
+
+    def __init__(self):
+        super().__init__()
+        self.date = datetime.utcnow().date()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", default=None, help="creation date YYYY-MM-DD (default: today)")
+
+    def configure(self, args):
+        if args.date:
+            self.date = datetime.strptime(args.date, "%Y-%m-%d").date()
+
+    def params(self):
+        return {"date": self.date.isoformat()}
+
+    def query(self):
+        return ContentLog.query.options(undefer_group('body')).filter(
+            db.func.date(ContentLog.created_at) == self.date.isoformat()
+        )
+
+    def prepare(self, article):
+        return {
+            "id": article.id,
+            "title": article.title,
+            "content": article.content,
+            "blog_id": article.blog_id,
+            "post_id": article.post_id,
+            "status": article.status,
+        }
+
+    def process(self, article):
+        if not has_markdown_artifacts(article["content"]):
+            return SKIPPED
+
+        cleaned = clean_markdown_artifacts(article["content"])
+        print(f"🔧 Fixing article {article['id']}: {(article['title'] or '')[:60]} "
+              f"({len(article['content'])} → {len(cleaned)} chars)")
+
+        ContentLog.query.filter_by(id=article["id"]).update({"content": cleaned})
         db.session.commit()
-        print("\n✅ All articles fixed!")
+
+        # Zaktualizuj w WordPress jeśli opublikowane
+        blog = self.blogs.get(article["blog_id"])
+        if article["post_id"] and article["status"] == 'published' and blog:
+            credentials = f"{blog['username']}:{blog['api_token']}"
+            auth_token = base64.b64encode(credentials.encode()).decode('utf-8')
+
+            response = self.http(
+                "POST",
+                f"{blog['url']}/wp-json/wp/v2/posts/{article['post_id']}",
+                headers={'Authorization': f'Basic {auth_token}', 'Content-Type': 'application/json'},
+                json={'content': cleaned},
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"WordPress update failed: {response.status_code}")
+            print(f"   ✅ Updated on WordPress (Post ID: {article['post_id']})")
+
+        return OK
 
 if __name__ == "__main__":
-    fix_articles()
+    run_job_cli(FixHtmlArtifactsJob())
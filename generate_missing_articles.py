@@ -1,56 +1,77 @@
 #!/usr/bin/env python3
 """
 Script do wygenerowania brakujących artykułów z dzisiaj
+
+Usage:
+    python generate_missing_articles.py [--missing 2:1,3:2] [--workers 2]
 """
 import sys
 sys.path.insert(0, '.')
 
-from app import app, db
-from models import AutomationRule, Blog
+from models import AutomationRule
+from utils.automation.batch_runner import BatchJob, OK, SKIPPED, run_job_cli
 from utils.automation.workflow_engine import WorkflowEngine, execute_automation_rule
 
-def generate_missing_articles():
-    with app.app_context():
-        # MamaTestuje - brakuje 1 artykuł
-        print("=" * 80)
-        print("🔧 Generating missing article for MAMATESTUJE")
-        print("=" * 80)
-        
-        rule_mt = AutomationRule.query.filter_by(blog_id=2, is_active=True).first()
-        if rule_mt:
-            engine_mt = WorkflowEngine()
-            result = execute_automation_rule(rule_mt.id, engine=engine_mt)
-            
+# blog_id: liczba brakujących artykułów (MamaTestuje - 1, ZnaneKosmetyki - 2)
+DEFAULT_MISSING = {2: 1, 3: 2}
+
+class GenerateMissingArticlesJob(BatchJob):
+    """Uruchamia regułę automatyzacji tyle razy, ile artykułów brakuje w blogu"""
+    name = "generate_missing_articles"
+    description = "Generate missing articles per blog with its active automation rule"
+    model = AutomationRule
+    workers = 2
+
+    def __init__(self):
+        super().__init__()
+        self.missing = DEFAULT_MISSING
+        self._seen_blogs = set()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing", default=None, help="blog_id:count pairs, e.g. 2:1,3:2")
+
+    def configure(self, args):
+        if args.missing:
+            pairs = (pair.split(':') for pair in args.missing.split(','))
+            self.missing = {int(blog_id): int(count) for blog_id, count in pairs}
+
+    def params(self):
+        return {"missing": {str(blog_id): count for blog_id, count in self.missing.items()}}
+
+    def query(self):
+        return AutomationRule.query.filter(
+            AutomationRule.blog_id.in_(list(self.missing)),
+            AutomationRule.is_active == True
+        )
+
+    def prepare(self, rule):
+        # Only the first active rule of each blog generates articles
+        if rule.blog_id in self._seen_blogs:
+            return None
+        self._seen_blogs.add(rule.blog_id)
+        return {"rule_id": rule.id, "blog_id": rule.blog_id, "count": self.missing[rule.blog_id]}
+
+    def process(self, item):
+        if item is None:
+            return SKIPPED
+
+        # One engine per blog keeps category and author rotation across its articles
+        engine = WorkflowEngine()
+
+        blog = self.blogs.get(item["blog_id"])
+        errors = []
+        for i in range(item["count"]):
+            self.wait_for_host(blog and blog['url'])
+            result = execute_automation_rule(item["rule_id"], engine=engine)
             if result.get("success"):
-                print(f"✅ MamaTestuje article generated successfully!")
-                print(f"   Article ID: {result.get('article_id')}")
-                print(f"   WordPress ID: {result.get('wordpress_post_id')}")
+                print(f"✅ Blog {item['blog_id']} article {i + 1}/{item['count']}: "
+                      f"ID {result.get('article_id')}, WordPress ID {result.get('wordpress_post_id')}")
             else:
-                print(f"❌ MamaTestuje failed: {result.get('error')}")
-        
-        # ZnaneKosmetyki - brakuje 2 artykuły
-        print("\n" + "=" * 80)
-        print("🔧 Generating 2 missing articles for ZNANEKOSMETYKI")
-        print("=" * 80)
-        
-        rule_zk = AutomationRule.query.filter_by(blog_id=3, is_active=True).first()
-        if rule_zk:
-            engine_zk = WorkflowEngine()
-            
-            for i in range(2):
-                print(f"\n📝 Article {i+1}/2 for ZnaneKosmetyki")
-                result = execute_automation_rule(rule_zk.id, engine=engine_zk)
-                
-                if result.get("success"):
-                    print(f"   ✅ Article {i+1} generated successfully!")
-                    print(f"   Article ID: {result.get('article_id')}")
-                    print(f"   WordPress ID: {result.get('wordpress_post_id')}")
-                else:
-                    print(f"   ❌ Article {i+1} failed: {result.get('error')}")
-        
-        print("\n" + "=" * 80)
-        print("✅ DONE - Check results above")
-        print("=" * 80)
+                errors.append(str(result.get('error')))
+
+        if errors:
+            raise RuntimeError(f"{len(errors)}/{item['count']} articles failed: {'; '.join(errors)}")
+        return OK
 
 if __name__ == "__main__":
-    generate_missing_articles()
+    run_job_cli(GenerateMissingArticlesJob())
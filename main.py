@@ -1,52 +1,72 @@
-from app import app, db
+from app import app, db, register_blueprints
 import logging
-import os
-from routes import register_routes
+import threading
+from models import Blog, settings_cache
 from utils.scheduler import start_scheduler
-from models import Blog, SocialAccount, ContentLog, ScheduledPublication
+from utils.monitoring.metrics import start_snapshots
+from utils.monitoring.startup import startup_report
 from utils.seo.analyzer import initialize_seo_module
-from utils.automation.scheduler import start_automation_scheduler
-from routes_scheduling import scheduling_bp
-import routes_multi_blog  # Multi-blog management API endpoints
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
+# Logging is configured by app.py
 logger = logging.getLogger(__name__)
 
-# Register blueprints
-app.register_blueprint(scheduling_bp)
+# Import and register the route modules (only the web process needs them)
+register_blueprints(app)
 
 # Initialize the database function
 def initialize_database():
     # Create tables if they don't exist
     db.create_all()
     
+    # Load system settings into the process-wide cache
+    settings_cache.load()
+    
     # Check if we have any blogs configured
     if Blog.query.count() == 0:
         logger.info("No blogs found in database. Please add blogs through the dashboard.")
 
+def initialize_seo_in_background():
+    """
+    Initialize the SEO module in a background thread: its Google Trends
+    self-test makes network requests that would otherwise hold up startup.
+    """
+    def run():
+        with app.app_context():
+            try:
+                initialize_seo_module()
+                logger.info("SEO module initialized")
+            except Exception as e:
+                logger.error(f"Error initializing SEO module: {str(e)}")
+
+    threading.Thread(target=run, name="seo-init", daemon=True).start()
+
 # Initialize the database and start scheduler
 with app.app_context():
-    initialize_database()
-    # Start the scheduler for automated content generation and posting
-    start_scheduler()
+    with startup_report.phase("database"):
+        initialize_database()
+    
+    with startup_report.phase("schedulers"):
+        # Start the scheduler for automated content generation and posting
+        start_scheduler()
+        
+        # Store metrics snapshots so dashboards see this process after a restart
+        start_snapshots()
     
     # Start automation scheduler for workflow management
     # DISABLED: Scheduler wyłączony na żądanie użytkownika (Nov 20, 2025)
     # try:
+    #     from utils.automation.scheduler import start_automation_scheduler
     #     start_automation_scheduler()
     #     logger.info("Automation scheduler started")
     # except Exception as e:
     #     logger.error(f"Error starting automation scheduler: {str(e)}")
     
     # Initialize SEO module with Google Trends and SerpAPI
-    try:
-        initialize_seo_module()
-        logger.info("SEO module initialized")
-    except Exception as e:
-        logger.error(f"Error initializing SEO module: {str(e)}")
+    initialize_seo_in_background()
     logger.info("Flask application initialized")
 
+startup_report.complete()
+
 if __name__ == "__main__":
     # Run the Flask app
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,54 @@
+"""
+Migration script creating the composite indexes declared on the models
+
+db.create_all() only creates indexes together with new tables, so existing
+databases need this script to pick up indexes added to __table_args__.
+Indexes that already exist are left untouched.
+"""
+import logging
+import sys
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import app, db
+import models  # noqa: F401
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Create every model index that is missing from the database"""
+    try:
+        with app.app_context():
+            inspector = inspect(db.engine)
+            existing_tables = set(inspector.get_table_names())
+            created = 0
+
+            for table in db.metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in existing_indexes:
+                        continue
+                    # Dialect-specific indexes (e.g. GIN) are skipped by ddl_if on other databases
+                    logger.info(f"Creating index {index.name} on {table.name}")
+                    index.create(db.engine)
+                    created += 1
+
+            logger.info(f"Index migration completed, {created} indexes created")
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_migration()
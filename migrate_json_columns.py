@@ -0,0 +1,119 @@
+"""
+Migration script converting JSON-in-TEXT columns to native JSONB on PostgreSQL
+
+Every column declared with models.JSONText is:
+1. scanned for values that are not valid JSON (these are re-encoded as JSON strings),
+2. converted from TEXT to JSONB,
+3. covered by the GIN indexes declared in the models (topic keywords, article tags).
+
+On SQLite the columns stay TEXT, so only the validation pass is run.
+"""
+import json
+import logging
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import app, db
+import models
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_json_columns():
+    """Returns (table_name, column_name) pairs for every JSONText column"""
+    columns = []
+    for table in db.metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, models.JSONText):
+                columns.append((table.name, column.name))
+    return columns
+
+
+def get_column_type(conn, table_name, column_name):
+    """Returns the PostgreSQL data type of a column or None if it does not exist"""
+    result = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name})
+    return result.scalar()
+
+
+def repair_invalid_json(conn, table_name, column_name):
+    """Re-encodes values that are not valid JSON so the cast to JSONB succeeds"""
+    rows = conn.execute(text(
+        f"SELECT id, {column_name} FROM {table_name} WHERE {column_name} IS NOT NULL"
+    ))
+    repaired = 0
+    for row_id, raw in rows.fetchall():
+        if raw == '':
+            conn.execute(text(
+                f"UPDATE {table_name} SET {column_name} = NULL WHERE id = :id"
+            ), {"id": row_id})
+            repaired += 1
+            continue
+        try:
+            json.loads(raw)
+        except (ValueError, TypeError):
+            conn.execute(text(
+                f"UPDATE {table_name} SET {column_name} = :value WHERE id = :id"
+            ), {"id": row_id, "value": json.dumps(raw)})
+            repaired += 1
+    if repaired:
+        logger.info(f"Repaired {repaired} non-JSON values in {table_name}.{column_name}")
+    return repaired
+
+
+def run_migration():
+    """Run the TEXT -> JSONB migration"""
+    try:
+        with app.app_context():
+            dialect = db.engine.dialect.name
+            columns = get_json_columns()
+            logger.info(f"Found {len(columns)} JSON columns ({dialect})")
+
+            with db.engine.connect() as conn:
+                for table_name, column_name in columns:
+                    if dialect == 'postgresql':
+                        column_type = get_column_type(conn, table_name, column_name)
+                        if column_type is None:
+                            logger.warning(f"Column {table_name}.{column_name} does not exist, skipping")
+                            continue
+                        if column_type == 'jsonb':
+                            logger.info(f"{table_name}.{column_name} is already JSONB")
+                            continue
+
+                    repair_invalid_json(conn, table_name, column_name)
+
+                    if dialect == 'postgresql':
+                        conn.execute(text(
+                            f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                            f"TYPE JSONB USING {column_name}::jsonb"
+                        ))
+                        logger.info(f"Converted {table_name}.{column_name} to JSONB")
+
+                conn.commit()
+
+            if dialect == 'postgresql':
+                # Creates the GIN indexes declared in __table_args__
+                for table in db.metadata.sorted_tables:
+                    for index in table.indexes:
+                        if index.name and index.name.endswith('_gin'):
+                            index.create(db.engine, checkfirst=True)
+                            logger.info(f"Ensured index {index.name}")
+
+            logger.info("JSON column migration completed")
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_migration()
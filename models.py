@@ -1,12 +1,131 @@
 from app import db
 from datetime import datetime, timedelta
 import json
+import threading
+import time
+import uuid
 from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred
 from typing import List, Optional, Dict, Any
 import os
 from flask_login import UserMixin
 from flask_dance.consumer.storage.sqla import OAuthConsumerMixin
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, cast, or_, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+
+class JSONText(TypeDecorator):
+    """
+    JSON column that is stored as JSONB on PostgreSQL and as TEXT elsewhere.
+
+    The Python-side value stays a JSON string so existing code that calls
+    json.loads/json.dumps on these attributes keeps working. Assigning a
+    list or dict directly is accepted as well. Run migrate_json_columns.py
+    to convert existing TEXT columns on PostgreSQL.
+    """
+    impl = db.Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(db.Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            if isinstance(value, str):
+                try:
+                    return json.loads(value)
+                except ValueError:
+                    # Legacy non-JSON text is kept as a JSON string scalar
+                    return value
+            return value
+        if isinstance(value, str):
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            # JSONB is decoded by the driver; a string scalar must be quoted again
+            return json.dumps(value)
+        if isinstance(value, str):
+            return value
+        return json.dumps(value)
+
+
+class JSONFieldsMixin:
+    """Decoded-value cache for JSONText columns, kept per model instance"""
+
+    def _get_json(self, attr: str, default: Any, safe: bool = False) -> Any:
+        """
+        Return the decoded value of a JSON column.
+
+        The decoded value is cached until the raw string changes, so repeated
+        get_* calls on the same instance only pay for json.loads once.
+        Lists and dicts are returned as shallow copies so callers can modify
+        them before passing them back to a set_* method.
+        """
+        raw = getattr(self, attr)
+        if not raw:
+            return default
+
+        cache = self.__dict__.setdefault('_json_cache', {})
+        cached = cache.get(attr)
+        if cached is not None and cached[0] is raw:
+            value = cached[1]
+        else:
+            try:
+                value = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                if safe:
+                    return default
+                raise
+            cache[attr] = (raw, value)
+
+        if isinstance(value, (list, dict)):
+            return value.copy()
+        return value
+
+
+
+class ListingMixin:
+    """Column projections for list views that do not need article bodies"""
+    
+    LISTING_COLUMNS: tuple = ('id',)
+    
+    @classmethod
+    def listing(cls, *criteria, columns: Optional[tuple] = None):
+        """
+        Query returning lightweight rows instead of full model instances.
+        
+        Rows behave like named tuples (row.title, row.published_at, ...) and
+        contain only LISTING_COLUMNS (or the given column names), so large
+        Text columns are never transferred from the database.
+        """
+        selected = [getattr(cls, name) for name in (columns or cls.LISTING_COLUMNS)]
+        return db.session.query(*selected).filter(*criteria)
+
+
+def json_array_contains(column, value):
+    """
+    SQL filter matching rows whose JSON array column contains value.
+
+    Uses the JSONB containment operator (served by the GIN indexes) on
+    PostgreSQL and a LIKE match on the encoded text elsewhere.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        # The operand is a one-element JSONB array: a bare string would be bound as a scalar
+        return column.op('@>')(cast([value], JSONB))
+    return or_(
+        column.contains(json.dumps(value), autoescape=True),
+        column.contains(json.dumps(value, ensure_ascii=False), autoescape=True),
+    )
+
 
 # Authentication Models (Required for Replit Auth)
 class User(UserMixin, db.Model):
@@ -40,7 +159,7 @@ class OAuth(OAuthConsumerMixin, db.Model):
     def __repr__(self) -> str:
         return f"<OAuth {self.provider or 'unknown'} - {self.user_id or 'unknown'}>"
 
-class Blog(db.Model):
+class Blog(JSONFieldsMixin, db.Model):
     """Model for WordPress blog configuration"""
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -48,7 +167,7 @@ class Blog(db.Model):
     api_url = db.Column(db.String(255), nullable=False)
     username = db.Column(db.String(100), nullable=False)
     api_token = db.Column(db.String(255), nullable=False)
-    categories = db.Column(db.Text, nullable=True)  # JSON string of categories
+    categories = db.Column(JSONText, nullable=True)  # JSON string of categories
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     active = db.Column(db.Boolean, default=True)
     approval_required = db.Column(db.Boolean, default=False)  # Require approval before publishing
@@ -58,12 +177,7 @@ class Blog(db.Model):
     
     def get_categories(self):
         """Returns categories as a Python list"""
-        if self.categories:
-            try:
-                return json.loads(self.categories)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return self._get_json('categories', [], safe=True)
     
     def set_categories(self, categories_list):
         """Sets categories from a Python list"""
@@ -117,20 +231,24 @@ class SocialAccount(db.Model):
     def __repr__(self):
         return f"<SocialAccount {self.platform} - {self.name}>"
 
-class Article(db.Model):
+class Article(JSONFieldsMixin, ListingMixin, db.Model):
     """Model for article content with long paragraphs"""
+    
+    # Heavy columns (group 'body') are deferred; list views use listing()
+    LISTING_COLUMNS = ('id', 'blog_id', 'title', 'status', 'post_id', 'category_id',
+                       'created_at', 'published_at')
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
-    content = db.Column(db.Text, nullable=False)  # Full article content
-    excerpt = db.Column(db.Text, nullable=True)  # Article excerpt/summary
+    content = deferred(db.Column(db.Text, nullable=False), group='body')  # Full article content
+    excerpt = deferred(db.Column(db.Text, nullable=True), group='body')  # Article excerpt/summary
     status = db.Column(db.String(50), default="draft")  # draft, ready, published, archived
     post_id = db.Column(db.Integer, nullable=True)  # WordPress post ID if published
     category_id = db.Column(db.Integer, nullable=True)  # Category ID
-    tags = db.Column(db.Text, nullable=True)  # JSON string of tags
+    tags = db.Column(JSONText, nullable=True)  # JSON string of tags
     token_count = db.Column(db.Integer, nullable=True)  # Total token count
     paragraph_count = db.Column(db.Integer, nullable=True)  # Number of paragraphs
-    metrics_data = db.Column(db.Text, nullable=True)  # JSON string of metrics
+    metrics_data = db.Column(JSONText, nullable=True)  # JSON string of metrics
     featured_image_url = db.Column(db.String(512), nullable=True)  # URL to featured image
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -139,14 +257,17 @@ class Article(db.Model):
     # Define relationship with Blog
     blog = db.relationship('Blog', backref=db.backref('articles', lazy=True))
     
+    __table_args__ = (
+        # GIN index for tag containment queries (see json_array_contains)
+        db.Index('ix_article_tags_gin', 'tags', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<Article {self.title} - {self.status}>"
     
     def get_tags(self):
         """Returns tags as a Python list"""
-        if self.tags:
-            return json.loads(self.tags)
-        return []
+        return self._get_json('tags', [])
     
     def set_tags(self, tags_list):
         """Sets tags from a Python list"""
@@ -154,36 +275,47 @@ class Article(db.Model):
     
     def get_metrics(self):
         """Returns metrics as a Python dict"""
-        if self.metrics_data:
-            return json.loads(self.metrics_data)
-        return {}
+        return self._get_json('metrics_data', {})
     
     def set_metrics(self, metrics_dict):
         """Sets metrics from a Python dict"""
         self.metrics_data = json.dumps(metrics_dict)
 
-class ContentLog(db.Model):
+class ContentLog(JSONFieldsMixin, ListingMixin, db.Model):
     """Model for logging content generation and publishing activities"""
+    
+    # Heavy columns (group 'body') are deferred; list views use listing()
+    LISTING_COLUMNS = ('id', 'blog_id', 'title', 'status', 'post_id', 'category_id',
+                       'created_at', 'publish_date', 'published_at')
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
     title = db.Column(db.String(255), nullable=True)
-    content = db.Column(db.Text, nullable=True)  # Full article content
-    excerpt = db.Column(db.Text, nullable=True)  # Article excerpt/summary
+    content = deferred(db.Column(db.Text, nullable=True), group='body')  # Full article content
+    excerpt = deferred(db.Column(db.Text, nullable=True), group='body')  # Article excerpt/summary
     status = db.Column(db.String(50), nullable=False)  # draft, scheduled, pending_review, published, failed
     post_id = db.Column(db.Integer, nullable=True)
     category_id = db.Column(db.Integer, nullable=True)  # WordPress category ID
-    tags = db.Column(db.Text, nullable=True)  # JSON string of tags
+    tags = db.Column(JSONText, nullable=True)  # JSON string of tags
     error_message = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     publish_date = db.Column(db.DateTime, nullable=True)  # When the post should be published
     published_at = db.Column(db.DateTime, nullable=True)  # When the post was actually published
-    social_media_posts = db.Column(db.Text, nullable=True)  # JSON string of social media post URLs
-    featured_image_data = db.Column(db.Text, nullable=True)  # JSON string of featured image data
-    seo_metadata = db.Column(db.Text, nullable=True)  # JSON string of SEO metadata
+    social_media_posts = db.Column(JSONText, nullable=True)  # JSON string of social media post URLs
+    featured_image_data = deferred(db.Column(JSONText, nullable=True), group='body')  # JSON string of featured image data
+    seo_metadata = deferred(db.Column(JSONText, nullable=True), group='body')  # JSON string of SEO metadata
     
     # Define relationship with Blog
     blog = db.relationship('Blog', backref=db.backref('content_logs', lazy=True))
     
+    __table_args__ = (
+        # Per-blog listings and counts filtered by status and date
+        db.Index('ix_content_log_blog_status_published', 'blog_id', 'status', 'published_at'),
+        db.Index('ix_content_log_blog_status_created', 'blog_id', 'status', 'created_at'),
+        # Dashboard "recent posts" across all blogs
+        db.Index('ix_content_log_status_published', 'status', 'published_at'),
+        db.Index('ix_content_log_tags_gin', 'tags', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<ContentLog {self.title} - {self.status}>"
     
@@ -193,9 +325,7 @@ class ContentLog(db.Model):
     
     def get_social_posts(self):
         """Returns social media posts as a Python dict"""
-        if self.social_media_posts:
-            return json.loads(self.social_media_posts)
-        return {}
+        return self._get_json('social_media_posts', {})
         
     def set_featured_image(self, image_data):
         """Sets featured image data from a Python dict"""
@@ -203,9 +333,7 @@ class ContentLog(db.Model):
     
     def get_featured_image(self):
         """Returns featured image data as a Python dict"""
-        if self.featured_image_data:
-            return json.loads(self.featured_image_data)
-        return None
+        return self._get_json('featured_image_data', None)
     
     def set_tags(self, tags_list):
         """Sets tags from a Python list"""
@@ -213,9 +341,7 @@ class ContentLog(db.Model):
     
     def get_tags(self):
         """Returns tags as a Python list"""
-        if self.tags:
-            return json.loads(self.tags)
-        return []
+        return self._get_json('tags', [])
     
     def set_seo_metadata(self, metadata_dict):
         """Sets SEO metadata from a Python dict"""
@@ -223,9 +349,109 @@ class ContentLog(db.Model):
     
     def get_seo_metadata(self):
         """Returns SEO metadata as a Python dict"""
-        if self.seo_metadata:
-            return json.loads(self.seo_metadata)
-        return {}
+        return self._get_json('seo_metadata', {})
+
+class SettingsCache:
+    """
+    Process-wide read-through cache for SystemSettings.
+
+    All settings are loaded with one query and served from memory. Writers
+    store a new random token in the version row (SETTINGS_VERSION_KEY);
+    readers compare it at most every `check_interval` seconds and reload
+    only when it changed. On PostgreSQL a LISTEN thread marks the cache
+    stale as soon as another process commits a change, so no polling is
+    needed at all.
+    """
+
+    NOTIFY_CHANNEL = 'system_settings_changed'
+
+    def __init__(self, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._version: Optional[str] = None
+        self._loaded = False
+        self._stale = False
+        self._checked_at = 0.0
+        self._listener: Optional[threading.Thread] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the decoded value of a setting without querying in the steady state"""
+        self._refresh_if_needed()
+        value = self._values.get(key, default)
+        if isinstance(value, (list, dict)):
+            return value.copy()
+        return value
+
+    def invalidate(self):
+        """Forces a reload on the next read"""
+        self._stale = True
+
+    def load(self):
+        """(Re)loads every setting with a single query"""
+        rows = db.session.query(SystemSettings.key, SystemSettings.value).all()
+        values = {}
+        version = None
+        for key, raw in rows:
+            if key == SystemSettings.SETTINGS_VERSION_KEY:
+                version = raw
+            elif raw:
+                values[key] = SystemSettings.decode_value(raw)
+
+        with self._lock:
+            self._values = values
+            self._version = version
+            self._loaded = True
+            self._stale = False
+            self._checked_at = time.monotonic()
+
+        if self._listener is None and db.engine.dialect.name == 'postgresql':
+            self._start_listener(db.engine)
+
+    def _refresh_if_needed(self):
+        if not self._loaded or self._stale:
+            self.load()
+            return
+
+        # The LISTEN thread reports changes, polling is only needed without it
+        if self._listener is not None and self._listener.is_alive():
+            return
+
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+
+        version = db.session.query(SystemSettings.value).filter_by(
+            key=SystemSettings.SETTINGS_VERSION_KEY
+        ).scalar()
+        self._checked_at = now
+        if version != self._version:
+            self.load()
+
+    def _start_listener(self, engine):
+        """Starts a daemon thread waiting for NOTIFY on PostgreSQL"""
+        def listen():
+            import select
+            try:
+                connection = engine.raw_connection()
+                raw = connection.driver_connection
+                raw.autocommit = True
+                cursor = raw.cursor()
+                cursor.execute(f"LISTEN {self.NOTIFY_CHANNEL}")
+                while True:
+                    if select.select([raw], [], [], 60) == ([], [], []):
+                        continue
+                    raw.poll()
+                    if raw.notifies:
+                        raw.notifies.clear()
+                        self.invalidate()
+            except Exception as e:
+                import logging
+                logging.getLogger(__name__).warning(f"Settings LISTEN thread stopped: {str(e)}")
+
+        self._listener = threading.Thread(target=listen, name='settings-listener', daemon=True)
+        self._listener.start()
+
 
 class SystemSettings(db.Model):
     """Model for system-wide settings"""
@@ -235,16 +461,21 @@ class SystemSettings(db.Model):
     description = db.Column(db.String(255), nullable=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Row whose value changes on every write, used to invalidate SettingsCache
+    SETTINGS_VERSION_KEY = '_settings_version'
+    
+    @staticmethod
+    def decode_value(raw: str) -> Any:
+        """Decodes a stored value (JSON if possible, plain string otherwise)"""
+        try:
+            return json.loads(raw)
+        except (ValueError, TypeError):
+            return raw
+    
     @classmethod
     def get(cls, key: str, default: Any = None) -> Any:
         """Get a setting value by key with optional default"""
-        setting = cls.query.filter_by(key=key).first()
-        if setting and setting.value:
-            try:
-                return json.loads(setting.value)
-            except:
-                return setting.value
-        return default
+        return settings_cache.get(key, default)
     
     @classmethod
     def set(cls, key: str, value: Any, description: Optional[str] = None) -> 'SystemSettings':
@@ -260,9 +491,24 @@ class SystemSettings(db.Model):
             setting.value = str(value)
             
         db.session.add(setting)
+        cls._bump_version()
         db.session.commit()
+        settings_cache.invalidate()
         return setting
     
+    @classmethod
+    def _bump_version(cls):
+        """Marks settings as changed for every process (committed with the caller's transaction)"""
+        version = cls.query.filter_by(key=cls.SETTINGS_VERSION_KEY).first()
+        if not version:
+            version = cls(key=cls.SETTINGS_VERSION_KEY, description='SettingsCache version token')
+            db.session.add(version)
+        version.value = uuid.uuid4().hex
+        
+        if db.engine.dialect.name == 'postgresql':
+            # Delivered to listeners when the transaction commits
+            db.session.execute(text(f"NOTIFY {SettingsCache.NOTIFY_CHANNEL}"))
+    
     @classmethod
     def get_publishing_times(cls) -> List[str]:
         """Get the default publishing times"""
@@ -275,6 +521,10 @@ class SystemSettings(db.Model):
         return int(cls.get('default_articles_per_day', 4))
 
 
+# Shared by every SystemSettings reader in this process
+settings_cache = SettingsCache()
+
+
 class Notification(db.Model):
     """Model for system notifications"""
     id = db.Column(db.Integer, primary_key=True)
@@ -318,14 +568,14 @@ class PublishingSchedule(db.Model):
             return datetime.combine(self.publish_date, self.publish_time)
         return None
 
-class ArticleTopic(db.Model):
+class ArticleTopic(JSONFieldsMixin, db.Model):
     """Model for storing generated topics"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
     topic = db.Column(db.String(255), nullable=False)  # Changed from title to topic
     title = db.Column(db.String(255), nullable=True)  # Keep both for compatibility
     description = db.Column(db.Text, nullable=True)
-    keywords = db.Column(db.Text, nullable=True)  # JSON string of keywords
+    keywords = db.Column(JSONText, nullable=True)  # JSON string of keywords
     category = db.Column(db.String(100), nullable=True)
     status = db.Column(db.String(50), default="pending")  # pending, approved, rejected, used
     priority = db.Column(db.Integer, default=3)  # Priority level (1-7)
@@ -345,20 +595,26 @@ class ArticleTopic(db.Model):
     # Define relationship with Blog
     blog = db.relationship('Blog', backref=db.backref('article_topics', lazy=True))
     
+    __table_args__ = (
+        # Topic selection: approved, unused topics of a blog/category in priority order
+        db.Index('ix_article_topic_selection', 'blog_id', 'status', 'used', 'category',
+                 priority.desc(), 'created_at'),
+        db.Index('ix_article_topic_status', 'status'),
+        db.Index('ix_article_topic_keywords_gin', 'keywords', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<ArticleTopic {self.title}>"
     
     def get_keywords(self):
         """Returns keywords as a Python list"""
-        if self.keywords:
-            return json.loads(self.keywords)
-        return []
+        return self._get_json('keywords', [])
     
     def set_keywords(self, keywords_list):
         """Sets keywords from a Python list"""
         self.keywords = json.dumps(keywords_list)
 
-class ContentMetrics(db.Model):
+class ContentMetrics(JSONFieldsMixin, db.Model):
     """Model for storing content performance metrics from Google Analytics"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
@@ -372,11 +628,17 @@ class ContentMetrics(db.Model):
     conversion_rate = db.Column(db.Float, default=0.0)  # Percentage
     social_shares = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    raw_data = db.Column(db.Text, nullable=True)  # JSON string of additional metrics
+    raw_data = db.Column(JSONText, nullable=True)  # JSON string of additional metrics
     
     # Define relationship with Blog
     blog = db.relationship('Blog', backref=db.backref('content_metrics', lazy=True))
     
+    __table_args__ = (
+        db.Index('ix_content_metrics_blog_post', 'blog_id', 'post_id'),
+        db.Index('ix_content_metrics_updated_at', 'updated_at'),
+        db.Index('ix_content_metrics_page_views', 'page_views'),
+    )
+    
     def __repr__(self):
         return f"<ContentMetrics {self.title} - views:{self.page_views}>"
     
@@ -386,12 +648,10 @@ class ContentMetrics(db.Model):
     
     def get_raw_data(self):
         """Returns raw data as a Python dict"""
-        if self.raw_data:
-            return json.loads(self.raw_data)
-        return {}
+        return self._get_json('raw_data', {})
 
 
-class ImageLibrary(db.Model):
+class ImageLibrary(JSONFieldsMixin, db.Model):
     """Model for storing saved images"""
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=True)
@@ -403,22 +663,25 @@ class ImageLibrary(db.Model):
     height = db.Column(db.Integer, nullable=True)
     attribution = db.Column(db.String(255), nullable=True)  # Attribution text
     attribution_url = db.Column(db.String(512), nullable=True)  # Attribution link
-    tags = db.Column(db.Text, nullable=True)  # JSON string of tags
-    image_metadata = db.Column(db.Text, nullable=True)  # JSON string of additional metadata
+    tags = db.Column(JSONText, nullable=True)  # JSON string of tags
+    image_metadata = db.Column(JSONText, nullable=True)  # JSON string of additional metadata
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Define relationship with Blog if applicable
     blog = db.relationship('Blog', backref=db.backref('images', lazy=True))
     
+    __table_args__ = (
+        db.Index('ix_image_library_url', 'url'),
+        db.Index('ix_image_library_blog_created', 'blog_id', 'created_at'),
+    )
+    
     def __repr__(self):
         return f"<ImageLibrary {self.title or 'untitled'}>"
     
     def get_tags(self):
         """Returns tags as a Python list"""
-        if self.tags:
-            return json.loads(self.tags)
-        return []
+        return self._get_json('tags', [])
     
     def set_tags(self, tags_list):
         """Sets tags from a Python list"""
@@ -426,9 +689,7 @@ class ImageLibrary(db.Model):
     
     def get_image_metadata(self):
         """Returns image metadata as a Python dict"""
-        if self.image_metadata:
-            return json.loads(self.image_metadata)
-        return {}
+        return self._get_json('image_metadata', {})
     
     def set_image_metadata(self, metadata_dict):
         """Sets image metadata from a Python dict"""
@@ -437,14 +698,14 @@ class ImageLibrary(db.Model):
 
 
 
-class SocialMediaTemplate(db.Model):
+class SocialMediaTemplate(JSONFieldsMixin, db.Model):
     """Model for storing social media content templates"""
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     platform = db.Column(db.String(50), nullable=False)  # facebook, twitter, linkedin, instagram
     type = db.Column(db.String(50), nullable=False)  # article_promotion, quote, question, etc.
     content = db.Column(db.Text, nullable=False)
-    hashtags = db.Column(db.Text, nullable=True)  # JSON string of hashtags
+    hashtags = db.Column(JSONText, nullable=True)  # JSON string of hashtags
     description = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -454,26 +715,24 @@ class SocialMediaTemplate(db.Model):
     
     def get_hashtags(self):
         """Returns hashtags as a Python list"""
-        if self.hashtags:
-            return json.loads(self.hashtags)
-        return []
+        return self._get_json('hashtags', [])
         
     def set_hashtags(self, hashtags_list):
         """Sets hashtags from a Python list"""
         self.hashtags = json.dumps(hashtags_list)
 
 
-class ScheduledSocialPost(db.Model):
+class ScheduledSocialPost(JSONFieldsMixin, db.Model):
     """Model for scheduled social media posts"""
     id = db.Column(db.Integer, primary_key=True)
     content_id = db.Column(db.Integer, db.ForeignKey('content_log.id'), nullable=True)
     platform = db.Column(db.String(50), nullable=False)  # facebook, twitter, linkedin, instagram
     content = db.Column(db.Text, nullable=False)
-    hashtags = db.Column(db.Text, nullable=True)  # JSON string of hashtags
+    hashtags = db.Column(JSONText, nullable=True)  # JSON string of hashtags
     image_url = db.Column(db.String(255), nullable=True)
     scheduled_date = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(50), default="scheduled")  # scheduled, published, error
-    result_data = db.Column(db.Text, nullable=True)  # JSON string of API response data
+    result_data = db.Column(JSONText, nullable=True)  # JSON string of API response data
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Define relationship with ContentLog (optional association)
@@ -484,9 +743,7 @@ class ScheduledSocialPost(db.Model):
     
     def get_hashtags(self):
         """Returns hashtags as a Python list"""
-        if self.hashtags:
-            return json.loads(self.hashtags)
-        return []
+        return self._get_json('hashtags', [])
         
     def set_hashtags(self, hashtags_list):
         """Sets hashtags from a Python list"""
@@ -494,21 +751,19 @@ class ScheduledSocialPost(db.Model):
         
     def get_result_data(self):
         """Returns result data as a Python dict"""
-        if self.result_data:
-            return json.loads(self.result_data)
-        return {}
+        return self._get_json('result_data', {})
         
     def set_result_data(self, result_dict):
         """Sets result data from a Python dict"""
         self.result_data = json.dumps(result_dict)
 
 
-class SocialMediaScheduleSettings(db.Model):
+class SocialMediaScheduleSettings(JSONFieldsMixin, db.Model):
     """Model for storing social media publishing schedule settings"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=True)  # NULL means global settings
-    optimal_times = db.Column(db.Text, nullable=True)  # JSON string of optimal posting times
-    platform_settings = db.Column(db.Text, nullable=True)  # JSON string of platform-specific settings
+    optimal_times = db.Column(JSONText, nullable=True)  # JSON string of optimal posting times
+    platform_settings = db.Column(JSONText, nullable=True)  # JSON string of platform-specific settings
     auto_distribute = db.Column(db.Boolean, default=True)
     platform_rotation = db.Column(db.Boolean, default=True)
     content_variety = db.Column(db.Boolean, default=True)
@@ -523,9 +778,7 @@ class SocialMediaScheduleSettings(db.Model):
     
     def get_optimal_times(self):
         """Returns optimal times as a Python list"""
-        if self.optimal_times:
-            return json.loads(self.optimal_times)
-        return ["08:00", "12:00", "16:00", "20:00"]
+        return self._get_json('optimal_times', ["08:00", "12:00", "16:00", "20:00"])
         
     def set_optimal_times(self, times_list):
         """Sets optimal times from a Python list"""
@@ -533,8 +786,9 @@ class SocialMediaScheduleSettings(db.Model):
         
     def get_platform_settings(self):
         """Returns platform settings as a Python dict"""
-        if self.platform_settings:
-            return json.loads(self.platform_settings)
+        settings = self._get_json('platform_settings', None)
+        if settings is not None:
+            return settings
         return {
             "facebook": {"frequency": 3, "days": ["mon", "wed", "fri"]},
             "twitter": {"frequency": 5, "days": ["mon", "tue", "wed", "thu", "fri"]},
@@ -547,7 +801,7 @@ class SocialMediaScheduleSettings(db.Model):
         self.platform_settings = json.dumps(settings_dict)
 
 
-class SocialMediaPostMetrics(db.Model):
+class SocialMediaPostMetrics(JSONFieldsMixin, db.Model):
     """Model for storing social media post performance metrics"""
     id = db.Column(db.Integer, primary_key=True)
     content_id = db.Column(db.Integer, db.ForeignKey('content_log.id'), nullable=True)
@@ -563,7 +817,7 @@ class SocialMediaPostMetrics(db.Model):
     engagement_rate = db.Column(db.Float, default=0.0)  # Percentage
     post_date = db.Column(db.DateTime, nullable=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
-    raw_data = db.Column(db.Text, nullable=True)  # JSON string of additional metrics
+    raw_data = db.Column(JSONText, nullable=True)  # JSON string of additional metrics
     
     # Define relationships
     content = db.relationship('ContentLog', backref=db.backref('social_metrics', lazy=True))
@@ -578,12 +832,10 @@ class SocialMediaPostMetrics(db.Model):
     
     def get_raw_data(self):
         """Returns raw data as a Python dict"""
-        if self.raw_data:
-            return json.loads(self.raw_data)
-        return {}
+        return self._get_json('raw_data', {})
 
 
-class PerformanceReport(db.Model):
+class PerformanceReport(JSONFieldsMixin, db.Model):
     """Model for storing aggregated performance reports"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
@@ -593,7 +845,7 @@ class PerformanceReport(db.Model):
     total_views = db.Column(db.Integer, default=0)
     total_visitors = db.Column(db.Integer, default=0)
     avg_bounce_rate = db.Column(db.Float, default=0.0)
-    top_posts = db.Column(db.Text, nullable=True)  # JSON string of top performing posts
+    top_posts = db.Column(JSONText, nullable=True)  # JSON string of top performing posts
     insights = db.Column(db.Text, nullable=True)  # AI-generated insights
     recommendations = db.Column(db.Text, nullable=True)  # AI-generated recommendations
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -601,6 +853,11 @@ class PerformanceReport(db.Model):
     # Define relationship with Blog
     blog = db.relationship('Blog', backref=db.backref('performance_reports', lazy=True))
     
+    __table_args__ = (
+        db.Index('ix_performance_report_blog_created', 'blog_id', 'created_at'),
+        db.Index('ix_performance_report_created_at', 'created_at'),
+    )
+    
     def __repr__(self):
         return f"<PerformanceReport {self.blog.name} - {self.report_type} - {self.start_date.strftime('%Y-%m-%d')}>"
     
@@ -610,9 +867,7 @@ class PerformanceReport(db.Model):
     
     def get_top_posts(self):
         """Returns top posts as a Python list"""
-        if self.top_posts:
-            return json.loads(self.top_posts)
-        return []
+        return self._get_json('top_posts', [])
     
     def set_insights(self, insights_list):
         """Sets insights from a Python list"""
@@ -620,9 +875,7 @@ class PerformanceReport(db.Model):
     
     def get_insights(self):
         """Returns insights as a Python list"""
-        if self.insights:
-            return json.loads(self.insights)
-        return []
+        return self._get_json('insights', [])
     
     def set_recommendations(self, recommendations_list):
         """Sets recommendations from a Python list"""
@@ -630,9 +883,7 @@ class PerformanceReport(db.Model):
     
     def get_recommendations(self):
         """Returns recommendations as a Python list"""
-        if self.recommendations:
-            return json.loads(self.recommendations)
-        return []
+        return self._get_json('recommendations', [])
 
 class Content(db.Model):
     """Model for simple content storage and editing"""
@@ -688,7 +939,7 @@ class ContentCalendar(db.Model):
     priority = db.Column(db.Integer, default=3)  # 1-5 (5 highest)
 
 
-class ScheduledPublication(db.Model):
+class ScheduledPublication(JSONFieldsMixin, db.Model):
     """Model for advanced 30-day publication scheduling"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
@@ -696,7 +947,7 @@ class ScheduledPublication(db.Model):
     main_category = db.Column(db.String(100), nullable=False)
     subcategory = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    keywords = db.Column(db.Text, nullable=True)  # JSON string
+    keywords = db.Column(JSONText, nullable=True)  # JSON string
     scheduled_date = db.Column(db.DateTime, nullable=False)
     priority = db.Column(db.Integer, default=5)  # 1-10 scale
     status = db.Column(db.String(50), default="scheduled")  # scheduled, generating, published, failed
@@ -712,10 +963,7 @@ class ScheduledPublication(db.Model):
     
     def get_keywords_list(self):
         """Returns keywords as a Python list"""
-        if self.keywords:
-            import json
-            return json.loads(self.keywords)
-        return []
+        return self._get_json('keywords', [])
     
     def set_keywords_list(self, keywords_list):
         """Sets keywords from a Python list"""
@@ -758,14 +1006,14 @@ class AnalyticsConfig(db.Model):
     def __repr__(self):
         return f"<AnalyticsConfig {self.blog.name}>"
 
-class Subscriber(db.Model):
+class Subscriber(JSONFieldsMixin, db.Model):
     """Model for newsletter subscribers"""
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), nullable=False, unique=True)
     first_name = db.Column(db.String(100), nullable=True)
     last_name = db.Column(db.String(100), nullable=True)
     status = db.Column(db.String(20), default='active')  # active, unsubscribed, bounced
-    preferences = db.Column(db.Text, nullable=True)  # JSON string of preferences
+    preferences = db.Column(JSONText, nullable=True)  # JSON string of preferences
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_activity = db.Column(db.DateTime, nullable=True)
@@ -779,18 +1027,13 @@ class Subscriber(db.Model):
     
     def get_preferences(self):
         """Returns preferences as a Python dict"""
-        if not self.preferences:
-            return {}
-        try:
-            return json.loads(self.preferences)
-        except Exception:
-            return {}
+        return self._get_json('preferences', {}, safe=True)
     
     def set_preferences(self, preferences_dict):
         """Sets preferences from a Python dict"""
         self.preferences = json.dumps(preferences_dict)
 
-class Newsletter(db.Model):
+class Newsletter(JSONFieldsMixin, db.Model):
     """Model for newsletter campaigns"""
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -811,7 +1054,7 @@ class Newsletter(db.Model):
     
     # Template and design settings
     template_id = db.Column(db.String(100), nullable=True)
-    design_settings = db.Column(db.Text, nullable=True)  # JSON string of design settings
+    design_settings = db.Column(JSONText, nullable=True)  # JSON string of design settings
     
     # Foreign key to blog if this is a blog-specific newsletter
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=True)
@@ -822,18 +1065,13 @@ class Newsletter(db.Model):
     
     def get_design_settings(self):
         """Returns design settings as a Python dict"""
-        if not self.design_settings:
-            return {}
-        try:
-            return json.loads(self.design_settings)
-        except Exception:
-            return {}
+        return self._get_json('design_settings', {}, safe=True)
     
     def set_design_settings(self, settings_dict):
         """Sets design settings from a Python dict"""
         self.design_settings = json.dumps(settings_dict)
 
-class NewsletterConfig(db.Model):
+class NewsletterConfig(JSONFieldsMixin, db.Model):
     """Model for newsletter configuration settings"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False, unique=True)
@@ -852,7 +1090,7 @@ class NewsletterConfig(db.Model):
     aws_ses_region = db.Column(db.String(50), default='us-east-1')
     
     # Additional settings as JSON
-    settings = db.Column(db.Text, nullable=True)  # JSON string of additional settings
+    settings = db.Column(JSONText, nullable=True)  # JSON string of additional settings
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -865,18 +1103,13 @@ class NewsletterConfig(db.Model):
     
     def get_settings(self):
         """Returns additional settings as a Python dict"""
-        if not self.settings:
-            return {}
-        try:
-            return json.loads(self.settings)
-        except Exception:
-            return {}
+        return self._get_json('settings', {}, safe=True)
     
     def set_settings(self, settings_dict):
         """Sets additional settings from a Python dict"""
         self.settings = json.dumps(settings_dict)
 
-class AutomationRule(db.Model):
+class AutomationRule(JSONFieldsMixin, db.Model):
     """Model for content automation rules"""
     id = db.Column(db.Integer, primary_key=True)
     blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
@@ -887,7 +1120,7 @@ class AutomationRule(db.Model):
     # Schedule settings
     days_of_week = db.Column(db.String(20), default="0,1,2,3,4")  # Monday=0, Sunday=6
     publishing_time = db.Column(db.String(5), default="12:00")  # Default publishing time in format HH:MM
-    time_slots = db.Column(db.Text, nullable=True)  # JSON string of time slots
+    time_slots = db.Column(JSONText, nullable=True)  # JSON string of time slots
     posts_per_day = db.Column(db.Integer, default=1)
     min_interval_hours = db.Column(db.Integer, default=4)  # Minimum hours between posts
     
@@ -898,7 +1131,7 @@ class AutomationRule(db.Model):
     paragraph_count = db.Column(db.Integer, default=4)  # Number of paragraphs for paragraph-based generation
     use_paragraph_mode = db.Column(db.Boolean, default=False)  # Whether to use paragraph-based generation
     content_tone = db.Column(db.String(50), default="informative")  # Changed back to content_tone to match database schema
-    topic_categories = db.Column(db.Text, nullable=True)  # JSON string of category IDs to focus on
+    topic_categories = db.Column(JSONText, nullable=True)  # JSON string of category IDs to focus on
     topic_min_score = db.Column(db.Float, default=0.7)  # Minimum score for auto-enabling topics
     
     # Approval settings
@@ -937,9 +1170,7 @@ class AutomationRule(db.Model):
     
     def get_time_slots(self):
         """Returns time slots as a Python list"""
-        if self.time_slots:
-            return json.loads(self.time_slots)
-        return []
+        return self._get_json('time_slots', [])
     
     def set_time_slots(self, slots_list):
         """Sets time slots from a Python list"""
@@ -947,9 +1178,7 @@ class AutomationRule(db.Model):
     
     def get_topic_categories(self):
         """Returns topic categories as a Python list"""
-        if self.topic_categories:
-            return json.loads(self.topic_categories)
-        return []
+        return self._get_json('topic_categories', [])
     
     def set_topic_categories(self, categories_list):
         """Sets topic categories from a Python list"""
@@ -990,17 +1219,18 @@ class AutomationRule(db.Model):
         import logging
         logger = logging.getLogger(__name__)
         
-        # Convert WordPress IDs to category names
+        # Resolve all WordPress IDs with a single query
+        lookup_ids = [int(wp_id) if str(wp_id).isdigit() else wp_id for wp_id in wordpress_ids]
+        names_by_id = dict(
+            db.session.query(Category.wordpress_id, Category.name)
+            .filter(Category.blog_id == self.blog_id, Category.wordpress_id.in_(lookup_ids))
+            .all()
+        )
+        
         category_names = []
-        for wp_id in wordpress_ids:
-            # Find category by wordpress_id
-            category = Category.query.filter_by(
-                blog_id=self.blog_id,
-                wordpress_id=int(wp_id) if str(wp_id).isdigit() else wp_id
-            ).first()
-            
-            if category:
-                category_names.append(category.name)
+        for wp_id, lookup_id in zip(wordpress_ids, lookup_ids):
+            if lookup_id in names_by_id:
+                category_names.append(names_by_id[lookup_id])
             else:
                 # Fallback - use ID if category not found
                 logger.warning(f"Category with wordpress_id={wp_id} not found for blog_id={self.blog_id}")
@@ -1015,4 +1245,175 @@ class AutomationRule(db.Model):
     @property
     def active(self):
         """Compatibility property for workflow engine"""
-        return self.is_active
\ No newline at end of file
+        return self.is_active
+
+class BatchJobRun(JSONFieldsMixin, db.Model):
+    """Progress of a bulk maintenance job, used to resume interrupted runs"""
+    __tablename__ = 'batch_job_run'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False, index=True)
+    status = db.Column(db.String(20), default="running")  # running, interrupted, completed, failed
+    params = db.Column(JSONText, nullable=True)  # JSON string of job parameters
+
+    # Rows with a primary key <= last_id have been fully processed
+    last_id = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    succeeded = db.Column(db.Integer, default=0)
+    skipped = db.Column(db.Integer, default=0)
+    failed = db.Column(db.Integer, default=0)
+    failed_ids = db.Column(JSONText, nullable=True)  # JSON string of row IDs that raised
+    last_error = db.Column(db.Text, nullable=True)
+
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<BatchJobRun {self.job_name} #{self.id} ({self.status}, last_id={self.last_id})>"
+
+    def get_params(self):
+        """Returns job parameters as a Python dict"""
+        return self._get_json('params', {})
+
+    def get_failed_ids(self):
+        """Returns IDs of failed rows as a Python list"""
+        return self._get_json('failed_ids', [])
+
+    def set_failed_ids(self, ids_list):
+        """Sets IDs of failed rows from a Python list"""
+        self.failed_ids = json.dumps(ids_list)
+
+
+class QueuedJob(JSONFieldsMixin, db.Model):
+    """Persistent background job claimed by worker processes (see worker.py)"""
+    __tablename__ = 'job_queue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(100), nullable=False)
+    payload = db.Column(JSONText, nullable=True)  # JSON string of handler arguments
+    state = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    priority = db.Column(db.Integer, nullable=False, default=0)  # higher number = claimed first
+    dedupe_key = db.Column(db.String(200), nullable=True)  # at most one unfinished job per key
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Lease held by the worker currently running the job
+    locked_by = db.Column(db.String(100), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+
+    result = db.Column(JSONText, nullable=True)  # JSON string returned by the handler
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claim order: runnable jobs by priority, then age
+        db.Index('ix_job_queue_claim', 'state', priority.desc(), 'run_after', 'id'),
+        db.Index('ix_job_queue_dedupe', 'dedupe_key', 'state'),
+    )
+
+    def __repr__(self):
+        return f"<QueuedJob {self.job_type} #{self.id} ({self.state})>"
+
+    def get_payload(self):
+        """Returns handler arguments as a Python dict"""
+        return self._get_json('payload', {})
+
+    def get_result(self):
+        """Returns the handler result as a Python object"""
+        return self._get_json('result', None)
+
+
+class SeoCacheEntry(db.Model):
+    """Cached Google Trends / SerpAPI response (see utils/seo/cache.py)"""
+    __tablename__ = 'seo_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # daily_trends, related_topics, interest_over_time, serp
+    keyword = db.Column(db.String(500), nullable=False, default="")
+    geo = db.Column(db.String(20), nullable=False, default="")
+    timeframe = db.Column(db.String(50), nullable=False, default="")
+    payload = db.Column(db.Text, nullable=False)  # JSON string of the response
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('kind', 'keyword', 'geo', 'timeframe', name='uq_seo_cache_key'),
+    )
+
+    def __repr__(self):
+        return f"<SeoCacheEntry {self.kind} '{self.keyword}' {self.geo}/{self.timeframe}>"
+
+
+class TagCorpus(db.Model):
+    """Per-blog document count of the tag keyphrase index (see utils/seo/keyphrases.py)"""
+    __tablename__ = 'tag_corpus'
+
+    blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), primary_key=True)
+    documents = db.Column(db.Integer, nullable=False, default=0)
+    # ContentLog rows with an ID <= last_content_log_id are counted
+    last_content_log_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TagCorpus blog={self.blog_id} documents={self.documents}>"
+
+
+class TagTermFrequency(db.Model):
+    """Number of a blog's articles containing a term (lemma key of a word or phrase)"""
+    __tablename__ = 'tag_term_frequency'
+
+    id = db.Column(db.Integer, primary_key=True)
+    blog_id = db.Column(db.Integer, db.ForeignKey('blog.id'), nullable=False)
+    term = db.Column(db.String(200), nullable=False)
+    document_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('blog_id', 'term', name='uq_tag_term_frequency_blog_term'),
+    )
+
+    def __repr__(self):
+        return f"<TagTermFrequency blog={self.blog_id} '{self.term}' {self.document_count}>"
+
+
+class MetricsSnapshot(db.Model):
+    """Latest metrics registry state of one process (see utils/monitoring/metrics.py)"""
+    __tablename__ = 'metrics_snapshot'
+
+    node = db.Column(db.String(150), primary_key=True)  # host:pid:start time
+    started_at = db.Column(db.DateTime, nullable=False)
+    taken_at = db.Column(db.DateTime, nullable=False, index=True)
+    payload = db.Column(db.Text, nullable=False)  # compact JSON of the registry state
+
+    def __repr__(self):
+        return f"<MetricsSnapshot {self.node} at {self.taken_at}>"
+
+
+class NewsletterContact(db.Model):
+    """
+    Cached roster of an EmailOctopus list (see utils/newsletter/subscriber_sync.py).
+    The subscriber sync diffs local subscribers against it, so only new and
+    changed contacts are sent to the API.
+    """
+    __tablename__ = 'newsletter_contact'
+
+    id = db.Column(db.Integer, primary_key=True)
+    list_id = db.Column(db.String(255), nullable=False)
+    email = db.Column(db.String(255), nullable=False)  # lower-cased
+    contact_id = db.Column(db.String(100), nullable=True)
+    fingerprint = db.Column(db.String(40), nullable=False)  # hash of the synced fields
+    status = db.Column(db.String(20), nullable=False, default='SUBSCRIBED')  # remote status
+    fetched_at = db.Column(db.DateTime, nullable=True)  # last seen in a full listing of the remote list
+    pushed_at = db.Column(db.DateTime, nullable=True)  # last created or updated by the sync
+
+    __table_args__ = (
+        UniqueConstraint('list_id', 'email', name='uq_newsletter_contact_list_email'),
+    )
+
+    def __repr__(self):
+        return f"<NewsletterContact {self.email} in {self.list_id}>"
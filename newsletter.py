@@ -14,6 +14,7 @@ from app import db
 from models import Blog, Newsletter, Subscriber, NewsletterConfig
 from utils.newsletter.generator import NewsletterGenerator
 from utils.newsletter.distributor import NewsletterDistributor, create_weekly_newsletter_for_blog
+from utils.scheduling.job_queue import enqueue, queue_enabled
 
 # Create blueprint
 newsletter_bp = Blueprint('newsletter', __name__, url_prefix='/newsletter')
@@ -412,28 +413,21 @@ def api_create_weekly(blog_id):
 
 @newsletter_bp.route('/api/upload-subscribers/<int:blog_id>', methods=['POST'])
 def api_upload_subscribers(blog_id):
-    """API endpoint to upload subscribers to EmailOctopus"""
+    """API endpoint to sync subscribers to EmailOctopus"""
     try:
         blog = Blog.query.get(blog_id)
         if not blog:
             return jsonify({'error': f'Blog with ID {blog_id} not found'})
         
-        # Get the distributor
-        distributor = NewsletterDistributor()
-        
-        # Get the email client for the blog
-        client = distributor.get_email_client(blog_id)
-        
-        if not client:
-            return jsonify({'error': 'EmailOctopus not configured for this blog'})
+        # Large lists take minutes: hand the sync to a worker when the job queue is enabled
+        if queue_enabled():
+            job = enqueue('newsletter_subscriber_sync', {'blog_id': blog_id},
+                          dedupe_key=f'newsletter_subscriber_sync:{blog_id}')
+            return jsonify({'queued': True, 'job_id': job.id})
         
-        # Get all active subscribers for this blog
-        subscribers = Subscriber.query.filter_by(status='active')
-        if blog_id:
-            subscribers = subscribers.filter((Subscriber.blog_id == blog_id) | (Subscriber.blog_id == None))
-            
-        # Upload subscribers
-        result = client.upload_subscribers(subscribers)
+        # Sync only new and changed subscribers (resumes an interrupted sync)
+        distributor = NewsletterDistributor()
+        result = distributor.upload_subscribers(blog_id, restart=request.args.get('restart') == '1')
         
         return jsonify(result)
         
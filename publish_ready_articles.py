@@ -6,6 +6,7 @@ import sys
 sys.path.insert(0, '.')
 
 from app import app, db
+from sqlalchemy.orm import undefer_group
 from models import ContentLog, Blog, AutomationRule
 import requests
 import base64
@@ -15,7 +16,7 @@ from datetime import datetime
 def publish_ready_articles():
     with app.app_context():
         # Pobierz artykuły w statusie ready z dzisiaj
-        ready_articles = ContentLog.query.filter_by(status='ready').filter(
+        ready_articles = ContentLog.query.options(undefer_group('body')).filter_by(status='ready').filter(
             db.func.date(ContentLog.created_at) == '2025-11-19'
         ).all()
         
@@ -7,7 +7,7 @@ from admin_auth import require_admin_login
 from models import (
     Blog, SocialAccount, ContentLog, ArticleTopic, Category, Tag,
     Notification, PublishingSchedule, ContentMetrics, ImageLibrary,
-    NewsletterConfig, AutomationRule
+    NewsletterConfig, AutomationRule, json_array_contains
 )
 from app import db
 from utils.scheduler import start_scheduler, process_content_generation
@@ -34,6 +34,8 @@ from routes_ai_content import ai_content, register_routes as register_ai_content
 from routes_automation import automation_bp
 import json
 from datetime import datetime, timedelta
+from sqlalchemy.orm import load_only
+from utils.pagination import keyset_paginate, parse_page_size
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -417,7 +419,105 @@ def register_routes(app: Flask):
         blogs = Blog.query.all()
         
         return render_template('topics.html', topics=topics, blogs=blogs, current_status=status, current_blog=blog_id)
-    
+
+    @app.route('/api/logs')
+    @require_admin_login
+    def api_logs():
+        """Keyset-paginated content logs (same filters as /logs plus ?tag=, without article bodies)"""
+        status = request.args.get('status', 'all')
+        blog_id = request.args.get('blog_id', 'all')
+        days = request.args.get('days', 7, type=int)
+        tag = request.args.get('tag', '').strip()
+
+        query = ContentLog.query.options(load_only(
+            ContentLog.id, ContentLog.blog_id, ContentLog.title, ContentLog.status,
+            ContentLog.post_id, ContentLog.error_message, ContentLog.created_at,
+            ContentLog.publish_date, ContentLog.published_at
+        ))
+
+        if status != 'all':
+            query = query.filter_by(status=status)
+
+        if blog_id != 'all':
+            query = query.filter_by(blog_id=blog_id)
+
+        if tag:
+            query = query.filter(json_array_contains(ContentLog.tags, tag))
+
+        start_date = datetime.utcnow() - timedelta(days=days)
+        query = query.filter(ContentLog.created_at >= start_date)
+
+        page = keyset_paginate(
+            query, ContentLog.created_at, ContentLog.id,
+            cursor=request.args.get('cursor'),
+            limit=parse_page_size(request.args.get('limit')),
+            with_count=request.args.get('count') == '1'
+        )
+
+        return jsonify({
+            'success': True,
+            'logs': [{
+                'id': log.id,
+                'blog_id': log.blog_id,
+                'title': log.title,
+                'status': log.status,
+                'post_id': log.post_id,
+                'error_message': log.error_message,
+                'created_at': log.created_at.isoformat() if log.created_at else None,
+                'publish_date': log.publish_date.isoformat() if log.publish_date else None,
+                'published_at': log.published_at.isoformat() if log.published_at else None
+            } for log in page['items']],
+            'next_cursor': page['next_cursor'],
+            'total': page['total']
+        })
+
+    @app.route('/api/topics')
+    @require_admin_login
+    def api_topics():
+        """Keyset-paginated article topics (same filters as /topics plus ?keyword=)"""
+        status = request.args.get('status', 'pending')
+        blog_id = request.args.get('blog_id', 'all')
+        keyword = request.args.get('keyword', '').strip()
+
+        query = ArticleTopic.query.options(load_only(
+            ArticleTopic.id, ArticleTopic.blog_id, ArticleTopic.title, ArticleTopic.topic,
+            ArticleTopic.category, ArticleTopic.status, ArticleTopic.priority,
+            ArticleTopic.used, ArticleTopic.score, ArticleTopic.created_at
+        ))
+
+        if status != 'all':
+            query = query.filter_by(status=status)
+
+        if blog_id != 'all':
+            query = query.filter_by(blog_id=blog_id)
+
+        if keyword:
+            query = query.filter(json_array_contains(ArticleTopic.keywords, keyword))
+
+        page = keyset_paginate(
+            query, ArticleTopic.created_at, ArticleTopic.id,
+            cursor=request.args.get('cursor'),
+            limit=parse_page_size(request.args.get('limit')),
+            with_count=request.args.get('count') == '1'
+        )
+
+        return jsonify({
+            'success': True,
+            'topics': [{
+                'id': topic.id,
+                'blog_id': topic.blog_id,
+                'title': topic.title or topic.topic,
+                'category': topic.category,
+                'status': topic.status,
+                'priority': topic.priority,
+                'used': topic.used,
+                'score': topic.score,
+                'created_at': topic.created_at.isoformat() if topic.created_at else None
+            } for topic in page['items']],
+            'next_cursor': page['next_cursor'],
+            'total': page['total']
+        })
+
     @app.route('/topics/generate', methods=['POST'])
     @require_admin_login
     def generate_topics():
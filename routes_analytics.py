@@ -273,11 +273,8 @@ def register_analytics_routes(app):
         # Get all metrics for this blog
         metrics = ContentMetrics.query.filter_by(blog_id=blog_id).all()
         
-        # Get content logs
-        logs = ContentLog.query.filter_by(blog_id=blog_id, status='published').all()
-        
         # Build content statistics
-        total_posts = len(logs)
+        total_posts = ContentLog.query.filter_by(blog_id=blog_id, status='published').count()
         posts_with_metrics = len(metrics)
         total_views = sum(m.page_views for m in metrics) if metrics else 0
         total_visitors = sum(m.unique_visitors for m in metrics) if metrics else 0
@@ -8,9 +8,11 @@ from datetime import datetime, timedelta
 
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from sqlalchemy import desc, and_, or_, func
+from sqlalchemy.orm import load_only
 
 from app import db
-from models import Blog, ArticleTopic, ContentLog, AutomationRule, Article
+from models import Blog, ArticleTopic, ContentLog, AutomationRule, Article, json_array_contains
+from utils.pagination import keyset_paginate, parse_page_size
 from utils.writing import content_generator
 from utils.automation import content_automation
 from utils.images.auto_image_finder import find_and_associate_images
@@ -1114,19 +1116,42 @@ def get_all_topics():
             except (ValueError, TypeError):
                 return jsonify({'success': False, 'message': 'Invalid blog ID'})
         
-        # Get approved topics ordered by score
-        topics = query.order_by(desc(ArticleTopic.score)).all()
+        # Filter by keyword in SQL (GIN index on PostgreSQL)
+        keyword = request.args.get('keyword', '').strip()
+        if keyword:
+            query = query.filter(json_array_contains(ArticleTopic.keywords, keyword))
+        
+        query = query.options(load_only(
+            ArticleTopic.id, ArticleTopic.title, ArticleTopic.score, ArticleTopic.status,
+            ArticleTopic.blog_id, ArticleTopic.keywords, ArticleTopic.created_at
+        ))
+        
+        # Keyset pagination when the client asks for pages, full list otherwise
+        next_cursor = None
+        total = None
+        if request.args.get('limit') or request.args.get('cursor'):
+            page = keyset_paginate(
+                query, func.coalesce(ArticleTopic.score, 0.0), ArticleTopic.id,
+                cursor=request.args.get('cursor'),
+                limit=parse_page_size(request.args.get('limit')),
+                with_count=request.args.get('count') == '1',
+                sort_value=lambda topic: topic.score or 0.0
+            )
+            topics = page['items']
+            next_cursor = page['next_cursor']
+            total = page['total']
+        else:
+            # Get approved topics ordered by score
+            topics = query.order_by(desc(ArticleTopic.score), desc(ArticleTopic.id)).all()
+        
+        # Resolve blog names with one query instead of one per topic
+        blog_names = dict(db.session.query(Blog.id, Blog.name).filter(
+            Blog.id.in_({topic.blog_id for topic in topics})
+        ).all()) if topics else {}
         
         # Convert to JSON format
         topics_data = []
         for topic in topics:
-            # Get blog name
-            blog_name = None
-            if topic.blog_id:
-                blog = Blog.query.get(topic.blog_id)
-                if blog:
-                    blog_name = blog.name
-            
             # Get keywords
             keywords = None
             try:
@@ -1142,14 +1167,16 @@ def get_all_topics():
                 'score': topic.score,
                 'status': topic.status,
                 'blog_id': topic.blog_id,
-                'blog_name': blog_name,
+                'blog_name': blog_names.get(topic.blog_id),
                 'keywords': keywords,
                 'created_at': topic.created_at.strftime('%Y-%m-%d') if topic.created_at else None
             })
         
         return jsonify({
             'success': True,
-            'topics': topics_data
+            'topics': topics_data,
+            'next_cursor': next_cursor,
+            'total': total
         })
         
     except Exception as e:
@@ -2,8 +2,14 @@
 Trasy dla monitorowania metrycznych aspektów działania systemu.
 """
 
-from flask import Blueprint, render_template, jsonify, request, redirect, url_for, flash
-from utils.monitoring.content_metrics import ContentMetricsTracker
+from flask import Blueprint, Response, render_template, jsonify, request, redirect, url_for, flash
+from admin_auth import require_admin_login
+from utils.monitoring.content_metrics import ContentMetricsTracker, get_daily_totals
+from utils.monitoring.metrics import WORKFLOW_STAGE_SECONDS, LLM_REQUEST_SECONDS, registry
+from utils.monitoring.startup import startup_report
+from utils.monitoring.tracing import trace_id_for, tracer, waterfall
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
 monitoring_bp = Blueprint('monitoring', __name__)
 
@@ -14,7 +20,14 @@ def metrics_dashboard():
 
 @monitoring_bp.route('/metrics', methods=['GET'])
 def show_metrics():
-    """Wyświetla panel monitorowania z metrykami generowania treści"""
+    """
+    Wyświetla panel monitorowania z metrykami generowania treści.
+    Klienci nie proszący o HTML (Prometheus, curl) dostają metryki w formacie tekstowym Prometheusa.
+    """
+    if request.args.get('format') == 'prometheus' or \
+            request.accept_mimetypes.best_match(['text/plain', 'text/html']) != 'text/html':
+        return Response(registry.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+    
     days = request.args.get('days', 7, type=int)
     avg_metrics = ContentMetricsTracker.calculate_average_metrics(days=days)
     recent_metrics = ContentMetricsTracker.get_recent_metrics(limit=20)
@@ -49,43 +62,75 @@ def api_metrics_dashboard():
     """API do pobierania danych metryk do dashboardu"""
     days = request.args.get('days', 30, type=int)
     
-    # Pobierz wszystkie metryki z określonego okresu
-    metrics = ContentMetricsTracker.get_recent_metrics(limit=100)
-    
-    # Przygotuj dane do wykresu
-    metrics_by_date = {}
-    for metric in metrics:
-        date = metric.get("timestamp_start", "").split("T")[0]  # Format: YYYY-MM-DD
-        if date:
-            if date not in metrics_by_date:
-                metrics_by_date[date] = {
-                    "date": date,
-                    "successful": 0,
-                    "failed": 0,
-                    "avg_duration": 0,
-                    "total_duration": 0,
-                    "total_words": 0,
-                    "content_count": 0
-                }
-            
-            if metric.get("success", False):
-                metrics_by_date[date]["successful"] += 1
-                metrics_by_date[date]["total_duration"] += metric.get("duration_seconds", 0)
-                metrics_by_date[date]["total_words"] += metric.get("content_length_words", 0)
-                metrics_by_date[date]["content_count"] += 1
-            else:
-                metrics_by_date[date]["failed"] += 1
-    
-    # Oblicz średnie
-    for date, data in metrics_by_date.items():
+    # Sumy dzienne z rejestru metryk (bez czytania plików)
+    metrics_timeline = []
+    for date, day in sorted(get_daily_totals(days).items()):
+        data = {
+            "date": date,
+            "successful": day["successful"],
+            "failed": day["failed"],
+            "avg_duration": 0,
+            "total_duration": day["total_duration"],
+            "total_words": day["total_words"],
+            "content_count": day["successful"]
+        }
         if data["content_count"] > 0:
             data["avg_duration"] = round(data["total_duration"] / data["content_count"], 2)
             data["avg_words"] = round(data["total_words"] / data["content_count"], 0)
+        metrics_timeline.append(data)
     
-    # Posortuj według daty
-    metrics_timeline = sorted(list(metrics_by_date.values()), key=lambda x: x["date"])
+    # Średnie czasy kroków workflow i zapytań LLM w tym procesie
+    stages = {
+        f"{stage}:{status}": {"count": stat["count"], "avg_seconds": round(stat["avg"], 2)}
+        for (stage, status), stat in WORKFLOW_STAGE_SECONDS.summary().items()
+    }
+    llm = {
+        f"{model}:{status}": {"count": stat["count"], "avg_seconds": round(stat["avg"], 2)}
+        for (model, status), stat in LLM_REQUEST_SECONDS.summary().items()
+    }
     
     return jsonify({
         "timeline": metrics_timeline,
-        "summary": ContentMetricsTracker.calculate_average_metrics(days=days)
-    })
\ No newline at end of file
+        "summary": ContentMetricsTracker.calculate_average_metrics(days=days),
+        "stages": stages,
+        "llm": llm
+    })
+
+
+def _resolve_trace_id(trace_ref):
+    """Trace ID z identyfikatora trace'a albo workflow_id"""
+    return trace_id_for(trace_ref) if trace_ref.startswith('workflow_') else trace_ref
+
+
+@monitoring_bp.route('/traces', methods=['GET'])
+@require_admin_login
+def show_traces():
+    """Lista ostatnich trace'ów workflow z pamięci procesu (tylko workflow zakładają trace'y)"""
+    return render_template('monitoring/traces.html', traces=tracer.recent_traces())
+
+
+@monitoring_bp.route('/traces/<trace_ref>', methods=['GET'])
+@require_admin_login
+def show_trace(trace_ref):
+    """Wykres kaskadowy (waterfall) jednego trace'a; przyjmuje trace ID albo workflow_id"""
+    trace_id = _resolve_trace_id(trace_ref)
+    layout = waterfall(tracer.get_trace(trace_id))
+    if not layout["rows"]:
+        flash(f"Nie znaleziono trace'a {trace_ref}", "warning")
+        return redirect(url_for('monitoring.show_traces'))
+    return render_template('monitoring/trace.html', trace_id=trace_id, trace_ref=trace_ref, **layout)
+
+
+@monitoring_bp.route('/api/traces/<trace_ref>', methods=['GET'])
+@require_admin_login
+def api_trace(trace_ref):
+    """Spany jednego trace'a w formacie JSON"""
+    trace_id = _resolve_trace_id(trace_ref)
+    return jsonify({"trace_id": trace_id, "spans": tracer.get_trace(trace_id)})
+
+
+@monitoring_bp.route('/api/startup', methods=['GET'])
+@require_admin_login
+def api_startup():
+    """Czasy poszczególnych faz startu procesu w formacie JSON"""
+    return jsonify(startup_report.as_dict())
@@ -1,5 +1,5 @@
 from flask import request, jsonify, render_template, Blueprint
-from app import app, db
+from app import db
 from models import Blog, Category, AutomationRule, ContentLog
 from datetime import datetime
 import json
@@ -417,7 +417,3 @@ def create_default_automation_rule(blog_id):
         db.session.rollback()
         print(f"Error creating default automation rule: {e}")
         return False
-
-
-# Register the blueprint with the app
-app.register_blueprint(multi_blog_bp)
\ No newline at end of file
@@ -6,11 +6,13 @@ import logging
 import json
 from datetime import datetime, timedelta
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
-from sqlalchemy import or_, and_, desc
+from sqlalchemy import or_, and_, desc, func
+from sqlalchemy.orm import load_only
 from app import db
 from models import Blog, ContentLog, Category, Tag, PublishingSchedule, AutomationRule, SystemSettings, Notification
 from utils.wordpress.client import get_wordpress_post, update_wordpress_post
 from utils.notifications import send_notification
+from utils.pagination import keyset_paginate, parse_page_size
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -646,6 +648,61 @@ def publication_history():
         success_data=success_data
     )
 
+@publishing_bp.route('/api/history')
+def api_publication_history():
+    """Keyset-paginated publication history (same filters as /history, without article bodies)"""
+    selected_blog_id = request.args.get('blog_id', type=int)
+    status_filter = request.args.get('status', 'all')
+    from_date = request.args.get('from_date')
+    to_date = request.args.get('to_date')
+
+    query = ContentLog.query.options(load_only(
+        ContentLog.id, ContentLog.blog_id, ContentLog.title, ContentLog.status,
+        ContentLog.post_id, ContentLog.error_message, ContentLog.created_at,
+        ContentLog.publish_date, ContentLog.published_at
+    ))
+
+    if selected_blog_id:
+        query = query.filter_by(blog_id=selected_blog_id)
+
+    if status_filter != 'all':
+        query = query.filter_by(status=status_filter)
+
+    try:
+        if from_date:
+            query = query.filter(ContentLog.publish_date >= datetime.strptime(from_date, '%Y-%m-%d'))
+        if to_date:
+            query = query.filter(ContentLog.publish_date <= datetime.strptime(to_date, '%Y-%m-%d') + timedelta(days=1))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid date format, expected YYYY-MM-DD'}), 400
+
+    # Entries without a publish date are ordered by creation time
+    sort_date = func.coalesce(ContentLog.publish_date, ContentLog.created_at)
+    page = keyset_paginate(
+        query, sort_date, ContentLog.id,
+        cursor=request.args.get('cursor'),
+        limit=parse_page_size(request.args.get('limit')),
+        with_count=request.args.get('count') == '1',
+        sort_value=lambda log: log.publish_date or log.created_at
+    )
+
+    return jsonify({
+        'success': True,
+        'history': [{
+            'id': log.id,
+            'blog_id': log.blog_id,
+            'title': log.title,
+            'status': log.status,
+            'post_id': log.post_id,
+            'error_message': log.error_message,
+            'created_at': log.created_at.isoformat() if log.created_at else None,
+            'publish_date': log.publish_date.isoformat() if log.publish_date else None,
+            'published_at': log.published_at.isoformat() if log.published_at else None
+        } for log in page['items']],
+        'next_cursor': page['next_cursor'],
+        'total': page['total']
+    })
+
 @publishing_bp.route('/preview/<int:content_id>')
 def preview_article(content_id):
     """Preview article before publication"""
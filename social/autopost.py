@@ -11,6 +11,7 @@ from flask import current_app
 
 from app import db
 from models import SocialAccount, ContentLog, Blog
+from social.dispatch import dispatcher, request_not_sent
 from utils.openrouter.social import generate_social_media_content, generate_hashtag_recommendations
 
 logger = logging.getLogger(__name__)
@@ -54,7 +55,8 @@ def create_social_media_posts(content_log_id: int, preview_only: bool = False) -
     # Extract content data
     title = content_log.title
     excerpt = content_log.excerpt or ""
-    url = content_log.url
+    # WordPress shortlink (ContentLog does not store the permalink)
+    url = f"{blog.url.rstrip('/')}/?p={content_log.post_id}" if content_log.post_id else blog.url
     keywords = content_log.get_tags() if content_log.tags else []
     
     # Get featured image if available
@@ -113,6 +115,10 @@ def post_article_to_social_media(content_log_id: int, platforms: Optional[List[s
     """
     Post article to social media platforms
     
+    Post copy for all platforms comes from one generation call; the platforms
+    are then posted to concurrently through their publishing queues
+    (social/dispatch.py) and the results are saved in one commit.
+    
     Args:
         content_log_id (int): ID of the content log entry
         platforms (list, optional): List of platforms to post to. If None, post to all available.
@@ -160,75 +166,53 @@ def post_article_to_social_media(content_log_id: int, platforms: Optional[List[s
         logger.info(f"Scheduled social media posts for content ID {content_log_id} at {scheduled_time}")
         return social_posts
     
-    # Post to each platform immediately
+    # Active accounts of the blog by platform (one query for all platforms)
+    accounts = {}
+    for account in SocialAccount.query.filter_by(blog_id=blog.id, active=True):
+        accounts.setdefault(account.platform.lower(), account)
+    
+    # Publish calls for the platform queues; they get plain data only
+    calls = {}
     for platform, post_data in social_posts.items():
-        try:
-            # Get social account for this platform
-            account = SocialAccount.query.filter_by(
-                blog_id=blog.id, 
-                platform=platform.capitalize(), 
-                active=True
-            ).first()
-            
-            if not account:
-                logger.warning(f"No active {platform} account found for blog: {blog.name}")
-                post_data["status"] = "error"
-                post_data["error"] = f"No active {platform} account configured"
-                continue
-            
-            # Post to the platform
-            if platform.lower() == 'facebook':
-                result = post_to_facebook(
-                    account.account_id, 
-                    account.api_token, 
-                    post_data["content"], 
-                    post_data["url"],
-                    post_data["featured_image"]
-                )
-            elif platform.lower() == 'twitter':
-                result = post_to_twitter(
-                    account.api_token, 
-                    account.api_secret, 
-                    post_data["content"], 
-                    post_data["hashtags"]
-                )
-            elif platform.lower() == 'linkedin':
-                result = post_to_linkedin(
-                    account.account_id, 
-                    account.api_token, 
-                    post_data["content"], 
-                    post_data["url"],
-                    post_data["featured_image"]
-                )
-            elif platform.lower() == 'instagram':
-                result = post_to_instagram(
-                    account.account_id, 
-                    account.api_token, 
-                    post_data["content"], 
-                    post_data["hashtags"],
-                    post_data["featured_image"]
-                )
-            else:
-                logger.warning(f"Unsupported platform: {platform}")
-                post_data["status"] = "error"
-                post_data["error"] = f"Unsupported platform: {platform}"
-                continue
-            
-            if result.get("success"):
-                post_data["status"] = "published"
-                post_data["post_id"] = result.get("id")
-                post_data["post_url"] = result.get("url")
-                post_data["published_at"] = datetime.now().isoformat()
-                logger.info(f"Posted article to {platform}: {result.get('url')}")
-            else:
-                post_data["status"] = "error"
-                post_data["error"] = result.get("error", "Unknown error")
-                logger.error(f"Error posting to {platform}: {result.get('error')}")
-        
-        except Exception as e:
-            logger.error(f"Exception posting to {platform}: {str(e)}")
+        account = accounts.get(platform.lower())
+        if not account:
+            logger.warning(f"No active {platform} account found for blog: {blog.name}")
+            post_data["status"] = "error"
+            post_data["error"] = f"No active {platform} account configured"
+            continue
+        
+        if platform.lower() not in PUBLISHERS:
+            logger.warning(f"Unsupported platform: {platform}")
+            post_data["status"] = "error"
+            post_data["error"] = f"Unsupported platform: {platform}"
+            continue
+        
+        calls[platform] = _publish_call(platform.lower(), {
+            "account_id": account.account_id,
+            "api_token": account.api_token,
+            "api_secret": account.api_secret,
+        }, dict(post_data))
+    
+    # Post to all platforms concurrently
+    results = dispatcher.publish(calls) if calls else {}
+    for platform, result in results.items():
+        post_data = social_posts[platform]
+        if result.get("success"):
+            post_data["status"] = "published"
+            post_data["post_id"] = result.get("id")
+            post_data["post_url"] = result.get("url")
+            post_data["published_at"] = datetime.now().isoformat()
+            post_data.pop("error", None)
+            logger.info(f"Posted article to {platform}: {result.get('url')}")
+        elif result.get("unknown"):
+            # The post may exist; posting again could duplicate it
+            post_data["status"] = "pending"
+            post_data["error"] = result.get("error", "Outcome unknown")
+            logger.warning(f"Outcome of posting to {platform} is unknown: {result.get('error')}")
+        else:
             post_data["status"] = "error"
-            post_data["error"] = str(e)
+            post_data["error"] = result.get("error", "Unknown error")
+            logger.error(f"Error posting to {platform}: {result.get('error')}")
     
     # Update database with results
     content_log.set_social_posts(social_posts)
@@ -240,8 +224,13 @@ def post_article_to_social_media(content_log_id: int, platforms: Optional[List[s
     
     return social_posts
 
+def _publish_call(platform: str, account: Dict[str, Any], post_data: Dict[str, Any]):
+    """Publish call for the platform queue (see social/dispatch.py)"""
+    publisher = PUBLISHERS[platform]
+    return lambda session: publisher(account, post_data, session)
+
 # Platform-specific posting functions
-def post_to_facebook(page_id, access_token, message, url=None, image_url=None):
+def post_to_facebook(page_id, access_token, message, url=None, image_url=None, session=None):
     """Post to Facebook page"""
     try:
         api_url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
@@ -261,7 +250,7 @@ def post_to_facebook(page_id, access_token, message, url=None, image_url=None):
             data["picture"] = image_url
             
         # Send request to Facebook API
-        response = requests.post(api_url, data=data)
+        response = (session or requests).post(api_url, data=data, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
@@ -275,14 +264,29 @@ def post_to_facebook(page_id, access_token, message, url=None, image_url=None):
             return {
                 "success": False,
                 "error": f"Facebook API error: {response.text}",
+                # Only a rate-limited request certainly created no post
+                "retryable": response.status_code == 429,
             }
+    except requests.RequestException as e:
+        if request_not_sent(e):
+            return {
+                "success": False,
+                "error": f"Facebook connection error: {str(e)}",
+                "retryable": True,
+            }
+        # The request may have reached Facebook, so the post may exist
+        return {
+            "success": False,
+            "error": f"Facebook posting error: {str(e)}",
+            "unknown": True,
+        }
     except Exception as e:
         return {
             "success": False,
             "error": f"Facebook posting error: {str(e)}",
         }
 
-def post_to_twitter(api_key, api_secret, message, hashtags=None):
+def post_to_twitter(api_key, api_secret, message, hashtags=None, session=None):
     """Post to Twitter (X)"""
     try:
         # Twitter has a 280 character limit
@@ -312,7 +316,7 @@ def post_to_twitter(api_key, api_secret, message, hashtags=None):
             "error": f"Twitter posting error: {str(e)}",
         }
 
-def post_to_linkedin(account_id, access_token, message, url=None, image_url=None):
+def post_to_linkedin(account_id, access_token, message, url=None, image_url=None, session=None):
     """Post to LinkedIn"""
     try:
         # LinkedIn API endpoint for creating posts
@@ -367,7 +371,7 @@ def post_to_linkedin(account_id, access_token, message, url=None, image_url=None
             "error": f"LinkedIn posting error: {str(e)}",
         }
 
-def post_to_instagram(account_id, access_token, caption, hashtags=None, image_url=None):
+def post_to_instagram(account_id, access_token, caption, hashtags=None, image_url=None, session=None):
     """Post to Instagram"""
     try:
         # Instagram requires an image
@@ -404,6 +408,21 @@ def post_to_instagram(account_id, access_token, caption, hashtags=None, image_ur
             "error": f"Instagram posting error: {str(e)}",
         }
 
+# Platform -> function posting (account data, post data) with the queue worker's session
+PUBLISHERS = {
+    "facebook": lambda account, post, session: post_to_facebook(
+        account["account_id"], account["api_token"], post["content"], post["url"], post["featured_image"],
+        session=session),
+    "twitter": lambda account, post, session: post_to_twitter(
+        account["api_token"], account["api_secret"], post["content"], post["hashtags"], session=session),
+    "linkedin": lambda account, post, session: post_to_linkedin(
+        account["account_id"], account["api_token"], post["content"], post["url"], post["featured_image"],
+        session=session),
+    "instagram": lambda account, post, session: post_to_instagram(
+        account["account_id"], account["api_token"], post["content"], post["hashtags"], post["featured_image"],
+        session=session),
+}
+
 def update_social_post_content(content_log_id, platform, new_content, new_hashtags=None):
     """
     Update the content of a social media post before publishing
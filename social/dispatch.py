@@ -0,0 +1,186 @@
+"""
+Social publishing queues
+
+Every platform has its own queue served by a few worker threads, with its own
+request rate and retry policy, so posting an article to several platforms
+takes about as long as the slowest platform instead of the sum of all of
+them. Workers reuse a keep-alive requests.Session per thread. Jobs carry
+plain data only (no ORM objects); the caller writes the results back.
+"""
+import logging
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from config import Config
+from utils.automation.batch_runner import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Requests per second each platform accepts from us; unknown platforms get DEFAULT_RATE
+PLATFORM_RATES = {
+    "facebook": 1.0,
+    "twitter": 0.5,
+    "linkedin": 1.0,
+    "instagram": 0.5,
+}
+DEFAULT_RATE = 1.0
+
+# Seconds between attempts (doubled per attempt) and the cap on one wait
+RETRY_BACKOFF = 2.0
+MAX_RETRY_DELAY = 30.0
+
+# A publish call takes the thread's session and returns
+# {"success": bool, "id", "url", "error", "retryable": bool, "unknown": bool}.
+# Posts are not idempotent: "retryable" is only for requests that certainly
+# did not create a post (429, or no connection could be opened); "unknown" is
+# for requests that may have (every other request error), which must not be
+# retried either.
+PublishCall = Callable[[requests.Session], Dict[str, Any]]
+
+
+def request_not_sent(error: BaseException) -> bool:
+    """
+    True if a request error happened before any bytes were sent: a connect
+    timeout, or a ConnectionError caused by failing to open the connection
+    (urllib3 NewConnectionError, name resolution). A ConnectionError raised
+    after sending ("Connection aborted", a reset while reading the response)
+    is not one of them.
+    """
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+
+    # requests wraps urllib3's MaxRetryError, whose reason is the original error
+    seen = set()
+    pending = [error]
+    while pending:
+        cause = pending.pop()
+        if cause is None or id(cause) in seen:
+            continue
+        seen.add(id(cause))
+        if isinstance(cause, (NewConnectionError, socket.gaierror)):
+            return True
+        if isinstance(cause, MaxRetryError):
+            pending.append(cause.reason)
+        pending.extend([cause.__cause__, cause.__context__])
+        pending.extend(arg for arg in getattr(cause, "args", ()) if isinstance(arg, BaseException))
+    return False
+
+
+class PlatformQueue:
+    """Rate-limited queue of publish calls for one platform"""
+
+    def __init__(self, platform: str, requests_per_second: float, workers: int, attempts: int):
+        self.platform = platform
+        self.limiter = HostRateLimiter(requests_per_second)
+        self.attempts = max(1, attempts)
+        self._jobs: "queue.Queue[tuple]" = queue.Queue()
+        for number in range(max(1, workers)):
+            threading.Thread(target=self._work, name=f"social-{platform}-{number}", daemon=True).start()
+
+    def submit(self, call: PublishCall) -> Future:
+        future = Future()
+        self._jobs.put((call, future))
+        return future
+
+    def _work(self):
+        session = requests.Session()
+        while True:
+            call, future = self._jobs.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._run(call, session))
+                except Exception as e:
+                    future.set_exception(e)
+            self._jobs.task_done()
+
+    def _run(self, call: PublishCall, session: requests.Session) -> Dict[str, Any]:
+        """Runs a call, retrying only results marked retryable (rate limited, or never sent)"""
+        for attempt in range(self.attempts):
+            self.limiter.acquire(self.platform)
+            try:
+                result = call(session)
+            except requests.RequestException as e:
+                if request_not_sent(e):
+                    result = {"success": False, "error": f"{self.platform} connection error: {str(e)}",
+                              "retryable": True}
+                else:
+                    # Sent, or possibly sent: the post may exist
+                    result = {"success": False, "error": f"{self.platform} request error: {str(e)}",
+                              "unknown": True}
+
+            if result.get("success") or not result.get("retryable") or attempt == self.attempts - 1:
+                result["attempts"] = attempt + 1
+                return result
+
+            delay = min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_DELAY)
+            logger.warning(f"Posting to {self.platform} failed ({result.get('error')}), retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+
+class SocialDispatcher:
+    """Per-platform publishing queues, created on first use"""
+
+    def __init__(self):
+        self._queues: Dict[str, PlatformQueue] = {}
+        self._lock = threading.Lock()
+
+    def queue_for(self, platform: str) -> PlatformQueue:
+        platform = platform.lower()
+        with self._lock:
+            platform_queue = self._queues.get(platform)
+            if platform_queue is None:
+                platform_queue = PlatformQueue(
+                    platform,
+                    PLATFORM_RATES.get(platform, DEFAULT_RATE),
+                    Config.SOCIAL_PUBLISH_WORKERS,
+                    Config.SOCIAL_PUBLISH_ATTEMPTS,
+                )
+                self._queues[platform] = platform_queue
+            return platform_queue
+
+    def publish(self, calls: Dict[str, PublishCall], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run publish calls of several platforms concurrently and wait for all of them.
+
+        Args:
+            calls: Platform -> publish call
+            timeout: Seconds to wait (defaults to SOCIAL_PUBLISH_TIMEOUT)
+
+        Returns:
+            Platform -> result; calls that raised or never started in time get
+            an unsuccessful result with the error, calls still running at the
+            timeout one marked "unknown" (the post may still go out)
+        """
+        started = time.monotonic()
+        futures = {platform: self.queue_for(platform).submit(call) for platform, call in calls.items()}
+        wait(futures.values(), timeout=Config.SOCIAL_PUBLISH_TIMEOUT if timeout is None else timeout)
+
+        results = {}
+        for platform, future in futures.items():
+            if not future.done():
+                if future.cancel():
+                    results[platform] = {"success": False, "error": f"Posting to {platform} timed out in the queue"}
+                else:
+                    results[platform] = {"success": False, "unknown": True,
+                                         "error": f"Posting to {platform} is still running; its outcome is unknown"}
+            elif future.exception() is not None:
+                results[platform] = {"success": False, "error": f"{platform} posting error: {future.exception()}"}
+            else:
+                results[platform] = future.result()
+
+        logger.info(f"Published to {sum(1 for result in results.values() if result.get('success'))}/"
+                    f"{len(results)} platforms in {time.monotonic() - started:.2f}s")
+        return results
+
+
+dispatcher = SocialDispatcher()
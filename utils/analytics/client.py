@@ -20,20 +20,29 @@ class GA4Client:
         """
         self.measurement_id = measurement_id or os.environ.get('GA4_MEASUREMENT_ID')
         self.api_secret = api_secret or os.environ.get('GA4_API_SECRET')
-        self.client = None
+        self._client = None
+        self._client_loaded = False
         
         if not self.measurement_id:
             logger.warning("GA4_MEASUREMENT_ID not set. Some functionality may be limited.")
         
         if not self.api_secret:
             logger.warning("GA4_API_SECRET not set. Some functionality may be limited.")
-        
-        try:
-            # Initialize analytics data client
-            self.client = BetaAnalyticsDataClient()
-        except Exception as e:
-            logger.error(f"Error initializing GA4 client: {str(e)}")
-            self.client = None
+    
+    @property
+    def client(self):
+        """
+        GA4 Data API client, created on first use: importing the Google client
+        library and looking up credentials is slow, and only reports need it.
+        """
+        if not self._client_loaded:
+            self._client_loaded = True
+            try:
+                from google.analytics.data_v1beta import BetaAnalyticsDataClient
+                self._client = BetaAnalyticsDataClient()
+            except Exception as e:
+                logger.error(f"Error initializing GA4 client: {str(e)}")
+        return self._client
     
     def get_tracking_code(self, custom_dimension_ids: Optional[List[str]] = None) -> str:
         """
@@ -142,6 +151,8 @@ class GA4Client:
             end_date = end_date.strftime('%Y-%m-%d')
         
         try:
+            from google.analytics.data_v1beta.types import DateRange, Dimension, Metric, RunReportRequest
+            
             # Create dimensions list
             dimension_list = []
             if dimensions:
@@ -7,6 +7,7 @@ Implements rotational author assignment based on daily article quotas:
 - 2 artykuły dziennie = 2 autorów, po 1 artykule każdy
 """
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from app import db
@@ -20,13 +21,27 @@ class AuthorRotationManager:
     """Manages rotational author assignment for multi-blog publishing"""
     
     def __init__(self):
-        # Real WordPress author IDs (will be updated from WordPress API)
-        self.blog_authors = {
-            'MAMATESTUJE.COM': [],  # Will be populated from WordPress
-            'ZNANEKOSMETYKI.PL': [], # Will be populated from WordPress  
-            'HOMOSONLY.PL': []      # Will be populated from WordPress
-        }
-        self._populate_real_authors()
+        self._blog_authors = None
+        self._authors_lock = threading.Lock()
+    
+    @property
+    def blog_authors(self) -> Dict[str, List[Dict]]:
+        """
+        Authors per blog, loaded from the WordPress API on first use rather
+        than when this module is imported (it costs one request per blog).
+        """
+        if self._blog_authors is None:
+            with self._authors_lock:
+                if self._blog_authors is None:
+                    # Real WordPress author IDs (updated from WordPress API)
+                    authors = {
+                        'MAMATESTUJE.COM': [],
+                        'ZNANEKOSMETYKI.PL': [],
+                        'HOMOSONLY.PL': []
+                    }
+                    self._populate_real_authors(authors)
+                    self._blog_authors = authors
+        return self._blog_authors
     
     def get_next_author_for_blog(self, blog_id: int, daily_quota: int) -> Optional[Dict]:
         """
@@ -114,7 +129,7 @@ class AuthorRotationManager:
             # Get articles from last N days
             start_date = datetime.utcnow() - timedelta(days=days)
             
-            articles = ContentLog.query.filter(
+            articles = ContentLog.listing(
                 ContentLog.blog_id == blog_id,
                 ContentLog.published_at >= start_date,
                 ContentLog.status == 'published'
@@ -259,8 +274,8 @@ class AuthorRotationManager:
         # Return as many unique categories as quota requires
         return pool[:quota] if len(pool) >= quota else pool * ((quota // len(pool)) + 1)[:quota]
     
-    def _populate_real_authors(self):
-        """Populate real WordPress author IDs from WordPress API"""
+    def _populate_real_authors(self, authors: Dict[str, List[Dict]]):
+        """Populate real WordPress author IDs from WordPress API into `authors`"""
         try:
             from app import app, db
             
@@ -304,18 +319,18 @@ class AuthorRotationManager:
                                     'weight': 1
                                 })
                             
-                            self.blog_authors[blog_config['name']] = blog_authors
+                            authors[blog_config['name']] = blog_authors
                             logger.info(f"Loaded {len(blog_authors)} authors for {blog_config['name']}")
                             
                     except Exception as e:
                         logger.error(f"Error loading authors for {blog_config['name']}: {str(e)}")
                         # Fallback to default authors if API fails
                         if blog_config['name'] == 'MAMATESTUJE.COM':
-                            self.blog_authors[blog_config['name']] = [{'id': 2, 'name': 'TomaszKotlinski', 'weight': 1}]
+                            authors[blog_config['name']] = [{'id': 2, 'name': 'TomaszKotlinski', 'weight': 1}]
                         elif blog_config['name'] == 'ZNANEKOSMETYKI.PL':
-                            self.blog_authors[blog_config['name']] = [{'id': 1, 'name': 'admin', 'weight': 1}]  
+                            authors[blog_config['name']] = [{'id': 1, 'name': 'admin', 'weight': 1}]  
                         elif blog_config['name'] == 'HOMOSONLY.PL':
-                            self.blog_authors[blog_config['name']] = [{'id': 1, 'name': 'admin', 'weight': 1}]
+                            authors[blog_config['name']] = [{'id': 1, 'name': 'admin', 'weight': 1}]
                             
         except Exception as e:
             logger.error(f"Error in _populate_real_authors: {str(e)}")
@@ -0,0 +1,350 @@
+"""
+Batch Job Runner
+
+Silnik do masowego przetwarzania archiwum artykułów przez skrypty konserwacyjne.
+Wiersze są strumieniowane oknami po kluczu głównym (yield_per), praca trafia do
+ograniczonej puli wątków, zapytania do WordPressa są limitowane per host, a postęp
+zapisywany jest w tabeli batch_job_run, więc przerwany przebieg można wznowić.
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from app import app, db
+from models import BatchJobRun, Blog
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Result statuses returned by BatchJob.process
+OK = "ok"
+SKIPPED = "skipped"
+
+# Cap on stored failed row IDs per run
+MAX_FAILED_IDS = 1000
+
+
+class HostRateLimiter:
+    """
+    Limiter zapytań per host (np. per instalacja WordPressa).
+
+    Każdy host dostaje kolejne sloty czasowe co 1/rate sekund; wątki czekają
+    na swój slot poza blokadą, więc różne hosty nie blokują się nawzajem.
+    """
+
+    def __init__(self, requests_per_second: float = 2.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: Optional[str]):
+        """Blokuje do momentu, w którym można wysłać kolejne zapytanie do hosta"""
+        if not host or not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def host_of(url: Optional[str]) -> Optional[str]:
+    """Zwraca host z adresu URL (klucz limitera)"""
+    if not url:
+        return None
+    return urlparse(url).netloc.lower() or None
+
+
+class BatchJob:
+    """
+    Definicja zadania wsadowego.
+
+    Podklasy ustawiają `name` i `model`, zwracają przefiltrowane zapytanie w
+    `query()` i przetwarzają pojedynczy wiersz w `process()`. `prepare()` jest
+    wywoływane w wątku głównym i powinno zwrócić zwykłe dane (bez obiektów ORM),
+    które trafiają do wątków roboczych.
+    """
+
+    name: str = None
+    description: str = ""
+    model = None
+
+    # Defaults, overridable from the command line
+    workers: int = 4
+    chunk_size: int = 200
+    requests_per_second: float = 2.0
+
+    def __init__(self):
+        self.limiter = HostRateLimiter(self.requests_per_second)
+        self.blogs: Dict[int, Dict[str, Any]] = {}
+        self._local = threading.local()
+
+    # --- Hooks --------------------------------------------------------------
+
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        """Dodaje argumenty specyficzne dla zadania"""
+
+    def configure(self, args: argparse.Namespace):
+        """Odczytuje argumenty specyficzne dla zadania"""
+
+    def params(self) -> Dict[str, Any]:
+        """Parametry identyfikujące przebieg; wznowienie wymaga tych samych parametrów"""
+        return {}
+
+    def setup(self):
+        """Przygotowanie przed przebiegiem (w wątku głównym, w kontekście aplikacji)"""
+        self.blogs = load_blog_credentials()
+
+    def query(self):
+        """Zwraca przefiltrowane zapytanie po `model` (bez ORDER BY/LIMIT)"""
+        raise NotImplementedError
+
+    def prepare(self, row) -> Any:
+        """Zamienia wiersz na dane dla wątku roboczego"""
+        return row.id
+
+    def process(self, item: Any) -> str:
+        """Przetwarza jeden wiersz; zwraca OK lub SKIPPED, błąd zgłasza wyjątkiem"""
+        raise NotImplementedError
+
+    def checkpoint(self):
+        """
+        Wywoływane w wątku głównym po każdym oknie, przed zapisem postępu;
+        zmiany dodane tu do db.session są zatwierdzane razem z checkpointem
+        """
+
+    # --- Helpers for job definitions -----------------------------------------
+
+    @property
+    def session(self) -> requests.Session:
+        """Sesja HTTP per wątek (pula połączeń keep-alive)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def http(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Zapytanie HTTP z limitem per host"""
+        self.limiter.acquire(host_of(url))
+        kwargs.setdefault('timeout', 30)
+        return self.session.request(method, url, **kwargs)
+
+    def wait_for_host(self, url: Optional[str]):
+        """Czeka na slot limitera dla kodu, który sam wysyła zapytania (np. WorkflowEngine)"""
+        self.limiter.acquire(host_of(url))
+
+
+def load_blog_credentials() -> Dict[int, Dict[str, Any]]:
+    """Ładuje dane dostępowe blogów jednym zapytaniem jako zwykłe słowniki"""
+    rows = db.session.query(Blog.id, Blog.name, Blog.url, Blog.api_url, Blog.username, Blog.api_token).all()
+    return {row.id: row._asdict() for row in rows}
+
+
+class BatchRunner:
+    """
+    Uruchamia BatchJob: strumieniuje wiersze, rozdziela je na pulę wątków,
+    zapisuje postęp i raportuje przepustowość.
+    """
+
+    def __init__(self, job: BatchJob, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 limit: Optional[int] = None, restart: bool = False):
+        self.job = job
+        self.workers = max(1, workers or job.workers)
+        self.chunk_size = max(1, chunk_size or job.chunk_size)
+        self.limit = limit
+        self.restart = restart
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Wykonuje zadanie do końca (lub do limitu).
+
+        Returns:
+            Dict ze statystykami przebiegu
+        """
+        with app.app_context():
+            db.create_all()
+            self.job.setup()
+            run = self._get_or_create_run()
+            started = time.monotonic()
+            processed_this_run = 0
+
+            logger.info(f"Batch job '{self.job.name}' run #{run.id}: starting after id {run.last_id} "
+                        f"({self.workers} workers, chunk {self.chunk_size})")
+
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.job.name)
+            try:
+                for chunk in self._iter_chunks(run.last_id):
+                    if self.limit is not None:
+                        chunk = chunk[:self.limit - processed_this_run]
+                    if not chunk:
+                        break
+
+                    self._process_chunk(executor, run, chunk)
+                    processed_this_run += len(chunk)
+                    self._report(run, processed_this_run, started)
+
+                    if self.limit is not None and processed_this_run >= self.limit:
+                        break
+
+                run.status = "completed" if self.limit is None or processed_this_run < self.limit else "interrupted"
+                run.finished_at = datetime.utcnow() if run.status == "completed" else None
+                db.session.commit()
+            except KeyboardInterrupt:
+                logger.warning(f"Batch job '{self.job.name}' interrupted, resume from id {run.last_id}")
+                executor.shutdown(wait=False, cancel_futures=True)
+                run.status = "interrupted"
+                db.session.commit()
+                raise
+            except Exception as e:
+                logger.error(f"Batch job '{self.job.name}' failed: {str(e)}")
+                db.session.rollback()
+                run.status = "failed"
+                run.last_error = str(e)
+                db.session.commit()
+                raise
+            finally:
+                executor.shutdown(wait=True)
+
+            elapsed = time.monotonic() - started
+            summary = {
+                "job": self.job.name,
+                "run_id": run.id,
+                "status": run.status,
+                "last_id": run.last_id,
+                "processed": run.processed,
+                "succeeded": run.succeeded,
+                "skipped": run.skipped,
+                "failed": run.failed,
+                "elapsed_seconds": round(elapsed, 2),
+                "rows_per_second": round(processed_this_run / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+            logger.info(f"Batch job '{self.job.name}' finished: {summary}")
+            return summary
+
+    def _get_or_create_run(self) -> BatchJobRun:
+        """Zwraca niedokończony przebieg z tymi samymi parametrami albo tworzy nowy"""
+        params = self.job.params()
+        if not self.restart:
+            candidates = BatchJobRun.query.filter(
+                BatchJobRun.job_name == self.job.name,
+                BatchJobRun.status.in_(["running", "interrupted", "failed"])
+            ).order_by(BatchJobRun.id.desc()).all()
+            for run in candidates:
+                if run.get_params() == params:
+                    logger.info(f"Resuming batch job '{self.job.name}' run #{run.id} after id {run.last_id}")
+                    run.status = "running"
+                    run.last_error = None
+                    db.session.commit()
+                    return run
+
+        run = BatchJobRun(job_name=self.job.name, status="running", params=json.dumps(params),
+                          last_id=0, processed=0, succeeded=0, skipped=0, failed=0)
+        db.session.add(run)
+        db.session.commit()
+        return run
+
+    def _iter_chunks(self, last_id: int) -> Iterator[List[Any]]:
+        """
+        Strumieniuje wiersze oknami po kluczu głównym.
+
+        Każde okno jest czytane do końca (yield_per) przed przekazaniem do puli,
+        więc kursor nie jest otwarty podczas zapisów wątków roboczych i checkpointu.
+        """
+        pk = self.job.model.id
+        while True:
+            rows = self.job.query().filter(pk > last_id).order_by(pk).limit(self.chunk_size).yield_per(self.chunk_size)
+            chunk = []
+            for row in rows:
+                chunk.append((row.id, self.job.prepare(row)))
+                # Drop the ORM object, the workers only get plain data
+                db.session.expunge(row)
+            if not chunk:
+                return
+            last_id = chunk[-1][0]
+            yield chunk
+
+    def _process_chunk(self, executor: ThreadPoolExecutor, run: BatchJobRun, chunk: List[Any]):
+        """Przetwarza okno w puli i zapisuje checkpoint po jego zakończeniu"""
+        futures = {executor.submit(self._run_item, item): row_id for row_id, item in chunk}
+        failed_ids = run.get_failed_ids()
+
+        for future in as_completed(futures):
+            row_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Batch job '{self.job.name}': row {row_id} failed: {str(e)}")
+                run.failed += 1
+                run.last_error = f"{row_id}: {str(e)}"
+                if len(failed_ids) < MAX_FAILED_IDS:
+                    failed_ids.append(row_id)
+            else:
+                if result == SKIPPED:
+                    run.skipped += 1
+                else:
+                    run.succeeded += 1
+            run.processed += 1
+
+        self.job.checkpoint()
+        run.set_failed_ids(failed_ids)
+        run.last_id = chunk[-1][0]
+        db.session.commit()
+
+    def _run_item(self, item: Any) -> str:
+        """Wywołuje job.process w wątku roboczym z własnym kontekstem aplikacji i sesją"""
+        with app.app_context():
+            try:
+                return self.job.process(item)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    def _report(self, run: BatchJobRun, processed_this_run: int, started: float):
+        """Loguje postęp i przepustowość"""
+        elapsed = time.monotonic() - started
+        rate = processed_this_run / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Batch job '{self.job.name}': {run.processed} rows "
+                    f"(ok {run.succeeded}, skipped {run.skipped}, failed {run.failed}), "
+                    f"last id {run.last_id}, {rate:.1f} rows/s")
+
+
+def run_job_cli(job: BatchJob, argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Wspólny interfejs wiersza poleceń dla skryptów konserwacyjnych.
+
+    Args:
+        job: Definicja zadania
+        argv: Argumenty (domyślnie sys.argv)
+
+    Returns:
+        Dict ze statystykami przebiegu
+    """
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=job.description or job.name)
+    parser.add_argument("--workers", type=int, default=job.workers, help="size of the worker pool")
+    parser.add_argument("--chunk-size", type=int, default=job.chunk_size, help="rows per streamed window")
+    parser.add_argument("--rate", type=float, default=job.requests_per_second,
+                        help="max requests per second per WordPress host (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="process at most N rows in this run")
+    parser.add_argument("--restart", action="store_true", help="ignore an unfinished run and start over")
+    job.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    job.configure(args)
+    job.limiter = HostRateLimiter(args.rate)
+
+    runner = BatchRunner(job, workers=args.workers, chunk_size=args.chunk_size,
+                         limit=args.limit, restart=args.restart)
+    return runner.run()
@@ -5,35 +5,32 @@ System harmonogramowania i automatycznego wykonywania reguł automatyzacji treś
 Integruje się z workflow engine i zarządza cyklicznym wykonywaniem zadań.
 """
 import logging
-import logging.handlers
-import time
-import schedule
-import threading
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from concurrent.futures import ThreadPoolExecutor
 
 from app import app, db
+from config import Config
 from models import AutomationRule, Blog
 from utils.automation.workflow_engine import execute_automation_rule
+from utils.scheduling.core import get_scheduler_core
+from utils.scheduling.job_queue import enqueue, queue_enabled
+from utils.scheduling.leader import get_leader_election
+from utils.logger import add_log_file
+from utils.scheduling.jobs import (
+    AutomationCleanupJob, AutomationReportJob, AutomationRulesCheckJob, BatchGenerationJob
+)
 
-# Configure logging with file handler
+# Configure logging with a file of its own (written by the logging listener thread)
 logger = logging.getLogger(__name__)
+add_log_file(__name__, 'logs/automation/scheduler.log')
 
-# Ensure logs directory exists
-os.makedirs('logs/automation', exist_ok=True)
-
-# Add file handler for persistent logs
-file_handler = logging.handlers.RotatingFileHandler(
-    'logs/automation/scheduler.log',
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5
-)
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+# Stały harmonogram batch generation (UTC time), blog_id: scheduled_time
+BATCH_SCHEDULE = {
+    2: "05:00",  # MamaTestuje - 07:00 PL (05:00 UTC)
+    3: "06:00",  # ZnaneKosmetyki - 08:00 PL (06:00 UTC)
+    4: "07:00",  # HomosOnly - 09:00 PL (07:00 UTC)
+}
 
 class AutomationScheduler:
     """
@@ -44,25 +41,28 @@ class AutomationScheduler:
         self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.is_running = False
-        self.scheduler_thread = None
+        self.job_names = []
         
     def start(self):
-        """Rozpoczyna scheduler w osobnym wątku"""
+        """Rozpoczyna scheduler - rejestruje zadania we wspólnym scheduler core"""
         if self.is_running:
             logger.warning("Scheduler is already running")
             return
             
         self.is_running = True
         
-        # NOWA FUNKCJA: Odzyskaj przegapione zadania z dzisiaj
-        self.recover_missed_tasks()
-        
         self.setup_schedules()
         
-        # Uruchom scheduler w osobnym wątku
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler)
-        self.scheduler_thread.daemon = True
-        self.scheduler_thread.start()
+        # Zadania wykonuje wspólny scheduler core (jeden wątek dla całej aplikacji)
+        core = get_scheduler_core()
+        core.start()
+        
+        # NOWA FUNKCJA: Odzyskaj przegapione zadania z dzisiaj - tylko na węźle-liderze,
+        # również po przejęciu roli lidera od węzła, który przestał działać
+        if Config.LEADER_ELECTION_ENABLED:
+            get_leader_election().on_elected(self.recover_missed_tasks)
+        else:
+            self.recover_missed_tasks()
         
         logger.info("Automation scheduler started")
     
@@ -76,14 +76,6 @@ class AutomationScheduler:
         """
         logger.info("🔍 Checking for missed batch generation tasks from today...")
         
-        # Stały harmonogram batch generation (UTC time)
-        # blog_id: scheduled_time
-        BATCH_SCHEDULE = {
-            2: "05:00",  # MamaTestuje - 07:00 PL (05:00 UTC)
-            3: "06:00",  # ZnaneKosmetyki - 08:00 PL (06:00 UTC)
-            4: "07:00",  # HomosOnly - 09:00 PL (07:00 UTC)
-        }
-        
         try:
             with app.app_context():
                 current_time = datetime.utcnow()
@@ -141,10 +133,12 @@ class AutomationScheduler:
     def stop(self):
         """Zatrzymuje scheduler"""
         self.is_running = False
-        schedule.clear()
         
-        if self.scheduler_thread:
-            self.scheduler_thread.join(timeout=5)
+        # Usuń tylko własne zadania - scheduler core obsługuje też inne moduły
+        core = get_scheduler_core()
+        for name in self.job_names:
+            core.remove_job(name)
+        self.job_names = []
             
         self.executor.shutdown(wait=True)
         logger.info("Automation scheduler stopped")
@@ -156,31 +150,24 @@ class AutomationScheduler:
         # 05:00 UTC = 07:00 PL - MamaTestuje
         # 06:00 UTC = 08:00 PL - ZnaneKosmetyki  
         # 07:00 UTC = 09:00 PL - HomosOnly
-        schedule.every().day.at("05:00").do(self.batch_generate_articles, blog_id=2)  # MamaTestuje - 4 artykuły (07:00 PL)
-        schedule.every().day.at("06:00").do(self.batch_generate_articles, blog_id=3)  # ZnaneKosmetyki - 3 artykuły (08:00 PL)
-        schedule.every().day.at("07:00").do(self.batch_generate_articles, blog_id=4)  # HomosOnly - 2 artykuły (09:00 PL)
+        core = get_scheduler_core()
+        jobs = [BatchGenerationJob(blog_id, at) for blog_id, at in BATCH_SCHEDULE.items()]
         
         # STARA LOGIKA: Sprawdzanie reguł co 15 minut (backup)
-        schedule.every(15).minutes.do(self.check_and_execute_rules)
+        jobs.append(AutomationRulesCheckJob())
         
         # Czyszczenie nieudanych zadań co godzinę
-        schedule.every().hour.do(self.cleanup_failed_rules)
+        jobs.append(AutomationCleanupJob())
         
         # Raport dzienny o 08:00 UTC = 10:00 PL (po wszystkich batch generation)
-        schedule.every().day.at("08:00").do(self.generate_daily_report)
+        jobs.append(AutomationReportJob())
+        
+        for job in jobs:
+            core.add_job(job)
+        self.job_names = [job.name for job in jobs]
         
         logger.info("Scheduler configured with BATCH GENERATION at 05:00 UTC (07:00 PL), 06:00 UTC (08:00 PL), 07:00 UTC (09:00 PL)")
     
-    def _run_scheduler(self):
-        """Główna pętla schedulera"""
-        while self.is_running:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # Sprawdzaj co minutę
-            except Exception as e:
-                logger.error(f"Scheduler error: {str(e)}")
-                time.sleep(60)
-    
     def batch_generate_articles(self, blog_id: int):
         """
         NOWA FUNKCJA: Generuje wszystkie artykuły dla danego bloga jedną sesją rano
@@ -298,8 +285,8 @@ class AutomationScheduler:
                 for rule in ready_rules:
                     # Sprawdź czy czas wykonania jest odpowiedni
                     if self._should_execute_rule(rule, current_time):
-                        # Wykonaj regułę asynchronicznie
-                        self.executor.submit(self._execute_rule_async, rule.id)
+                        # Wykonaj regułę asynchronicznie (w workerze kolejki, jeśli włączona)
+                        self._submit_rule(rule.id)
                         
                         # Ustaw następny czas wykonania
                         self._schedule_next_execution(rule)
@@ -339,6 +326,13 @@ class AutomationScheduler:
                 
         return True
     
+    def _submit_rule(self, rule_id: int):
+        """Przekazuje regułę do kolejki zadań (JOB_QUEUE_ENABLED) albo do lokalnej puli wątków"""
+        if queue_enabled():
+            enqueue("execute_rule", {"rule_id": rule_id}, dedupe_key=f"execute_rule:{rule_id}")
+        else:
+            self.executor.submit(self._execute_rule_async, rule_id)
+    
     def _execute_rule_async(self, rule_id: int):
         """Wykonuje regułę automatyzacji asynchronicznie"""
         try:
@@ -511,8 +505,8 @@ class AutomationScheduler:
                     
                 logger.info(f"Manual execution of rule: {rule.name}")
                 
-                # Wykonaj przez executor
-                future = self.executor.submit(self._execute_rule_async, rule_id)
+                # Wykonaj przez executor lub kolejkę zadań
+                self._submit_rule(rule_id)
                 
                 return {"success": True, "message": f"Rule {rule.name} execution started"}
                 
@@ -531,11 +525,13 @@ class AutomationScheduler:
             
             return {
                 "is_running": self.is_running,
+                "is_leader": get_scheduler_core().is_leader,
                 "max_workers": self.max_workers,
                 "active_rules": active_rules,
                 "total_rules": total_rules,
                 "failed_rules": failed_rules,
-                "next_scheduled_jobs": len(schedule.jobs)
+                "next_scheduled_jobs": len(self.job_names),
+                "jobs": [job for job in get_scheduler_core().get_jobs() if job["name"] in self.job_names]
             }
 
 # Global scheduler instance
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
+from sqlalchemy import case, update
+
 from app import db
 from models import ArticleTopic, Blog, AutomationRule, Category
 from utils.ai_content_strategy.topic_generator import generate_ai_topics_for_category
@@ -465,6 +467,95 @@ class TopicManager:
             logger.error(f"Failed to get blog categories: {str(e)}")
             return []
 
+def topic_claim_query(blog_id: int, preferred_categories: Optional[List[str]] = None,
+                      fallback_categories: Optional[List[str]] = None):
+    """
+    Zapytanie o zatwierdzone, nieużyte tematy bloga w kolejności rezerwacji.
+    Używane przez claim_next_topic oraz explain_queries.py.
+    """
+    preferred_categories = list(preferred_categories or [])
+    allowed_categories = preferred_categories + [
+        cat for cat in (fallback_categories or []) if cat not in preferred_categories
+    ]
+
+    ordering = [ArticleTopic.priority.desc(), ArticleTopic.created_at.asc()]
+    if preferred_categories:
+        category_rank = case(
+            {category: rank for rank, category in enumerate(preferred_categories)},
+            value=ArticleTopic.category,
+            else_=len(preferred_categories)
+        )
+        ordering.insert(0, category_rank)
+
+    query = ArticleTopic.query.filter_by(
+        blog_id=blog_id,
+        status=TopicStatus.APPROVED.value,
+        used=False
+    )
+    if allowed_categories:
+        query = query.filter(ArticleTopic.category.in_(allowed_categories))
+    query = query.order_by(*ordering)
+    return query
+
+def claim_next_topic(blog_id: int, preferred_categories: Optional[List[str]] = None,
+                     fallback_categories: Optional[List[str]] = None) -> Optional[ArticleTopic]:
+    """
+    Atomowo rezerwuje następny zatwierdzony, nieużyty temat bloga.
+
+    Tematy z preferred_categories mają pierwszeństwo (w podanej kolejności),
+    potem tematy z fallback_categories; w obrębie kategorii decyduje priorytet
+    i data utworzenia. Bez żadnych kategorii brany jest dowolny temat.
+
+    Na PostgreSQL używa SELECT ... FOR UPDATE SKIP LOCKED, więc równoległe
+    workery nigdy nie dostaną tego samego tematu. Na innych bazach (SQLite)
+    rezerwacja to warunkowy UPDATE ... WHERE used = false, powtarzany gdy
+    inny worker zdążył zająć kandydata.
+
+    Args:
+        blog_id: ID bloga
+        preferred_categories: Kategorie preferowane, w kolejności ważności
+        fallback_categories: Pozostałe dopuszczalne kategorie
+
+    Returns:
+        Zarezerwowany temat (used=True) lub None
+    """
+    query = topic_claim_query(blog_id, preferred_categories, fallback_categories)
+
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            topic = query.with_for_update(skip_locked=True).first()
+            if topic is None:
+                db.session.rollback()
+                return None
+            topic.used = True
+            topic.used_at = datetime.utcnow()
+            db.session.commit()
+            return topic
+
+        for _ in range(5):
+            candidate_id = query.with_entities(ArticleTopic.id).limit(1).scalar()
+            if candidate_id is None:
+                return None
+
+            result = db.session.execute(
+                update(ArticleTopic)
+                .where(ArticleTopic.id == candidate_id, ArticleTopic.used == False)  # noqa: E712
+                .values(used=True, used_at=datetime.utcnow())
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                return db.session.get(ArticleTopic, candidate_id, populate_existing=True)
+
+            logger.debug(f"Topic {candidate_id} claimed by another worker, retrying")
+
+        logger.warning(f"Could not claim a topic for blog {blog_id} after repeated conflicts")
+        return None
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to claim topic for blog {blog_id}: {str(e)}")
+        return None
+
 def get_topic_manager() -> TopicManager:
     """
     Factory function do pobierania instancji TopicManager.
@@ -5,8 +5,6 @@ Centralny silnik zarządzający całym cyklem automatycznego generowania i publi
 Integruje wszystkie komponenty systemu w jeden spójny workflow.
 """
 import logging
-import logging.handlers
-import os
 import time
 import traceback
 from datetime import datetime, timedelta
@@ -19,29 +17,21 @@ from models import (
     ContentMetrics, ImageLibrary, Notification, ContentLog
 )
 from utils.ai_content_strategy.topic_generator import generate_ai_topics_for_category
+from utils.automation.topic_manager import claim_next_topic
 from utils.ai_content_strategy.article_generator import generate_article_from_topic
 from utils.images.auto_image_finder import find_article_images
 from utils.wordpress.client import build_wp_api_url
 from social.autopost import post_article_to_social_media
 import requests
 from utils.content.ai_adapter import get_default_ai_service
+from utils.logger import add_log_file
+from utils.monitoring.content_metrics import ContentMetricsTracker
+from utils.monitoring.metrics import WORKFLOW_STAGE_SECONDS
+from utils.monitoring.tracing import STATUS_ERROR, trace_id_for, tracer
 
-# Configure logging with file handler
+# Configure logging with a file of its own (written by the logging listener thread)
 logger = logging.getLogger(__name__)
-
-# Ensure logs directory exists
-os.makedirs('logs/automation', exist_ok=True)
-
-# Add file handler for persistent logs
-file_handler = logging.handlers.RotatingFileHandler(
-    'logs/automation/workflow_engine.log',
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5
-)
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+add_log_file(__name__, 'logs/automation/workflow_engine.log')
 
 class WorkflowStatus(Enum):
     """Status możliwych stanów workflow"""
@@ -88,6 +78,21 @@ class WorkflowEngine:
         workflow_id = f"workflow_{automation_rule.id}_{int(time.time())}"
         self.workflow_id = workflow_id
         
+        # Każdy workflow to osobny trace (podgląd: /monitoring/traces/<workflow_id>)
+        with tracer.span("workflow", trace_id=trace_id_for(workflow_id), attributes={
+            "workflow.id": workflow_id,
+            "automation_rule.id": automation_rule.id,
+            "blog.id": automation_rule.blog_id,
+        }) as span:
+            workflow_result = self._run_cycle(automation_rule, workflow_id)
+            if span is not None:
+                span.set_attribute("workflow.status", workflow_result["status"])
+                if workflow_result["status"] == WorkflowStatus.FAILED.value:
+                    span.set_status(STATUS_ERROR, "; ".join(workflow_result["errors"])[:200])
+            return workflow_result
+    
+    def _run_cycle(self, automation_rule: AutomationRule, workflow_id: str) -> Dict[str, Any]:
+        """Kroki pełnego cyklu workflow (wywoływane przez execute_full_cycle)"""
         logger.info(f"Starting workflow {workflow_id} for automation rule: {automation_rule.name}")
         
         # Inicjalizacja wyników workflow
@@ -107,7 +112,7 @@ class WorkflowEngine:
         
         try:
             # Krok 1: Sprawdzenie i generowanie tematów
-            topic_result = self._execute_topic_management(automation_rule)
+            topic_result = self._run_step(WorkflowStep.TOPIC_GENERATION, self._execute_topic_management, automation_rule)
             workflow_result["steps_completed"].append(WorkflowStep.TOPIC_GENERATION.value)
             
             if not topic_result["success"]:
@@ -116,7 +121,7 @@ class WorkflowEngine:
                 return workflow_result
                 
             # Krok 2: Wybór tematu do artykułu
-            selected_topic = self._select_topic_for_article(automation_rule)
+            selected_topic = self._run_step(WorkflowStep.TOPIC_SELECTION, self._select_topic_for_article, automation_rule)
             workflow_result["steps_completed"].append(WorkflowStep.TOPIC_SELECTION.value)
             
             if not selected_topic:
@@ -125,7 +130,12 @@ class WorkflowEngine:
                 return workflow_result
                 
             # Krok 3: Generowanie artykułu
-            article_result = self._execute_content_generation(automation_rule, selected_topic)
+            tracker = ContentMetricsTracker().start_tracking(selected_topic.title, "workflow")
+            article_result = self._run_step(WorkflowStep.CONTENT_GENERATION, self._execute_content_generation,
+                                            automation_rule, selected_topic)
+            if article_result["success"]:
+                tracker.set_content_metrics(article_result["article"].content)
+            tracker.end_tracking(success=article_result["success"], error=article_result.get("error"))
             workflow_result["steps_completed"].append(WorkflowStep.CONTENT_GENERATION.value)
             
             if not article_result["success"]:
@@ -136,7 +146,8 @@ class WorkflowEngine:
             workflow_result["article_id"] = article_result["article_id"]
             
             # Krok 4: Pobieranie obrazów (z kategorią dla lepszego doboru)
-            image_result = self._execute_image_acquisition(
+            image_result = self._run_step(
+                WorkflowStep.IMAGE_ACQUISITION, self._execute_image_acquisition,
                 article_result["article"],
                 topic_category=article_result.get("topic_category")
             )
@@ -148,7 +159,8 @@ class WorkflowEngine:
                 
             # Krok 5: Publikacja na WordPress
             if automation_rule.auto_publish:
-                publish_result = self._execute_wordpress_publishing(
+                publish_result = self._run_step(
+                    WorkflowStep.WORDPRESS_PUBLISHING, self._execute_wordpress_publishing,
                     article_result["article"], 
                     automation_rule, 
                     topic_category=article_result.get("topic_category")
@@ -160,14 +172,16 @@ class WorkflowEngine:
                     
                     # Krok 6: Posty w social media (tylko jeśli publikacja się udała)
                     if automation_rule.auto_social_post:
-                        social_result = self._execute_social_media_posting(article_result["article"], automation_rule)
+                        social_result = self._run_step(WorkflowStep.SOCIAL_MEDIA_POSTING, self._execute_social_media_posting,
+                                                       article_result["article"], automation_rule)
                         workflow_result["steps_completed"].append(WorkflowStep.SOCIAL_MEDIA_POSTING.value)
                         workflow_result["social_media_posts"] = social_result.get("posts", [])
                 else:
                     workflow_result["errors"].append(f"WordPress publishing failed: {publish_result['error']}")
                     
             # Krok 7: Aktualizacja metryki
-            metrics_result = self._update_workflow_metrics(workflow_result, automation_rule)
+            metrics_result = self._run_step(WorkflowStep.METRICS_UPDATE, self._update_workflow_metrics,
+                                            workflow_result, automation_rule)
             workflow_result["steps_completed"].append(WorkflowStep.METRICS_UPDATE.value)
             workflow_result["metrics"] = metrics_result
             
@@ -201,6 +215,22 @@ class WorkflowEngine:
             
         return workflow_result
     
+    def _run_step(self, step: WorkflowStep, func, *args, **kwargs):
+        """
+        Wykonuje krok workflow jako span trace'a, zapisując czas jego trwania w metrykach.
+        Status: "ok", "failed" (wynik z success=False lub brak wyniku) albo "error" (wyjątek).
+        """
+        self.current_step = step
+        with tracer.span(f"step {step.value}", attributes={"workflow.step": step.value}) as span, \
+                WORKFLOW_STAGE_SECONDS.time(stage=step.value) as labels:
+            result = func(*args, **kwargs)
+            if result is None or (isinstance(result, dict) and result.get("success") is False):
+                labels["status"] = "failed"
+                if span is not None:
+                    error = result.get("error") if isinstance(result, dict) else None
+                    span.set_status(STATUS_ERROR, str(error or "no result")[:200])
+            return result
+    
     def _select_author_for_article(self, category: str, article_id: int) -> Dict[str, Any]:
         """
         Wybiera autora na podstawie kategorii i systemu rotacji MamaTestuje.com
@@ -344,49 +374,24 @@ class WorkflowEngine:
                 self.used_categories = []
                 unused_categories = available_categories
             
-            # Znajdź zatwierdzone tematy preferując nieużyte kategorie
-            selected_topic = None
-            
-            # Najpierw spróbuj z nieużytymi kategoriami
-            for preferred_category in unused_categories:
-                topics = ArticleTopic.query.filter_by(
-                    blog_id=automation_rule.blog_id,
-                    status='approved',
-                    used=False,
-                    category=preferred_category
-                ).order_by(ArticleTopic.priority.desc(), ArticleTopic.created_at.asc()).all()
-                
-                if topics:
-                    selected_topic = topics[0]
-                    # Dodaj kategorię do listy użytych
-                    self.used_categories.append(preferred_category)
-                    logger.info(f"Selected topic from unused category: {preferred_category}")
-                    break
-            
-            # Jeśli nie znaleziono w nieużytych, weź dowolny dostępny
-            if not selected_topic:
-                available_topics = ArticleTopic.query.filter_by(
-                    blog_id=automation_rule.blog_id,
-                    status='approved',
-                    used=False
-                ).filter(
-                    ArticleTopic.category.in_(available_categories)
-                ).order_by(ArticleTopic.priority.desc(), ArticleTopic.created_at.asc()).all()
-                
-                if available_topics:
-                    selected_topic = available_topics[0]
-                    if selected_topic.category not in self.used_categories:
-                        self.used_categories.append(selected_topic.category)
-                    logger.info(f"Selected topic from any available category: {selected_topic.category}")
+            if not available_categories:
+                logger.warning("No approved topics available")
+                return None
+            
+            # Jedno zapytanie: nieużyte kategorie mają pierwszeństwo, potem dowolna dostępna.
+            # Temat jest od razu atomowo oznaczany jako używany (bezpieczne dla równoległych workerów).
+            selected_topic = claim_next_topic(
+                automation_rule.blog_id,
+                preferred_categories=unused_categories,
+                fallback_categories=available_categories
+            )
             
             if not selected_topic:
                 logger.warning("No approved topics available")
                 return None
             
-            # Oznacz jako używany
-            selected_topic.used = True
-            selected_topic.used_at = datetime.utcnow()
-            db.session.commit()
+            if selected_topic.category not in self.used_categories:
+                self.used_categories.append(selected_topic.category)
             
             logger.info(f"Selected topic: {selected_topic.title} (Category: {selected_topic.category})")
             logger.info(f"Used categories so far: {self.used_categories}")
@@ -499,7 +504,7 @@ class WorkflowEngine:
                 
                 # Generate 12 SEO tags
                 from utils.seo.tag_generator import generate_seo_tags
-                seo_tags = generate_seo_tags(title, content, topic.category)
+                seo_tags = generate_seo_tags(title, content, topic.category, blog_id=automation_rule.blog_id)
                 logger.info(f"Generated {len(seo_tags)} SEO tags")
                 
                 # Zapisz artykuł w bazie z lepszą obsługą błędów i 12 tagami
@@ -697,7 +702,7 @@ class WorkflowEngine:
             if hasattr(article, 'get_tags') and article.get_tags():
                 tag_names = article.get_tags()[:6]  # WordPress limit
             else:
-                tag_names = self._generate_tags_for_category(category)[:6]
+                tag_names = self._generate_tags_for_article(article, category)[:6]
             
             # ROTACJA AUTORÓW: Pobierz następnego autora w rotacji
             author_id = self._get_next_author_id(blog)
@@ -910,6 +915,26 @@ class WorkflowEngine:
             logger.error(f"Failed to get WordPress category ID: {e}")
             return None
     
+    def _generate_tags_for_article(self, article: Article, category: str) -> List[str]:
+        """
+        Generuje tagi z treści artykułu (lokalnie, bez AI), uzupełniając je tagami kategorii.
+        """
+        from utils.seo.keyphrases import extract_keyphrases
+        
+        tags = []
+        try:
+            local = extract_keyphrases(article.title, article.content or "", blog_id=getattr(article, 'blog_id', None), limit=6)
+            tags = [keyphrase["phrase"] for keyphrase in local["keyphrases"]]
+        except Exception as e:
+            logger.warning(f"Local tag extraction failed for article {article.id}: {e}")
+        
+        for tag in self._generate_tags_for_category(category):
+            if len(tags) >= 6:
+                break
+            if tag not in tags:
+                tags.append(tag)
+        return tags
+    
     def _generate_tags_for_category(self, category: str) -> List[str]:
         """
         Generuje tagi na podstawie kategorii.
@@ -14,6 +14,8 @@ import requests
 from typing import Dict, Any, Optional, List
 
 from config import Config
+from utils.monitoring.metrics import LLM_REQUEST_SECONDS, record_llm_usage
+from utils.monitoring.tracing import KIND_CLIENT, traced, tracer
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,6 +34,7 @@ def get_openrouter_api_key():
     # No hardcoded key - raise error if not found
     raise ValueError("OPENROUTER_API_KEY not found in environment or config")
 
+@traced("get_ai_completion", attributes=lambda args: {"llm.model": args["model"], "llm.max_tokens": args["max_tokens"]})
 def get_ai_completion(
     system_prompt: str,
     user_prompt: str,
@@ -177,10 +180,17 @@ def openrouter_call(
     if response_format:
         data["response_format"] = response_format
     
+    with tracer.span("openrouter chat.completions", KIND_CLIENT, {"llm.model": model, "llm.max_tokens": max_tokens}), \
+            LLM_REQUEST_SECONDS.time(model=model):
+        return _openrouter_request(model, headers, data)
+
+
+def _openrouter_request(model: str, headers: Dict[str, str], data: Dict[str, Any]) -> str:
+    """Send a chat completion request and extract the generated text"""
     try:
         logger.info(f"Making OpenRouter API request with model: {model}")
         response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+            f"{Config.OPENROUTER_API_BASE}/chat/completions",
             headers=headers,
             json=data,
             timeout=120  # 2 minute timeout for long requests
@@ -231,6 +241,7 @@ def openrouter_call(
             raise Exception("No choices in OpenRouter response")
         
         content = response_data["choices"][0]["message"]["content"]
+        record_llm_usage(model, response_data.get("usage"))
         logger.info(f"Successfully received response from OpenRouter (length: {len(content)} chars)")
         return content
         
@@ -6,6 +6,8 @@ import logging
 import re
 from typing import Dict, List, Tuple, Optional
 
+from utils.polish_lexicon import STOPWORDS, normalize
+
 logger = logging.getLogger(__name__)
 
 class ContentValidator:
@@ -28,6 +30,7 @@ class ContentValidator:
             self._validate_title,
             self._validate_excerpt, 
             self._validate_content,
+            self._validate_topic_focus,
             self._validate_structure,
             self._validate_length,
             self._validate_html_format
@@ -161,6 +164,22 @@ class ContentValidator:
         
         return errors
     
+    def _validate_topic_focus(self, title: str, excerpt: str, content: str, category: str) -> List[str]:
+        """Validate that the content is about the title (title keywords appear in any inflected form)"""
+        errors = []
+        
+        title_keywords = [word for word in re.findall(r'\w+', title.lower())
+                          if len(word) > 3 and word not in STOPWORDS and not word.isdigit()]
+        if not title_keywords:
+            return errors
+        
+        text_content = re.sub(r'<[^>]+>', ' ', content).lower()
+        content_keys = {normalize(word) for word in set(re.findall(r'\w+', text_content))}
+        if not any(normalize(word) in content_keys for word in title_keywords):
+            errors.append(f"Treść nie zawiera żadnego słowa kluczowego z tytułu: {', '.join(title_keywords[:5])}")
+        
+        return errors
+    
     def _validate_structure(self, title: str, excerpt: str, content: str, category: str) -> List[str]:
         """Validate HTML structure requirements"""
         errors = []
@@ -260,8 +279,8 @@ def check_duplicate_content(title: str, blog_id: int) -> bool:
         # Normalize title for comparison
         normalized_title = re.sub(r'[^\w\s]', '', title.lower()).strip()
         
-        # Check for exact or very similar titles
-        existing = ContentLog.query.filter_by(blog_id=blog_id).all()
+        # Check for exact or very similar titles (titles only, no article bodies)
+        existing = ContentLog.listing(ContentLog.blog_id == blog_id, columns=('title',)).all()
         
         for article in existing:
             if article.title:
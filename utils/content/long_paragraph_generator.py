@@ -8,21 +8,30 @@ import json
 import logging
 import re
 import time
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 
-import tiktoken
 from config import Config
 from utils.content.ai_adapter import get_ai_completion
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize tiktoken encoder
-try:
-    encoder = tiktoken.get_encoding("cl100k_base")  # Claude/OpenAI compatible encoding
-except Exception as e:
-    logger.warning(f"Could not initialize tiktoken encoder: {str(e)}")
-    encoder = None
+@lru_cache(maxsize=1)
+def get_encoder():
+    """
+    The tiktoken encoder, loaded on first use: loading it imports tiktoken
+    and may download the encoding, which is too slow to do at import time.
+
+    Returns:
+        The cl100k_base encoder, or None if it cannot be loaded (e.g. offline)
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")  # Claude/OpenAI compatible encoding
+    except Exception as e:
+        logger.warning(f"Could not initialize tiktoken encoder: {str(e)}")
+        return None
 
 def count_tokens(text: str) -> int:
     """
@@ -34,6 +43,7 @@ def count_tokens(text: str) -> int:
     Returns:
         Number of tokens
     """
+    encoder = get_encoder()
     if encoder is None:
         # Fallback: rough approximation (4 chars per token)
         return len(text) // 4
@@ -75,7 +75,7 @@ def get_ai_response(
         }
         
         response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+            f"{Config.OPENROUTER_API_BASE}/chat/completions",
             headers=headers,
             json=request_data
         )
@@ -8,6 +8,7 @@ import os
 import logging
 import requests
 from typing import List, Dict, Any, Optional
+from utils.monitoring.metrics import timed_image_search
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -16,8 +17,9 @@ logger = logging.getLogger(__name__)
 from config import Config
 
 BING_SEARCH_API_KEY = Config.BING_SEARCH_API_KEY
-BING_SEARCH_ENDPOINT = "https://api.bing.microsoft.com/v7.0/images/search"
+BING_SEARCH_ENDPOINT = os.environ.get("BING_SEARCH_ENDPOINT", "https://api.bing.microsoft.com/v7.0/images/search")
 
+@timed_image_search("bing")
 def search_bing_images(
     query: str,
     per_page: int = 20,
@@ -8,8 +8,8 @@ import urllib.parse
 import json
 import random
 import time
-from googleapiclient.discovery import build
 from config import Config
+from utils.monitoring.metrics import timed_image_search
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -27,6 +27,7 @@ def get_random_user_agent():
     """Get a random user agent from the list"""
     return random.choice(USER_AGENTS)
 
+@timed_image_search("google_scrape")
 def search_google_images(
     query: str,
     per_page: int = 20,
@@ -179,6 +180,7 @@ def extract_image_data(grid_item):
     
     return images
 
+@timed_image_search("google")
 def search_google_images_api(
     query: str,
     per_page: int = 20,
@@ -208,7 +210,8 @@ def search_google_images_api(
         return []
     
     try:
-        # Initialize Google Custom Search API
+        # Initialize Google Custom Search API (the client library is slow to import)
+        from googleapiclient.discovery import build
         service = build("customsearch", "v1", developerKey=api_key)
         
         # Set up search parameters
@@ -5,14 +5,16 @@ import os
 import requests
 import logging
 from typing import List, Dict, Any, Optional
+from utils.monitoring.metrics import timed_image_search
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 # Pexels API configuration
 PEXELS_API_KEY = os.environ.get('PEXELS_API_KEY')
-PEXELS_API_URL = 'https://api.pexels.com/v1'
+PEXELS_API_URL = os.environ.get('PEXELS_API_URL', 'https://api.pexels.com/v1')
 
+@timed_image_search("pexels")
 def search_pexels_images(
     query: str,
     per_page: int = 20,
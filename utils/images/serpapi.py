@@ -8,6 +8,7 @@ import logging
 import requests
 import json
 from typing import List, Dict, Any, Optional, Union
+from utils.monitoring.metrics import timed_image_search
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 # SerpAPI key from environment (or Config)
 SERPAPI_KEY = os.environ.get("SERPAPI_KEY", "57d393880136bab7d3159bf1d56d251fa3945bf56e6d1fa3448199e7c10e069c")
 
+@timed_image_search("serpapi")
 def search_google_images_serpapi(
     query: str,
     per_page: int = 20,
@@ -2,14 +2,16 @@ import os
 import requests
 import logging
 from typing import List, Dict, Any, Optional
+from utils.monitoring.metrics import timed_image_search
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 # Get Unsplash API key from environment
 UNSPLASH_API_KEY = os.environ.get('UNSPLASH_API_KEY')
-UNSPLASH_API_URL = 'https://api.unsplash.com'
+UNSPLASH_API_URL = os.environ.get('UNSPLASH_API_URL', 'https://api.unsplash.com')
 
+@timed_image_search("unsplash")
 def search_unsplash_images(
     query: str,
     per_page: int = 20,
@@ -1,67 +1,246 @@
+"""
+Logging backend
+
+configure_logging() installs one non-blocking QueueHandler on the root
+logger. Records are put on a bounded in-memory queue as they are (message
+arguments unformatted) and a QueueListener thread formats them and writes
+the console and rotating file output, so the threads generating articles
+never wait on terminal or disk I/O. On top of that:
+
+- high-volume DEBUG records are sampled per call site,
+- formatted messages are capped at LOG_MAX_MESSAGE_CHARS,
+- records are dropped (and counted) instead of blocking when the queue is full.
+
+Pass large payloads as arguments wrapped in LazyJson
+(logger.debug("Request: %s", LazyJson(data))) so they are only serialised
+when the record is actually written, on the listener thread.
+"""
+import atexit
+import json
 import logging
 import os
-import json
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
 
-# Configure logger
+from config import Config
+
+# Structured events logger
 logger = logging.getLogger("zyga")
-logger.setLevel(logging.DEBUG)
-
-# Create log directory if it doesn't exist
-log_dir = "logs"
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-# Configure file handler with rotation
-file_handler = RotatingFileHandler(
-    os.path.join(log_dir, "zyga.log"),
-    maxBytes=10485760,  # 10MB
-    backupCount=5
-)
-file_handler.setLevel(logging.INFO)
-
-# Configure formatter
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-
-# Add handler to logger
-logger.addHandler(file_handler)
-
-# Configure console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_configure_lock = threading.Lock()
+
+# Logger name -> (path, level) of extra per-module log files
+_log_files: Dict[str, tuple] = {}
+
+
+def truncate(text: str, limit: Optional[int] = None) -> str:
+    """Cap a string at limit characters, noting how much was cut"""
+    limit = Config.LOG_MAX_MESSAGE_CHARS if limit is None else limit
+    if limit and len(text) > limit:
+        return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+    return text
+
+
+class LazyJson:
+    """
+    Log argument serialised to JSON only when the record is formatted.
+    Capped at half of LOG_MAX_MESSAGE_CHARS by default, leaving room for the
+    rest of the message.
+    """
+
+    __slots__ = ('value', 'limit')
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        try:
+            text = json.dumps(self.value, default=str, ensure_ascii=False)
+        except Exception as e:
+            text = f"<unserialisable {type(self.value).__name__}: {str(e)}>"
+        return truncate(text, self.limit if self.limit is not None else Config.LOG_MAX_MESSAGE_CHARS // 2)
+
+
+class DebugSampler(logging.Filter):
+    """
+    Passes every record above DEBUG. DEBUG records are counted per call site
+    (logger, line) in one-minute windows: the first `burst` pass, then one
+    in every `rate`.
+    """
+
+    def __init__(self, rate: int, burst: int = 10, window_seconds: float = 60.0):
+        super().__init__()
+        self.rate = max(1, rate)
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._counts: Dict[tuple, int] = {}
+        self._window_started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        key = (record.name, record.lineno)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_started >= self.window_seconds:
+                self._counts.clear()
+                self._window_started = now
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        return count <= self.burst or count % self.rate == 0
+
+
+class TruncatingFormatter(logging.Formatter):
+    """Formatter that caps the message part of each line"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = truncate(record.message)
+        return super().formatMessage(record)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener and never blocks the caller"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record needs no pickling and its
+        # arguments are formatted by the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level: Optional[str] = None) -> Optional[QueueListener]:
+    """
+    Route all logging through the background listener (idempotent).
+
+    Args:
+        level: Root log level name; defaults to Config.LOG_LEVEL
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _queue_handler
+
+    with _configure_lock:
+        root = logging.getLogger()
+        root.setLevel((level or Config.LOG_LEVEL).upper())
+        if _listener is not None:
+            return _listener
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(TruncatingFormatter(LOG_FORMAT))
+        handlers = [console_handler]
+
+        if Config.LOG_FILE:
+            # Structured events only, as before; other loggers go to the console
+            handlers.append(_file_handler(Config.LOG_FILE, logging.INFO, logger.name))
+        for logger_name, (path, file_level) in _log_files.items():
+            handlers.append(_file_handler(path, file_level, logger_name))
+
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=Config.LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(DebugSampler(Config.LOG_DEBUG_SAMPLE_RATE))
+
+        # Handlers installed earlier (basicConfig) would write synchronously
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+
+        _listener = QueueListener(_queue_handler.queue, *[h for h in handlers if h], respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def add_log_file(logger_name: str, path: str, level: int = logging.DEBUG):
+    """
+    Also write one logger's records (and its children's) to a rotating file of
+    its own. The file is opened by the listener on first write, so calling
+    this at import time touches nothing on disk.
+
+    Args:
+        logger_name: Logger whose records go to the file
+        path: Log file path
+        level: Lowest level written to the file
+    """
+    with _configure_lock:
+        _log_files[logger_name] = (path, level)
+        if _listener is not None:
+            handler = _file_handler(path, level, logger_name)
+            if handler:
+                _listener.handlers = _listener.handlers + (handler,)
+
+
+def _file_handler(path: str, level: int, logger_name: Optional[str] = None) -> Optional[logging.Handler]:
+    """Rotating file handler (10MB x 5), None if the directory can't be created"""
+    try:
+        log_dir = os.path.dirname(path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Log file {path} unavailable: {str(e)}")
+        return None
+    handler = RotatingFileHandler(path, maxBytes=10485760, backupCount=5, encoding='utf-8', delay=True)
+    handler.setLevel(level)
+    handler.setFormatter(TruncatingFormatter(LOG_FORMAT))
+    if logger_name:
+        handler.addFilter(logging.Filter(logger_name))
+    return handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    """Records dropped because the logging queue was full"""
+    return _queue_handler.dropped if _queue_handler else 0
+
 
 def log_event(event_type: str, data: Dict[str, Any], level: str = "info") -> None:
     """
     Log an event with structured data
-    
+
     Args:
         event_type: Type of event (e.g., "content_generation", "wordpress_publish")
         data: Event data dictionary
         level: Log level (debug, info, warning, error)
     """
+    levelno = logging.getLevelName(level.upper())
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    if not logger.isEnabledFor(levelno):
+        return
+
     log_data = {
         "timestamp": datetime.utcnow().isoformat(),
         "event_type": event_type,
         "data": data
     }
-    
-    log_json = json.dumps(log_data)
-    
-    if level == "debug":
-        logger.debug(log_json)
-    elif level == "info":
-        logger.info(log_json)
-    elif level == "warning":
-        logger.warning(log_json)
-    elif level == "error":
-        logger.error(log_json)
-    else:
-        logger.info(log_json)
+
+    logger.log(levelno, "%s", LazyJson(log_data))
 
 def log_api_request(api_name: str, request_data: Dict[str, Any], response: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
     """
@@ -8,31 +8,108 @@ Zapewnia funkcje do śledzenia:
 - Liczby użytych tokenów
 
 Pozwala na łatwe monitorowanie wydajności i szybkie wykrywanie problemów.
+Metryki trafiają do rejestru procesu (utils/monitoring/metrics.py) zamiast
+do osobnych plików JSON, więc panel czyta gotowe sumy zamiast plików.
 """
 
-import os
-import json
 import time
 import logging
-from datetime import datetime
-from pathlib import Path
+import threading
+from collections import deque
+from datetime import datetime, timedelta
 import re
 
+from utils.monitoring.metrics import SLOW_BUCKETS, peer_snapshots, registry
+
 # Konfiguracja logowania
 logger = logging.getLogger(__name__)
 
-# Domyślna lokalizacja dla przechowywania metryk
-METRICS_DIR = os.path.join("logs", "content_metrics")
+# Liczba ostatnich generacji pamiętanych do tabeli w panelu
+RECENT_LIMIT = 100
+
+# Liczba dni, dla których trzymane są dzienne sumy
+DAILY_RETENTION_DAYS = 90
+
+CONTENT_GENERATIONS = registry.counter(
+    "content_generations_total", "Finished article generations", ("generation_type", "status"))
+CONTENT_GENERATION_SECONDS = registry.histogram(
+    "content_generation_seconds", "Article generation duration", ("generation_type",), SLOW_BUCKETS)
+CONTENT_WORDS = registry.histogram(
+    "content_generation_words", "Words in generated articles", ("generation_type",),
+    (300, 500, 800, 1000, 1200, 1500, 2000, 3000))
+
+
+class ContentStats:
+    """
+    Zagregowane metryki generowania treści tego procesu: sumy dzienne
+    i ostatnie generacje. Aktualizacja i odczyt w O(1) względem liczby
+    generacji; stan trafia do snapshotów rejestru metryk.
+    """
+
+    def __init__(self):
+        self._daily = {}
+        self._recent = deque(maxlen=RECENT_LIMIT)
+        self._lock = threading.Lock()
+
+    def record(self, metrics):
+        date = (metrics.get("timestamp_start") or datetime.now().isoformat()).split("T")[0]
+        with self._lock:
+            day = self._daily.setdefault(date, {
+                "successful": 0, "failed": 0, "total_duration": 0.0, "total_words": 0,
+                "total_paragraphs": 0, "total_tokens": 0, "token_generations": 0
+            })
+            if metrics["success"]:
+                day["successful"] += 1
+                day["total_duration"] += metrics["duration_seconds"]
+                day["total_words"] += metrics["content_length_words"]
+                day["total_paragraphs"] += metrics["paragraphs_count"]
+                if metrics.get("tokens_used", 0) > 0:
+                    day["total_tokens"] += metrics["tokens_used"]
+                    day["token_generations"] += 1
+            else:
+                day["failed"] += 1
+            self._recent.appendleft(dict(metrics))
+
+            cutoff = (datetime.now() - timedelta(days=DAILY_RETENTION_DAYS)).strftime("%Y-%m-%d")
+            for old in [d for d in self._daily if d < cutoff]:
+                del self._daily[old]
+
+    def snapshot(self):
+        with self._lock:
+            return {"daily": {date: dict(day) for date, day in self._daily.items()},
+                    "recent": list(self._recent)}
+
+
+content_stats = ContentStats()
+registry.add_snapshot_section("content", content_stats.snapshot)
+
+
+def _all_states():
+    """Stan tego procesu oraz zapisane stany pozostałych (workerów, poprzednich uruchomień)"""
+    states = [content_stats.snapshot()]
+    states.extend(peer.get("content") or {"daily": {}, "recent": []} for peer in peer_snapshots())
+    return states
+
+
+def get_daily_totals(days=7):
+    """Dzienne sumy z ostatnich X dni, połączone ze wszystkich procesów"""
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    totals = {}
+    for state in _all_states():
+        for date, day in state["daily"].items():
+            if date < cutoff:
+                continue
+            merged = totals.setdefault(date, dict.fromkeys(day, 0))
+            for key, value in day.items():
+                merged[key] = merged.get(key, 0) + value
+    return totals
 
-# Upewnij się, że katalog istnieje
-os.makedirs(METRICS_DIR, exist_ok=True)
 
 class ContentMetricsTracker:
     """Klasa do śledzenia metryk generowania treści"""
     
-    def __init__(self, metrics_dir=METRICS_DIR):
-        """Inicjalizacja trackera metryk"""
-        self.metrics_dir = metrics_dir
+    def __init__(self, metrics_dir=None):
+        """Inicjalizacja trackera metryk (metrics_dir pozostawiony dla zgodności, nieużywany)"""
         self.current_metrics = {
             "timestamp_start": "",
             "timestamp_end": "",
@@ -46,9 +123,7 @@ class ContentMetricsTracker:
             "tokens_used": 0,
             "error": None
         }
-        
-        # Upewnij się, że katalog metryk istnieje
-        os.makedirs(self.metrics_dir, exist_ok=True)
+        self._started = None
     
     def start_tracking(self, topic, generation_type):
         """Rozpocznij śledzenie generowania artykułu"""
@@ -65,16 +140,15 @@ class ContentMetricsTracker:
             "tokens_used": 0,
             "error": None
         }
+        self._started = time.monotonic()
         logger.info(f"Rozpoczęto śledzenie generowania artykułu: {topic} (metoda: {generation_type})")
         return self
     
     def end_tracking(self, success=True, error=None):
-        """Zakończ śledzenie i zapisz metryki"""
-        end_time = datetime.now()
-        start_time = datetime.fromisoformat(self.current_metrics["timestamp_start"])
-        duration = (end_time - start_time).total_seconds()
+        """Zakończ śledzenie i zapisz metryki w rejestrze"""
+        duration = time.monotonic() - self._started if self._started is not None else 0.0
         
-        self.current_metrics["timestamp_end"] = end_time.isoformat()
+        self.current_metrics["timestamp_end"] = datetime.now().isoformat()
         self.current_metrics["duration_seconds"] = duration
         self.current_metrics["success"] = success
         if error:
@@ -82,11 +156,9 @@ class ContentMetricsTracker:
         
         self._save_metrics()
         
-        logger.info(f"Zakończono śledzenie generowania artykułu: {self.current_metrics['topic']}")
-        logger.info(f"Czas generowania: {duration:.2f} sekund")
-        logger.info(f"Status: {'Sukces' if success else 'Błąd'}")
-        if self.current_metrics["content_length_words"] > 0:
-            logger.info(f"Długość artykułu: {self.current_metrics['content_length_words']} słów")
+        logger.info(f"Zakończono śledzenie generowania artykułu: {self.current_metrics['topic']} "
+                    f"({duration:.2f} s, {'sukces' if success else 'błąd'}, "
+                    f"{self.current_metrics['content_length_words']} słów)")
         return self.current_metrics
     
     def set_content_metrics(self, content):
@@ -98,9 +170,7 @@ class ContentMetricsTracker:
         self.current_metrics["content_length_chars"] = len(content)
         
         # Liczba słów (przybliżona, po usunięciu tagów HTML)
-        clean_content = re.sub(r'<[^>]*>', ' ', content)
-        words = clean_content.split()
-        self.current_metrics["content_length_words"] = len(words)
+        self.current_metrics["content_length_words"] = self.count_words(content)
         
         # Liczba akapitów
         self.current_metrics["paragraphs_count"] = content.count("<p>")
@@ -113,17 +183,15 @@ class ContentMetricsTracker:
         return self
     
     def _save_metrics(self):
-        """Zapisz metryki do pliku JSON"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        topic_slug = self.current_metrics["topic"].lower().replace(" ", "_")[:30]
-        filename = f"metrics_{topic_slug}_{timestamp}.json"
-        filepath = os.path.join(self.metrics_dir, filename)
-        
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self.current_metrics, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"Zapisano metryki do pliku: {filepath}")
-        return filepath
+        """Zapisz metryki w rejestrze (liczniki, histogramy, sumy dzienne)"""
+        metrics = self.current_metrics
+        generation_type = metrics["generation_type"] or "unknown"
+        CONTENT_GENERATIONS.inc(generation_type=generation_type, status="success" if metrics["success"] else "failed")
+        if metrics["success"]:
+            CONTENT_GENERATION_SECONDS.observe(metrics["duration_seconds"], generation_type=generation_type)
+            if metrics["content_length_words"]:
+                CONTENT_WORDS.observe(metrics["content_length_words"], generation_type=generation_type)
+        content_stats.record(metrics)
     
     @staticmethod
     def count_words(text):
@@ -137,51 +205,25 @@ class ContentMetricsTracker:
     @staticmethod
     def get_recent_metrics(limit=10):
         """Pobiera ostatnie metryki generowania treści"""
-        metrics_files = sorted(
-            Path(METRICS_DIR).glob("metrics_*.json"),
-            key=os.path.getmtime,
-            reverse=True
-        )[:limit]
-        
-        metrics = []
-        for file in metrics_files:
-            try:
-                with open(file, "r", encoding="utf-8") as f:
-                    metrics.append(json.load(f))
-            except Exception as e:
-                logger.error(f"Błąd podczas odczytu pliku metryk {file}: {str(e)}")
-        
-        return metrics
+        recent = [metric for state in _all_states() for metric in state["recent"]]
+        recent.sort(key=lambda metric: metric.get("timestamp_start", ""), reverse=True)
+        return recent[:limit]
     
     @staticmethod
     def calculate_average_metrics(days=7):
-        """Oblicza średnie metryki z ostatnich X dni"""
-        # Oblicz datę graniczną
-        cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        
-        metrics_files = Path(METRICS_DIR).glob("metrics_*.json")
-        successful_generations = []
-        failed_generations = []
-        
-        for file in metrics_files:
-            # Sprawdź czy plik jest młodszy niż X dni
-            if os.path.getmtime(file) >= cutoff_date:
-                try:
-                    with open(file, "r", encoding="utf-8") as f:
-                        metrics = json.load(f)
-                        if metrics["success"]:
-                            successful_generations.append(metrics)
-                        else:
-                            failed_generations.append(metrics)
-                except Exception as e:
-                    logger.error(f"Błąd podczas odczytu pliku metryk {file}: {str(e)}")
+        """Oblicza średnie metryki z ostatnich X dni (z sum dziennych)"""
+        totals = {}
+        for day in get_daily_totals(days).values():
+            for key, value in day.items():
+                totals[key] = totals.get(key, 0) + value
+        successful = totals.get("successful", 0)
+        failed = totals.get("failed", 0)
         
-        # Oblicz średnie dla udanych generacji
         avg_metrics = {
             "period_days": days,
-            "total_generations": len(successful_generations) + len(failed_generations),
-            "successful_generations": len(successful_generations),
-            "failed_generations": len(failed_generations),
+            "total_generations": successful + failed,
+            "successful_generations": successful,
+            "failed_generations": failed,
             "success_rate": 0,
             "avg_duration_seconds": 0,
             "avg_content_length_words": 0,
@@ -190,17 +232,16 @@ class ContentMetricsTracker:
         }
         
         if avg_metrics["total_generations"] > 0:
-            avg_metrics["success_rate"] = len(successful_generations) / avg_metrics["total_generations"]
+            avg_metrics["success_rate"] = successful / avg_metrics["total_generations"]
         
-        if successful_generations:
-            avg_metrics["avg_duration_seconds"] = sum(m["duration_seconds"] for m in successful_generations) / len(successful_generations)
-            avg_metrics["avg_content_length_words"] = sum(m["content_length_words"] for m in successful_generations) / len(successful_generations)
-            avg_metrics["avg_paragraphs_count"] = sum(m["paragraphs_count"] for m in successful_generations) / len(successful_generations)
+        if successful:
+            avg_metrics["avg_duration_seconds"] = totals["total_duration"] / successful
+            avg_metrics["avg_content_length_words"] = totals["total_words"] / successful
+            avg_metrics["avg_paragraphs_count"] = totals["total_paragraphs"] / successful
             
             # Tokeny mogą nie być dostępne we wszystkich metrykach
-            tokens_metrics = [m for m in successful_generations if m.get("tokens_used", 0) > 0]
-            if tokens_metrics:
-                avg_metrics["avg_tokens_used"] = sum(m["tokens_used"] for m in tokens_metrics) / len(tokens_metrics)
+            if totals.get("token_generations"):
+                avg_metrics["avg_tokens_used"] = totals["total_tokens"] / totals["token_generations"]
         
         return avg_metrics
 
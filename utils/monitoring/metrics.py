@@ -0,0 +1,379 @@
+"""
+In-process metrics registry
+
+Counters, gauges and histograms with labels, updated in O(1) by the code
+doing the work (LLM calls, image searches, WordPress requests, workflow
+steps) and rendered in the Prometheus text format at /monitoring/metrics.
+
+Each process also stores a compact snapshot of its state in the
+metrics_snapshot table every METRICS_SNAPSHOT_SECONDS, so dashboards can
+combine the web process with job queue workers, and history survives
+restarts.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import Config
+from utils.monitoring.tracing import KIND_CLIENT, tracer
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds; LLM and workflow stages take far longer than HTTP calls
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SLOW_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class: one named metric with a fixed set of label names"""
+
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelKey, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: str = '') -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def samples(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            return [(key, self._copy(value)) for key, value in self._values.items()]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, value in sorted(self.samples()):
+            lines.append(f"{self.name}{self._labels(key)} {_format_value(value)}")
+        return lines
+
+    def snapshot(self) -> List[list]:
+        return [[list(key), value] for key, value in self.samples()]
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Observations counted in fixed buckets, with their sum and count"""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = HTTP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (not cumulative) counts, sum, count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[Dict[str, Any]]:
+        """
+        Observe the duration of a block. The yielded dict holds the labels and
+        may be updated inside the block; a "status" label, if declared, is set
+        to "error" when the block raises and defaults to "ok".
+        """
+        labels = dict(labels)
+        started = time.monotonic()
+        try:
+            yield labels
+        except BaseException:
+            if 'status' in self.labelnames:
+                labels['status'] = 'error'
+            raise
+        finally:
+            if 'status' in self.labelnames:
+                labels.setdefault('status', 'ok')
+            self.observe(time.monotonic() - started, **labels)
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1], value[2]]
+
+    def summary(self) -> Dict[LabelKey, Dict[str, float]]:
+        """Count and mean per label set"""
+        return {
+            key: {"count": state[2], "avg": state[1] / state[2] if state[2] else 0.0}
+            for key, state in self.samples()
+        }
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, (counts, total, count) in sorted(self.samples()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of this process, plus extra sections stored in snapshots"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._sections: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = HTTP_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def add_snapshot_section(self, name: str, collect: Callable[[], Any]):
+        """Store collect() under `name` in every snapshot of this process"""
+        self._sections[name] = collect
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = {
+            "metrics": {
+                name: {"type": metric.type, "labels": list(metric.labelnames), "samples": metric.snapshot()}
+                for name, metric in self._metrics.items()
+            }
+        }
+        for name, collect in self._sections.items():
+            try:
+                state[name] = collect()
+            except Exception as e:
+                logger.warning(f"Metrics snapshot section {name} failed: {str(e)}")
+        return state
+
+
+registry = MetricsRegistry()
+
+# --- Application metrics -------------------------------------------------------
+
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_seconds", "LLM completion request latency", ("model", "status"), SLOW_BUCKETS)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens reported by the LLM provider", ("model", "kind"))
+IMAGE_SEARCH_SECONDS = registry.histogram(
+    "image_search_seconds", "Image search latency per provider", ("provider", "status"))
+WORDPRESS_REQUEST_SECONDS = registry.histogram(
+    "wordpress_request_seconds", "WordPress REST API request latency", ("endpoint", "method", "status"))
+WORKFLOW_STAGE_SECONDS = registry.histogram(
+    "workflow_stage_seconds", "Duration of automation workflow steps", ("stage", "status"), SLOW_BUCKETS)
+
+WP_ID_PATTERN = re.compile(r'/\d+(?=/|$)')
+
+
+def wordpress_endpoint(url: str) -> str:
+    """Low-cardinality endpoint label of a WordPress REST URL (/wp/v2/posts/12 -> posts/:id)"""
+    path = url.split('?', 1)[0]
+    marker = path.find('/wp/v2/')
+    path = path[marker + len('/wp/v2/'):] if marker >= 0 else path.rsplit('/', 1)[-1]
+    return WP_ID_PATTERN.sub('/:id', '/' + path.strip('/'))[1:] or 'root'
+
+
+@contextmanager
+def time_wordpress_request(method: str, url: str) -> Iterator[Dict[str, Any]]:
+    """Time (and trace) a WordPress request; set labels["status"] to the HTTP status inside the block"""
+    endpoint = wordpress_endpoint(url)
+    with tracer.span(f"wordpress {method.upper()} {endpoint}", KIND_CLIENT,
+                     {"http.method": method.upper(), "http.url": url.split('?', 1)[0]}) as span, \
+            WORDPRESS_REQUEST_SECONDS.time(endpoint=endpoint, method=method.upper()) as labels:
+        yield labels
+        if span is not None and labels.get("status"):
+            span.set_attribute("http.status_code", labels["status"])
+
+
+def timed_image_search(provider: str):
+    """Decorator recording the latency (and a trace span) of an image provider search function"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(f"image_search {provider}", KIND_CLIENT, {"image.provider": provider}) as span, \
+                    IMAGE_SEARCH_SECONDS.time(provider=provider) as labels:
+                results = func(*args, **kwargs)
+                if not results:
+                    labels['status'] = 'empty'
+                if span is not None:
+                    span.set_attribute("image.results", len(results or []))
+                return results
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(model: str, usage: Optional[Dict[str, Any]]):
+    """Count prompt/completion tokens from an OpenAI-style usage block"""
+    if not usage:
+        return
+    for kind in ('prompt_tokens', 'completion_tokens'):
+        if usage.get(kind):
+            LLM_TOKENS.inc(usage[kind], model=model, kind=kind.split('_')[0])
+
+
+# --- Snapshots ---------------------------------------------------------------
+
+NODE_STARTED_AT = datetime.utcnow()
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}:{int(NODE_STARTED_AT.timestamp())}"
+
+_snapshot_thread: Optional[threading.Thread] = None
+_snapshot_stop = threading.Event()
+_peer_cache: Tuple[float, List[Dict[str, Any]]] = (0.0, [])
+_peer_lock = threading.Lock()
+
+
+def store_snapshot():
+    """Write this process's state to metrics_snapshot and prune rows past retention"""
+    from sqlalchemy.orm import Session
+    from app import app, db
+    from models import MetricsSnapshot
+
+    payload = json.dumps(registry.snapshot(), separators=(',', ':'), default=str)
+    now = datetime.utcnow()
+    with app.app_context():
+        with Session(db.engine) as session:
+            row = session.get(MetricsSnapshot, NODE_ID)
+            if row is None:
+                session.add(MetricsSnapshot(node=NODE_ID, started_at=NODE_STARTED_AT, taken_at=now, payload=payload))
+            else:
+                row.taken_at = now
+                row.payload = payload
+            session.query(MetricsSnapshot).filter(
+                MetricsSnapshot.taken_at < now - timedelta(days=Config.METRICS_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+            session.commit()
+
+
+def peer_snapshots() -> List[Dict[str, Any]]:
+    """
+    Stored states of other processes (including ones that have exited), read
+    at most once per snapshot interval.
+    """
+    global _peer_cache
+    from flask import has_app_context
+
+    with _peer_lock:
+        loaded_at, states = _peer_cache
+        if time.monotonic() - loaded_at < Config.METRICS_SNAPSHOT_SECONDS or not has_app_context():
+            return states
+        try:
+            from models import MetricsSnapshot
+            rows = MetricsSnapshot.query.filter(MetricsSnapshot.node != NODE_ID).all()
+            states = [json.loads(row.payload) for row in rows]
+        except Exception as e:
+            logger.warning(f"Could not read metrics snapshots: {str(e)}")
+        _peer_cache = (time.monotonic(), states)
+        return states
+
+
+def start_snapshots():
+    """Store a snapshot every METRICS_SNAPSHOT_SECONDS on a daemon thread (idempotent)"""
+    global _snapshot_thread
+    if _snapshot_thread is not None and _snapshot_thread.is_alive():
+        return
+
+    def run():
+        while not _snapshot_stop.wait(Config.METRICS_SNAPSHOT_SECONDS):
+            try:
+                store_snapshot()
+            except Exception as e:
+                logger.warning(f"Could not store metrics snapshot: {str(e)}")
+
+    _snapshot_stop.clear()
+    _snapshot_thread = threading.Thread(target=run, name="metrics-snapshot", daemon=True)
+    _snapshot_thread.start()
+    atexit.register(stop_snapshots)
+
+
+def stop_snapshots():
+    """Stop the snapshot thread and store a final snapshot"""
+    _snapshot_stop.set()
+    try:
+        store_snapshot()
+    except Exception as e:
+        logger.warning(f"Could not store final metrics snapshot: {str(e)}")
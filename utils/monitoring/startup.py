@@ -0,0 +1,72 @@
+"""
+Startup-time report
+
+Records how long each phase of process startup takes (creating the app,
+importing and registering each route module, creating tables, starting the
+schedulers) so slow cold starts can be traced to the module or client that
+causes them. The report is logged once startup completes, exported as the
+startup_phase_seconds gauge and served at /monitoring/api/startup.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Startup is measured from the first import of this module, which app.py
+# imports before anything else
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupReport:
+    """Ordered list of timed startup phases for this process"""
+
+    def __init__(self):
+        self._phases: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.completed_after = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one startup phase (failures are recorded too)"""
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            with self._lock:
+                self._phases.append({"phase": name, "seconds": round(seconds, 4), "status": status,
+                                     "offset": round(started - PROCESS_STARTED, 4)})
+
+    def complete(self):
+        """Mark startup as finished, log the summary and export the gauge"""
+        self.completed_after = round(time.perf_counter() - PROCESS_STARTED, 4)
+        report = self.as_dict()
+
+        from utils.monitoring.metrics import registry
+        gauge = registry.get("startup_phase_seconds") or registry.gauge(
+            "startup_phase_seconds", "Duration of each process startup phase", ["phase"])
+        for item in report["phases"]:
+            gauge.set(item["seconds"], phase=item["phase"])
+
+        slowest = sorted(report["phases"], key=lambda item: item["seconds"], reverse=True)[:5]
+        logger.info(f"Startup completed in {self.completed_after:.2f}s; slowest phases: " +
+                    ", ".join(f"{item['phase']} {item['seconds']:.2f}s" for item in slowest))
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = list(self._phases)
+        return {
+            "completed_after_seconds": self.completed_after,
+            "since_start_seconds": round(time.perf_counter() - PROCESS_STARTED, 4),
+            "phases": phases,
+        }
+
+
+startup_report = StartupReport()
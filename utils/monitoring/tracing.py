@@ -0,0 +1,513 @@
+"""
+Workflow tracing
+
+A small tracer with the OpenTelemetry span model (32-hex trace IDs, 16-hex
+span IDs, parent links, kinds, attributes, status, nanosecond times).
+Spans are opened around LLM calls, WordPress and image provider requests,
+SQL statements and workflow steps; each automation workflow is one trace
+whose ID is derived from its workflow_id.
+
+Only workflows start traces: instrumented calls made outside a trace (web
+requests, scripts) record nothing.
+
+Finished spans go to a bounded queue and are written in batches by a
+background thread, either to a size-capped, rotated local JSONL file (one
+span per line) or to an OTLP/HTTP collector as OTLP JSON. The most recent
+traces are also kept in memory for the waterfall view in
+routes_monitoring.py.
+"""
+import atexit
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Span kinds (OTLP enum values)
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# Status codes (OTLP enum values)
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Spans written per batch, recent traces kept in memory, longest SQL kept in a span
+EXPORT_BATCH_SIZE = 256
+RECENT_TRACES = 200
+MAX_STATEMENT_CHARS = 500
+
+# Traces whose file offsets the JSONL exporter remembers, and how much of the
+# end of the file is searched for traces it does not know (written by other processes)
+INDEXED_TRACES = 10000
+LOOKUP_TAIL_BYTES = 8 * 1024 * 1024
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def trace_id_for(key: str) -> str:
+    """Stable trace ID for a workflow_id (or any other key)"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_span_id', 'name', 'kind', 'attributes',
+                 'start_time_unix_nano', 'end_time_unix_nano', 'status_code', 'status_message')
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_status(self, code: int, message: str = ""):
+        self.status_code = code
+        self.status_message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class JsonlExporter:
+    """
+    Appends finished spans to a JSONL file.
+
+    The file is rotated (path.1 ... path.N) once it reaches max_bytes, and the
+    byte range of every trace written by this process is indexed, so a trace
+    is read back without scanning the files.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, backups: int = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        # Rotations so far; an index entry's file is path.(epoch - entry epoch)
+        self._epoch = 0
+        # trace_id -> [(epoch, first byte, end byte)], one range per file the trace is in
+        self._index: "OrderedDict[str, List[tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Dict[str, Any]]):
+        lines = [(span["trace_id"], (json.dumps(span, default=str, separators=(',', ':')) + '\n').encode('utf-8'))
+                 for span in spans]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self.max_bytes and size and size + sum(len(line) for _, line in lines) > self.max_bytes:
+                self._rotate()
+                size = 0
+
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(line for _, line in lines))
+
+            for trace_id, line in lines:
+                ranges = self._index.get(trace_id)
+                if ranges is None:
+                    ranges = self._index[trace_id] = []
+                else:
+                    self._index.move_to_end(trace_id)
+                if ranges and ranges[-1][0] == self._epoch:
+                    ranges[-1] = (self._epoch, ranges[-1][1], size + len(line))
+                else:
+                    ranges.append((self._epoch, size, size + len(line)))
+                size += len(line)
+            while len(self._index) > INDEXED_TRACES:
+                self._index.popitem(last=False)
+
+    def _rotate(self):
+        for number in range(self.backups, 0, -1):
+            source = self.path if number == 1 else f"{self.path}.{number - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{number}")
+        if not self.backups:
+            os.remove(self.path)
+        self._epoch += 1
+
+    def read_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of a trace: its indexed byte ranges, or else the end of the current file"""
+        with self._lock:
+            ranges = list(self._index.get(trace_id, []))
+            epoch = self._epoch
+
+        tail = not ranges
+        if tail:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            ranges = [(epoch, max(0, size - LOOKUP_TAIL_BYTES), size)]
+
+        needle = trace_id.encode('utf-8')
+        spans = []
+        for range_epoch, start, end in ranges:
+            age = epoch - range_epoch
+            path = self.path if age == 0 else f"{self.path}.{age}"
+            if age > self.backups or not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                f.seek(start)
+                chunk = f.read(end - start)
+            if tail and start:
+                # Drop the partial first line of the tail
+                chunk = chunk.split(b'\n', 1)[-1]
+            spans.extend(json.loads(line) for line in chunk.splitlines() if needle in line)
+        return spans
+
+
+class OtlpHttpExporter:
+    """Posts finished spans to an OTLP/HTTP collector (JSON encoding)"""
+
+    def __init__(self, endpoint: str, service_name: str = "auto-blog-agent"):
+        self.endpoint = endpoint.rstrip('/')
+        if not self.endpoint.endswith('/v1/traces'):
+            self.endpoint += '/v1/traces'
+        self.service_name = service_name
+
+    def export(self, spans: List[Dict[str, Any]]):
+        import requests
+
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span["trace_id"],
+                "spanId": span["span_id"],
+                "name": span["name"],
+                "kind": span["kind"],
+                "startTimeUnixNano": str(span["start_time_unix_nano"]),
+                "endTimeUnixNano": str(span["end_time_unix_nano"]),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span["attributes"].items()],
+                "status": span["status"],
+            }
+            if span["parent_span_id"]:
+                otlp_span["parentSpanId"] = span["parent_span_id"]
+            otlp_spans.append(otlp_span)
+
+        body = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+        }]}
+        requests.post(self.endpoint, json=body, timeout=10).raise_for_status()
+
+
+class Tracer:
+    """Creates spans, keeps recent traces and exports finished spans in the background"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10000)
+        self._recent: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._exporter = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return Config.TRACING_ENABLED
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+             trace_id: Optional[str] = None) -> Iterator[Optional[Span]]:
+        """
+        Open a span as a child of the current one.
+
+        Args:
+            name: Span name
+            kind: KIND_INTERNAL, KIND_CLIENT or KIND_SERVER
+            attributes: Initial attributes
+            trace_id: Start a new trace with this ID (workflows); without
+                one, a span is only recorded inside an existing trace
+
+        Yields:
+            The span (None when tracing is disabled or there is no trace)
+        """
+        parent = _current_span.get()
+        if not self.enabled or (parent is None and not trace_id):
+            yield None
+            return
+
+        if trace_id:
+            span = Span(name, trace_id, None, kind, attributes)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, kind, attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_status(STATUS_ERROR, f"{type(e).__name__}: {str(e)[:200]}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    def start_child(self, name: str, kind: int = KIND_INTERNAL,
+                    attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """Start a span under the current one without making it current (None if there is no trace)"""
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            return None
+        return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+
+    def end(self, span: Span):
+        """Finish a span and hand it to the exporter"""
+        span.end_time_unix_nano = time.time_ns()
+        data = span.to_dict()
+        with self._recent_lock:
+            spans = self._recent.get(span.trace_id)
+            if spans is None:
+                spans = self._recent[span.trace_id] = []
+                while len(self._recent) > RECENT_TRACES:
+                    self._recent.popitem(last=False)
+            else:
+                self._recent.move_to_end(span.trace_id)
+            spans.append(data)
+
+        self._ensure_exporter()
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+
+    # --- Reading -----------------------------------------------------------------
+
+    def recent_traces(self) -> List[Dict[str, Any]]:
+        """Summaries of the traces kept in memory, newest first"""
+        with self._recent_lock:
+            traces = [(trace_id, list(spans)) for trace_id, spans in self._recent.items()]
+        summaries = []
+        for trace_id, spans in reversed(traces):
+            root = next((span for span in spans if not span["parent_span_id"]), spans[0])
+            start = min(span["start_time_unix_nano"] for span in spans)
+            end = max(span["end_time_unix_nano"] for span in spans)
+            summaries.append({
+                "trace_id": trace_id,
+                "name": root["name"],
+                "workflow_id": root["attributes"].get("workflow.id"),
+                "start_time_unix_nano": start,
+                "duration_ms": (end - start) / 1e6,
+                "span_count": len(spans),
+                "error": any(span["status"]["code"] == STATUS_ERROR for span in spans),
+            })
+        return summaries
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of a trace from memory, or from the JSONL file if it was evicted or recorded elsewhere"""
+        with self._recent_lock:
+            spans = list(self._recent.get(trace_id, []))
+        if spans:
+            return spans
+        self._ensure_exporter()
+        if isinstance(self._exporter, JsonlExporter):
+            return self._exporter.read_trace(trace_id)
+        return []
+
+    # --- Export --------------------------------------------------------------------
+
+    def _ensure_exporter(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            if Config.TRACING_EXPORTER == 'otlp' and Config.TRACING_OTLP_ENDPOINT:
+                self._exporter = OtlpHttpExporter(Config.TRACING_OTLP_ENDPOINT)
+            elif Config.TRACING_EXPORTER == 'jsonl' and Config.TRACING_JSONL_PATH:
+                self._exporter = JsonlExporter(Config.TRACING_JSONL_PATH, Config.TRACING_JSONL_MAX_BYTES,
+                                               Config.TRACING_JSONL_BACKUPS)
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + Config.TRACING_EXPORT_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def _export(self, batch: List[Dict[str, Any]]):
+        if not self._exporter or not batch:
+            return
+        try:
+            self._exporter.export(batch)
+        except Exception as e:
+            logger.warning(f"Could not export {len(batch)} spans: {str(e)}")
+
+    def flush(self):
+        """Export everything queued so far on the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._export(batch)
+
+
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None, kind: int = KIND_INTERNAL,
+           attributes: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+    """
+    Decorator opening a span around each call.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+        kind: Span kind
+        attributes: Optional function of the call's arguments (a dict by
+            parameter name, defaults applied) returning span attributes
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            span_attributes = None
+            if attributes and tracer.enabled:
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    span_attributes = attributes(bound.arguments)
+                except Exception:
+                    span_attributes = None
+            with tracer.span(span_name, kind, span_attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_sqlalchemy():
+    """Record a client span for every SQL statement run inside an active trace (all engines)"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_child(statement.split(None, 1)[0].upper() if statement else "SQL", KIND_CLIENT, {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:MAX_STATEMENT_CHARS],
+    })
+    if span is not None:
+        conn.info.setdefault('_trace_spans', []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get('_trace_spans')
+    if spans:
+        span = spans.pop()
+        rowcount = getattr(cursor, 'rowcount', None)
+        if rowcount is not None and rowcount >= 0:
+            span.set_attribute("db.rowcount", rowcount)
+        tracer.end(span)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get('_trace_spans') if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.set_status(STATUS_ERROR, str(exception_context.original_exception)[:200])
+        tracer.end(span)
+
+
+def waterfall(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Lay spans out for a waterfall chart: depth-first order under their
+    parents, with offsets and widths as percentages of the trace duration.
+    """
+    if not spans:
+        return {"rows": [], "duration_ms": 0}
+    start = min(span["start_time_unix_nano"] for span in spans)
+    end = max(span["end_time_unix_nano"] or span["start_time_unix_nano"] for span in spans)
+    total = max(end - start, 1)
+
+    by_id = {span["span_id"]: span for span in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        parent = span["parent_span_id"] if span["parent_span_id"] in by_id else None
+        children.setdefault(parent, []).append(span)
+
+    rows = []
+
+    def visit(parent_id: Optional[str], depth: int):
+        for span in sorted(children.get(parent_id, []), key=lambda s: s["start_time_unix_nano"]):
+            span_end = span["end_time_unix_nano"] or span["start_time_unix_nano"]
+            rows.append({
+                "name": span["name"],
+                "depth": depth,
+                "offset_pct": 100.0 * (span["start_time_unix_nano"] - start) / total,
+                "width_pct": max(100.0 * (span_end - span["start_time_unix_nano"]) / total, 0.2),
+                "start_ms": (span["start_time_unix_nano"] - start) / 1e6,
+                "duration_ms": (span_end - span["start_time_unix_nano"]) / 1e6,
+                "error": span["status"]["code"] == STATUS_ERROR,
+                "attributes": span["attributes"],
+            })
+            visit(span["span_id"], depth + 1)
+
+    visit(None, 0)
+    return {"rows": rows, "duration_ms": total / 1e6}
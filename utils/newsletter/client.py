@@ -7,6 +7,8 @@ import logging
 import requests
 from typing import Dict, List, Any, Optional, Union
 
+from config import Config
+
 logger = logging.getLogger(__name__)
 
 class EmailOctopusClient:
@@ -22,7 +24,7 @@ class EmailOctopusClient:
         """
         self.api_key = api_key or os.environ.get('EMAILOCTOPUS_API_KEY')
         self.list_id = list_id or os.environ.get('EMAILOCTOPUS_LIST_ID')
-        self.base_url = "https://emailoctopus.com/api/1.6"
+        self.base_url = Config.EMAILOCTOPUS_API_URL
         
         if not self.api_key:
             logger.warning("EmailOctopus API key not set. Functionality will be limited.")
@@ -6,12 +6,51 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 
+from sqlalchemy.orm import joinedload
+
 from app import db
+from config import Config
 from models import Blog, Newsletter, Subscriber, NewsletterConfig
 from utils.newsletter.client import EmailOctopusClient
+from utils.newsletter.subscriber_sync import sync_subscribers
 
 logger = logging.getLogger(__name__)
 
+
+def weekly_titles(blog: Blog, scheduled_for: datetime) -> Dict[str, str]:
+    """Title and subject of a blog's weekly newsletter"""
+    return {
+        "title": f"{blog.name} Weekly Newsletter - {scheduled_for.strftime('%B %d, %Y')}",
+        "subject": f"Weekly Update from {blog.name} - {scheduled_for.strftime('%B %d')}"
+    }
+
+
+def last_weekly_slot(config: NewsletterConfig, now: datetime) -> Optional[datetime]:
+    """
+    Most recent weekly send time (send_day at send_time) not later than now
+    
+    Args:
+        config: Newsletter configuration of the blog
+        now: Current time
+        
+    Returns:
+        Send time or None if send_day/send_time are invalid
+    """
+    try:
+        send_hour, send_minute = map(int, (config.send_time or '10:00').split(':'))
+        slot = now.replace(hour=send_hour, minute=send_minute, second=0, microsecond=0)
+    except ValueError:
+        logger.warning(f"Invalid newsletter send time {config.send_time!r} for blog ID {config.blog_id}")
+        return None
+    if config.send_day is None or not 0 <= config.send_day <= 6:
+        return None
+    
+    slot -= timedelta(days=(now.weekday() - config.send_day) % 7)
+    if slot > now:
+        slot -= timedelta(days=7)
+    return slot
+
+
 class NewsletterDistributor:
     """Newsletter distribution system"""
     
@@ -19,12 +58,13 @@ class NewsletterDistributor:
         """Initialize newsletter distributor"""
         self.email_clients = {}  # Cache for EmailOctopus clients by blog_id
     
-    def get_email_client(self, blog_id: int) -> Optional[EmailOctopusClient]:
+    def get_email_client(self, blog_id: int, config: Optional[NewsletterConfig] = None) -> Optional[EmailOctopusClient]:
         """
         Get or create EmailOctopus client for a blog
         
         Args:
             blog_id: Blog ID
+            config: Newsletter configuration of the blog, if already loaded
             
         Returns:
             EmailOctopus client instance or None if not configured
@@ -34,7 +74,8 @@ class NewsletterDistributor:
             return self.email_clients[blog_id]
         
         # Get newsletter configuration
-        config = NewsletterConfig.query.filter_by(blog_id=blog_id).first()
+        if config is None:
+            config = NewsletterConfig.query.filter_by(blog_id=blog_id).first()
         if not config or not config.enabled or not config.email_octopus_api_key:
             logger.error(f"Newsletter not properly configured for blog ID {blog_id}")
             return None
@@ -75,11 +116,28 @@ class NewsletterDistributor:
             return {"error": f"Blog with ID {blog_id} not found"}
         
         config = NewsletterConfig.query.filter_by(blog_id=blog_id).first()
+        return self._dispatch(newsletter, blog, config)
+    
+    def _dispatch(self, newsletter: Newsletter, blog: Blog, config: Optional[NewsletterConfig]) -> Dict[str, Any]:
+        """
+        Create the EmailOctopus campaign of a newsletter and mark it as sent
+        
+        The newsletter is committed right after its campaign is created, so a
+        crash later in a batch cannot send it twice.
+        
+        Args:
+            newsletter: Newsletter to send
+            blog: Blog of the newsletter
+            config: Newsletter configuration of the blog
+            
+        Returns:
+            Result information
+        """
         if not config or not config.enabled:
             return {"error": f"Newsletter not enabled for blog {blog.name}"}
         
         # Get EmailOctopus client
-        client = self.get_email_client(blog_id)
+        client = self.get_email_client(blog.id, config)
         if not client:
             return {"error": f"Could not initialize EmailOctopus client for blog {blog.name}"}
         
@@ -125,33 +183,154 @@ class NewsletterDistributor:
             }
             
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error updating newsletter status: {str(e)}")
             return {"error": str(e)}
     
-    def process_pending_newsletters(self) -> Dict[str, Any]:
+    def create_due_weekly_newsletters(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Create the weekly newsletters whose send time has passed
+        
+        For every enabled weekly configuration whose last send slot was at
+        most NEWSLETTER_WEEKLY_CATCHUP_HOURS ago and has no newsletter yet, a
+        newsletter scheduled for that slot is rendered from the recent
+        articles of the blog. Configurations, existing newsletters and
+        articles of all blogs are loaded with one query each, and the new
+        newsletters are committed together.
+        
+        Args:
+            now: Current time (defaults to now)
+            
+        Returns:
+            Results summary
+        """
+        from utils.newsletter.generator import blog_design, get_recent_articles_by_blog, render_newsletter
+        
+        now = now or datetime.utcnow()
+        catchup = timedelta(hours=Config.NEWSLETTER_WEEKLY_CATCHUP_HOURS)
+        
+        configs = NewsletterConfig.query.options(joinedload(NewsletterConfig.blog)).filter(
+            NewsletterConfig.enabled.is_(True),
+            NewsletterConfig.frequency == 'weekly'
+        ).all()
+        
+        # Blog ID -> (config, slot) for configs with a recent send slot
+        due = {}
+        for config in configs:
+            if not config.blog or not config.blog.active:
+                continue
+            slot = last_weekly_slot(config, now)
+            if slot is not None and now - slot <= catchup:
+                due[config.blog_id] = (config, slot)
+        
+        results = {"created": 0, "skipped": 0, "newsletter_ids": []}
+        if not due:
+            return results
+        
+        # Slots that already have a newsletter (created here or by hand)
+        existing = set(db.session.query(Newsletter.blog_id, Newsletter.scheduled_for).filter(
+            Newsletter.blog_id.in_(list(due)),
+            Newsletter.scheduled_for.in_({slot for _, slot in due.values()})
+        ))
+        due = {blog_id: item for blog_id, item in due.items() if (blog_id, item[1]) not in existing}
+        if not due:
+            return results
+        
+        articles = get_recent_articles_by_blog([config.blog for config, _ in due.values()], days=7, limit=5, now=now)
+        
+        created = []
+        for blog_id, (config, slot) in due.items():
+            blog = config.blog
+            if not articles[blog_id]:
+                logger.info(f"No recent articles for the weekly newsletter of {blog.name}")
+                results["skipped"] += 1
+                continue
+            
+            titles = weekly_titles(blog, slot)
+            design = blog_design(config)
+            content = render_newsletter(blog, titles["title"], articles[blog_id], design)
+            if not content["html"]:
+                results["skipped"] += 1
+                continue
+            
+            newsletter = Newsletter(
+                title=titles["title"],
+                subject=titles["subject"],
+                content_html=content["html"],
+                content_text=content["text"],
+                status="scheduled",
+                scheduled_for=slot,
+                blog_id=blog_id
+            )
+            if design:
+                newsletter.set_design_settings(design)
+            db.session.add(newsletter)
+            created.append(newsletter)
+        
+        if created:
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error creating weekly newsletters: {str(e)}")
+                results["error"] = str(e)
+                return results
+            logger.info(f"Created {len(created)} weekly newsletters")
+        
+        results["created"] = len(created)
+        results["newsletter_ids"] = [newsletter.id for newsletter in created]
+        return results
+    
+    def process_pending_newsletters(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Process all pending newsletters that are scheduled for now or the past
         
+        With NEWSLETTER_AUTO_WEEKLY enabled (it is off by default), weekly
+        newsletters that are due are created first, so a week's newsletters
+        of all blogs are rendered and sent in one pass. Blogs and configurations of the
+        pending newsletters are loaded with one query each.
+        
+        Args:
+            now: Current time (defaults to now)
+            
         Returns:
             Results summary
         """
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
+        
+        created = 0
+        if Config.NEWSLETTER_AUTO_WEEKLY:
+            created = self.create_due_weekly_newsletters(now)["created"]
         
         # Find scheduled newsletters due for sending
         pending_newsletters = Newsletter.query.filter(
             Newsletter.status == 'scheduled',
             Newsletter.scheduled_for <= now
-        ).all()
+        ).order_by(Newsletter.scheduled_for).all()
         
         results = {
             "total": len(pending_newsletters),
+            "created": created,
             "sent": 0,
             "failed": 0,
             "errors": []
         }
+        if not pending_newsletters:
+            return results
+        
+        blog_ids = {newsletter.blog_id for newsletter in pending_newsletters if newsletter.blog_id}
+        blogs = {blog.id: blog for blog in Blog.query.filter(Blog.id.in_(blog_ids))}
+        configs = {
+            config.blog_id: config
+            for config in NewsletterConfig.query.filter(NewsletterConfig.blog_id.in_(blog_ids))
+        }
         
         for newsletter in pending_newsletters:
-            result = self.send_newsletter(newsletter.id)
+            blog = blogs.get(newsletter.blog_id)
+            if not blog:
+                result = {"error": f"Blog with ID {newsletter.blog_id} not found"}
+            else:
+                result = self._dispatch(newsletter, blog, configs.get(blog.id))
             
             if "success" in result and result["success"]:
                 results["sent"] += 1
@@ -165,12 +344,17 @@ class NewsletterDistributor:
         
         return results
     
-    def upload_subscribers(self, blog_id: int) -> Dict[str, Any]:
+    def upload_subscribers(self, blog_id: int, restart: bool = False) -> Dict[str, Any]:
         """
-        Upload all subscribers for a blog to EmailOctopus
+        Sync all active subscribers of a blog to EmailOctopus.
+        
+        Only subscribers missing from the list or with changed fields are
+        sent (see utils/newsletter/subscriber_sync.py); an interrupted sync
+        is resumed where it stopped.
         
         Args:
             blog_id: Blog ID
+            restart: Ignore an unfinished sync and start over
             
         Returns:
             Result information
@@ -188,44 +372,10 @@ class NewsletterDistributor:
         client = self.get_email_client(blog_id)
         if not client:
             return {"error": f"Could not initialize EmailOctopus client for blog {blog.name}"}
+        if not client.list_id:
+            return {"error": f"EmailOctopus list ID not configured for blog {blog.name}"}
         
-        # Get all active subscribers
-        subscribers = Subscriber.query.filter_by(blog_id=blog_id, status='active').all()
-        
-        results = {
-            "total": len(subscribers),
-            "added": 0,
-            "skipped": 0,
-            "failed": 0,
-            "errors": []
-        }
-        
-        for subscriber in subscribers:
-            # Prepare fields
-            fields = {
-                "FirstName": subscriber.first_name or "",
-                "LastName": subscriber.last_name or ""
-            }
-            
-            # Try to add the subscriber
-            result = client.add_subscriber(
-                email=subscriber.email,
-                fields=fields
-            )
-            
-            if "error" in result:
-                if result["error"] == "already_exists":
-                    results["skipped"] += 1
-                else:
-                    results["failed"] += 1
-                    results["errors"].append({
-                        "email": subscriber.email,
-                        "error": result.get("message", "Unknown error")
-                    })
-            else:
-                results["added"] += 1
-        
-        return results
+        return sync_subscribers(blog_id, client.api_key, client.list_id, client.base_url, restart=restart)
 
 def create_weekly_newsletter_for_blog(blog_id: int) -> Dict[str, Any]:
     """
@@ -275,14 +425,13 @@ def create_weekly_newsletter_for_blog(blog_id: int) -> Dict[str, Any]:
     )
     
     # Create newsletter title and subject
-    title = f"{blog.name} Weekly Newsletter - {scheduled_for.strftime('%B %d, %Y')}"
-    subject = f"Weekly Update from {blog.name} - {scheduled_for.strftime('%B %d')}"
+    titles = weekly_titles(blog, scheduled_for)
     
     # Create and schedule newsletter
     generator = NewsletterGenerator(blog_id)
     result = generator.create_scheduled_newsletter(
-        title=title,
-        subject=subject,
+        title=titles["title"],
+        subject=titles["subject"],
         scheduled_for=scheduled_for,
         days=7,
         article_limit=5
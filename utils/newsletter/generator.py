@@ -5,14 +5,159 @@ import os
 import logging
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
-from jinja2 import Template
+from typing import Dict, Iterable, List, Any, Optional, Union
+from sqlalchemy import func
 
 from app import db
 from models import Blog, Newsletter, ContentLog, NewsletterConfig
+from utils.newsletter.templates import DEFAULT_TEMPLATE, template_registry
 
 logger = logging.getLogger(__name__)
 
+
+def get_recent_articles_by_blog(
+    blogs: Iterable[Blog],
+    days: int = 7,
+    limit: int = 5,
+    now: Optional[datetime] = None
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Get recent published articles of several blogs with one query
+    
+    Args:
+        blogs: Blogs to get articles for
+        days: Number of days to look back
+        limit: Maximum number of articles per blog
+        now: End of the date range (defaults to now)
+        
+    Returns:
+        Blog ID -> list of article data, newest first (every blog has an entry)
+    """
+    blogs = {blog.id: blog for blog in blogs}
+    articles = {blog_id: [] for blog_id in blogs}
+    if not blogs:
+        return articles
+    
+    # Calculate date range
+    end_date = now or datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    
+    # Newest `limit` published articles per blog (only the first 150 characters of the body)
+    ranked = db.session.query(
+        ContentLog.blog_id,
+        ContentLog.title,
+        ContentLog.post_id,
+        ContentLog.published_at,
+        func.substr(ContentLog.content, 1, 150).label('content_start'),
+        func.row_number().over(
+            partition_by=ContentLog.blog_id,
+            order_by=ContentLog.published_at.desc()
+        ).label('position')
+    ).filter(
+        ContentLog.blog_id.in_(list(blogs)),
+        ContentLog.status == 'published',
+        ContentLog.published_at >= start_date,
+        ContentLog.published_at <= end_date
+    ).subquery()
+    
+    recent_posts = db.session.query(ranked).filter(
+        ranked.c.position <= limit
+    ).order_by(ranked.c.blog_id, ranked.c.position).all()
+    
+    for post in recent_posts:
+        blog = blogs[post.blog_id]
+        
+        # Extract excerpt from content if available
+        excerpt = post.content_start + "..." if post.content_start else ""
+        
+        # Get the URL
+        post_url = ""
+        if blog.url and post.post_id:
+            post_url = f"{blog.url.rstrip('/')}/p/{post.post_id}"
+        
+        articles[post.blog_id].append({
+            'title': post.title,
+            'excerpt': excerpt,
+            'published_at': post.published_at.strftime('%B %d, %Y') if post.published_at else "Recently",
+            'url': post_url,
+            'post_id': post.post_id
+        })
+    
+    return articles
+
+
+def blog_design(config: Optional[NewsletterConfig]) -> Dict[str, Any]:
+    """Design settings of a blog's newsletters (the "design" entry of its config settings)"""
+    if not config:
+        return {}
+    design = config.get_settings().get('design')
+    return design if isinstance(design, dict) else {}
+
+
+def render_newsletter(
+    blog: Blog,
+    title: str,
+    articles: List[Dict[str, Any]],
+    design: Optional[Dict[str, Any]] = None,
+    extra_context: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    Render newsletter HTML (with the design's precompiled template) and text
+    
+    Args:
+        blog: Blog the newsletter is for
+        title: Newsletter title
+        articles: Article data from get_recent_articles_by_blog
+        design: Design settings (see utils/newsletter/templates.py)
+        extra_context: Additional context for template rendering
+        
+    Returns:
+        Dictionary with HTML and text content (empty strings if rendering fails)
+    """
+    # Prepare template context
+    context = {
+        'blog': {
+            'id': blog.id,
+            'name': blog.name,
+            'url': blog.url
+        },
+        'newsletter': {
+            'title': title,
+            'date': datetime.utcnow().strftime('%B %d, %Y')
+        },
+        'articles': articles,
+        'unsubscribe_url': f"{blog.url.rstrip('/')}/unsubscribe"
+    }
+    
+    # Add any extra context
+    if extra_context:
+        context.update(extra_context)
+    
+    # Render HTML content
+    try:
+        html_content = template_registry.render(design, context)
+    except Exception as e:
+        logger.error(f"Error rendering newsletter template: {str(e)}")
+        return {"html": "", "text": ""}
+    
+    # Generate simple text version
+    text_content = f"{title}\n\n"
+    text_content += f"Latest articles from {blog.name}:\n\n"
+    
+    for article in articles:
+        text_content += f"* {article['title']}\n"
+        text_content += f"  Published on {article['published_at']}\n"
+        text_content += f"  {article['url']}\n\n"
+    
+    text_content += f"\nYou're receiving this email because you subscribed to updates from {blog.name}.\n"
+    text_content += f"To unsubscribe, visit: {context['unsubscribe_url']}"
+    
+    return {
+        "html": html_content,
+        "text": text_content
+    }
+
+
 class NewsletterGenerator:
     """Generator for newsletter content"""
     
@@ -24,84 +169,7 @@ class NewsletterGenerator:
             blog_id: Optional blog ID to generate for
         """
         self.blog_id = blog_id
-        self.default_template = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{{ newsletter.title }}</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        h1 {
-            color: #2c3e50;
-            font-size: 24px;
-        }
-        h2 {
-            color: #3498db;
-            font-size: 20px;
-        }
-        .article {
-            margin-bottom: 30px;
-            border-bottom: 1px solid #eee;
-            padding-bottom: 20px;
-        }
-        .article h3 {
-            margin-bottom: 10px;
-        }
-        .article-meta {
-            color: #7f8c8d;
-            font-size: 14px;
-            margin-bottom: 10px;
-        }
-        .read-more {
-            display: inline-block;
-            background-color: #3498db;
-            color: white;
-            padding: 8px 15px;
-            text-decoration: none;
-            border-radius: 4px;
-            font-size: 14px;
-        }
-        .footer {
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #eee;
-            font-size: 12px;
-            color: #7f8c8d;
-        }
-        .unsubscribe {
-            color: #7f8c8d;
-        }
-    </style>
-</head>
-<body>
-    <h1>{{ newsletter.title }}</h1>
-    
-    <p>Here are the latest articles from {{ blog.name }}:</p>
-    
-    {% for article in articles %}
-    <div class="article">
-        <h3>{{ article.title }}</h3>
-        <div class="article-meta">Published on {{ article.published_at }}</div>
-        <p>{{ article.excerpt }}</p>
-        <a href="{{ article.url }}" class="read-more">Read More</a>
-    </div>
-    {% endfor %}
-    
-    <div class="footer">
-        <p>You're receiving this email because you subscribed to updates from {{ blog.name }}.</p>
-        <p><a href="{{ unsubscribe_url }}" class="unsubscribe">Unsubscribe</a></p>
-    </div>
-</body>
-</html>
-"""
+        self.default_template = DEFAULT_TEMPLATE
     
     def get_recent_articles(self, blog_id: Optional[int] = None, days: int = 7, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -120,43 +188,12 @@ class NewsletterGenerator:
             logger.error("Blog ID not provided")
             return []
         
-        # Calculate date range
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-        
-        # Query recent published articles
-        recent_posts = ContentLog.query.filter(
-            ContentLog.blog_id == blog_id,
-            ContentLog.status == 'published',
-            ContentLog.published_at >= start_date,
-            ContentLog.published_at <= end_date
-        ).order_by(ContentLog.published_at.desc()).limit(limit).all()
-        
-        articles = []
-        for post in recent_posts:
-            # Extract excerpt from content if available
-            excerpt = ""
-            try:
-                if post.content:
-                    excerpt = post.content[:150] + "..."
-            except:
-                excerpt = "Read the full article..."
-            
-            # Get the URL
-            post_url = ""
-            blog = Blog.query.get(blog_id)
-            if blog and post.post_id:
-                post_url = f"{blog.url.rstrip('/')}/p/{post.post_id}"
-            
-            articles.append({
-                'title': post.title,
-                'excerpt': excerpt,
-                'published_at': post.published_at.strftime('%B %d, %Y') if post.published_at else "Recently",
-                'url': post_url,
-                'post_id': post.post_id
-            })
+        blog = Blog.query.get(blog_id)
+        if not blog:
+            logger.error(f"Blog with ID {blog_id} not found")
+            return []
         
-        return articles
+        return get_recent_articles_by_blog([blog], days, limit)[blog_id]
     
     def generate_newsletter_content(
         self, 
@@ -196,58 +233,19 @@ class NewsletterGenerator:
         title = title or f"{blog.name} Weekly Newsletter"
         
         # Get recent articles
-        articles = self.get_recent_articles(blog_id, days, article_limit)
+        articles = get_recent_articles_by_blog([blog], days, article_limit)[blog_id]
         
         if not articles:
             logger.warning(f"No recent articles found for blog {blog.name}")
             return {"html": "", "text": ""}
         
-        # Prepare template context
-        context = {
-            'blog': {
-                'id': blog.id,
-                'name': blog.name,
-                'url': blog.url
-            },
-            'newsletter': {
-                'title': title,
-                'date': datetime.utcnow().strftime('%B %d, %Y')
-            },
-            'articles': articles,
-            'unsubscribe_url': f"{blog.url.rstrip('/')}/unsubscribe"
-        }
-        
-        # Add any extra context
-        if extra_context:
-            context.update(extra_context)
-        
-        # Use custom template if provided, otherwise use default
-        template_html = custom_template or self.default_template
-        
-        # Render HTML content
-        try:
-            template = Template(template_html)
-            html_content = template.render(**context)
-        except Exception as e:
-            logger.error(f"Error rendering newsletter template: {str(e)}")
-            return {"html": "", "text": ""}
-        
-        # Generate simple text version
-        text_content = f"{title}\n\n"
-        text_content += f"Latest articles from {blog.name}:\n\n"
-        
-        for article in articles:
-            text_content += f"* {article['title']}\n"
-            text_content += f"  Published on {article['published_at']}\n"
-            text_content += f"  {article['url']}\n\n"
-        
-        text_content += f"\nYou're receiving this email because you subscribed to updates from {blog.name}.\n"
-        text_content += f"To unsubscribe, visit: {context['unsubscribe_url']}"
+        # Use custom template if provided, otherwise the blog's design
+        if custom_template:
+            design = {"template_html": custom_template}
+        else:
+            design = blog_design(NewsletterConfig.query.filter_by(blog_id=blog_id).first())
         
-        return {
-            "html": html_content,
-            "text": text_content
-        }
+        return render_newsletter(blog, title, articles, design, extra_context)
     
     def create_scheduled_newsletter(
         self,
@@ -315,6 +313,9 @@ class NewsletterGenerator:
                 scheduled_for=scheduled_for,
                 blog_id=blog_id
             )
+            design = blog_design(config)
+            if design:
+                newsletter.set_design_settings(design)
             
             db.session.add(newsletter)
             db.session.commit()
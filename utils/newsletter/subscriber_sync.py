@@ -0,0 +1,278 @@
+"""
+Streaming subscriber sync to EmailOctopus
+
+Active subscribers of a blog are streamed from the database in primary-key
+windows by the batch runner (utils/automation/batch_runner.py) and compared
+with a cached copy of the remote list roster (the newsletter_contact table).
+Only contacts missing from the list or with changed fields are sent. Worker
+threads send requests over per-thread keep-alive sessions, limited by a shared
+rate limiter. Progress is stored in batch_job_run, so an interrupted sync
+resumes after the last finished window.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from sqlalchemy import insert
+
+from app import db
+from config import Config
+from models import NewsletterContact, Subscriber
+from utils.automation.batch_runner import OK, SKIPPED, BatchJob, BatchRunner
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBED = "SUBSCRIBED"
+ROSTER_PAGE_SIZE = 100
+MAX_ATTEMPTS = 4
+# Failed emails listed in the result; the run counts all of them
+MAX_REPORTED_ERRORS = 100
+
+# email -> (contact_id, fingerprint, remote status)
+Roster = Dict[str, Tuple[Optional[str], str, str]]
+
+
+def contact_fields(first_name: Optional[str], last_name: Optional[str]) -> Dict[str, str]:
+    """EmailOctopus fields of a subscriber"""
+    return {"FirstName": first_name or "", "LastName": last_name or ""}
+
+
+def contact_fingerprint(fields: Dict[str, Any]) -> str:
+    """Hash of the synced fields; a contact whose hash is unchanged needs no request"""
+    payload = json.dumps([fields.get("FirstName") or "", fields.get("LastName") or ""])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def member_id(email: str) -> str:
+    """EmailOctopus accepts the MD5 of the lower-cased email in place of a contact ID"""
+    return hashlib.md5(email.strip().lower().encode("utf-8")).hexdigest()
+
+
+class SubscriberSyncJob(BatchJob):
+    """Creates or updates the active subscribers of a blog in its EmailOctopus list"""
+    name = "newsletter_subscriber_sync"
+    description = "Sync active newsletter subscribers of a blog to EmailOctopus"
+    model = Subscriber
+
+    workers = Config.NEWSLETTER_SYNC_WORKERS
+    chunk_size = 500
+    requests_per_second = Config.NEWSLETTER_SYNC_REQUESTS_PER_SECOND
+
+    def __init__(self, blog_id: int, api_key: str, list_id: str, base_url: Optional[str] = None):
+        super().__init__()
+        self.blog_id = blog_id
+        self.api_key = api_key
+        self.list_id = list_id
+        self.contacts_url = f"{(base_url or Config.EMAILOCTOPUS_API_URL).rstrip('/')}/lists/{list_id}/contacts"
+
+        self.roster: Roster = {}
+        self.added = 0
+        self.updated = 0
+        self.errors: List[Dict[str, str]] = []
+        # Contacts pushed by the workers since the last checkpoint
+        self._pushed: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def params(self):
+        return {"blog_id": self.blog_id, "list_id": self.list_id}
+
+    def setup(self):
+        self.roster = self.load_roster()
+        logger.info(f"Subscriber sync for blog {self.blog_id}: {len(self.roster)} contacts in the cached roster")
+
+    def query(self):
+        return Subscriber.query.filter_by(blog_id=self.blog_id, status='active')
+
+    def prepare(self, subscriber):
+        """Diff against the roster here, in the main thread: unchanged contacts never reach the API"""
+        key = (subscriber.email or "").strip().lower()
+        fields = contact_fields(subscriber.first_name, subscriber.last_name)
+        fingerprint = contact_fingerprint(fields)
+        cached = self.roster.get(key)
+
+        if cached is None:
+            action = "create"
+        elif cached[2] != SUBSCRIBED or cached[1] == fingerprint:
+            # Unchanged, or unsubscribed on the EmailOctopus side (which the sync must not undo)
+            action = None
+        else:
+            action = "update"
+
+        return {"email": subscriber.email, "key": key, "fields": fields, "fingerprint": fingerprint,
+                "action": action, "contact_id": cached[0] if cached else None}
+
+    def process(self, item):
+        if item["action"] is None:
+            return SKIPPED
+
+        if item["action"] == "create":
+            response = self._request("POST", self.contacts_url,
+                                     json={"email_address": item["email"], "fields": item["fields"],
+                                           "status": SUBSCRIBED})
+            if response.status_code == 409:
+                # Added since the roster was fetched: update it instead
+                item["action"] = "update"
+        if item["action"] == "update":
+            contact_id = item["contact_id"] or member_id(item["email"])
+            response = self._request("PUT", f"{self.contacts_url}/{contact_id}", json={"fields": item["fields"]})
+
+        if response.status_code >= 400:
+            message = f"{response.status_code}: {response.text[:200]}"
+            with self._lock:
+                if len(self.errors) < MAX_REPORTED_ERRORS:
+                    self.errors.append({"email": item["email"], "error": message})
+            raise RuntimeError(f"EmailOctopus {item['action']} of {item['email']} failed ({message})")
+
+        try:
+            contact_id = response.json().get("id")
+        except ValueError:
+            contact_id = None
+        with self._lock:
+            self._pushed.append({"key": item["key"], "contact_id": contact_id or item["contact_id"],
+                                 "fingerprint": item["fingerprint"]})
+            if item["action"] == "create":
+                self.added += 1
+            else:
+                self.updated += 1
+        return OK
+
+    def checkpoint(self):
+        """Writes the contacts pushed in this window to the roster, committed with the run progress"""
+        with self._lock:
+            pushed, self._pushed = self._pushed, []
+        if not pushed:
+            return
+
+        existing = {
+            contact.email: contact for contact in NewsletterContact.query.filter(
+                NewsletterContact.list_id == self.list_id,
+                NewsletterContact.email.in_([item["key"] for item in pushed])
+            )
+        }
+        now = datetime.utcnow()
+        for item in pushed:
+            contact = existing.get(item["key"])
+            if contact is None:
+                contact = NewsletterContact(list_id=self.list_id, email=item["key"])
+                db.session.add(contact)
+                existing[item["key"]] = contact
+            contact.contact_id = item["contact_id"] or contact.contact_id
+            contact.fingerprint = item["fingerprint"]
+            contact.status = SUBSCRIBED
+            contact.pushed_at = now
+            self.roster[item["key"]] = (contact.contact_id, item["fingerprint"], SUBSCRIBED)
+
+    # --- Roster ---------------------------------------------------------------
+
+    def load_roster(self) -> Roster:
+        """
+        Cached roster of the list. It is fetched again from the API when the
+        last full listing is older than NEWSLETTER_ROSTER_CACHE_HOURS, which
+        also picks up contacts changed outside this application.
+        """
+        fetched_at = db.session.query(db.func.max(NewsletterContact.fetched_at)).filter(
+            NewsletterContact.list_id == self.list_id
+        ).scalar()
+        if fetched_at is None or datetime.utcnow() - fetched_at > timedelta(hours=Config.NEWSLETTER_ROSTER_CACHE_HOURS):
+            self.refresh_roster()
+
+        rows = db.session.query(
+            NewsletterContact.email, NewsletterContact.contact_id, NewsletterContact.fingerprint,
+            NewsletterContact.status
+        ).filter(NewsletterContact.list_id == self.list_id).yield_per(5000)
+        return {row.email: (row.contact_id, row.fingerprint, row.status) for row in rows}
+
+    def refresh_roster(self):
+        """Replaces the cached roster with a full listing of the remote list"""
+        started = time.monotonic()
+        now = datetime.utcnow()
+        contacts = {}
+        for contact in self.fetch_remote_contacts():
+            email = (contact.get("email_address") or "").strip().lower()
+            if not email:
+                continue
+            contacts[email] = {
+                "list_id": self.list_id,
+                "email": email,
+                "contact_id": contact.get("id"),
+                "fingerprint": contact_fingerprint(contact.get("fields") or {}),
+                "status": contact.get("status") or SUBSCRIBED,
+                "fetched_at": now,
+            }
+
+        NewsletterContact.query.filter_by(list_id=self.list_id).delete(synchronize_session=False)
+        rows = list(contacts.values())
+        for start in range(0, len(rows), 1000):
+            db.session.execute(insert(NewsletterContact), rows[start:start + 1000])
+        db.session.commit()
+        logger.info(f"Fetched the roster of list {self.list_id}: {len(rows)} contacts "
+                    f"in {time.monotonic() - started:.1f}s")
+
+    def fetch_remote_contacts(self) -> Iterator[Dict[str, Any]]:
+        """All contacts of the list, page by page"""
+        page = 1
+        while True:
+            response = self._request("GET", self.contacts_url, params={"limit": ROSTER_PAGE_SIZE, "page": page})
+            response.raise_for_status()
+            data = response.json()
+            contacts = data.get("data", [])
+            yield from contacts
+
+            paging = data.get("paging")
+            if len(contacts) < ROSTER_PAGE_SIZE or (paging is not None and not paging.get("next")):
+                return
+            page += 1
+
+    # --- HTTP -----------------------------------------------------------------
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Rate-limited request with the API key, retried with backoff on 429 and 5xx responses"""
+        kwargs["params"] = {**kwargs.get("params", {}), "api_key": self.api_key}
+        for attempt in range(MAX_ATTEMPTS):
+            response = self.http(method, url, **kwargs)
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if attempt < MAX_ATTEMPTS - 1:
+                retry_after = response.headers.get("Retry-After", "")
+                time.sleep(min(float(retry_after) if retry_after.isdigit() else 2 ** attempt, 30))
+        return response
+
+
+def sync_subscribers(blog_id: int, api_key: str, list_id: str, base_url: Optional[str] = None,
+                     restart: bool = False) -> Dict[str, Any]:
+    """
+    Sync the active subscribers of a blog to its EmailOctopus list.
+
+    An unfinished sync of the same blog and list is resumed after its last
+    finished window unless `restart` is set. When a run is resumed, total,
+    skipped and failed count the whole run; added and updated count this call.
+
+    Args:
+        blog_id: Blog ID
+        api_key: EmailOctopus API key
+        list_id: EmailOctopus list ID
+        base_url: API base URL (defaults to EMAILOCTOPUS_API_URL)
+        restart: Ignore an unfinished run and start over
+
+    Returns:
+        Dict with total, added, updated, skipped, failed, errors and run statistics
+    """
+    job = SubscriberSyncJob(blog_id, api_key, list_id, base_url)
+    summary = BatchRunner(job, restart=restart).run()
+    return {
+        "total": summary["processed"],
+        "added": job.added,
+        "updated": job.updated,
+        "skipped": summary["skipped"],
+        "failed": summary["failed"],
+        "errors": job.errors,
+        "run_id": summary["run_id"],
+        "status": summary["status"],
+        "elapsed_seconds": summary["elapsed_seconds"],
+        "rows_per_second": summary["rows_per_second"],
+    }
@@ -0,0 +1,167 @@
+"""
+Newsletter template registry
+
+Compiles the template of each newsletter design once per process. A design
+is the dict returned by Newsletter.get_design_settings() (or the "design"
+entry of NewsletterConfig settings): an optional "template_html" replacing
+the default template, plus style values such as "primary_color" that the
+template reads from `design`.
+"""
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+# Style values available to every template as `design`
+DEFAULT_DESIGN = {
+    "font_family": "Arial, sans-serif",
+    "text_color": "#333",
+    "heading_color": "#2c3e50",
+    "primary_color": "#3498db",
+    "muted_color": "#7f8c8d",
+}
+
+DEFAULT_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ newsletter.title }}</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body {
+            font-family: {{ design.font_family }};
+            line-height: 1.6;
+            color: {{ design.text_color }};
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        h1 {
+            color: {{ design.heading_color }};
+            font-size: 24px;
+        }
+        h2 {
+            color: {{ design.primary_color }};
+            font-size: 20px;
+        }
+        .article {
+            margin-bottom: 30px;
+            border-bottom: 1px solid #eee;
+            padding-bottom: 20px;
+        }
+        .article h3 {
+            margin-bottom: 10px;
+        }
+        .article-meta {
+            color: {{ design.muted_color }};
+            font-size: 14px;
+            margin-bottom: 10px;
+        }
+        .read-more {
+            display: inline-block;
+            background-color: {{ design.primary_color }};
+            color: white;
+            padding: 8px 15px;
+            text-decoration: none;
+            border-radius: 4px;
+            font-size: 14px;
+        }
+        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #eee;
+            font-size: 12px;
+            color: {{ design.muted_color }};
+        }
+        .unsubscribe {
+            color: {{ design.muted_color }};
+        }
+    </style>
+</head>
+<body>
+    <h1>{{ newsletter.title }}</h1>
+
+    <p>Here are the latest articles from {{ blog.name }}:</p>
+
+    {% for article in articles %}
+    <div class="article">
+        <h3>{{ article.title }}</h3>
+        <div class="article-meta">Published on {{ article.published_at }}</div>
+        <p>{{ article.excerpt }}</p>
+        <a href="{{ article.url }}" class="read-more">Read More</a>
+    </div>
+    {% endfor %}
+
+    <div class="footer">
+        <p>You're receiving this email because you subscribed to updates from {{ blog.name }}.</p>
+        <p><a href="{{ unsubscribe_url }}" class="unsubscribe">Unsubscribe</a></p>
+    </div>
+</body>
+</html>
+"""
+
+# Designs are few (one or two per blog); the cap only guards against unbounded growth
+MAX_CACHED_DESIGNS = 256
+
+
+def design_key(design: Optional[Dict[str, Any]]) -> str:
+    """Stable key of a design dict"""
+    return hashlib.sha1(json.dumps(design or {}, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TemplateRegistry:
+    """Compiled templates by design; designs sharing a template source share the compiled template"""
+
+    def __init__(self):
+        self._env = Environment()
+        self._by_design: Dict[str, Tuple[Template, Dict[str, Any]]] = {}
+        self._by_source: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+
+    def get(self, design: Optional[Dict[str, Any]] = None) -> Tuple[Template, Dict[str, Any]]:
+        """
+        Compiled template of a design and its style values merged with DEFAULT_DESIGN.
+
+        Raises:
+            jinja2.TemplateSyntaxError: If the design's template_html does not compile
+        """
+        key = design_key(design)
+        cached = self._by_design.get(key)
+        if cached:
+            return cached
+
+        design = dict(design or {})
+        source = design.pop("template_html", None) or DEFAULT_TEMPLATE
+        source_key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        with self._lock:
+            template = self._by_source.get(source_key)
+            if template is None:
+                template = self._env.from_string(source)
+                if len(self._by_source) >= MAX_CACHED_DESIGNS:
+                    self._by_source.clear()
+                self._by_source[source_key] = template
+                logger.debug(f"Compiled newsletter template {source_key[:8]}")
+
+            entry = (template, {**DEFAULT_DESIGN, **design})
+            if len(self._by_design) >= MAX_CACHED_DESIGNS:
+                self._by_design.clear()
+            self._by_design[key] = entry
+        return entry
+
+    def render(self, design: Optional[Dict[str, Any]], context: Dict[str, Any]) -> str:
+        """Render the design's template with `context` (plus `design`)"""
+        template, values = self.get(design)
+        return template.render(**{"design": values, **context})
+
+    def clear(self):
+        with self._lock:
+            self._by_design.clear()
+            self._by_source.clear()
+
+
+template_registry = TemplateRegistry()
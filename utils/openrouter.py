@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 class OpenRouterClient:
     """Client for interacting with OpenRouter API"""
     
-    BASE_URL = "https://openrouter.ai/api/v1"
+    BASE_URL = Config.OPENROUTER_API_BASE
     
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -5,6 +5,9 @@ import logging
 import requests
 from typing import Dict, List, Any, Optional, Union
 from config import Config
+from utils.logger import LazyJson
+from utils.monitoring.metrics import LLM_REQUEST_SECONDS, record_llm_usage
+from utils.monitoring.tracing import KIND_CLIENT, tracer
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -15,7 +18,7 @@ class OpenRouterClient:
     def __init__(self):
         """Initialize the OpenRouter client"""
         self.api_key = Config.OPENROUTER_API_KEY
-        self.api_base = "https://openrouter.ai/api/v1"
+        self.api_base = Config.OPENROUTER_API_BASE
         self.fallback_model = "anthropic/claude-3.5-sonnet"
         self.default_topic_model = Config.DEFAULT_TOPIC_MODEL or "anthropic/claude-3.5-haiku"
         self.default_content_model = Config.DEFAULT_CONTENT_MODEL or "anthropic/claude-3.5-sonnet"
@@ -115,14 +118,16 @@ class OpenRouterClient:
         while retry_count < max_retries:
             try:
                 logger.info(f"Sending request to OpenRouter with model: {model} (Attempt {retry_count + 1}/{max_retries})")
-                logger.debug(f"Request data: {json.dumps(data)}")
-                response = requests.post(
-                    f"{self.api_base}/chat/completions",
-                    headers=self._get_headers(),
-                    json=data,
-                    timeout=180  # Zwiększony timeout dla długich artykułów (3 minuty)
-                )
-                response.raise_for_status()
+                logger.debug("Request data: %s", LazyJson(data))
+                with tracer.span("openrouter chat.completions", KIND_CLIENT, {"llm.model": model, "llm.max_tokens": max_tokens}), \
+                        LLM_REQUEST_SECONDS.time(model=model):
+                    response = requests.post(
+                        f"{self.api_base}/chat/completions",
+                        headers=self._get_headers(),
+                        json=data,
+                        timeout=180  # Zwiększony timeout dla długich artykułów (3 minuty)
+                    )
+                    response.raise_for_status()
                 # If successful, break out of retry loop
                 break
             except requests.exceptions.Timeout:
@@ -192,6 +197,7 @@ class OpenRouterClient:
                     }
                 
                 result = response.json()
+                record_llm_usage(model, result.get("usage"))
                 content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                 logger.info(f"Successfully received response from OpenRouter (length: {len(content)} chars)")
                 return result
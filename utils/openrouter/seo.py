@@ -162,6 +162,9 @@ def analyze_content_seo_performance(
     """
     Analyze content for SEO performance and provide recommendations
     
+    Computed locally with the inflection-aware SEO analyzer (no AI request),
+    in the same response format the AI analysis used.
+    
     Args:
         title: Content title
         content: The full content text
@@ -170,74 +173,50 @@ def analyze_content_seo_performance(
     Returns:
         Dictionary with SEO analysis and recommendations
     """
-    keywords_text = ", ".join(keywords)
-    content_sample = content[:3000] + "..." if len(content) > 3000 else content
-    
-    prompt = f"""
-    Perform an SEO analysis of the following content:
-    
-    Title: {title}
-    Target Keywords: {keywords_text}
-    
-    Content Sample:
-    {content_sample}
-    
-    Analyze for:
-    1. Keyword density and placement
-    2. Content readability and structure
-    3. Meta description quality
-    4. Header tag usage
-    5. Internal and external linking opportunities
-    6. Overall SEO score (0-100)
-    
-    Format your response as a JSON object with the following structure:
-    {{
-        "seo_score": 75,
-        "keyword_analysis": {{
-            "primary_keyword_density": 0.02,
-            "secondary_keyword_presence": true,
-            "keyword_in_title": true,
-            "keyword_in_headers": true
-        }},
-        "readability": {{
-            "score": "good|medium|poor",
-            "issues": ["issue1", "issue2"]
-        }},
-        "structure": {{
-            "header_usage": "good|medium|poor",
-            "paragraph_length": "good|medium|poor"
-        }},
-        "recommendations": [
-            "recommendation1",
-            "recommendation2"
-        ]
-    }}
-    """
-    
-    # Get model for content analysis
-    model = openrouter.get_content_model()
+    from utils.seo.analyzer import analyze_content, calculate_seo_score
     
     try:
-        # Send to OpenRouter for analysis
-        response = openrouter.generate_json_response(
-            prompt=prompt,
-            model=model,
-            system_prompt="You are an SEO content optimizer who specializes in analyzing content for search engine performance. Provide detailed, actionable insights on how to improve content for better search rankings.",
-            temperature=0.3
+        keywords = [keyword for keyword in keywords if keyword] or [title]
+        analysis = analyze_content(
+            content=content,
+            primary_keyword=keywords[0],
+            secondary_keywords=keywords[1:],
+            meta_title=title
         )
         
-        if not response:
-            logger.error("Failed to analyze content SEO performance")
-            return {
-                "success": False,
-                "message": "Failed to analyze content",
-                "data": {}
-            }
+        readability = analysis['readability']
+        h2_count = analysis['headings']['h2_count']
+        words_per_paragraph = analysis['word_count'] / max(1, analysis['paragraph_count'])
+        secondary = analysis['secondary_keywords']
+        
+        def rating(good, medium):
+            return "good" if good else "medium" if medium else "poor"
         
         return {
             "success": True,
             "message": "Content analysis completed",
-            "data": response
+            "data": {
+                "seo_score": calculate_seo_score(analysis),
+                "keyword_analysis": {
+                    "primary_keyword_density": round(analysis['primary_keyword']['density'], 4),
+                    "secondary_keyword_presence": any(kw['in_content'] for kw in secondary),
+                    "keyword_in_title": analysis['primary_keyword']['in_title'],
+                    "keyword_in_headers": analysis['primary_keyword']['in_headings']
+                },
+                "readability": {
+                    "score": rating(readability['score'] >= 60, readability['score'] >= 40),
+                    "fog_pl": readability['fog_pl'],
+                    "issues": [
+                        recommendation for recommendation in analysis['recommendations']
+                        if 'Readability' in recommendation or 'sentence length' in recommendation
+                    ]
+                },
+                "structure": {
+                    "header_usage": rating(h2_count >= 3, h2_count >= 1),
+                    "paragraph_length": rating(words_per_paragraph <= 120, words_per_paragraph <= 200)
+                },
+                "recommendations": analysis['recommendations']
+            }
         }
     except Exception as e:
         logger.error(f"Error analyzing content SEO: {str(e)}")
@@ -245,4 +224,4 @@ def analyze_content_seo_performance(
             "success": False,
             "message": f"Error: {str(e)}",
             "data": {}
-        }
\ No newline at end of file
+        }
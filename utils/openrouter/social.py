@@ -36,6 +36,10 @@ def generate_social_media_content(
     
     platforms_str = ", ".join(platforms)
     keywords_str = ", ".join(keywords) if keywords else ""
+    response_structure = {
+        platform: {"content": f"Complete post content for {platform.capitalize()}", "hashtags": ["hashtag1", "hashtag2"]}
+        for platform in platforms
+    }
     
     prompt = f"""
     Generate engaging social media posts for the following article:
@@ -54,25 +58,8 @@ def generate_social_media_content(
     - LinkedIn: Professional tone, business insights, 2-3 paragraphs, industry hashtags
     - Instagram: Visual focus, emoji use, 5-10 relevant hashtags, conversational
     
-    Format your response as a JSON object with the following structure:
-    {{
-        "facebook": {{
-            "content": "Complete post content for Facebook",
-            "hashtags": ["hashtag1", "hashtag2"]
-        }},
-        "twitter": {{
-            "content": "Complete post content for Twitter",
-            "hashtags": ["hashtag1", "hashtag2", "hashtag3"]
-        }},
-        "linkedin": {{
-            "content": "Complete post content for LinkedIn",
-            "hashtags": ["hashtag1", "hashtag2"]
-        }},
-        "instagram": {{
-            "content": "Complete post content for Instagram",
-            "hashtags": ["hashtag1", "hashtag2", "hashtag3", "hashtag4"]
-        }}
-    }}
+    Format your response as a JSON object with one key per platform, following this structure:
+    {json.dumps(response_structure, indent=4)}
     
     Only include the platforms requested in the original list.
     """
@@ -93,14 +80,24 @@ def generate_social_media_content(
             logger.error("Failed to generate social media content")
             return {platform: {"content": f"Check out our latest post: {title} {url}", "hashtags": []} for platform in platforms}
         
+        if not isinstance(response, dict):
+            logger.error("Social media content is not a JSON object")
+            response = {}
+        
         # Validate that we have content for all requested platforms
         for platform in platforms:
-            if platform not in response:
-                logger.warning(f"Missing content for platform: {platform}")
-                response[platform] = {
-                    "content": f"Check out our latest post: {title} {url}",
-                    "hashtags": []
-                }
+            post = response.get(platform)
+            if isinstance(post, dict) and isinstance(post.get("content"), str) and post["content"].strip():
+                if not isinstance(post.get("hashtags"), list):
+                    post["hashtags"] = []
+                post["hashtags"] = [str(tag).lstrip("#") for tag in post["hashtags"]]
+                continue
+            
+            logger.warning(f"Missing content for platform: {platform}")
+            response[platform] = {
+                "content": f"Check out our latest post: {title} {url}",
+                "hashtags": []
+            }
         
         return response
     except Exception as e:
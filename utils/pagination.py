@@ -0,0 +1,118 @@
+"""
+Keyset (cursor) pagination helpers
+
+Unlike Query.paginate(), which runs OFFSET + a full COUNT for every page,
+keyset pagination continues from the last row of the previous page using
+the (sort value, id) pair, so every page costs one indexed range scan no
+matter how deep the client pages. An exact count is only computed when
+explicitly requested.
+"""
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encodes the position after a row as an opaque, URL-safe cursor"""
+    if isinstance(sort_value, datetime):
+        value = {"dt": sort_value.isoformat()}
+    else:
+        value = sort_value
+    payload = json.dumps([value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Decodes a cursor produced by encode_cursor, returns None if it is missing or invalid"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(value, dict) and 'dt' in value:
+            value = datetime.fromisoformat(value['dt'])
+        return [value, int(row_id)]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        logger.warning(f"Ignoring invalid pagination cursor: {cursor}")
+        return None
+
+
+def parse_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Parses a `limit` request argument, clamped to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_paginate(query, sort_column, id_column, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE, descending: bool = True,
+                    with_count: bool = False,
+                    sort_value: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    """
+    Returns one page of `query` ordered by (sort_column, id_column).
+
+    Args:
+        query: Filtered query (without ORDER BY/LIMIT)
+        sort_column: Column or expression to order by (must not be NULL)
+        id_column: Unique tie-breaker, usually the primary key
+        cursor: Cursor returned as `next_cursor` by the previous page
+        limit: Page size
+        descending: Newest/highest first when True
+        with_count: Also run COUNT(*) over the filtered query
+        sort_value: Reads the sort value from a result row; required when
+            sort_column is an expression rather than a mapped column
+
+    Returns:
+        Dict with `items`, `next_cursor` (None on the last page) and
+        `total` (None unless with_count)
+    """
+    total = query.order_by(None).count() if with_count else None
+
+    position = decode_cursor(cursor)
+    if position is not None:
+        last_value, last_id = position
+        if descending:
+            query = query.filter(or_(
+                sort_column < last_value,
+                and_(sort_column == last_value, id_column < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > last_value,
+                and_(sort_column == last_value, id_column > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        last_value = sort_value(last) if sort_value else getattr(last, sort_column.key)
+        next_cursor = encode_cursor(last_value, getattr(last, id_column.key))
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "total": total,
+    }
+
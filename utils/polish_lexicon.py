@@ -0,0 +1,289 @@
+"""
+Polish Lexicon
+
+Inflection-aware word normalization for keyword matching and readability.
+
+Irregular and core-vocabulary forms come from a lookup table built from the
+bundled wordlist (data/pl_wordlist.txt) into a compact binary file
+(data/pl_lexicon.bin) that is memory-mapped and binary-searched, so every
+process shares the same pages and nothing is parsed at import time. Words
+that are not in the table are reduced with a light suffix stemmer.
+
+normalize() maps all inflected forms of a word to one key:
+"ciąża", "ciąży", "ciążę" and "ciążą" all become "ciąż".
+
+Rebuild the table after editing the wordlist:
+    python -m utils.polish_lexicon build
+"""
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+WORDLIST_PATH = os.path.join(DATA_DIR, 'pl_wordlist.txt')
+LEXICON_PATH = os.path.join(DATA_DIR, 'pl_lexicon.bin')
+
+# File layout: header, form index (sorted by UTF-8 bytes), lemma index,
+# form references grouped by lemma, NUL-terminated string blob
+MAGIC = b'PLLEX001'
+HEADER = struct.Struct('<8s20sIII')   # magic, wordlist sha1, forms, lemmas, references
+FORM_ENTRY = struct.Struct('<II')     # string offset, lemma id
+LEMMA_ENTRY = struct.Struct('<III')   # string offset, first reference, reference count
+REFERENCE = struct.Struct('<I')       # form index
+
+# Inflectional endings, longest first; a stem keeps at least MIN_STEM_LENGTH letters,
+# one more for endings of three or more letters ("zdrowie" is not "zdr-owie")
+SUFFIXES = sorted({
+    'ościami', 'ościach', 'owiami', 'iejszy', 'ejszego', 'ejszej', 'ejszych', 'ejszy',
+    'owania', 'owanie', 'owaniu', 'owała', 'owało', 'owali', 'owały', 'ować', 'ował',
+    'ujesz', 'ujemy', 'ujecie', 'ością', 'ości', 'ość',
+    'owie', 'ami', 'ach', 'ych', 'ich', 'ymi', 'imi', 'ego', 'emu', 'owi', 'iem', 'uje', 'ują',
+    'ała', 'ało', 'ali', 'ały', 'esz', 'emy', 'ecie', 'isz', 'imy', 'icie',
+    'ów', 'om', 'em', 'ej', 'ym', 'im', 'ie', 'ia', 'iu', 'io', 'ią', 'ię', 'ać', 'eć', 'ić', 'yć', 'ał',
+    'a', 'ą', 'ę', 'e', 'i', 'o', 'u', 'y',
+}, key=len, reverse=True)
+MIN_STEM_LENGTH = 3
+
+# Soft consonants at the end of a stem ("badań") matched to their hard spelling ("badani-a")
+SOFT_ENDINGS = {'ń': 'n', 'ć': 'c', 'ś': 's', 'ź': 'z'}
+
+# Vowels (syllable nuclei); "i" before another vowel only softens the consonant
+VOWEL_PATTERN = re.compile(r'[aąeęioóuy]')
+SOFTENING_I_PATTERN = re.compile(r'i(?=[aąeęoóuy])')
+
+# Function words ignored when picking keywords
+STOPWORDS = frozenset("""
+a aby ach albo ale ani aż bardzo bez bo bowiem by był była było były być będzie ci cię ciebie co coś czy czyli
+dla do dlaczego dlatego dość gdy gdyż gdzie go i ich ile im inne inny jak jaka jaki jakie jako je jeden jedna
+jedno jego jej jemu jest jestem jeszcze jeśli jeżeli już ją każdy kiedy kto która które którego której który
+których którym ku lub ma mają mi mnie może można mu musi na nad nam nas nawet nic nich nie niech nim nią niż no
+o od oraz po pod ponieważ przed przez przy również są się sobie swoje ta tak takie także tam te tego tej ten
+też to tobą tu tutaj twój ty tylko tym u w we więc wszystko wszystkie z za zawsze ze że żeby
+""".split())
+
+
+def build_lexicon(wordlist_path: str = WORDLIST_PATH, target_path: str = LEXICON_PATH) -> str:
+    """
+    Compile the wordlist into the binary lookup table.
+
+    Args:
+        wordlist_path: Source wordlist ("lemma: form form ..." lines)
+        target_path: Where to write the table (replaced atomically)
+
+    Returns:
+        Path of the written table
+    """
+    with open(wordlist_path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha1(source).digest()
+
+    lemmas: List[str] = []
+    form_lemma: Dict[str, int] = {}
+    for number, line in enumerate(source.decode('utf-8').splitlines(), start=1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if ':' not in line:
+            raise ValueError(f"{wordlist_path}:{number}: expected 'lemma: forms'")
+        lemma, forms = line.split(':', 1)
+        lemma = lemma.strip().lower()
+        lemma_id = len(lemmas)
+        lemmas.append(lemma)
+        for form in [lemma] + forms.lower().split():
+            if form_lemma.setdefault(form, lemma_id) != lemma_id:
+                logger.debug(f"Form '{form}' of '{lemma}' already belongs to '{lemmas[form_lemma[form]]}'")
+
+    forms = sorted(form_lemma, key=lambda form: form.encode('utf-8'))
+    form_index = {form: index for index, form in enumerate(forms)}
+    references: List[List[int]] = [[] for _ in lemmas]
+    for form in forms:
+        references[form_lemma[form]].append(form_index[form])
+
+    # String blob: forms first, then lemmas that are not also forms
+    blob = bytearray()
+    string_offsets: Dict[str, int] = {}
+    for value in forms + lemmas:
+        if value not in string_offsets:
+            string_offsets[value] = len(blob)
+            blob += value.encode('utf-8') + b'\0'
+
+    reference_count = sum(len(group) for group in references)
+    parts = [HEADER.pack(MAGIC, digest, len(forms), len(lemmas), reference_count)]
+    parts += [FORM_ENTRY.pack(string_offsets[form], form_lemma[form]) for form in forms]
+    first = 0
+    for lemma, group in zip(lemmas, references):
+        parts.append(LEMMA_ENTRY.pack(string_offsets[lemma], first, len(group)))
+        first += len(group)
+    parts += [REFERENCE.pack(index) for group in references for index in group]
+    parts.append(bytes(blob))
+
+    temporary_path = f"{target_path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as f:
+        f.write(b''.join(parts))
+    os.replace(temporary_path, target_path)
+
+    logger.info(f"Built Polish lexicon with {len(lemmas)} lemmas and {len(forms)} forms: {target_path}")
+    return target_path
+
+
+class PolishLexicon:
+    """Read-only view of a memory-mapped lexicon table"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.digest, self.form_count, self.lemma_count, reference_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a Polish lexicon table")
+        self._forms_offset = HEADER.size
+        self._lemmas_offset = self._forms_offset + self.form_count * FORM_ENTRY.size
+        self._references_offset = self._lemmas_offset + self.lemma_count * LEMMA_ENTRY.size
+        self._strings_offset = self._references_offset + reference_count * REFERENCE.size
+
+    def lemma(self, word: str) -> Optional[str]:
+        """Lemma of an inflected form, or None if the form is not in the table"""
+        index = self._find(word.encode('utf-8'))
+        if index is None:
+            return None
+        _, lemma_id = FORM_ENTRY.unpack_from(self._map, self._forms_offset + index * FORM_ENTRY.size)
+        offset, _, _ = LEMMA_ENTRY.unpack_from(self._map, self._lemmas_offset + lemma_id * LEMMA_ENTRY.size)
+        return self._string(offset).decode('utf-8')
+
+    def forms(self, word: str) -> List[str]:
+        """All forms sharing a lemma with the given form (empty if unknown)"""
+        index = self._find(word.encode('utf-8'))
+        if index is None:
+            return []
+        _, lemma_id = FORM_ENTRY.unpack_from(self._map, self._forms_offset + index * FORM_ENTRY.size)
+        _, first, count = LEMMA_ENTRY.unpack_from(self._map, self._lemmas_offset + lemma_id * LEMMA_ENTRY.size)
+        forms = []
+        for position in range(first, first + count):
+            (form_index,) = REFERENCE.unpack_from(self._map, self._references_offset + position * REFERENCE.size)
+            forms.append(self._form(form_index).decode('utf-8'))
+        return forms
+
+    def close(self):
+        self._map.close()
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self.form_count
+        while low < high:
+            middle = (low + high) // 2
+            form = self._form(middle)
+            if form < key:
+                low = middle + 1
+            elif form > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _form(self, index: int) -> bytes:
+        (offset,) = struct.unpack_from('<I', self._map, self._forms_offset + index * FORM_ENTRY.size)
+        return self._string(offset)
+
+    def _string(self, offset: int) -> bytes:
+        start = self._strings_offset + offset
+        return self._map[start:self._map.find(b'\0', start)]
+
+
+_lexicon: Optional[PolishLexicon] = None
+_lexicon_loaded = False
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon() -> Optional[PolishLexicon]:
+    """
+    The process-wide lexicon, built from the wordlist on first use if the
+    table is missing or out of date. Returns None if it can't be loaded
+    (normalization then relies on the stemmer alone).
+    """
+    global _lexicon, _lexicon_loaded
+    if _lexicon_loaded:
+        return _lexicon
+
+    with _lexicon_lock:
+        if not _lexicon_loaded:
+            try:
+                _lexicon = _open_lexicon()
+            except Exception as e:
+                logger.error(f"Polish lexicon unavailable, using the stemmer only: {str(e)}")
+                _lexicon = None
+            _lexicon_loaded = True
+    return _lexicon
+
+
+def _open_lexicon() -> PolishLexicon:
+    with open(WORDLIST_PATH, 'rb') as f:
+        digest = hashlib.sha1(f.read()).digest()
+
+    fallback_path = os.path.join(tempfile.gettempdir(), f"pl_lexicon-{digest.hex()[:12]}.bin")
+    for path in (LEXICON_PATH, fallback_path):
+        if os.path.exists(path):
+            lexicon = PolishLexicon(path)
+            if lexicon.digest == digest:
+                return lexicon
+            lexicon.close()
+
+    try:
+        return PolishLexicon(build_lexicon(WORDLIST_PATH, LEXICON_PATH))
+    except OSError:
+        # Read-only deployment: keep the table next to other temporary files
+        return PolishLexicon(build_lexicon(WORDLIST_PATH, fallback_path))
+
+
+def stem(word: str) -> str:
+    """Strip the inflectional ending of a lowercase word"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH + (len(suffix) >= 3):
+            word = word[:-len(suffix)]
+            break
+    if word and word[-1] in SOFT_ENDINGS:
+        word = word[:-1] + SOFT_ENDINGS[word[-1]]
+    return word
+
+
+@lru_cache(maxsize=100000)
+def normalize(word: str) -> str:
+    """
+    Matching key of a word: the stem of its lemma if the lexicon knows the
+    form, otherwise the stem of the word itself.
+    """
+    word = word.lower()
+    lexicon = get_lexicon()
+    lemma = lexicon.lemma(word) if lexicon is not None else None
+    return stem(lemma or word)
+
+
+def inflected_forms(word: str) -> List[str]:
+    """Known inflected forms of a word (including itself)"""
+    word = word.lower()
+    lexicon = get_lexicon()
+    forms = lexicon.forms(word) if lexicon is not None else []
+    return forms or [word]
+
+
+@lru_cache(maxsize=100000)
+def count_syllables(word: str) -> int:
+    """Number of syllables in a Polish word (vowel nuclei)"""
+    return max(1, len(VOWEL_PATTERN.findall(SOFTENING_I_PATTERN.sub('', word.lower()))))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    if sys.argv[1:] != ['build']:
+        print("Usage: python -m utils.polish_lexicon build")
+        sys.exit(2)
+    build_lexicon()
@@ -1,67 +1,40 @@
 """
-Simple scheduler module without syntax errors
+Content scheduler jobs running on the shared scheduler core
 """
 import logging
-import threading
-import time
-import schedule
 import traceback
 
-logger = logging.getLogger(__name__)
+from utils.scheduling.core import get_scheduler_core
+from utils.scheduling.jobs import AnalyticsSyncJob, ContentGenerationJob, MaintenanceJob, NewsletterJob
 
-# Scheduler thread
-scheduler_thread = None
-running = False
+logger = logging.getLogger(__name__)
 
 def start_scheduler():
-    """Start the scheduler in a background thread"""
-    global scheduler_thread, running
-    
-    if scheduler_thread and scheduler_thread.is_alive():
-        logger.info("Scheduler already running")
-        return
+    """Register the content jobs and start the shared scheduler core"""
+    core = get_scheduler_core()
     
     logger.info("Starting scheduler")
-    running = True
     
     # Schedule tasks
-    schedule.every().hour.do(process_content_generation)
-    schedule.every().day.at("02:00").do(run_maintenance_tasks)
+    core.add_job(ContentGenerationJob())
+    core.add_job(MaintenanceJob())
+    core.add_job(NewsletterJob())
+    core.add_job(AnalyticsSyncJob())
     
-    # Start scheduler thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    core.start()
     
     logger.info("Scheduler started successfully")
 
 def stop_scheduler():
-    """Stop the scheduler thread"""
-    global running, scheduler_thread
+    """Stop the shared scheduler core"""
+    core = get_scheduler_core()
     
-    if not running:
+    if not core.is_running:
         logger.info("Scheduler is not running")
         return
     
     logger.info("Stopping scheduler")
-    running = False
-    
-    # Wait for thread to terminate
-    if scheduler_thread:
-        scheduler_thread.join(timeout=5)
-        scheduler_thread = None
-
-def run_scheduler():
-    """Run the scheduler continuously"""
-    global running
-    
-    while running:
-        try:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-        except Exception as e:
-            logger.error(f"Error in scheduler: {str(e)}")
-            logger.error(traceback.format_exc())
-            time.sleep(300)  # Wait 5 minutes after error
+    core.stop()
 
 def process_content_generation():
     """Process content generation for all active blogs"""
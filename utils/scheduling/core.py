@@ -0,0 +1,262 @@
+"""
+Scheduler core
+
+A single timer thread for every periodic job in the application. Jobs are
+kept in one registry keyed by name and their next fire times in a heap, so
+the thread sleeps exactly until the earliest due job instead of polling
+every minute. Due jobs run on a small thread pool; a job that is still
+running when it comes due again is skipped rather than started twice.
+With several instances, timed jobs only fire on the elected leader
+(see utils.scheduling.leader).
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from utils.scheduling.leader import get_leader_election
+
+logger = logging.getLogger(__name__)
+
+
+class Trigger:
+    """Computes the next fire time of a job"""
+
+    def next_after(self, moment: datetime) -> datetime:
+        raise NotImplementedError
+
+
+class Every(Trigger):
+    """Fires at a fixed interval"""
+
+    def __init__(self, seconds: int = 0, minutes: int = 0, hours: int = 0):
+        self.interval = timedelta(seconds=seconds, minutes=minutes, hours=hours)
+        if self.interval.total_seconds() <= 0:
+            raise ValueError("Interval must be positive")
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + self.interval
+
+    def __repr__(self):
+        return f"every {int(self.interval.total_seconds())}s"
+
+
+class DailyAt(Trigger):
+    """Fires once a day at HH:MM (server local time, like schedule.every().day.at)"""
+
+    def __init__(self, at: str):
+        hour, minute = map(int, at.split(':'))
+        self.at = at
+        self.hour = hour
+        self.minute = minute
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if candidate <= moment:
+            candidate += timedelta(days=1)
+        return candidate
+
+    def __repr__(self):
+        return f"daily at {self.at}"
+
+
+class ScheduledJob:
+    """
+    Base class for scheduled jobs.
+
+    Subclasses set `name` (unique in the registry) and `trigger`, and
+    either implement run() or name a job queue handler in `task`. run() is
+    called inside an application context. With JOB_QUEUE_ENABLED, jobs
+    that have a `task` are enqueued for worker.py instead of run in-process.
+    """
+
+    name: str = None
+    trigger: Trigger = None
+    task: str = None
+    priority: int = 0
+
+    def payload(self) -> Dict[str, Any]:
+        """Arguments passed to the task handler"""
+        return {}
+
+    def run(self):
+        from utils.scheduling.job_queue import get_handler
+        return get_handler(self.task)(self.payload())
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "trigger": repr(self.trigger), "type": type(self).__name__, "task": self.task}
+
+
+class SchedulerCore:
+    """Heap-ordered timer with a single job registry and per-job overlap protection"""
+
+    def __init__(self, max_workers: int = 3):
+        self.max_workers = max_workers
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._next_run: Dict[str, datetime] = {}
+        self._last_run: Dict[str, datetime] = {}
+        self._running_jobs = set()
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_leader(self) -> bool:
+        """True if this node fires timed jobs"""
+        return not Config.LEADER_ELECTION_ENABLED or get_leader_election().is_leader
+
+    def add_job(self, job: ScheduledJob) -> ScheduledJob:
+        """Register a job, replacing any job with the same name"""
+        if not job.name or job.trigger is None:
+            raise ValueError("Scheduled jobs need a name and a trigger")
+
+        with self._condition:
+            replaced = job.name in self._jobs
+            self._jobs[job.name] = job
+            self._push(job.name, job.trigger.next_after(datetime.now()))
+            self._condition.notify()
+
+        logger.info(f"{'Replaced' if replaced else 'Scheduled'} job {job.name} ({job.trigger!r}), "
+                    f"next run at {self._next_run[job.name]}")
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        """Unregister a job; a run already in progress is not interrupted"""
+        with self._condition:
+            removed = self._jobs.pop(name, None) is not None
+            self._next_run.pop(name, None)
+            self._condition.notify()
+        return removed
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Registered jobs with their next and last run times"""
+        with self._condition:
+            return [
+                dict(job.describe(),
+                     next_run=self._next_run.get(name),
+                     last_run=self._last_run.get(name),
+                     running=name in self._running_jobs)
+                for name, job in sorted(self._jobs.items(), key=lambda item: self._next_run.get(item[0]))
+            ]
+
+    def run_job_now(self, name: str) -> bool:
+        """Dispatch a registered job immediately, returns False if unknown or already running"""
+        with self._condition:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            return self._dispatch(job)
+
+    def start(self):
+        """Start the timer thread (idempotent)"""
+        with self._condition:
+            if self.is_running:
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduled-job")
+            self._thread = threading.Thread(target=self._run, name="scheduler-core", daemon=True)
+            self._thread.start()
+        if Config.LEADER_ELECTION_ENABLED:
+            get_leader_election().start()
+        logger.info(f"Scheduler core started with {len(self._jobs)} jobs")
+
+    def stop(self, wait: bool = True):
+        """Stop the timer thread; registered jobs are kept"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        logger.info("Scheduler core stopped")
+
+    def _push(self, name: str, when: datetime):
+        """Record the next fire time; older heap entries for the job become stale"""
+        self._next_run[name] = when
+        heapq.heappush(self._heap, (when, next(self._sequence), name))
+
+    def _run(self):
+        """Timer loop: sleep until the earliest due job, then dispatch everything due"""
+        with self._condition:
+            while not self._stopping:
+                now = datetime.now()
+                while self._heap:
+                    when, _, name = self._heap[0]
+                    if self._next_run.get(name) != when:
+                        # Removed or rescheduled job
+                        heapq.heappop(self._heap)
+                        continue
+                    if when > now:
+                        break
+                    heapq.heappop(self._heap)
+                    job = self._jobs[name]
+                    self._push(name, job.trigger.next_after(now))
+                    if self.is_leader:
+                        self._dispatch(job)
+                    else:
+                        logger.debug(f"Not the scheduler leader, job {name} left to the leader node")
+
+                timeout = None
+                if self._heap:
+                    # Wake up at least once a minute so wall clock changes are picked up
+                    timeout = min(max((self._heap[0][0] - datetime.now()).total_seconds(), 0), 60)
+                self._condition.wait(timeout)
+
+    def _dispatch(self, job: ScheduledJob) -> bool:
+        """Submit a job to the pool unless a previous run is still in progress (holds the lock)"""
+        if job.name in self._running_jobs:
+            logger.warning(f"Skipping job {job.name}: previous run still in progress")
+            return False
+        if self._executor is None:
+            logger.warning(f"Scheduler core not running, job {job.name} not dispatched")
+            return False
+        self._running_jobs.add(job.name)
+        self._executor.submit(self._execute, job)
+        return True
+
+    def _execute(self, job: ScheduledJob):
+        """Run (or enqueue) a job inside an application context"""
+        from app import app
+
+        started = time.monotonic()
+        try:
+            with app.app_context():
+                from utils.scheduling.job_queue import enqueue, queue_enabled
+                if job.task and queue_enabled():
+                    # Overlap across processes is prevented by the dedupe key
+                    enqueue(job.task, job.payload(), priority=job.priority, dedupe_key=job.name)
+                else:
+                    job.run()
+            logger.info(f"Job {job.name} finished in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Error in scheduled job {job.name}: {str(e)}")
+            logger.error(traceback.format_exc())
+        finally:
+            with self._condition:
+                self._running_jobs.discard(job.name)
+                self._last_run[job.name] = datetime.now()
+
+
+# Process-wide scheduler shared by all modules
+scheduler_core = SchedulerCore()
+
+
+def get_scheduler_core() -> SchedulerCore:
+    """Returns the process-wide scheduler"""
+    return scheduler_core
@@ -0,0 +1,356 @@
+"""
+Persistent job queue
+
+Jobs are rows in the job_queue table. Worker processes (worker.py) claim
+them under a lease: on PostgreSQL with SELECT ... FOR UPDATE SKIP LOCKED,
+on SQLite with a conditional UPDATE, so any number of workers can share the
+queue without running a job twice. A worker that dies loses its lease and
+the job is re-queued; failed jobs are retried with exponential backoff
+until max_attempts is reached.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, text, update
+
+from app import app, db
+from config import Config
+from models import QueuedJob
+
+logger = logging.getLogger(__name__)
+
+# Registered handlers: job_type -> callable(payload) -> JSON-serialisable result
+_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+UNFINISHED_STATES = ("queued", "running")
+
+# Retry backoff: 30 s, 60 s, 120 s, ... capped at one hour
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def job_handler(job_type: str):
+    """Decorator registering a function as the handler of a job type"""
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def get_handler(job_type: str) -> Callable[[Dict[str, Any]], Any]:
+    """Returns the handler of a job type, raises KeyError if none is registered"""
+    return _handlers[job_type]
+
+
+def queue_enabled() -> bool:
+    """True when scheduled work should go through the queue instead of running in-process"""
+    return Config.JOB_QUEUE_ENABLED
+
+
+def enqueue(job_type: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0,
+            run_after: Optional[datetime] = None, max_attempts: Optional[int] = None,
+            dedupe_key: Optional[str] = None) -> QueuedJob:
+    """
+    Add a job to the queue.
+
+    Args:
+        job_type: Registered handler name
+        payload: Handler arguments (JSON-serialisable)
+        priority: Higher values are claimed first
+        run_after: Earliest start time (UTC), defaults to now
+        max_attempts: Attempts before the job is marked failed
+        dedupe_key: If an unfinished job with this key exists it is returned instead
+
+    Returns:
+        The queued (or already pending) job
+    """
+    if dedupe_key:
+        existing = QueuedJob.query.filter(
+            QueuedJob.dedupe_key == dedupe_key,
+            QueuedJob.state.in_(UNFINISHED_STATES)
+        ).first()
+        if existing:
+            logger.info(f"Job {dedupe_key} already {existing.state} as #{existing.id}, not enqueued again")
+            return existing
+
+    job = QueuedJob(
+        job_type=job_type,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or Config.JOB_QUEUE_MAX_ATTEMPTS,
+        run_after=run_after or datetime.utcnow(),
+        state="queued",
+        attempts=0,
+    )
+    db.session.add(job)
+    db.session.commit()
+    logger.info(f"Enqueued job {job_type} #{job.id} (priority {priority})")
+    return job
+
+
+def _runnable(now: datetime, job_types: Optional[List[str]] = None):
+    """Filter criteria of jobs a worker may claim"""
+    criteria = [QueuedJob.state == "queued", QueuedJob.run_after <= now]
+    if job_types:
+        criteria.append(QueuedJob.job_type.in_(job_types))
+    return criteria
+
+
+def claim_next_job(worker_id: str, job_types: Optional[List[str]] = None,
+                   lease_seconds: Optional[int] = None) -> Optional[QueuedJob]:
+    """
+    Atomically claim the highest-priority runnable job.
+
+    Args:
+        worker_id: Identifier stored in locked_by
+        job_types: Only claim these job types (all when None)
+        lease_seconds: Lease length; the worker must extend it while running
+
+    Returns:
+        The claimed job or None if the queue is empty
+    """
+    lease = timedelta(seconds=lease_seconds or Config.JOB_QUEUE_LEASE_SECONDS)
+    now = datetime.utcnow()
+    ordered = QueuedJob.query.filter(*_runnable(now, job_types)).order_by(
+        QueuedJob.priority.desc(), QueuedJob.run_after.asc(), QueuedJob.id.asc()
+    )
+
+    if db.engine.dialect.name == 'postgresql':
+        # Row lock; concurrent workers skip the locked row and take the next one
+        job = ordered.with_for_update(skip_locked=True).first()
+        if job is None:
+            db.session.commit()
+            return None
+        job.state = "running"
+        job.locked_by = worker_id
+        job.lease_expires_at = now + lease
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = now
+        db.session.commit()
+        return job
+
+    # SQLite: compare-and-swap on the state column, retry if another worker won
+    for _ in range(5):
+        candidate_ids = [row.id for row in ordered.with_entities(QueuedJob.id).limit(5).all()]
+        if not candidate_ids:
+            db.session.commit()
+            return None
+        for job_id in candidate_ids:
+            claimed = db.session.execute(
+                update(QueuedJob)
+                .where(QueuedJob.id == job_id, QueuedJob.state == "queued")
+                .values(state="running", locked_by=worker_id, lease_expires_at=now + lease,
+                        attempts=QueuedJob.attempts + 1, started_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(QueuedJob, job_id, populate_existing=True)
+    return None
+
+
+def extend_lease(job_id: int, worker_id: str, lease_seconds: Optional[int] = None) -> bool:
+    """Extend the lease of a running job, returns False if the worker lost it"""
+    lease = timedelta(seconds=lease_seconds or Config.JOB_QUEUE_LEASE_SECONDS)
+    extended = db.session.execute(
+        update(QueuedJob)
+        .where(QueuedJob.id == job_id, QueuedJob.locked_by == worker_id, QueuedJob.state == "running")
+        .values(lease_expires_at=datetime.utcnow() + lease)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return bool(extended)
+
+
+def complete_job(job_id: int, worker_id: str, result: Any = None) -> bool:
+    """Mark a job succeeded; ignored if the lease was lost to another worker"""
+    done = db.session.execute(
+        update(QueuedJob)
+        .where(QueuedJob.id == job_id, QueuedJob.locked_by == worker_id, QueuedJob.state == "running")
+        .values(state="succeeded", result=json.dumps(result, default=str), finished_at=datetime.utcnow(),
+                lease_expires_at=None, last_error=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return bool(done)
+
+
+def fail_job(job_id: int, worker_id: str, error: str) -> bool:
+    """Schedule a retry with backoff, or mark the job failed after max_attempts"""
+    job = db.session.get(QueuedJob, job_id, populate_existing=True)
+    if job is None or job.locked_by != worker_id or job.state != "running":
+        db.session.commit()
+        return False
+
+    now = datetime.utcnow()
+    if job.attempts >= job.max_attempts:
+        values = dict(state="failed", finished_at=now)
+        logger.error(f"Job {job.job_type} #{job_id} failed after {job.attempts} attempts: {error}")
+    else:
+        delay = min(RETRY_BASE_SECONDS * 2 ** (job.attempts - 1), RETRY_MAX_SECONDS)
+        values = dict(state="queued", run_after=now + timedelta(seconds=delay))
+        logger.warning(f"Job {job.job_type} #{job_id} attempt {job.attempts} failed, retry in {delay}s: {error}")
+
+    db.session.execute(
+        update(QueuedJob)
+        .where(QueuedJob.id == job_id, QueuedJob.locked_by == worker_id, QueuedJob.state == "running")
+        .values(locked_by=None, lease_expires_at=None, last_error=error, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return True
+
+
+def requeue_expired_jobs() -> int:
+    """Return jobs whose worker stopped renewing the lease to the queue (or fail them)"""
+    now = datetime.utcnow()
+    expired = and_(QueuedJob.state == "running", QueuedJob.lease_expires_at < now)
+
+    failed = db.session.execute(
+        update(QueuedJob)
+        .where(expired, QueuedJob.attempts >= QueuedJob.max_attempts)
+        .values(state="failed", locked_by=None, lease_expires_at=None, finished_at=now,
+                last_error="Lease expired")
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    requeued = db.session.execute(
+        update(QueuedJob)
+        .where(expired)
+        .values(state="queued", locked_by=None, lease_expires_at=None, run_after=now,
+                last_error="Lease expired")
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+
+    if failed or requeued:
+        logger.warning(f"Expired leases: {requeued} jobs re-queued, {failed} marked failed")
+    return requeued
+
+
+def get_queue_stats() -> Dict[str, int]:
+    """Number of jobs per state"""
+    rows = db.session.query(QueuedJob.state, db.func.count(QueuedJob.id)).group_by(QueuedJob.state).all()
+    return {state: count for state, count in rows}
+
+
+def prepare_sqlite(engine) -> None:
+    """
+    Switch a SQLite database to WAL so readers don't block the writing worker.
+
+    The journal mode is stored in the database file, so this only has to run
+    once per database; it is a no-op on other dialects.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.connect() as conn:
+        mode = conn.execute(text("PRAGMA journal_mode=WAL")).scalar()
+        conn.commit()
+    logger.info(f"SQLite journal mode: {mode}")
+
+
+class QueueWorker:
+    """
+    Claims and runs queued jobs on `concurrency` threads.
+
+    Each thread has its own application context and session. While a job is
+    running its lease is renewed every lease/3 seconds.
+    """
+
+    def __init__(self, concurrency: int = 1, job_types: Optional[List[str]] = None,
+                 lease_seconds: Optional[int] = None, poll_seconds: Optional[float] = None):
+        self.concurrency = max(1, concurrency)
+        self.job_types = job_types or None
+        self.lease_seconds = lease_seconds or Config.JOB_QUEUE_LEASE_SECONDS
+        self.poll_seconds = poll_seconds if poll_seconds is not None else Config.JOB_QUEUE_POLL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the worker threads"""
+        for number in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, args=(f"{self.worker_id}:{number}",),
+                                      name=f"queue-worker-{number}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"Queue worker {self.worker_id} started with {self.concurrency} threads"
+                    f"{' for ' + ', '.join(self.job_types) if self.job_types else ''}")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming new jobs and wait for running ones to finish"""
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        logger.info(f"Queue worker {self.worker_id} stopped")
+
+    def run_forever(self):
+        """Start the threads and block until stop() is called"""
+        self.start()
+        while not self.stop_event.is_set():
+            self.stop_event.wait(1)
+
+    def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """Claim and run a single job, returns False if the queue was empty"""
+        worker_id = worker_id or self.worker_id
+        with app.app_context():
+            job = claim_next_job(worker_id, self.job_types, self.lease_seconds)
+            if job is None:
+                return False
+            job_id, job_type, payload = job.id, job.job_type, job.get_payload()
+
+        logger.info(f"Running job {job_type} #{job_id} on {worker_id}")
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, worker_id, heartbeat_stop), daemon=True)
+        heartbeat.start()
+        started = time.monotonic()
+
+        try:
+            with app.app_context():
+                result = get_handler(job_type)(payload)
+        except Exception as e:
+            heartbeat_stop.set()
+            logger.error(traceback.format_exc())
+            with app.app_context():
+                fail_job(job_id, worker_id, f"{type(e).__name__}: {str(e)}")
+        else:
+            heartbeat_stop.set()
+            with app.app_context():
+                if not complete_job(job_id, worker_id, result):
+                    logger.warning(f"Job {job_type} #{job_id} finished after its lease was lost")
+            logger.info(f"Job {job_type} #{job_id} finished in {time.monotonic() - started:.1f}s")
+        finally:
+            heartbeat.join()
+        return True
+
+    def _loop(self, worker_id: str):
+        """Thread body: reap expired leases, claim, run, sleep when idle"""
+        while not self.stop_event.is_set():
+            try:
+                with app.app_context():
+                    requeue_expired_jobs()
+                if self.run_once(worker_id):
+                    continue
+            except Exception as e:
+                logger.error(f"Queue worker {worker_id} error: {str(e)}")
+            self.stop_event.wait(self.poll_seconds)
+
+    def _heartbeat(self, job_id: int, worker_id: str, stop: threading.Event):
+        """Renew the lease until the job finishes"""
+        interval = max(self.lease_seconds / 3, 1)
+        while not stop.wait(interval):
+            try:
+                with app.app_context():
+                    if not extend_lease(job_id, worker_id, self.lease_seconds):
+                        logger.warning(f"Lost lease on job #{job_id}")
+                        return
+            except Exception as e:
+                logger.error(f"Error extending lease on job #{job_id}: {str(e)}")
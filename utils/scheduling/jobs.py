@@ -0,0 +1,170 @@
+"""
+Scheduled job definitions
+
+Every periodic task of the application as a job queue handler plus a named
+ScheduledJob class binding it to a trigger. The work itself stays in the
+modules that own it. Handlers are what worker.py runs when the job queue
+is enabled; otherwise the scheduler core calls them in-process.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from utils.scheduling.core import DailyAt, Every, ScheduledJob
+from utils.scheduling.job_queue import job_handler
+
+logger = logging.getLogger(__name__)
+
+
+# --- Handlers ---------------------------------------------------------------
+
+@job_handler("batch_generation")
+def batch_generation(payload: Dict[str, Any]):
+    """Morning batch generation of all articles for one blog"""
+    from utils.automation.scheduler import get_automation_scheduler
+    get_automation_scheduler().batch_generate_articles(blog_id=payload["blog_id"])
+
+
+@job_handler("execute_rule")
+def execute_rule(payload: Dict[str, Any]):
+    """Single run of an automation rule"""
+    from utils.automation.scheduler import get_automation_scheduler
+    get_automation_scheduler()._execute_rule_async(payload["rule_id"])
+
+
+@job_handler("automation_rules_check")
+def automation_rules_check(payload: Dict[str, Any]):
+    """Backup check of automation rules due for execution"""
+    from utils.automation.scheduler import get_automation_scheduler
+    get_automation_scheduler().check_and_execute_rules()
+
+
+@job_handler("automation_cleanup")
+def automation_cleanup(payload: Dict[str, Any]):
+    """Resets failure counters of rules disabled for over a day"""
+    from utils.automation.scheduler import get_automation_scheduler
+    get_automation_scheduler().cleanup_failed_rules()
+
+
+@job_handler("automation_daily_report")
+def automation_daily_report(payload: Dict[str, Any]):
+    """Daily automation report after all batch generations"""
+    from utils.automation.scheduler import get_automation_scheduler
+    get_automation_scheduler().generate_daily_report()
+
+
+@job_handler("seo_daily_analysis")
+def seo_daily_analysis(payload: Dict[str, Any]):
+    """Daily trends analysis and topic generation"""
+    from utils.seo.scheduler import run_daily_seo_analysis
+    return run_daily_seo_analysis()
+
+
+@job_handler("content_generation")
+def content_generation(payload: Dict[str, Any]):
+    """Hourly content generation pass over active blogs"""
+    from utils.scheduler import process_content_generation
+    process_content_generation()
+
+
+@job_handler("maintenance")
+def maintenance(payload: Dict[str, Any]):
+    """Nightly cleanup of old content logs"""
+    from utils.scheduler import run_maintenance_tasks
+    run_maintenance_tasks()
+
+
+@job_handler("newsletters")
+def newsletters(payload: Dict[str, Any]):
+    """Sends scheduled newsletters whose send time has passed (and creates due weekly ones with NEWSLETTER_AUTO_WEEKLY)"""
+    from utils.newsletter.distributor import NewsletterDistributor
+    results = NewsletterDistributor().process_pending_newsletters()
+    if results.get("total"):
+        logger.info(f"Newsletters processed: {results}")
+    return results
+
+
+@job_handler("newsletter_subscriber_sync")
+def newsletter_subscriber_sync(payload: Dict[str, Any]):
+    """Syncs the active subscribers of one blog to EmailOctopus (resumes an interrupted sync)"""
+    from utils.newsletter.distributor import NewsletterDistributor
+    return NewsletterDistributor().upload_subscribers(payload["blog_id"])
+
+
+@job_handler("analytics_sync")
+def analytics_sync(payload: Dict[str, Any]):
+    """Syncs analytics of every blog whose sync_frequency has elapsed"""
+    from models import AnalyticsConfig
+    from utils.analytics.collector import AnalyticsCollector
+
+    now = datetime.utcnow()
+    due = [
+        config.blog_id for config in AnalyticsConfig.query.filter_by(active=True).all()
+        if not config.last_sync or now - config.last_sync >= timedelta(hours=config.sync_frequency or 24)
+    ]
+    if not due:
+        return {"synced": []}
+
+    collector = AnalyticsCollector()
+    for blog_id in due:
+        result = collector.sync_blog_metrics(blog_id)
+        if 'error' in result:
+            logger.error(f"Analytics sync failed for blog {blog_id}: {result['error']}")
+    return {"synced": due}
+
+
+# --- Scheduled jobs -----------------------------------------------------------
+
+class BatchGenerationJob(ScheduledJob):
+    """Morning batch generation of all articles for one blog"""
+    task = "batch_generation"
+    priority = 10
+
+    def __init__(self, blog_id: int, at: str):
+        self.blog_id = blog_id
+        self.name = f"batch_generation:{blog_id}"
+        self.trigger = DailyAt(at)
+
+    def payload(self):
+        return {"blog_id": self.blog_id}
+
+
+class AutomationRulesCheckJob(ScheduledJob):
+    name = task = "automation_rules_check"
+    trigger = Every(minutes=15)
+
+
+class AutomationCleanupJob(ScheduledJob):
+    name = task = "automation_cleanup"
+    trigger = Every(hours=1)
+
+
+class AutomationReportJob(ScheduledJob):
+    name = task = "automation_daily_report"
+    trigger = DailyAt("08:00")
+
+
+class SeoAnalysisJob(ScheduledJob):
+    name = task = "seo_daily_analysis"
+    trigger = DailyAt("05:00")
+    priority = 5
+
+
+class ContentGenerationJob(ScheduledJob):
+    name = task = "content_generation"
+    trigger = Every(hours=1)
+
+
+class MaintenanceJob(ScheduledJob):
+    name = task = "maintenance"
+    trigger = DailyAt("02:00")
+
+
+class NewsletterJob(ScheduledJob):
+    name = task = "newsletters"
+    trigger = Every(minutes=15)
+
+
+class AnalyticsSyncJob(ScheduledJob):
+    name = task = "analytics_sync"
+    trigger = Every(hours=1)
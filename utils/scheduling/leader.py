@@ -0,0 +1,204 @@
+"""
+Scheduler leader election
+
+When several instances (or gunicorn workers) run the app, only the leader
+fires timed jobs; the others keep serving requests and running queue
+workers. Leadership is a lease tied to the life of the holder:
+
+- PostgreSQL: a session-level advisory lock held on a dedicated connection.
+  If the leader process dies its connection closes and the lock is freed.
+- SQLite: an exclusive flock() on a lockfile next to the database, released
+  by the kernel when the leader process exits.
+
+Followers retry every LEADER_CHECK_SECONDS, so failover takes at most one
+check interval.
+"""
+import hashlib
+import logging
+import os
+import socket
+import tempfile
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "auto-blog-agent:scheduler-leader"
+
+
+def _advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg_try_advisory_lock"""
+    return int.from_bytes(hashlib.sha1(name.encode('utf-8')).digest()[:8], 'big', signed=True)
+
+
+class LeaderElection:
+    """Lease-based leader election on the application database"""
+
+    def __init__(self, name: str = LOCK_NAME, check_seconds: Optional[float] = None):
+        self.name = name
+        self.check_seconds = check_seconds or Config.LEADER_CHECK_SECONDS
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._is_leader = False
+        self._connection = None
+        self._lockfile = None
+        self._elected_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def on_elected(self, callback: Callable[[], None]):
+        """Run callback (on a background thread) every time this node becomes leader"""
+        self._elected_callbacks.append(callback)
+        if self._is_leader:
+            self._run_callback(callback)
+
+    def start(self):
+        """Try to become leader now and keep checking in the background"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="leader-election", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop checking and give up leadership"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.release()
+
+    def check(self) -> bool:
+        """Acquire leadership if free, or verify it is still held; returns is_leader"""
+        with self._lock:
+            was_leader = self._is_leader
+            try:
+                self._is_leader = self._verify() if was_leader else self._acquire()
+            except Exception as e:
+                logger.error(f"Leader election check failed: {str(e)}")
+                self._release_resources()
+                self._is_leader = False
+
+        if self._is_leader and not was_leader:
+            logger.info(f"Node {self.node_id} is now the scheduler leader")
+            for callback in list(self._elected_callbacks):
+                self._run_callback(callback)
+        elif was_leader and not self._is_leader:
+            logger.warning(f"Node {self.node_id} lost scheduler leadership")
+        return self._is_leader
+
+    def release(self):
+        """Give up leadership"""
+        with self._lock:
+            if self._is_leader:
+                logger.info(f"Node {self.node_id} released scheduler leadership")
+            self._release_resources()
+            self._is_leader = False
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.check_seconds)
+
+    def _run_callback(self, callback: Callable[[], None]):
+        # Separate thread so a long callback doesn't delay lease checks
+        def target():
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in leader election callback {getattr(callback, '__name__', callback)}: {str(e)}")
+        threading.Thread(target=target, name="leader-elected", daemon=True).start()
+
+    # --- Backends ---------------------------------------------------------------
+
+    def _engine(self):
+        from app import app, db
+        with app.app_context():
+            return db.engine
+
+    def _acquire(self) -> bool:
+        engine = self._engine()
+        if engine.dialect.name == 'postgresql':
+            connection = engine.connect()
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _advisory_lock_key(self.name)}
+            ).scalar()
+            if acquired:
+                # Keep the session (and with it the lock) open for as long as we lead
+                connection.commit()
+                self._connection = connection
+                return True
+            connection.close()
+            return False
+        return self._acquire_lockfile(engine)
+
+    def _verify(self) -> bool:
+        if self._connection is not None:
+            # A broken connection means the server already released the lock
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        return self._lockfile is not None
+
+    def _acquire_lockfile(self, engine) -> bool:
+        import fcntl
+
+        path = self._lockfile_path(engine)
+        handle = open(path, 'a+')
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(self.node_id)
+        handle.flush()
+        self._lockfile = handle
+        return True
+
+    def _lockfile_path(self, engine) -> str:
+        database = engine.url.database
+        if database and database != ':memory:':
+            return f"{os.path.abspath(database)}.leader.lock"
+        digest = hashlib.sha1(str(engine.url).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(tempfile.gettempdir(), f"auto-blog-agent-{digest}.leader.lock")
+
+    def _release_resources(self):
+        if self._connection is not None:
+            try:
+                self._connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": _advisory_lock_key(self.name)}
+                )
+                self._connection.commit()
+            except Exception:
+                pass
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+        if self._lockfile is not None:
+            try:
+                self._lockfile.close()  # closing the descriptor drops the flock
+            except Exception:
+                pass
+            self._lockfile = None
+
+
+# Process-wide election shared by the scheduler core and the automation scheduler
+leader_election = LeaderElection()
+
+
+def get_leader_election() -> LeaderElection:
+    """Returns the process-wide leader election"""
+    return leader_election
@@ -12,12 +12,7 @@ import logging
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# Apply monkey patches to fix compatibility issues
-from . import monkey_patch
-if monkey_patch.apply_patches():
-    logger.info("Successfully applied SEO module patches")
-else:
-    logger.warning("Failed to apply some SEO module patches")
+# The pytrends compatibility patches are applied by trends on first use
 
 # Make all modules available through the package
 from . import trends
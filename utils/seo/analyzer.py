@@ -4,26 +4,194 @@ SEO Analyzer Module
 This module provides functions for analyzing content for SEO optimization.
 """
 import logging
+import os
 import re
 import json
+from bisect import bisect_right
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+
+from utils.polish_lexicon import SOFT_ENDINGS, count_syllables, inflected_forms, normalize
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-def analyze_content(content, primary_keyword, secondary_keywords=None):
+# Elements whose text forms a paragraph of its own, and headings
+BLOCK_TAGS = ('p', 'li', 'blockquote', 'pre', 'td', 'th', 'dd', 'dt', 'figcaption',
+              'div', 'section', 'article', 'header', 'footer', 'ul', 'ol', 'table', 'tr',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+BOUNDARY_PATTERN = re.compile(r'<(/?)(' + '|'.join(BLOCK_TAGS) + r')\b[^>]*>', re.IGNORECASE)
+HIDDEN_PATTERN = re.compile(r'<!--.*?-->|<(script|style|noscript)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n\s*\n')
+
+# Blocks are joined into one text with this separator, which ends sentences and keyword matches
+BLOCK_SEPARATOR = '\x00'
+
+# Word and sentence boundaries
+WORD_PATTERN = re.compile(r'\w+')
+
+# Stems ending in a hard consonant whose soft spelling ends a word ("badan" / "badań")
+HARD_ENDINGS = {hard: soft for soft, hard in SOFT_ENDINGS.items()}
+
+# FOG-PL (Pisarek): words of this many syllables or more are hard
+HARD_WORD_SYLLABLES = 4
+SENTENCE_PATTERN = re.compile(r'[^.!?\x00\w]*\w[^.!?\x00]*')
+
+# Articles per process pool task in analyze_many, and the fields they pass on
+ANALYZE_CHUNK_SIZE = 16
+ANALYZE_ARGUMENTS = ('content', 'primary_keyword', 'secondary_keywords', 'meta_title', 'meta_description')
+
+
+class ParsedDocument:
+    """
+    Content split into blocks, each a (kind, text) pair where kind is
+    'h1'..'h6' for headings and 'p' for paragraphs. Plain text (no HTML)
+    is split into paragraphs on blank lines.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        
+        # Lowercase text of all blocks and the offset where each block starts
+        lowered = [text.lower() for _, text in blocks]
+        self.offsets = []
+        position = 0
+        for text in lowered:
+            self.offsets.append(position)
+            position += len(text) + len(BLOCK_SEPARATOR)
+        self.text = BLOCK_SEPARATOR.join(lowered)
+
+    def block_at(self, offset):
+        """Index of the block containing a text offset"""
+        return bisect_right(self.offsets, offset) - 1
+
+    @classmethod
+    def parse(cls, content):
+        """Split HTML (or plain text) at block element boundaries, dropping other markup"""
+        content = HIDDEN_PATTERN.sub(' ', content)
+        blocks = []
+        heading = None
+        position = 0
+        for boundary in BOUNDARY_PATTERN.finditer(content):
+            cls._add_text(blocks, heading, content[position:boundary.start()])
+            position = boundary.end()
+            tag = boundary.group(2).lower()
+            if tag[0] == 'h':
+                heading = None if boundary.group(1) else tag
+            elif heading and not boundary.group(1):
+                # Block element inside a heading (rare) ends the heading
+                heading = None
+        cls._add_text(blocks, heading, content[position:])
+        return cls(blocks)
+
+    @staticmethod
+    def _add_text(blocks, heading, text):
+        if '<' in text:
+            text = TAG_PATTERN.sub('', text)
+        if '&' in text:
+            text = unescape(text)
+        if heading:
+            if text.strip():
+                blocks.append((heading, ' '.join(text.replace(BLOCK_SEPARATOR, ' ').split())))
+            return
+        for paragraph in PARAGRAPH_BREAK_PATTERN.split(text):
+            paragraph = paragraph.strip()
+            if paragraph:
+                blocks.append(('p', paragraph.replace(BLOCK_SEPARATOR, ' ')))
+
+
+class KeywordMatcher:
+    """
+    Counts many keywords with one multi-pattern scan.
+    
+    A single regex alternation of the keywords' first words finds candidate
+    positions; only there are the full keywords compared. Matches are on
+    whole words, overlapping keywords ("dieta", "dieta w ciąży") are all
+    counted, and text is expected in lowercase.
+    
+    With inflections=True (the default) words match in any inflected form:
+    the regex admits every form the lexicon knows plus anything starting
+    with the word's stem, and candidates are confirmed by comparing
+    polish_lexicon.normalize() keys, so "ciąża" also counts "ciąży" and
+    "ciążę" but not "ciążowy".
+    """
+
+    def __init__(self, keywords, inflections=True):
+        self.keywords = list(keywords)
+        self.inflections = inflections
+        self._candidates = {}
+        first_word_patterns = set()
+        for position, keyword in enumerate(self.keywords):
+            words = WORD_PATTERN.findall((keyword or '').lower())
+            if not words:
+                continue
+            keys = tuple(normalize(word) for word in words) if inflections else tuple(words)
+            patterns = [self._word_pattern(word, key) for word, key in zip(words, keys)]
+            pattern = re.compile(r'[^\w\x00]+'.join(f'({p})' for p in patterns) + r'(?!\w)')
+            self._candidates.setdefault(keys[0], []).append((pattern, keys, position))
+            first_word_patterns.add(patterns[0])
+        
+        self._prefilter = re.compile(
+            r'(?<!\w)(?:' + '|'.join(sorted(first_word_patterns, key=len, reverse=True)) + r')(?!\w)'
+        ) if first_word_patterns else None
+
+    def _word_pattern(self, word, key):
+        """Regex admitting the surface forms of one keyword word"""
+        if not self.inflections:
+            return re.escape(word)
+        alternatives = {re.escape(key) + r'\w*'}
+        if key[-1:] in HARD_ENDINGS:
+            # "badań" for key "badan"
+            alternatives.add(re.escape(key[:-1] + HARD_ENDINGS[key[-1]]))
+        alternatives.update(re.escape(form) for form in inflected_forms(word))
+        return '|'.join(sorted(alternatives, key=len, reverse=True))
+
+    def scan(self, text):
+        """
+        Find keyword occurrences in lowercase text.
+        
+        Returns:
+            One list per keyword with the offsets where it occurs
+        """
+        hits = [[] for _ in self.keywords]
+        if self._prefilter is None:
+            return hits
+        for match in self._prefilter.finditer(text):
+            start = match.start()
+            first = normalize(match.group()) if self.inflections else match.group()
+            for pattern, keys, position in self._candidates.get(first, ()):
+                found = pattern.match(text, start)
+                if found and (not self.inflections or all(
+                        normalize(word) == key for word, key in zip(found.groups()[1:], keys[1:]))):
+                    hits[position].append(start)
+        return hits
+
+
+def analyze_content(content=None, primary_keyword=None, secondary_keywords=None,
+                    meta_title=None, meta_description=None, html_content=None):
     """
     Analyze content for SEO optimization.
     
+    The content is parsed once into headings and paragraphs and tokenized in
+    a single pass; all keywords are then counted together by KeywordMatcher,
+    in any inflected form. Readability uses the Polish FOG-PL index.
+    
     Args:
-        content: The content to analyze
+        content: The content to analyze (HTML or plain text)
         primary_keyword: The primary keyword to check for
         secondary_keywords: List of secondary keywords to check for
+        meta_title: Optional SEO title, counts as the title if the content has no H1
+        meta_description: Optional meta description (reported, not scored)
+        html_content: Alias of content
         
     Returns:
         Dictionary containing analysis results
     """
-    logger.info(f"Analyzing content for primary keyword: {primary_keyword}")
+    content = content if content is not None else html_content
+    primary_keyword = primary_keyword or ''
+    logger.debug(f"Analyzing content for primary keyword: {primary_keyword}")
     
     if not content:
         logger.warning("No content provided for analysis")
@@ -33,8 +201,11 @@ def analyze_content(content, primary_keyword, secondary_keywords=None):
                 'score': 0,
                 'level': 'Unknown',
                 'sentences': 0,
-                'avg_sentence_length': 0
+                'avg_sentence_length': 0,
+                'fog_pl': 0,
+                'hard_words': 0
             },
+            'paragraph_count': 0,
             'primary_keyword': {
                 'count': 0,
                 'density': 0,
@@ -55,83 +226,72 @@ def analyze_content(content, primary_keyword, secondary_keywords=None):
             ]
         }
     
-    secondary_keywords = secondary_keywords or []
+    secondary_keywords = [keyword.lower() for keyword in (secondary_keywords or []) if keyword]
+    document = ParsedDocument.parse(content.strip())
     
-    # Normalize content
-    content = content.strip()
-    lowercase_content = content.lower()
-    primary_keyword_lower = primary_keyword.lower()
+    # Block structure
+    heading_blocks = {'h1': [], 'h2': [], 'h3': [], 'h4_plus': []}
+    paragraph_blocks = []
+    for block_id, (kind, _) in enumerate(document.blocks):
+        if kind == 'p':
+            paragraph_blocks.append(block_id)
+        else:
+            heading_blocks[kind if kind in heading_blocks else 'h4_plus'].append(block_id)
     
-    # Word count
-    words = re.findall(r'\b\w+\b', content)
+    # Words and sentences, counted over the whole document at once
+    text = document.text
+    words = WORD_PATTERN.findall(text)
     word_count = len(words)
+    hard_word_count = sum(
+        count for word, count in Counter(words).items() if count_syllables(word) >= HARD_WORD_SYLLABLES
+    )
+    sentence_count = len(SENTENCE_PATTERN.findall(text))
+    
+    # All keywords in one scan; the primary keyword is at position 0
+    hits = KeywordMatcher([primary_keyword] + secondary_keywords).scan(text)
+    counts = [len(offsets) for offsets in hits]
+    primary_blocks = {document.block_at(offset) for offset in hits[0]}
     
     # Keyword analysis
-    primary_keyword_count = lowercase_content.count(primary_keyword_lower)
+    primary_keyword_count = counts[0]
     primary_keyword_density = primary_keyword_count / word_count if word_count > 0 else 0
     
-    # Split content into paragraphs
-    paragraphs = content.split('\n\n')
-    paragraphs = [p for p in paragraphs if p.strip()]
-    
-    # Check for keyword in first and last paragraphs
-    in_first_paragraph = primary_keyword_lower in paragraphs[0].lower() if paragraphs else False
-    in_last_paragraph = primary_keyword_lower in paragraphs[-1].lower() if paragraphs else False
-    
-    # Extract headings
-    h1_pattern = re.compile(r'<h1[^>]*>(.*?)</h1>', re.IGNORECASE)
-    h2_pattern = re.compile(r'<h2[^>]*>(.*?)</h2>', re.IGNORECASE)
-    h3_pattern = re.compile(r'<h3[^>]*>(.*?)</h3>', re.IGNORECASE)
-    h4_plus_pattern = re.compile(r'<h[4-6][^>]*>(.*?)</h[4-6]>', re.IGNORECASE)
-    
-    h1_tags = h1_pattern.findall(content)
-    h2_tags = h2_pattern.findall(content)
-    h3_tags = h3_pattern.findall(content)
-    h4_plus_tags = h4_plus_pattern.findall(content)
-    
-    # Check if keyword is in headings
-    in_headings = any(
-        primary_keyword_lower in h.lower() 
-        for h in h1_tags + h2_tags + h3_tags + h4_plus_tags
-    )
+    h1_tags = heading_blocks['h1']
+    h2_tags = heading_blocks['h2']
+    h3_tags = heading_blocks['h3']
+    h4_plus_tags = heading_blocks['h4_plus']
+    
+    in_first_paragraph = bool(paragraph_blocks) and paragraph_blocks[0] in primary_blocks
+    in_last_paragraph = bool(paragraph_blocks) and paragraph_blocks[-1] in primary_blocks
+    in_headings = any(block_id in primary_blocks for block_id in h1_tags + h2_tags + h3_tags + h4_plus_tags)
     
     # Check if keyword is in title (assuming first h1 is title)
-    in_title = primary_keyword_lower in h1_tags[0].lower() if h1_tags else False
+    if h1_tags:
+        in_title = h1_tags[0] in primary_blocks
+    else:
+        in_title = bool(meta_title and KeywordMatcher([primary_keyword]).scan(meta_title.lower())[0])
     
     # Analyze secondary keywords
     secondary_keyword_analysis = []
-    
-    for keyword in secondary_keywords:
-        if not keyword:
-            continue
-            
-        keyword = keyword.lower()
-        count = lowercase_content.count(keyword)
-        density = count / word_count if word_count > 0 else 0
-        
+    for position, keyword in enumerate(secondary_keywords, start=1):
+        count = counts[position]
         secondary_keyword_analysis.append({
             'keyword': keyword,
             'count': count,
-            'density': density,
+            'density': count / word_count if word_count > 0 else 0,
             'in_content': count > 0
         })
     
-    # Count sentences
-    sentences = re.split(r'[.!?]+', content)
-    sentences = [s for s in sentences if s.strip()]
-    sentence_count = len(sentences)
-    
     # Average sentence length
-    if sentence_count > 0:
-        avg_sentence_length = sum(len(re.findall(r'\b\w+\b', s)) for s in sentences) / sentence_count
-    else:
-        avg_sentence_length = 0
+    avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
     
-    # Calculate readability score (simplified Flesch-Kincaid)
+    # Readability: FOG-PL index (Polish school grade) mapped onto a 0-100 ease scale,
+    # 60 ("Standard") corresponds to FOG-PL of about 10
     if sentence_count > 0 and word_count > 0:
-        readability_score = 206.835 - (1.015 * (word_count / sentence_count)) - (84.6 * (sum(1 for w in words if len(w) > 2) / word_count))
-        readability_score = max(0, min(100, readability_score))
+        fog_index = 0.4 * (word_count / sentence_count + 100 * hard_word_count / word_count)
+        readability_score = max(0, min(100, 100 - (fog_index - 4) * 6.25))
     else:
+        fog_index = 0
         readability_score = 0
     
     # Determine readability level
@@ -188,6 +348,9 @@ def analyze_content(content, primary_keyword, secondary_keywords=None):
     if avg_sentence_length > 25:
         recommendations.append(f"Average sentence length is high ({avg_sentence_length:.1f} words). Consider using shorter sentences.")
     
+    if meta_description is not None and not 120 <= len(meta_description) <= 160:
+        recommendations.append(f"Meta description is {len(meta_description)} characters long. Aim for 120-160 characters.")
+    
     if word_count > 0 and len(secondary_keywords) > 0:
         secondary_keyword_coverage = sum(1 for kw in secondary_keyword_analysis if kw['in_content']) / len(secondary_keywords)
         if secondary_keyword_coverage < 0.7:
@@ -200,8 +363,11 @@ def analyze_content(content, primary_keyword, secondary_keywords=None):
             'score': readability_score,
             'level': readability_level,
             'sentences': sentence_count,
-            'avg_sentence_length': avg_sentence_length
+            'avg_sentence_length': avg_sentence_length,
+            'fog_pl': round(fog_index, 1),
+            'hard_words': hard_word_count
         },
+        'paragraph_count': len(paragraph_blocks),
         'primary_keyword': {
             'count': primary_keyword_count,
             'density': primary_keyword_density,
@@ -220,6 +386,68 @@ def analyze_content(content, primary_keyword, secondary_keywords=None):
         'recommendations': recommendations
     }
 
+def calculate_seo_score(analysis):
+    """
+    Overall SEO score (0-100) of an analyze_content result.
+    
+    Args:
+        analysis: Dictionary returned by analyze_content
+        
+    Returns:
+        Integer score
+    """
+    primary = analysis['primary_keyword']
+    word_count = analysis['word_count']
+    h2_count = analysis['headings']['h2_count']
+    secondary = analysis['secondary_keywords']
+    
+    score = 0
+    score += 15 if primary['in_title'] else 0
+    score += 10 if primary['in_first_paragraph'] else 0
+    score += 10 if primary['in_headings'] else 0
+    score += 5 if primary['in_last_paragraph'] else 0
+    score += 15 if 0.005 <= primary['density'] <= 0.03 else 0
+    score += 15 if word_count >= 500 else 8 if word_count >= 300 else 0
+    score += 10 if h2_count >= 2 else 5 if h2_count == 1 else 0
+    score += 10 * min(1, analysis['readability']['score'] / 60)
+    score += 10 * (sum(1 for kw in secondary if kw['in_content']) / len(secondary) if secondary else 1)
+    return int(round(score))
+
+def analyze_many(articles, workers=None, chunk_size=ANALYZE_CHUNK_SIZE):
+    """
+    Analyze a batch of articles, spread over a process pool.
+    
+    Small batches (or workers=1) are analyzed in the calling process.
+    
+    Args:
+        articles: Iterable of dictionaries with the analyze_content arguments
+            ('content', 'primary_keyword', optional 'secondary_keywords',
+            'meta_title', 'meta_description'); other keys are ignored
+        workers: Number of processes (default: CPU count)
+        chunk_size: Articles sent to a worker process at a time
+        
+    Returns:
+        List of analysis results in input order; an article that failed to
+        analyze gets {'error': message}
+    """
+    articles = list(articles)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1 or len(articles) <= chunk_size:
+        return [_analyze_article(article) for article in articles]
+    
+    logger.info(f"Analyzing {len(articles)} articles on {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_analyze_article, articles, chunksize=chunk_size))
+
+def _analyze_article(article):
+    """analyze_many worker; must stay a module-level function so it can be pickled"""
+    try:
+        return analyze_content(**{key: article.get(key) for key in ANALYZE_ARGUMENTS})
+    except Exception as e:
+        logger.error(f"Error analyzing article: {str(e)}")
+        return {'error': str(e)}
+
 def get_keyword_suggestions(topic, limit=5):
     """
     Get keyword suggestions for a topic.
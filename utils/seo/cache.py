@@ -0,0 +1,175 @@
+"""
+SEO Data Cache
+
+This module caches Google Trends and SerpAPI responses keyed by
+(kind, keyword, geo, timeframe). Responses are kept in memory and in the
+seo_cache table, so they survive restarts and are shared between processes.
+Concurrent lookups of the same key are coalesced into a single upstream
+request, and an expired entry is served when the upstream call fails.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import has_app_context
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import Config
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Freshness windows per kind of lookup
+FRESHNESS = {
+    "daily_trends": timedelta(hours=Config.SEO_DAILY_TRENDS_CACHE_HOURS),
+    "related_topics": timedelta(hours=Config.SEO_TREND_SERIES_CACHE_HOURS),
+    "interest_over_time": timedelta(hours=Config.SEO_TREND_SERIES_CACHE_HOURS),
+    "serp": timedelta(days=Config.SEO_SERP_CACHE_DAYS),
+}
+
+# How long followers wait for a coalesced request
+COALESCE_TIMEOUT_SECONDS = 120
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class SeoCache:
+    """Two-level (memory + database) cache with request coalescing"""
+
+    def __init__(self):
+        # key -> (expires_at, JSON string)
+        self._memory: Dict[CacheKey, Tuple[datetime, str]] = {}
+        self._inflight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind: str, keyword: str = "", geo: str = "", timeframe: str = "") -> CacheKey:
+        return (kind, (keyword or "").strip().lower(), (geo or "").lower(), timeframe or "")
+
+    def get_or_fetch(self, kind: str, fetch: Callable[[], Any], keyword: str = "", geo: str = "",
+                     timeframe: str = "", cacheable: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return a fresh cached value or call `fetch` once for all concurrent callers.
+
+        Args:
+            kind: Lookup type, selects the freshness window
+            fetch: Performs the upstream request; should raise on failure
+            keyword, geo, timeframe: Cache key parts
+            cacheable: Predicate deciding whether a fetched value is stored
+
+        Returns:
+            The (deserialised) value
+
+        Raises:
+            Whatever `fetch` raised, if there is no stale entry to fall back to
+        """
+        key = self.make_key(kind, keyword, geo, timeframe)
+        now = datetime.utcnow()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and cached[0] > now:
+                return json.loads(cached[1])
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight {kind} lookup: {key}")
+            return json.loads(future.result(timeout=COALESCE_TIMEOUT_SECONDS))
+
+        try:
+            serialized = self._resolve(key, fetch, cacheable, now)
+            future.set_result(serialized)
+            return json.loads(serialized)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drop in-memory entries (all, or of one kind); database rows expire on their own"""
+        with self._lock:
+            for key in [key for key in self._memory if kind is None or key[0] == kind]:
+                del self._memory[key]
+
+    def _resolve(self, key: CacheKey, fetch: Callable[[], Any], cacheable: Callable[[Any], bool],
+                 now: datetime) -> str:
+        """Database lookup, then upstream fetch; returns the JSON string"""
+        stored = self._load(key)
+        if stored and stored[0] > now:
+            self._remember(key, *stored)
+            return stored[1]
+
+        try:
+            value = fetch()
+        except Exception as e:
+            stale = stored or self._memory.get(key)
+            if stale:
+                logger.warning(f"{key[0]} lookup failed ({str(e)}), serving cached data that expired at {stale[0]}")
+                return stale[1]
+            raise
+
+        serialized = json.dumps(value, default=str)
+        if cacheable(value):
+            expires_at = now + FRESHNESS.get(key[0], timedelta(hours=1))
+            self._remember(key, expires_at, serialized)
+            self._store(key, serialized, now, expires_at)
+        return serialized
+
+    def _remember(self, key: CacheKey, expires_at: datetime, serialized: str):
+        with self._lock:
+            self._memory[key] = (expires_at, serialized)
+
+    def _load(self, key: CacheKey) -> Optional[Tuple[datetime, str]]:
+        """Read an entry from the seo_cache table (fresh or expired)"""
+        if not has_app_context():
+            return None
+        from app import db
+        from models import SeoCacheEntry
+
+        try:
+            with Session(db.engine) as session:
+                row = session.query(SeoCacheEntry.expires_at, SeoCacheEntry.payload).filter_by(
+                    kind=key[0], keyword=key[1], geo=key[2], timeframe=key[3]
+                ).first()
+            return (row.expires_at, row.payload) if row else None
+        except Exception as e:
+            logger.warning(f"Could not read SEO cache: {str(e)}")
+            return None
+
+    def _store(self, key: CacheKey, serialized: str, fetched_at: datetime, expires_at: datetime):
+        """Upsert an entry in its own session so callers' transactions are untouched"""
+        if not has_app_context():
+            return
+        from app import db
+        from models import SeoCacheEntry
+
+        values = dict(payload=serialized, fetched_at=fetched_at, expires_at=expires_at)
+        try:
+            with Session(db.engine) as session:
+                updated = session.query(SeoCacheEntry).filter_by(
+                    kind=key[0], keyword=key[1], geo=key[2], timeframe=key[3]
+                ).update(values)
+                if not updated:
+                    session.add(SeoCacheEntry(kind=key[0], keyword=key[1], geo=key[2], timeframe=key[3], **values))
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Another process inserted the same key first; theirs is as fresh as ours
+                    session.rollback()
+        except Exception as e:
+            logger.warning(f"Could not write SEO cache: {str(e)}")
+
+
+# Process-wide cache used by trends.py and serp.py
+seo_cache = SeoCache()
@@ -0,0 +1,325 @@
+"""
+Keyphrase Extraction
+
+This module picks tags for an article locally: candidate words and phrases
+are taken the way RAKE does (runs of content words between stopwords and
+punctuation) and ranked by TF-IDF. Document frequencies come from the blog's
+own articles and are stored in the tag_corpus / tag_term_frequency tables;
+each refresh only reads the articles added since the previous one.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import has_app_context
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import Config
+from utils.polish_lexicon import STOPWORDS, get_lexicon, normalize
+from utils.seo.analyzer import ParsedDocument
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Words that are frequent in any article and make poor tags
+GENERIC_WORDS = frozenset("""
+artykuł artykule warto należy można trzeba bardzo dużo wiele więcej mniej często czasem zawsze nigdy
+sposób sposoby sposobów rzecz rzeczy sprawa sprawy kwestia kwestii przypadku przypadków np itp itd tzw
+pierwszy pierwsza drugi druga trzeci ważne ważny ważna dobry dobra dobre lepiej najlepiej każda każde
+wśród według około jednak również natomiast przede wszystkim dzięki podczas ponad poniżej powyżej
+każdej każdego każdym powinien powinna powinno powinny mogą może swój swoja swoim swojej
+""".split())
+
+# Candidates are split at punctuation and at non-word characters other than spaces
+PHRASE_BREAK_PATTERN = re.compile(r'[.,;:!?()\[\]{}"„”«»/\\|\x00\n–—-]+')
+WORD_PATTERN = re.compile(r'[^\W\d_]+')
+
+# Longest candidate phrase; document frequencies are stored up to bigrams
+MAX_PHRASE_WORDS = 3
+MAX_STORED_PHRASE_WORDS = 2
+MIN_WORD_LENGTH = 3
+
+# Occurrence weights by where the candidate appears
+TITLE_WEIGHT = 3.0
+HEADING_WEIGHT = 2.0
+
+# Corpus size at which document frequencies are fully trusted
+MIN_CORPUS_DOCUMENTS = 20
+
+# Articles read per batch when updating the index, and terms per SQL statement
+INDEX_BATCH_SIZE = 200
+TERM_CHUNK_SIZE = 500
+
+
+def _candidate_runs(text: str) -> Iterable[List[str]]:
+    """Runs of content words (lowercase) between punctuation and stopwords"""
+    for fragment in PHRASE_BREAK_PATTERN.split(text.lower()):
+        run = []
+        for word in WORD_PATTERN.findall(fragment):
+            if word in STOPWORDS or word in GENERIC_WORDS or len(word) < MIN_WORD_LENGTH:
+                if run:
+                    yield run
+                run = []
+            else:
+                run.append(word)
+        if run:
+            yield run
+
+
+def _phrases(run: List[str], max_words: int = MAX_PHRASE_WORDS) -> Iterable[Tuple[str, ...]]:
+    """All n-grams of a run up to max_words"""
+    for size in range(1, min(max_words, len(run)) + 1):
+        for start in range(len(run) - size + 1):
+            yield tuple(run[start:start + size])
+
+
+def _term_key(words: Tuple[str, ...]) -> str:
+    """Inflection-independent key of a word or phrase"""
+    return ' '.join(normalize(word) for word in words)
+
+
+def document_terms(title: str, content: str) -> Set[str]:
+    """Keys of every candidate stored in the index for one article"""
+    text = (title or '') + '\n' + ' \n'.join(text for _, text in ParsedDocument.parse(content or '').blocks)
+    return {
+        _term_key(phrase)
+        for run in _candidate_runs(text)
+        for phrase in _phrases(run, MAX_STORED_PHRASE_WORDS)
+    }
+
+
+class KeyphraseIndex:
+    """In-memory copy of one blog's document frequencies"""
+
+    def __init__(self, blog_id: int):
+        self.blog_id = blog_id
+        self.documents = 0
+        self.last_content_log_id = 0
+        self.frequencies: Dict[str, int] = {}
+        self.refreshed_at = 0.0
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def document_frequency(self, key: str) -> int:
+        """Documents containing a term; longer phrases use their rarest stored part"""
+        words = key.split(' ')
+        if len(words) <= MAX_STORED_PHRASE_WORDS:
+            return self.frequencies.get(key, 0)
+        return min(
+            self.frequencies.get(' '.join(words[start:start + MAX_STORED_PHRASE_WORDS]), 0)
+            for start in range(len(words) - MAX_STORED_PHRASE_WORDS + 1)
+        )
+
+    def idf(self, key: str) -> float:
+        return math.log((self.documents + 1) / (self.document_frequency(key) + 1)) + 1
+
+    def refresh(self):
+        """Load the stored index once, then fold in articles added since the last refresh"""
+        from app import db
+
+        with self.lock:
+            if not self.loaded:
+                self._load(db)
+            delta, documents, last_id = self._count_new_documents(db)
+            if documents:
+                if self._store(db, delta, documents, last_id):
+                    self.documents += documents
+                    self.last_content_log_id = last_id
+                    for key, count in delta.items():
+                        self.frequencies[key] = self.frequencies.get(key, 0) + count
+                    logger.info(f"Tag index of blog {self.blog_id} updated with {documents} articles "
+                                f"({self.documents} in total)")
+                else:
+                    # Another process stored the same articles first; take its counts
+                    self._load(db)
+            self.refreshed_at = time.monotonic()
+
+    def _load(self, db):
+        from models import TagCorpus, TagTermFrequency
+
+        with Session(db.engine) as session:
+            corpus = session.get(TagCorpus, self.blog_id)
+            rows = session.query(TagTermFrequency.term, TagTermFrequency.document_count).filter(
+                TagTermFrequency.blog_id == self.blog_id
+            ).yield_per(5000)
+            self.frequencies = {term: count for term, count in rows}
+        self.documents = corpus.documents if corpus else 0
+        self.last_content_log_id = corpus.last_content_log_id if corpus else 0
+        self.loaded = True
+
+    def _count_new_documents(self, db) -> Tuple[Counter, int, int]:
+        """Term counts of articles with an ID above last_content_log_id, read in keyset pages"""
+        from models import ContentLog
+
+        delta = Counter()
+        documents = 0
+        last_id = self.last_content_log_id
+        with Session(db.engine) as session:
+            while True:
+                rows = session.query(ContentLog.id, ContentLog.title, ContentLog.content).filter(
+                    ContentLog.blog_id == self.blog_id,
+                    ContentLog.id > last_id,
+                    ContentLog.content.isnot(None),
+                ).order_by(ContentLog.id).limit(INDEX_BATCH_SIZE).all()
+                if not rows:
+                    break
+                for row in rows:
+                    delta.update(document_terms(row.title, row.content))
+                    documents += 1
+                last_id = rows[-1].id
+        return delta, documents, last_id
+
+    def _store(self, db, delta: Counter, documents: int, last_id: int) -> bool:
+        """
+        Apply a delta in one transaction. The corpus row is advanced with a
+        compare-and-set on last_content_log_id, so concurrent refreshes never
+        count the same articles twice.
+
+        Returns:
+            False if another process advanced the index first
+        """
+        from models import TagCorpus, TagTermFrequency
+
+        try:
+            with Session(db.engine) as session:
+                advanced = session.query(TagCorpus).filter(
+                    TagCorpus.blog_id == self.blog_id,
+                    TagCorpus.last_content_log_id == self.last_content_log_id,
+                ).update({
+                    TagCorpus.documents: TagCorpus.documents + documents,
+                    TagCorpus.last_content_log_id: last_id,
+                }, synchronize_session=False)
+                if not advanced:
+                    if self.last_content_log_id or session.get(TagCorpus, self.blog_id):
+                        return False
+                    session.add(TagCorpus(blog_id=self.blog_id, documents=documents, last_content_log_id=last_id))
+
+                # Existing terms are incremented, grouped by increment; the rest are inserted
+                by_increment = defaultdict(list)
+                for key, count in delta.items():
+                    by_increment[count].append(key)
+                existing = set()
+                for count, keys in by_increment.items():
+                    for start in range(0, len(keys), TERM_CHUNK_SIZE):
+                        chunk = keys[start:start + TERM_CHUNK_SIZE]
+                        existing.update(term for term, in session.query(TagTermFrequency.term).filter(
+                            TagTermFrequency.blog_id == self.blog_id, TagTermFrequency.term.in_(chunk)
+                        ))
+                        session.query(TagTermFrequency).filter(
+                            TagTermFrequency.blog_id == self.blog_id, TagTermFrequency.term.in_(chunk)
+                        ).update({TagTermFrequency.document_count: TagTermFrequency.document_count + count},
+                                 synchronize_session=False)
+                session.bulk_insert_mappings(TagTermFrequency, [
+                    {"blog_id": self.blog_id, "term": key, "document_count": count}
+                    for key, count in delta.items() if key not in existing
+                ])
+                session.commit()
+            return True
+        except IntegrityError:
+            return False
+        except Exception as e:
+            logger.warning(f"Could not update tag index of blog {self.blog_id}: {str(e)}")
+            return False
+
+
+_indexes: Dict[int, KeyphraseIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_keyphrase_index(blog_id: int) -> Optional[KeyphraseIndex]:
+    """Process-wide index of a blog, refreshed at most every TAG_INDEX_REFRESH_SECONDS"""
+    if not blog_id or not has_app_context():
+        return None
+    with _indexes_lock:
+        index = _indexes.setdefault(blog_id, KeyphraseIndex(blog_id))
+    if not index.loaded or time.monotonic() - index.refreshed_at >= Config.TAG_INDEX_REFRESH_SECONDS:
+        try:
+            index.refresh()
+        except Exception as e:
+            logger.warning(f"Tag index refresh failed for blog {blog_id}: {str(e)}")
+    return index
+
+
+def extract_keyphrases(title: str, content: str, blog_id: Optional[int] = None,
+                       limit: int = 12) -> Dict[str, Any]:
+    """
+    Rank the keyphrases of an article.
+
+    Args:
+        title: Article title
+        content: Article content (HTML or plain text)
+        blog_id: Blog whose articles provide document frequencies (optional)
+        limit: Maximum number of keyphrases
+
+    Returns:
+        Dict with 'keyphrases' (list of {'phrase', 'score'}, best first) and
+        'confidence' (0-1: how much the ranking can be trusted)
+    """
+    index = get_keyphrase_index(blog_id)
+    documents = index.documents if index else 0
+
+    # Candidate occurrences with their weight by position
+    sources = [(TITLE_WEIGHT, title or '')]
+    for kind, text in ParsedDocument.parse(content or '').blocks:
+        sources.append((HEADING_WEIGHT if kind != 'p' else 1.0, text))
+
+    weights = Counter()
+    occurrences = Counter()
+    surfaces = defaultdict(Counter)
+    prominent = set()
+    word_frequency = Counter()
+    word_degree = Counter()
+    for weight, text in sources:
+        for run in _candidate_runs(text):
+            word_keys = [normalize(word) for word in run]
+            for word_key in word_keys:
+                word_frequency[word_key] += 1
+                # Capped so a long run of words doesn't outweigh how often a word recurs
+                word_degree[word_key] += min(len(run), MAX_PHRASE_WORDS)
+            for phrase in _phrases(run):
+                key = _term_key(phrase)
+                weights[key] += weight
+                occurrences[key] += 1
+                surfaces[key][' '.join(phrase)] += 1
+                if weight > 1:
+                    prominent.add(key)
+
+    def rake(key: str) -> float:
+        return sum(word_degree[word] / word_frequency[word] for word in key.split(' '))
+
+    scored = []
+    for key, weight in weights.items():
+        # A phrase seen once in body text is an accident of wording, not a topic
+        if ' ' in key and occurrences[key] < 2 and key not in prominent:
+            continue
+        idf = index.idf(key) if index else 1.0
+        scored.append((weight * idf * rake(key), key))
+    scored.sort(reverse=True)
+
+    lexicon = get_lexicon()
+    keyphrases = []
+    covered = set()
+    for score, key in scored:
+        words = set(key.split(' '))
+        if words <= covered:
+            continue
+        surface = surfaces[key].most_common(1)[0][0]
+        if ' ' not in surface and lexicon is not None:
+            surface = lexicon.lemma(surface) or surface
+        keyphrases.append({"phrase": surface, "score": round(score, 3)})
+        covered |= words
+        if len(keyphrases) >= limit:
+            break
+
+    # Trust grows with the blog's corpus and with candidates that recur or stand out
+    strong = sum(1 for key in weights if occurrences[key] >= 2 or key in prominent)
+    corpus_factor = min(1.0, documents / MIN_CORPUS_DOCUMENTS)
+    content_factor = min(1.0, strong / max(limit, 1))
+    confidence = round(0.4 * corpus_factor + 0.6 * content_factor, 3)
+
+    return {"keyphrases": keyphrases, "confidence": confidence, "documents": documents}
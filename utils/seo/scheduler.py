@@ -4,12 +4,11 @@ SEO Scheduler
 This module provides scheduling functionality for SEO tasks.
 """
 import logging
-import threading
-import time
-import schedule
 import json
 from datetime import datetime, timedelta
 from models import ArticleTopic, Blog, db
+from utils.scheduling.core import get_scheduler_core
+from utils.scheduling.jobs import SeoAnalysisJob
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -21,8 +20,8 @@ def initialize_seo_scheduler():
     # Schedule daily SEO analysis
     schedule_daily_seo_analysis()
     
-    # Start the scheduler thread
-    start_scheduler_thread()
+    # Make sure the shared scheduler core is running
+    get_scheduler_core().start()
     
     logger.info("SEO analysis scheduler initialized and started")
     return True
@@ -32,35 +31,29 @@ def schedule_daily_seo_analysis():
     logger.info("Scheduling daily SEO analysis job at 05:00")
     
     # Schedule daily analysis at 5:00 AM
-    schedule.every().day.at("05:00").do(run_daily_seo_analysis)
-
-def start_scheduler_thread():
-    """Start the scheduler thread"""
-    logger.info("Starting SEO analysis scheduler thread")
-    
-    # Create and start the scheduler thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
-    
-    logger.info("SEO analysis scheduler thread started")
-
-def run_scheduler():
-    """Run the scheduler loop"""
-    logger.info("Running SEO scheduler loop")
-    
-    while True:
-        try:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-        except Exception as e:
-            logger.error(f"Error in scheduler loop: {str(e)}")
-            time.sleep(300)  # Wait 5 minutes on error
+    get_scheduler_core().add_job(SeoAnalysisJob())
 
 def run_daily_seo_analysis():
-    """Run daily SEO analysis"""
+    """
+    Run daily SEO analysis.
+    
+    Trends are fetched, looked up in SerpAPI and ranked once for all blogs;
+    each blog then gets template topics in its own categories (plus one AI
+    request per blog with SEO_TOPIC_AI_VARIATIONS).
+    """
     logger.info("Running daily SEO analysis")
     
     try:
+        from .trends import get_trending_topics
+        from .topic_generator import generate_topics_from_trends, rank_trends
+        
+        # Trends are the same for every blog
+        trends = get_trending_topics(limit=10)
+        if not trends:
+            logger.warning("No trends found, skipping topic generation")
+            return True
+        ranked = rank_trends(trends)
+        
         # Get all active blogs
         with db.session.no_autoflush:
             blogs = Blog.query.filter_by(active=True).all()
@@ -69,32 +62,25 @@ def run_daily_seo_analysis():
                 try:
                     logger.info(f"Running SEO analysis for blog: {blog.name}")
                     
-                    # Get trends for this blog
-                    from .trends import get_trending_topics
-                    trends = get_trending_topics(limit=10)
+                    # Get categories from the blog
+                    categories = []
+                    if blog.categories:
+                        try:
+                            categories = json.loads(blog.categories)
+                        except:
+                            pass
+                    
+                    # Generate topics for this blog
+                    topics = generate_topics_from_trends(
+                        trends=trends,
+                        categories=categories,
+                        blog_id=blog.id,
+                        limit=5,
+                        batch=True,
+                        ranked=ranked
+                    )
                     
-                    # Generate topics
-                    from .topic_generator import generate_topics_from_trends
-                    if trends:
-                        # Get categories from the blog
-                        categories = []
-                        if blog.categories:
-                            try:
-                                categories = json.loads(blog.categories)
-                            except:
-                                pass
-                        
-                        # Generate topics for this blog
-                        topics = generate_topics_from_trends(
-                            trends=trends,
-                            categories=categories,
-                            blog_id=blog.id,
-                            limit=5
-                        )
-                        
-                        logger.info(f"Generated {len(topics)} topics for blog: {blog.name}")
-                    else:
-                        logger.warning(f"No trends found for blog: {blog.name}")
+                    logger.info(f"Generated {len(topics)} topics for blog: {blog.name}")
                 
                 except Exception as e:
                     logger.error(f"Error in SEO analysis for blog {blog.name}: {str(e)}")
@@ -104,4 +90,4 @@ def run_daily_seo_analysis():
         
     except Exception as e:
         logger.error(f"Error in daily SEO analysis: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -9,9 +9,19 @@ import requests
 import json
 from urllib.parse import urlparse
 
+import numpy as np
+
+from utils.seo.cache import seo_cache
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Known high authority domains, used to estimate keyword difficulty
+HIGH_AUTHORITY_DOMAINS = ["wikipedia.org", "amazon.com", "youtube.com", "facebook.com", 
+                          "twitter.com", "linkedin.com", "instagram.com", "pinterest.com",
+                          "reddit.com", "quora.com", "nytimes.com", "bbc.com", "cnn.com",
+                          "github.com", "medium.com", "forbes.com", "wsj.com", "bloomberg.com"]
+
 # Get SerpAPI key from environment
 SERPAPI_KEY = os.environ.get("SERPAPI_KEY", "57d393880136bab7d3159bf1d56d251fa3945bf56e6d1fa3448199e7c10e069c")
 
@@ -28,6 +38,9 @@ def get_serp_data(query, country="pl", language="pl", page=1):
     """
     Get SERP data for a query using SerpAPI.
     
+    Snapshots are cached for SEO_SERP_CACHE_DAYS, so repeated lookups of the
+    same keyword (e.g. from get_keyword_competition) don't use API quota.
+    
     Args:
         query: The search query
         country: The country code (default: 'pl')
@@ -37,12 +50,23 @@ def get_serp_data(query, country="pl", language="pl", page=1):
     Returns:
         Dictionary containing SERP data
     """
-    logger.info(f"Getting SERP data for query: {query}")
-    
     if not SERPAPI_KEY:
         logger.error("SERPAPI_KEY not found in environment variables")
         return {}
     
+    try:
+        return seo_cache.get_or_fetch(
+            "serp", lambda: _fetch_serp_data(query, country, language, page),
+            keyword=query, geo=country, timeframe=f"{language}:{page}"
+        )
+    except Exception as e:
+        logger.error(f"Error getting SERP data: {str(e)}")
+        return {}
+
+def _fetch_serp_data(query, country, language, page):
+    """Request SERP data from SerpAPI, raises on failure"""
+    logger.info(f"Getting SERP data for query: {query}")
+    
     # Construct API URL
     base_url = "https://serpapi.com/search"
     
@@ -56,66 +80,60 @@ def get_serp_data(query, country="pl", language="pl", page=1):
         "google_domain": f"google.{country}"
     }
     
-    try:
-        # Make API request
-        response = requests.get(base_url, params=params)
-        
-        # Check if request was successful
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Extract useful information
-            serp_data = {
-                "query": query,
-                "organic_results": [],
-                "related_searches": [],
-                "knowledge_graph": {},
-                "top_stories": []
-            }
-            
-            # Extract organic results
-            if "organic_results" in data:
-                for result in data["organic_results"]:
-                    serp_data["organic_results"].append({
-                        "title": result.get("title", ""),
-                        "link": result.get("link", ""),
-                        "snippet": result.get("snippet", ""),
-                        "domain": extract_domain(result.get("link", "")),
-                        "position": result.get("position", 0)
-                    })
-            
-            # Extract related searches
-            if "related_searches" in data:
-                for search in data["related_searches"]:
-                    serp_data["related_searches"].append(search.get("query", ""))
-            
-            # Extract knowledge graph
-            if "knowledge_graph" in data:
-                kg = data["knowledge_graph"]
-                serp_data["knowledge_graph"] = {
-                    "title": kg.get("title", ""),
-                    "description": kg.get("description", ""),
-                    "type": kg.get("type", "")
-                }
-            
-            # Extract top stories
-            if "top_stories" in data:
-                for story in data["top_stories"]:
-                    serp_data["top_stories"].append({
-                        "title": story.get("title", ""),
-                        "link": story.get("link", ""),
-                        "source": story.get("source", ""),
-                        "published_date": story.get("date", "")
-                    })
-            
-            return serp_data
-        else:
-            logger.error(f"SerpAPI request failed with status code: {response.status_code}")
-            return {}
+    # Make API request
+    response = requests.get(base_url, params=params, timeout=30)
     
-    except Exception as e:
-        logger.error(f"Error getting SERP data: {str(e)}")
-        return {}
+    # Check if request was successful
+    if response.status_code != 200:
+        raise RuntimeError(f"SerpAPI request failed with status code: {response.status_code}")
+    
+    data = response.json()
+    
+    # Extract useful information
+    serp_data = {
+        "query": query,
+        "organic_results": [],
+        "related_searches": [],
+        "knowledge_graph": {},
+        "top_stories": []
+    }
+    
+    # Extract organic results
+    if "organic_results" in data:
+        for result in data["organic_results"]:
+            serp_data["organic_results"].append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", ""),
+                "domain": extract_domain(result.get("link", "")),
+                "position": result.get("position", 0)
+            })
+    
+    # Extract related searches
+    if "related_searches" in data:
+        for search in data["related_searches"]:
+            serp_data["related_searches"].append(search.get("query", ""))
+    
+    # Extract knowledge graph
+    if "knowledge_graph" in data:
+        kg = data["knowledge_graph"]
+        serp_data["knowledge_graph"] = {
+            "title": kg.get("title", ""),
+            "description": kg.get("description", ""),
+            "type": kg.get("type", "")
+        }
+    
+    # Extract top stories
+    if "top_stories" in data:
+        for story in data["top_stories"]:
+            serp_data["top_stories"].append({
+                "title": story.get("title", ""),
+                "link": story.get("link", ""),
+                "source": story.get("source", ""),
+                "published_date": story.get("date", "")
+            })
+    
+    return serp_data
 
 def analyze_serp_results(serp_data):
     """
@@ -211,14 +229,8 @@ def get_keyword_competition(keyword, country="pl", language="pl"):
     organic_results = serp_data["organic_results"]
     top_domains = [result["domain"] for result in organic_results[:5] if "domain" in result]
     
-    # Check for known high authority domains
-    high_authority_domains = ["wikipedia.org", "amazon.com", "youtube.com", "facebook.com", 
-                             "twitter.com", "linkedin.com", "instagram.com", "pinterest.com",
-                             "reddit.com", "quora.com", "nytimes.com", "bbc.com", "cnn.com",
-                             "github.com", "medium.com", "forbes.com", "wsj.com", "bloomberg.com"]
-    
     # Count high authority domains in top results
-    high_authority_count = sum(1 for domain in top_domains if any(auth_domain in domain for auth_domain in high_authority_domains))
+    high_authority_count = sum(1 for domain in top_domains if is_high_authority(domain))
     
     # Calculate difficulty score (0-100)
     difficulty_score = min(100, (high_authority_count / len(top_domains) * 100) + (len(organic_results) / 10 * 20))
@@ -249,6 +261,45 @@ def get_keyword_competition(keyword, country="pl", language="pl"):
     
     return competition
 
+def score_competition_batch(serp_results):
+    """
+    Compute difficulty scores for many SERP snapshots at once.
+    
+    Same formula as get_keyword_competition (share of high authority domains
+    in the top 5 plus result count), evaluated on arrays instead of per keyword.
+    
+    Args:
+        serp_results: List of SERP data dictionaries (as returned by get_serp_data)
+        
+    Returns:
+        List of difficulty scores (0-100, None where there is no SERP data), in input order
+    """
+    if not serp_results:
+        return []
+    
+    # One row per snapshot: high authority flags of the top 5 domains (padded with -1)
+    authority = np.full((len(serp_results), 5), -1, dtype=np.int8)
+    result_counts = np.zeros(len(serp_results), dtype=np.float64)
+    for row, serp_data in enumerate(serp_results):
+        organic_results = (serp_data or {}).get("organic_results") or []
+        result_counts[row] = len(organic_results)
+        top_domains = [result["domain"] for result in organic_results[:5] if "domain" in result]
+        authority[row, :len(top_domains)] = [is_high_authority(domain) for domain in top_domains]
+    
+    present = authority >= 0
+    top_counts = present.sum(axis=1)
+    high_authority_counts = (authority == 1).sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(top_counts > 0, high_authority_counts / top_counts, 0.0)
+    scores = np.minimum(100.0, share * 100 + result_counts / 10 * 20).round(1)
+    
+    return [float(score) if count else None for score, count in zip(scores, result_counts)]
+
+def is_high_authority(domain):
+    """Check if a domain belongs to a known high authority site"""
+    return any(auth_domain in domain for auth_domain in HIGH_AUTHORITY_DOMAINS)
+
 def extract_domain(url):
     """Extract domain from URL"""
     try:
@@ -1,11 +1,15 @@
 """
 SEO Tag Generator - Creates exactly 12 tags per article
-Generates relevant Polish SEO tags based on article content and category
+Generates relevant Polish SEO tags based on article content and category.
+Tags are extracted locally (see keyphrases.py); AI is only asked when the
+local ranking has low confidence.
 """
 import logging
 import re
-from typing import List, Set
+from typing import List, Optional, Set
 from utils.content.ai_adapter import get_ai_completion
+from utils.polish_lexicon import normalize
+from utils.seo.keyphrases import extract_keyphrases
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -25,7 +29,7 @@ class SEOTagGenerator:
     def __init__(self):
         pass
     
-    def generate_tags(self, title: str, content: str, category: str = "") -> List[str]:
+    def generate_tags(self, title: str, content: str, category: str = "", blog_id: Optional[int] = None) -> List[str]:
         """
         Generate exactly 12 SEO tags for an article.
         
@@ -33,6 +37,7 @@ class SEOTagGenerator:
             title: Article title
             content: Article content (HTML)
             category: Article category
+            blog_id: Blog whose articles weight the keyphrases (optional)
             
         Returns:
             List of exactly 12 unique Polish SEO tags
@@ -46,11 +51,18 @@ class SEOTagGenerator:
             # Extract keywords from title and content
             extracted_tags = self._extract_keywords(title, content)
             
-            # Use AI to generate contextual tags
-            ai_tags = self._generate_ai_tags(title, content, category)
+            # Rank the article's own keyphrases
+            local = extract_keyphrases(title, content, blog_id=blog_id, limit=12)
+            local_tags = [keyphrase["phrase"] for keyphrase in local["keyphrases"]]
+            
+            # Use AI to generate contextual tags only when the local ranking is weak
+            ai_tags = []
+            if local["confidence"] < Config.TAG_MIN_CONFIDENCE and Config.TAG_AI_FALLBACK_ENABLED:
+                logger.info(f"Local tag confidence {local['confidence']} is low, asking AI for tags")
+                ai_tags = self._generate_ai_tags(title, content, category)
             
             # Combine and filter to exactly 12 tags
-            all_tags = base_tags + extracted_tags + ai_tags
+            all_tags = local_tags + ai_tags + base_tags + extracted_tags
             final_tags = self._filter_to_12_tags(all_tags, title, content)
             
             logger.info(f"Generated 12 tags: {', '.join(final_tags)}")
@@ -69,10 +81,13 @@ class SEOTagGenerator:
         text_content = re.sub(r'<[^>]+>', '', content)
         combined_text = (title + " " + text_content).lower()
         
+        # Inflection-aware: "ciąży" in the text counts for "ciąża"
+        text_keys = {normalize(word) for word in set(re.findall(r'\w+', combined_text))}
+        
         # Common Polish keywords for parenting/health content
         potential_keywords = [
             'ciąża', 'dziecko', 'mama', 'tata', 'rodzina', 'zdrowie', 'rozwój',
-            'poród', 'karmieniem', 'pielęgnacja', 'bezpieczeństwo', 'edukacja',
+            'poród', 'karmienie', 'pielęgnacja', 'bezpieczeństwo', 'edukacja',
             'zabawki', 'ubranka', 'kosmetyki', 'suplementy', 'witaminy',
             'badania', 'lekarz', 'pediatra', 'ginekolog', 'porady', 'wskazówki',
             'przygotowanie', 'planowanie', 'organizm', 'odżywianie', 'dieta'
@@ -80,7 +95,7 @@ class SEOTagGenerator:
         
         # Find keywords present in the text
         for keyword in potential_keywords:
-            if keyword in combined_text:
+            if normalize(keyword) in text_keys:
                 keywords.append(keyword)
         
         return keywords[:8]  # Limit to 8 extracted keywords
@@ -127,22 +142,27 @@ Odpowiedz tylko listą tagów oddzielonych przecinkami, bez dodatkowych słów."
     
     def _filter_to_12_tags(self, all_tags: List[str], title: str, content: str) -> List[str]:
         """Filter and prioritize tags to exactly 12 unique tags"""
-        # Remove duplicates while preserving order
+        # Remove duplicates (including other inflected forms) while preserving order
         seen = set()
         unique_tags = []
         
         for tag in all_tags:
             tag_clean = tag.lower().strip()
-            if tag_clean not in seen and len(tag_clean) > 2:
+            tag_key = self._tag_key(tag_clean)
+            if tag_key not in seen and len(tag_clean) > 2:
                 unique_tags.append(tag_clean)
-                seen.add(tag_clean)
+                seen.add(tag_key)
         
         # If we have more than 12, prioritize by relevance
         if len(unique_tags) > 12:
-            # Prioritize tags that appear in title
-            title_lower = title.lower()
-            title_tags = [tag for tag in unique_tags if tag in title_lower]
-            other_tags = [tag for tag in unique_tags if tag not in title_lower]
+            # Prioritize tags that appear in title (in any form)
+            title_keys = set(self._tag_key(title.lower()))
+            
+            def in_title(tag):
+                return all(key in title_keys for key in self._tag_key(tag))
+            
+            title_tags = [tag for tag in unique_tags if in_title(tag)]
+            other_tags = [tag for tag in unique_tags if not in_title(tag)]
             
             # Combine: title tags first, then others
             prioritized = title_tags + other_tags
@@ -157,14 +177,20 @@ Odpowiedz tylko listą tagów oddzielonych przecinkami, bez dodatkowych słów."
             ]
             
             for generic in generic_tags:
-                if generic not in unique_tags:
+                if self._tag_key(generic) not in seen:
                     unique_tags.append(generic)
+                    seen.add(self._tag_key(generic))
                     break
             else:
                 break  # No more generic tags to add
         
         return unique_tags[:12]  # Ensure exactly 12
     
+    @staticmethod
+    def _tag_key(tag: str) -> tuple:
+        """Inflection-independent identity of a tag"""
+        return tuple(normalize(word) for word in re.findall(r'\w+', tag))
+    
     def _get_fallback_tags(self, category: str) -> List[str]:
         """Get fallback tags if generation fails"""
         base = self.CATEGORY_BASE_TAGS.get(category, ['artykuł', 'porady', 'informacje'])
@@ -173,7 +199,7 @@ Odpowiedz tylko listą tagów oddzielonych przecinkami, bez dodatkowych słów."
         all_fallback = base + fallback
         return all_fallback[:12]
 
-def generate_seo_tags(title: str, content: str, category: str = "") -> List[str]:
+def generate_seo_tags(title: str, content: str, category: str = "", blog_id: Optional[int] = None) -> List[str]:
     """
     Convenience function to generate exactly 12 SEO tags.
     
@@ -181,9 +207,10 @@ def generate_seo_tags(title: str, content: str, category: str = "") -> List[str]
         title: Article title
         content: Article content
         category: Article category
+        blog_id: Blog whose articles weight the keyphrases (optional)
         
     Returns:
         List of exactly 12 SEO tags
     """
     generator = SEOTagGenerator()
-    return generator.generate_tags(title, content, category)
\ No newline at end of file
+    return generator.generate_tags(title, content, category, blog_id=blog_id)
\ No newline at end of file
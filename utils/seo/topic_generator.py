@@ -6,14 +6,20 @@ This module provides functions for generating article topics from trends and key
 import logging
 import random
 import json
-from models import ArticleTopic, db
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from .serp import get_serp_data, analyze_serp_results
+
+from flask import current_app, has_app_context
+
+from config import Config
+from models import ArticleTopic, db
+from utils.content.ai_adapter import get_default_ai_service
+from .serp import get_serp_data, analyze_serp_results, score_competition_batch
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-def generate_topics_from_trends(trends, categories=None, blog_id=None, limit=5):
+def generate_topics_from_trends(trends, categories=None, blog_id=None, limit=5, batch=False, ranked=None):
     """
     Generate article topics from trending searches.
     
@@ -22,6 +28,10 @@ def generate_topics_from_trends(trends, categories=None, blog_id=None, limit=5):
         categories: List of categories to filter by
         blog_id: ID of the blog to generate topics for
         limit: Maximum number of topics to generate (default: 5)
+        batch: Fetch SERP data concurrently and score all trends at once
+            (see generate_topics_batch)
+        ranked: Result of rank_trends for these trends, to share one ranking
+            between several blogs (batch mode only)
         
     Returns:
         List of generated topics
@@ -32,54 +42,46 @@ def generate_topics_from_trends(trends, categories=None, blog_id=None, limit=5):
         logger.warning("No trends provided for topic generation")
         return []
     
-    topics = []
-    for trend in trends[:limit * 2]:  # Process more trends than we need
-        try:
-            # Get SERP data for the trend
-            serp_data = get_serp_data(trend)
-            
-            # Analyze SERP results
-            serp_analysis = analyze_serp_results(serp_data)
-            
-            # Generate topic variations based on the trend and SERP analysis
-            variations = generate_topic_variations(trend, serp_analysis, categories)
-            
-            # Take the first variation
-            if variations:
-                topic_data = variations[0]
+    if batch:
+        topics = generate_topics_batch(trends[:limit * 2], categories, ranked)[:limit]
+    else:
+        topics = []
+        for trend in trends[:limit * 2]:  # Process more trends than we need
+            try:
+                # Get SERP data for the trend
+                serp_data = get_serp_data(trend)
                 
-                # Add blog ID if provided
-                if blog_id:
-                    # Create a new ArticleTopic object
-                    topic = ArticleTopic(
-                        title=topic_data['title'],
-                        description=topic_data['description'],
-                        keywords=json.dumps(topic_data['keywords']),
-                        category=topic_data['category'],
-                        blog_id=blog_id,
-                        status='pending'
-                    )
-                    
-                    # Add topic to the database
-                    db.session.add(topic)
+                # Analyze SERP results
+                serp_analysis = analyze_serp_results(serp_data)
+                
+                # Generate topic variations based on the trend and SERP analysis
+                variations = generate_topic_variations(trend, serp_analysis, categories)
+                
+                # Take the first variation
+                if variations:
+                    topics.append(variations[0])
                     
-                    # Generate additional topics if needed
+                    # Break if we have enough topics
                     if len(topics) >= limit:
                         break
-                
-                # Add topic to the list
-                topics.append(topic_data)
-                
-                # Break if we have enough topics
-                if len(topics) >= limit:
-                    break
-        
-        except Exception as e:
-            logger.error(f"Error generating topic for trend '{trend}': {str(e)}")
+            
+            except Exception as e:
+                logger.error(f"Error generating topic for trend '{trend}': {str(e)}")
     
-    # Commit changes to the database
+    # Save topics to the database
     if blog_id:
         try:
+            for topic_data in topics:
+                db.session.add(ArticleTopic(
+                    topic=topic_data['title'],
+                    title=topic_data['title'],
+                    description=topic_data['description'],
+                    keywords=json.dumps(topic_data['keywords']),
+                    category=topic_data['category'],
+                    score=topic_data.get('score'),
+                    blog_id=blog_id,
+                    status='pending'
+                ))
             db.session.commit()
             logger.info(f"Generated {len(topics)} topics for blog ID {blog_id}")
         except Exception as e:
@@ -88,6 +90,196 @@ def generate_topics_from_trends(trends, categories=None, blog_id=None, limit=5):
     
     return topics
 
+def fetch_serp_batch(trends, max_workers=None):
+    """
+    Fetch SERP data for many trends concurrently.
+    
+    Requests go through get_serp_data, so cached snapshots cost nothing and
+    at most SEO_SERP_CONCURRENCY requests hit SerpAPI at the same time.
+    
+    Args:
+        trends: List of trend terms
+        max_workers: Concurrency limit (default: Config.SEO_SERP_CONCURRENCY)
+        
+    Returns:
+        List of SERP data dictionaries in input order ({} on failure)
+    """
+    if not trends:
+        return []
+    
+    app = current_app._get_current_object() if has_app_context() else None
+    
+    def fetch(trend):
+        try:
+            if app is None:
+                return get_serp_data(trend)
+            # Worker threads need their own context for the SEO cache table
+            with app.app_context():
+                return get_serp_data(trend)
+        except Exception as e:
+            logger.error(f"Error getting SERP data for trend '{trend}': {str(e)}")
+            return {}
+    
+    workers = max(1, min(max_workers or Config.SEO_SERP_CONCURRENCY, len(trends)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serp") as executor:
+        return list(executor.map(fetch, trends))
+
+def rank_trends(trends):
+    """
+    Fetch and score SERP data of trends, easiest first.
+    
+    SERP data for all trends is fetched concurrently and scored in one pass.
+    The ranking does not depend on the blog, so one ranking can be shared by
+    all blogs generating topics from the same trends.
+    
+    Args:
+        trends: List of trend terms
+        
+    Returns:
+        List of dictionaries (trend, serp_data, analysis, score), ordered from
+        the least to the most competitive trend
+    """
+    trends = list(dict.fromkeys(trend.strip() for trend in trends if trend and trend.strip()))
+    if not trends:
+        return []
+    
+    serp_results = fetch_serp_batch(trends)
+    scores = score_competition_batch(serp_results)
+    ranked = [
+        {"trend": trend, "serp_data": serp_data, "analysis": analyze_serp_results(serp_data), "score": score}
+        for trend, serp_data, score in zip(trends, serp_results, scores)
+    ]
+    
+    # Unknown difficulty sorts between moderate and hard
+    return sorted(ranked, key=lambda item: 50 if item["score"] is None else item["score"])
+
+def generate_topics_batch(trends, categories=None, ranked=None):
+    """
+    Generate one topic per trend from a batched SERP lookup.
+    
+    Trends are ranked with rank_trends (unless a ranking is passed in) and
+    get the template variations. With SEO_TOPIC_AI_VARIATIONS enabled the AI
+    is asked for variations of every trend, in one structured prompt per
+    SEO_TOPIC_BATCH_SIZE trends; trends it skipped (or all of them, if the
+    request fails) keep the template variations.
+    
+    Args:
+        trends: List of trend terms
+        categories: List of categories to choose from
+        ranked: Result of rank_trends for these trends
+        
+    Returns:
+        List of topic dictionaries (title, description, keywords, category, score),
+        ordered from the least to the most competitive trend
+    """
+    if ranked is None:
+        ranked = rank_trends(trends)
+    if not ranked:
+        return []
+    
+    variations = {}
+    if Config.SEO_TOPIC_AI_VARIATIONS:
+        batch_size = max(1, Config.SEO_TOPIC_BATCH_SIZE)
+        for offset in range(0, len(ranked), batch_size):
+            chunk = ranked[offset:offset + batch_size]
+            variations.update(generate_topic_variations_batch(
+                [item["trend"] for item in chunk], [item["serp_data"] for item in chunk], categories
+            ))
+    
+    topics = []
+    for item in ranked:
+        trend = item["trend"]
+        trend_variations = variations.get(trend) or generate_topic_variations(trend, item["analysis"], categories)
+        if trend_variations:
+            topics.append(dict(trend_variations[0], trend=trend, score=item["score"]))
+    
+    logger.info(f"Generated {len(topics)} topics from {len(ranked)} trends in batch mode")
+    return topics
+
+def generate_topic_variations_batch(trends, serp_results, categories=None):
+    """
+    Generate Polish topic variations for several trends with a single AI request
+    (used only with SEO_TOPIC_AI_VARIATIONS).
+    
+    Args:
+        trends: List of trend terms
+        serp_results: SERP data for each trend (same order)
+        categories: List of categories to choose from
+        
+    Returns:
+        Dictionary mapping trend -> list of variations; trends missing from the
+        AI response (or all trends, if the request failed) are left out
+    """
+    if not trends:
+        return {}
+    
+    context = []
+    for trend, serp_data in zip(trends, serp_results):
+        serp_data = serp_data or {}
+        context.append({
+            "trend": trend,
+            "top_titles": [result.get("title", "") for result in (serp_data.get("organic_results") or [])[:3]],
+            "related_searches": (serp_data.get("related_searches") or [])[:5],
+        })
+    
+    allowed_categories = categories or []
+    prompt = f"""Dla każdego z poniższych trendów wyszukiwania zaproponuj 3 tematy artykułów blogowych po polsku.
+Uwzględnij tytuły konkurencji i powiązane wyszukiwania, aby tematy się wyróżniały.
+
+Trendy (JSON):
+{json.dumps(context, ensure_ascii=False)}
+
+{"Dozwolone kategorie: " + ", ".join(allowed_categories) if allowed_categories else "Dobierz ogólną kategorię tematyczną."}
+
+Odpowiedz wyłącznie w formacie JSON:
+{{"topics": [{{"trend": "trend z listy", "variations": [{{"title": "...", "description": "...", "keywords": ["...", "..."], "category": "..."}}]}}]}}"""
+    
+    try:
+        response = get_default_ai_service().complete_json(
+            prompt,
+            system_prompt="Jesteś ekspertem SEO i redaktorem polskiego bloga. Odpowiadasz wyłącznie poprawnym JSON.",
+            max_tokens=min(4000, 300 * len(trends) + 200),
+            temperature=0.7
+        )
+    except Exception as e:
+        logger.error(f"Batch topic generation failed for {len(trends)} trends: {str(e)}")
+        return {}
+    
+    if not isinstance(response, dict) or not isinstance(response.get("topics"), list):
+        logger.warning("Batch topic generation returned an unexpected response, using templates")
+        return {}
+    
+    by_trend = {trend.lower(): trend for trend in trends}
+    results = {}
+    for item in response["topics"]:
+        if not isinstance(item, dict):
+            continue
+        trend = by_trend.get(str(item.get("trend", "")).strip().lower())
+        if not trend:
+            continue
+        
+        variations = []
+        for variation in item.get("variations") or []:
+            if not isinstance(variation, dict) or not variation.get("title"):
+                continue
+            keywords = variation.get("keywords")
+            if not isinstance(keywords, list) or not keywords:
+                keywords = [trend]
+            category = variation.get("category")
+            if allowed_categories and category not in allowed_categories:
+                category = get_best_category(trend, allowed_categories)
+            variations.append({
+                'title': str(variation["title"]).strip(),
+                'description': str(variation.get("description") or "").strip(),
+                'keywords': [str(keyword) for keyword in keywords],
+                'category': category or get_best_category(trend, categories)
+            })
+        if variations:
+            results[trend] = variations
+    
+    logger.info(f"AI returned variations for {len(results)} of {len(trends)} trends")
+    return results
+
 def generate_topic_variations(trend, serp_analysis, categories=None):
     """
     Generate article topics in Polish based on a trend and SERP analysis.
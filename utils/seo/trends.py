@@ -9,64 +9,88 @@ import json
 import time
 import random
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from utils.seo.cache import seo_cache
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# If import fails, we'll use our custom PatchedTrendReq implementation
-try:
-    # Try import original pytrends
-    from utils.seo.patched_trends import PatchedTrendReq
-    logger.info("Using PatchedTrendReq for Google Trends API")
-except ImportError:
-    # Fallback to our custom implementation
-    logger.warning("Could not import PatchedTrendReq, using built-in fallback")
-    # Define a simpler fallback trend implementation
-    class PatchedTrendReq:
-        def __init__(self, hl='en-US', tz=360, geo='', timeout=(2, 5), proxies='',
-                    retries=0, backoff_factor=0, requests_args=None):
-            self.hl = hl
-            self.geo = geo
-            
-        def trending_searches(self, pn='poland'):
-            """Fallback trending searches data"""
-            fallback_trends = get_fallback_trends(pn)
-            return fallback_trends
-            
-        def today_searches(self, pn='PL'):
-            """Get today's trending searches"""
-            fallback_trends = get_fallback_trends(pn)
-            return [{"title": {"query": t}} for t in fallback_trends]
-            
-        def interest_over_time(self):
-            """Fallback interest over time data"""
-            return {
-                "data": {
-                    "timestamp": [int(datetime.now().timestamp()) - i * 86400 for i in range(30)],
-                    "values": [random.randint(20, 100) for _ in range(30)]
-                }
-            }
-            
-        def related_topics(self):
-            """Fallback related topics data"""
-            return {
-                "rising": [
-                    {"topic_title": f"Related Topic {i}", "value": random.randint(1, 100)} 
-                    for i in range(1, 6)
-                ]
+class FallbackTrendReq:
+    """Offline stand-in used when PatchedTrendReq cannot be imported"""
+
+    def __init__(self, hl='en-US', tz=360, geo='', timeout=(2, 5), proxies='',
+                retries=0, backoff_factor=0, requests_args=None):
+        self.hl = hl
+        self.geo = geo
+        
+    def trending_searches(self, pn='poland'):
+        """Fallback trending searches data"""
+        fallback_trends = get_fallback_trends(pn)
+        return fallback_trends
+        
+    def today_searches(self, pn='PL'):
+        """Get today's trending searches"""
+        fallback_trends = get_fallback_trends(pn)
+        return [{"title": {"query": t}} for t in fallback_trends]
+        
+    def interest_over_time(self):
+        """Fallback interest over time data"""
+        return {
+            "data": {
+                "timestamp": [int(datetime.now().timestamp()) - i * 86400 for i in range(30)],
+                "values": [random.randint(20, 100) for _ in range(30)]
             }
+        }
         
-        def build_payload(self, kw_list, timeframe='today 12-m', geo=''):
-            """Build payload for trend requests"""
-            self.kw_list = kw_list
-            self.geo = geo or self.geo
-            return True
+    def related_topics(self):
+        """Fallback related topics data"""
+        return {
+            "rising": [
+                {"topic_title": f"Related Topic {i}", "value": random.randint(1, 100)} 
+                for i in range(1, 6)
+            ]
+        }
+    
+    def build_payload(self, kw_list, timeframe='today 12-m', geo=''):
+        """Build payload for trend requests"""
+        self.kw_list = kw_list
+        self.geo = geo or self.geo
+        return True
+
+
+@lru_cache(maxsize=1)
+def _trend_request_class():
+    """
+    Class used for Google Trends requests, resolved on first use: it pulls in
+    pandas and pytrends, which would otherwise add a noticeable delay to every
+    import of utils.seo.
+    """
+    from utils.seo import monkey_patch
+    if monkey_patch.apply_patches():
+        logger.info("Successfully applied SEO module patches")
+    else:
+        logger.warning("Failed to apply some SEO module patches")
+    
+    try:
+        from utils.seo.patched_trends import PatchedTrendReq
+        logger.info("Using PatchedTrendReq for Google Trends API")
+        return PatchedTrendReq
+    except ImportError:
+        logger.warning("Could not import PatchedTrendReq, using built-in fallback")
+        return FallbackTrendReq
+
+
+def _new_trend_request(country):
+    return _trend_request_class()(hl=f'pl-{country.upper()}')
 
 
 def get_daily_trends(country="pl"):
     """
     Get daily trends from Google Trends.
     
+    Results are cached for SEO_DAILY_TRENDS_CACHE_HOURS.
+    
     Args:
         country: The country code (default: 'pl' for Poland)
         
@@ -74,42 +98,48 @@ def get_daily_trends(country="pl"):
         List of trending search terms
     """
     try:
-        logger.info(f"Fetching daily trends for {country}")
-        pytrend = PatchedTrendReq(hl=f'pl-{country.upper()}')
-        
-        # Map country code to Google Trends country name
-        country_map = {
-            'pl': 'poland',
-            'us': 'united_states',
-            'uk': 'united_kingdom',
-            'de': 'germany',
-            'fr': 'france',
-            'es': 'spain',
-            'it': 'italy'
-        }
-        country_name = country_map.get(country.lower(), 'poland')
-        
-        # Get trending searches for the country
-        trending = pytrend.trending_searches(pn=country_name)
-        
-        # Extract the trending topics
-        if isinstance(trending, list) and len(trending) > 0:
-            # If the data is returned as expected
-            return trending[:20]  # Limit to top 20
-        else:
-            # Fallback to default topics
-            logger.warning(f"Unexpected response format from Google Trends: {trending}")
-            return get_fallback_trends(country)
-            
+        return seo_cache.get_or_fetch(
+            "daily_trends", lambda: _fetch_daily_trends(country), geo=country, timeframe="daily"
+        )
     except Exception as e:
         logger.error(f"Error fetching daily trends: {str(e)}")
         return get_fallback_trends(country)
 
 
+def _fetch_daily_trends(country):
+    """Fetch daily trends from Google Trends, raises if the response is unusable"""
+    logger.info(f"Fetching daily trends for {country}")
+    pytrend = _new_trend_request(country)
+    
+    # Map country code to Google Trends country name
+    country_map = {
+        'pl': 'poland',
+        'us': 'united_states',
+        'uk': 'united_kingdom',
+        'de': 'germany',
+        'fr': 'france',
+        'es': 'spain',
+        'it': 'italy'
+    }
+    country_name = country_map.get(country.lower(), 'poland')
+    
+    # Get trending searches for the country
+    trending = pytrend.trending_searches(pn=country_name)
+    
+    # Extract the trending topics
+    if isinstance(trending, list) and len(trending) > 0:
+        # If the data is returned as expected
+        return trending[:20]  # Limit to top 20
+    
+    raise ValueError(f"Unexpected response format from Google Trends: {trending}")
+
+
 def get_related_topics(keyword, country="pl", timeframe="today 12-m"):
     """
     Get topics related to a keyword.
     
+    Results are cached for SEO_TREND_SERIES_CACHE_HOURS.
+    
     Args:
         keyword: The keyword to get related topics for
         country: The country code (default: 'pl')
@@ -119,21 +149,34 @@ def get_related_topics(keyword, country="pl", timeframe="today 12-m"):
         Dictionary of related topics
     """
     try:
-        pytrend = PatchedTrendReq(hl=f'pl-{country.upper()}')
-        pytrend.build_payload([keyword], timeframe=timeframe, geo=country.upper())
-        related_topics = pytrend.related_topics()
-        
-        if keyword in related_topics and 'rising' in related_topics[keyword]:
-            return related_topics[keyword]['rising'][:10]
-        else:
+        related = seo_cache.get_or_fetch(
+            "related_topics", lambda: _fetch_related_topics(keyword, country, timeframe),
+            keyword=keyword, geo=country, timeframe=timeframe, cacheable=lambda value: True
+        )
+        if not related:
             logger.warning(f"No related topics found for {keyword}")
-            return []
+        return related
             
     except Exception as e:
         logger.error(f"Error getting related topics for {keyword}: {str(e)}")
         return []
 
 
+def _fetch_related_topics(keyword, country, timeframe):
+    """Fetch rising related topics from Google Trends"""
+    pytrend = _new_trend_request(country)
+    pytrend.build_payload([keyword], timeframe=timeframe, geo=country.upper())
+    related_topics = pytrend.related_topics()
+    
+    if keyword in related_topics and 'rising' in related_topics[keyword]:
+        rising = related_topics[keyword]['rising']
+        if hasattr(rising, 'to_dict'):
+            # pandas DataFrame from pytrends
+            rising = rising.to_dict('records')
+        return rising[:10]
+    return []
+
+
 def get_trending_topics(country="pl", limit=10):
     """
     Get trending topics for content creation.
@@ -168,6 +211,8 @@ def get_interest_over_time(keyword, country="pl", timeframe="today 12-m"):
     """
     Get interest over time for a keyword.
     
+    Results are cached for SEO_TREND_SERIES_CACHE_HOURS.
+    
     Args:
         keyword: The keyword to get interest data for
         country: The country code (default: 'pl')
@@ -177,24 +222,10 @@ def get_interest_over_time(keyword, country="pl", timeframe="today 12-m"):
         Dictionary with interest over time data
     """
     try:
-        pytrend = PatchedTrendReq(hl=f'pl-{country.upper()}')
-        pytrend.build_payload([keyword], timeframe=timeframe, geo=country.upper())
-        interest_over_time_df = pytrend.interest_over_time()
-        
-        if isinstance(interest_over_time_df, dict) and 'data' in interest_over_time_df:
-            # Our custom implementation returns dict
-            return interest_over_time_df['data']
-        
-        # Convert pandas DataFrame to dict
-        result = {}
-        for col in interest_over_time_df.columns:
-            if col != 'isPartial':
-                result[col] = interest_over_time_df[col].to_list()
-        
-        # Add timestamps
-        result['timestamp'] = interest_over_time_df.index.astype(int).to_list() // 10**9
-        
-        return result
+        return seo_cache.get_or_fetch(
+            "interest_over_time", lambda: _fetch_interest_over_time(keyword, country, timeframe),
+            keyword=keyword, geo=country, timeframe=timeframe
+        )
         
     except Exception as e:
         logger.error(f"Error getting interest over time for {keyword}: {str(e)}")
@@ -209,6 +240,28 @@ def get_interest_over_time(keyword, country="pl", timeframe="today 12-m"):
         }
 
 
+def _fetch_interest_over_time(keyword, country, timeframe):
+    """Fetch the interest series of a keyword from Google Trends"""
+    pytrend = _new_trend_request(country)
+    pytrend.build_payload([keyword], timeframe=timeframe, geo=country.upper())
+    interest_over_time_df = pytrend.interest_over_time()
+    
+    if isinstance(interest_over_time_df, dict) and 'data' in interest_over_time_df:
+        # Our custom implementation returns dict
+        return interest_over_time_df['data']
+    
+    # Convert pandas DataFrame to dict
+    result = {}
+    for col in interest_over_time_df.columns:
+        if col != 'isPartial':
+            result[col] = interest_over_time_df[col].to_list()
+    
+    # Add timestamps
+    result['timestamp'] = (interest_over_time_df.index.astype('int64') // 10**9).to_list()
+    
+    return result
+
+
 def get_fallback_trends(country="pl"):
     """
     Get fallback trends when Google Trends API is rate-limited.
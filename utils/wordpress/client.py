@@ -9,9 +9,20 @@ import re
 from datetime import datetime
 from typing import Tuple, Dict, Any, List, Optional, Union
 
+from utils.monitoring.metrics import time_wordpress_request
+from utils.monitoring.tracing import KIND_CLIENT, tracer
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
+
+def _wp_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Request to the WordPress REST API, timed per endpoint in the metrics registry"""
+    with time_wordpress_request(method, url) as labels:
+        response = requests.request(method, url, **kwargs)
+        labels["status"] = str(response.status_code)
+        return response
+
 def normalize_wp_api_url(api_url: str) -> str:
     """
     Normalize a WordPress API URL to ensure consistent formatting
@@ -104,7 +115,7 @@ def get_wordpress_categories(blog_id: int) -> List[Dict[str, Any]]:
     auth = (username, token)
     
     try:
-        response = requests.get(url, auth=auth, params={"per_page": 100})
+        response = _wp_request("GET", url, auth=auth, params={"per_page": 100})
         response.raise_for_status()
         
         categories = response.json()
@@ -183,7 +194,7 @@ def get_wordpress_tags(blog_id: int) -> List[Dict[str, Any]]:
     auth = (username, token)
     
     try:
-        response = requests.get(url, auth=auth, params={"per_page": 100})
+        response = _wp_request("GET", url, auth=auth, params={"per_page": 100})
         response.raise_for_status()
         
         tags = response.json()
@@ -233,7 +244,7 @@ def get_or_create_tag_ids(blog_id: int, tag_names: List[str]) -> List[int]:
         # Try to find existing tag
         url = build_wp_api_url(api_url, "tags")
         try:
-            response = requests.get(url, auth=auth, params={"search": tag_name})
+            response = _wp_request("GET", url, auth=auth, params={"search": tag_name})
             response.raise_for_status()
             existing_tags = response.json()
             
@@ -250,7 +261,7 @@ def get_or_create_tag_ids(blog_id: int, tag_names: List[str]) -> List[int]:
             else:
                 # Create new tag
                 create_url = build_wp_api_url(api_url, "tags")
-                create_response = requests.post(
+                create_response = _wp_request("POST",
                     create_url, 
                     auth=auth, 
                     json={"name": tag_name}
@@ -286,7 +297,7 @@ def get_wordpress_post(blog_id: int, post_id: int) -> Dict[str, Any]:
     auth = (username, token)
     
     try:
-        response = requests.get(url, auth=auth)
+        response = _wp_request("GET", url, auth=auth)
         response.raise_for_status()
         
         return response.json()
@@ -358,7 +369,7 @@ def create_wordpress_post(
         logger.info(f"Setting post author to ID: {author_id}")
     
     try:
-        response = requests.post(url, auth=auth, json=post_data)
+        response = _wp_request("POST", url, auth=auth, json=post_data)
         response.raise_for_status()
         
         post = response.json()
@@ -453,7 +464,7 @@ def update_wordpress_post(
         logger.info(f"Setting post author to ID: {author_id}")
     
     try:
-        response = requests.post(url, auth=auth, json=post_data)
+        response = _wp_request("POST", url, auth=auth, json=post_data)
         response.raise_for_status()
         
         post = response.json()
@@ -544,6 +555,16 @@ def publish_wordpress_post(
             author_id=author_id
         )
 
+def _get_image(image_url: str, timeout: int = 30) -> requests.Response:
+    """GET an image, traced as a client span of the current workflow"""
+    with tracer.span("image_download", KIND_CLIENT,
+                     {"http.method": "GET", "http.url": image_url.split('?', 1)[0]}) as span:
+        response = requests.get(image_url, timeout=timeout)
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("http.response_content_length", len(response.content))
+        return response
+
 def download_image_from_url(image_url: str) -> bytes:
     """
     Download image binary data from URL (zgodnie z instrukcjami użytkownika)
@@ -555,7 +576,7 @@ def download_image_from_url(image_url: str) -> bytes:
         Binary image data
     """
     try:
-        response = requests.get(image_url, timeout=30)
+        response = _get_image(image_url)
         response.raise_for_status()
         return response.content
     except Exception as e:
@@ -598,7 +619,7 @@ def upload_image_to_wordpress_media(
     
     try:
         # Upload image to WordPress media library
-        response = requests.post(url, auth=auth, headers=headers, data=image_data)
+        response = _wp_request("POST", url, auth=auth, headers=headers, data=image_data)
         response.raise_for_status()
         
         media = response.json()
@@ -609,7 +630,7 @@ def upload_image_to_wordpress_media(
             try:
                 alt_text_data = {'alt_text': alt_text}
                 alt_url = build_wp_api_url(api_url, f"media/{media_id}")
-                requests.post(alt_url, auth=auth, json=alt_text_data)
+                _wp_request("POST", alt_url, auth=auth, json=alt_text_data)
             except:
                 pass  # Alt text update failure shouldn't break the upload
         
@@ -648,7 +669,7 @@ def upload_media_to_wordpress(
     
     try:
         # Download the image
-        image_response = requests.get(image_url)
+        image_response = _get_image(image_url)
         image_response.raise_for_status()
         
         # Determine content type from response or default to jpeg
@@ -660,7 +681,7 @@ def upload_media_to_wordpress(
             "Content-Type": content_type
         }
         
-        response = requests.post(
+        response = _wp_request("POST",
             url, 
             auth=auth, 
             headers=headers,
@@ -679,7 +700,7 @@ def upload_media_to_wordpress(
             }
             
             logger.info(f"Setting alt text for media ID {media['id']}")
-            update_response = requests.post(update_url, auth=auth, json=update_data)
+            update_response = _wp_request("POST", update_url, auth=auth, json=update_data)
             update_response.raise_for_status()
         
         return True, media["id"], None
@@ -708,7 +729,7 @@ def delete_wordpress_post(blog_id: int, post_id: int) -> bool:
     auth = (username, token)
     
     try:
-        response = requests.delete(url, auth=auth, params={"force": True})
+        response = _wp_request("DELETE", url, auth=auth, params={"force": True})
         response.raise_for_status()
         
         return True
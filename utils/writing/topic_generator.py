@@ -8,8 +8,6 @@ from datetime import datetime, timedelta
 import re
 
 import requests
-import anthropic
-from anthropic import Anthropic
 from app import db
 from models import ArticleTopic
 from utils.seo import seo_analyzer
@@ -152,7 +150,8 @@ def generate_topics_using_ai(blog_name, blog_category, count=3):
             logger.warning("No ANTHROPIC_API_KEY found, falling back to template-based generation")
             return generate_topics_from_template(blog_category, count)
         
-        # Create Anthropic client
+        # Create Anthropic client (the SDK is imported here: it takes over a second to import)
+        from anthropic import Anthropic
         client = Anthropic(api_key=api_key)
         
         # Current date information for context
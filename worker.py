@@ -0,0 +1,76 @@
+"""
+Standalone job queue worker
+
+Runs queued jobs (article generation, SEO analysis, newsletters, ...) outside
+the web process. Start any number of these, on one or many machines, against
+the same database; jobs are claimed with row locks so each runs once.
+
+Usage:
+    JOB_QUEUE_ENABLED=true python worker.py --concurrency 2
+    python worker.py --types batch_generation,execute_rule
+    python worker.py --once            # drain the queue and exit
+
+With a SQLite DATABASE_URL (single-box deployments) the worker switches the
+database to WAL mode so the web process and the workers can share it.
+"""
+import argparse
+import logging
+import signal
+import sys
+
+from app import app, db
+from utils.logger import configure_logging
+from utils.monitoring.metrics import start_snapshots
+from utils.scheduling import jobs  # noqa: F401 - registers the job handlers
+from utils.scheduling.job_queue import QueueWorker, get_queue_stats, prepare_sqlite
+
+# Setup logging
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs run in parallel by this process")
+    parser.add_argument("--types", default=None, help="comma separated job types to claim (default: all)")
+    parser.add_argument("--lease", type=int, default=None, help="lease length in seconds")
+    parser.add_argument("--poll", type=float, default=None, help="seconds to wait when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="run until the queue is empty, then exit")
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        prepare_sqlite(db.engine)
+        logger.info(f"Queue state: {get_queue_stats()}")
+    
+    # Job metrics reach the web dashboard through the stored snapshots
+    start_snapshots()
+
+    job_types = [job_type.strip() for job_type in args.types.split(',')] if args.types else None
+    worker = QueueWorker(concurrency=args.concurrency, job_types=job_types,
+                         lease_seconds=args.lease, poll_seconds=args.poll)
+
+    if args.once:
+        processed = 0
+        while worker.run_once():
+            processed += 1
+        logger.info(f"Queue drained, {processed} jobs processed")
+        return
+
+    def shutdown(signum, frame):
+        logger.info("Shutting down worker, waiting for running jobs")
+        worker.stop_event.set()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    worker.run_forever()
+    worker.stop()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Worker failed: {str(e)}")
+        sys.exit(1)